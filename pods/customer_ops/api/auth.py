@@ -5,14 +5,12 @@ Multi-tenant API key authentication with rate limiting and quotas.
 from __future__ import annotations
 
 import os
-import time
-from collections import deque
 from typing import Literal
 
 from fastapi import Header, HTTPException, Request
 from typing_extensions import TypedDict
 
-from pods.customer_ops.db_duck import bump_api_key_counters, get_api_key
+from .auth_cache import get_auth_state
 
 Role = Literal["admin", "editor", "viewer"]
 
@@ -24,10 +22,6 @@ class TenantContext(TypedDict):
     role: str
 
 
-# In-memory rate limiters (per-key RPM tracking)
-_rpm_limiters: dict[str, deque] = {}
-
-
 def _check_rpm_limit(api_key: str, rpm_limit: int) -> bool:
     """
     Check if API key is within RPM limit using sliding window.
@@ -39,26 +33,7 @@ def _check_rpm_limit(api_key: str, rpm_limit: int) -> bool:
     Returns:
         True if within limit, False if exceeded
     """
-    now = time.time()
-    window = 60.0  # 1 minute window
-
-    # Initialize deque for this key if needed
-    if api_key not in _rpm_limiters:
-        _rpm_limiters[api_key] = deque()
-
-    timestamps = _rpm_limiters[api_key]
-
-    # Remove timestamps outside window
-    while timestamps and timestamps[0] < now - window:
-        timestamps.popleft()
-
-    # Check limit
-    if len(timestamps) >= rpm_limit:
-        return False
-
-    # Add current request
-    timestamps.append(now)
-    return True
+    return get_auth_state().rpm.allow(api_key, rpm_limit)
 
 
 def resolve_auth(
@@ -94,7 +69,8 @@ def resolve_auth(
 
     # 2) API key lookup
     if x_api_key:
-        key_data = get_api_key(x_api_key)
+        state = get_auth_state()
+        key_data = state.keys.get(x_api_key)
 
         if not key_data:
             raise HTTPException(status_code=401, detail="Invalid API key")
@@ -110,16 +86,12 @@ def resolve_auth(
                     status_code=429, detail=f"Rate limit exceeded: {rpm_limit} requests/minute"
                 )
 
-        # Check daily quota
-        ok, reason = bump_api_key_counters(x_api_key)
-        if not ok:
-            if reason == "daily_quota_exceeded":
-                raise HTTPException(
-                    status_code=429,
-                    detail=f"Daily quota exceeded: {key_data.get('daily_quota')} requests/day",
-                )
-            else:
-                raise HTTPException(status_code=401, detail=f"API key error: {reason}")
+        # Check daily quota (counted in memory/Redis, flushed to DuckDB in batches)
+        if not state.counters.hit(x_api_key, key_data):
+            raise HTTPException(
+                status_code=429,
+                detail=f"Daily quota exceeded: {key_data.get('daily_quota')} requests/day",
+            )
 
         return TenantContext(
             tenant_id=key_data.get("tenant_id"), role=key_data.get("role", "viewer")
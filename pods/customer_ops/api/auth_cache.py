@@ -0,0 +1,368 @@
+"""
+Hot-path state for API-key authentication.
+
+resolve_auth() used to read the key from DuckDB and update its counters
+there on every request. It now goes through:
+
+- KeyCache: TTL + LRU cache of key records (AUTH_KEY_CACHE_TTL seconds).
+  The /admin/apikeys endpoints call invalidate_api_key(). The
+  invalidation reaches other workers through a per-key generation in Redis
+  (see response_cache.TenantGenerations) within a second.
+- DailyCounters: atomic per-day request counters (Redis INCR, or
+  in-process if Redis is unavailable). They are seeded from
+  api_keys.daily_count, and the increments are written back to DuckDB in
+  batches every AUTH_COUNTER_FLUSH_SECONDS (write-behind).
+- RpmLimiter: sliding-window counter (the current minute's count plus the
+  previous minute's, weighted by how much of it is still in the window).
+  State is two counters per key, kept in Redis so the limit holds across
+  workers, or locally as a fallback.
+
+Redis key names carry a SHA-256 of the API key, never the key itself
+(SCAN, MONITOR and the slowlog would otherwise expose it).
+
+Redis errors fail open to the in-process structures for
+AUTH_REDIS_COOLDOWN seconds. Without Redis, quotas and RPM limits are
+enforced per worker, as before.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from prometheus_client import Counter
+
+from .response_cache import TenantGenerations
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover
+    redis = None  # type: ignore
+
+log = logging.getLogger("auth_cache")
+
+AUTH_KEY_CACHE_TTL = float(os.getenv("AUTH_KEY_CACHE_TTL", "30"))
+AUTH_KEY_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_KEY_CACHE_MAX_ENTRIES", "10000"))
+AUTH_COUNTER_FLUSH_SECONDS = float(os.getenv("AUTH_COUNTER_FLUSH_SECONDS", "5"))
+AUTH_REDIS_COOLDOWN = float(os.getenv("AUTH_REDIS_COOLDOWN", "30"))
+
+AUTH_KEY_LOOKUPS = Counter(
+    "aether_auth_key_cache_lookups_total",
+    "API key record lookups by result",
+    ["result"],  # hit, miss
+)
+AUTH_COUNTER_FLUSHES = Counter(
+    "aether_auth_counter_flushes_total",
+    "Write-behind flushes of API key daily counters",
+    ["outcome"],  # ok, error
+)
+
+_DAY_SECONDS = 86400
+_WINDOW_SECONDS = 60
+
+
+def _key_id(key: str) -> str:
+    """Digest of an API key, used in Redis key names instead of the key."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class _FailOpen:
+    """Shared Redis client with a cooldown after errors."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._down_until = 0.0
+
+    def available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._down_until
+
+    def failed(self, what: str, e: Exception) -> None:
+        log.warning(
+            "auth %s: redis unavailable (%s); using local state for %.0fs",
+            what,
+            e,
+            AUTH_REDIS_COOLDOWN,
+        )
+        self._down_until = time.monotonic() + AUTH_REDIS_COOLDOWN
+
+
+class KeyCache:
+    """TTL + LRU cache of API key records (None = unknown key, cached too)."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], dict[str, Any] | None],
+        generations: TenantGenerations,
+        ttl_seconds: float = AUTH_KEY_CACHE_TTL,
+        max_entries: int = AUTH_KEY_CACHE_MAX_ENTRIES,
+    ):
+        self.loader = loader
+        self.generations = generations
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expires_at, generation, record)
+        self._entries: OrderedDict[str, tuple[float, tuple[int, int], dict | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        generation = self.generations.current(_key_id(key))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now and entry[1] == generation:
+                self._entries.move_to_end(key)
+                AUTH_KEY_LOOKUPS.labels(result="hit").inc()
+                return entry[2]
+        AUTH_KEY_LOOKUPS.labels(result="miss").inc()
+        record = self.loader(key)
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, generation, record)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return record
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        self.generations.bump(_key_id(key))
+
+
+class DailyCounters:
+    """Per-key daily request counters with write-behind to DuckDB."""
+
+    def __init__(self, redis_state: _FailOpen):
+        self._redis = redis_state
+        self._local: dict[tuple[str, str], int] = {}
+        self._pending: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _redis_key(key: str, day: str) -> str:
+        return f"auth:daily:{_key_id(key)}:{day}"
+
+    def _incr_redis(self, key: str, day: str, seed: int) -> int | None:
+        if not self._redis.available():
+            return None
+        rkey = self._redis_key(key, day)
+        try:
+            pipe = self._redis.client.pipeline(transaction=False)
+            pipe.set(rkey, seed, nx=True, ex=2 * _DAY_SECONDS)
+            pipe.incr(rkey)
+            return int(pipe.execute()[1])
+        except Exception as e:
+            self._redis.failed("daily counters", e)
+            return None
+
+    def _incr_local(self, key: str, day: str, seed: int) -> int:
+        with self._lock:
+            if (key, day) not in self._local:
+                # New day (or first request): drop other days' counters
+                for stale in [k for k in self._local if k[1] != day]:
+                    del self._local[stale]
+                self._local[(key, day)] = seed
+            self._local[(key, day)] += 1
+            return self._local[(key, day)]
+
+    def _undo(self, key: str, day: str, in_redis: bool) -> None:
+        if in_redis:
+            try:
+                self._redis.client.decr(self._redis_key(key, day))
+            except Exception as e:
+                self._redis.failed("daily counters", e)
+        else:
+            with self._lock:
+                self._local[(key, day)] -= 1
+
+    def hit(self, key: str, record: dict[str, Any]) -> bool:
+        """Count one request for key; False (and not counted) if over its daily quota."""
+        day = datetime.date.today().isoformat()
+        seed = int(record.get("daily_count") or 0) if record.get("daily_reset") == day else 0
+        count = self._incr_redis(key, day, seed)
+        in_redis = count is not None
+        if count is None:
+            count = self._incr_local(key, day, seed)
+        quota = record.get("daily_quota")
+        if quota is not None and count > quota:
+            self._undo(key, day, in_redis)
+            return False
+        with self._lock:
+            self._pending[(key, day)] += 1
+        return True
+
+    def drain(self) -> dict[tuple[str, str], int]:
+        """Counts accumulated since the last drain (for the DuckDB flush)."""
+        with self._lock:
+            pending, self._pending = dict(self._pending), defaultdict(int)
+        return pending
+
+    def restore(self, pending: dict[tuple[str, str], int]) -> None:
+        """Put back counts whose flush failed."""
+        with self._lock:
+            for k, n in pending.items():
+                self._pending[k] += n
+
+
+class RpmLimiter:
+    """Sliding-window requests-per-minute limiter, shared via Redis when available."""
+
+    def __init__(self, redis_state: _FailOpen, max_keys: int = AUTH_KEY_CACHE_MAX_ENTRIES):
+        self._redis = redis_state
+        self.max_keys = max_keys
+        # key -> [window, count in window, count in previous window]
+        self._local: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _redis_key(key: str, window: int) -> str:
+        return f"auth:rpm:{_key_id(key)}:{window}"
+
+    def _counts_redis(self, key: str, window: int) -> tuple[int, int] | None:
+        if not self._redis.available():
+            return None
+        try:
+            pipe = self._redis.client.pipeline(transaction=False)
+            pipe.incr(self._redis_key(key, window))
+            pipe.expire(self._redis_key(key, window), 2 * _WINDOW_SECONDS)
+            pipe.get(self._redis_key(key, window - 1))
+            current, _, previous = pipe.execute()
+            return int(current), int(previous or 0)
+        except Exception as e:
+            self._redis.failed("rpm limiter", e)
+            return None
+
+    def _counts_local(self, key: str, window: int) -> tuple[int, int]:
+        with self._lock:
+            state = self._local.get(key)
+            if state is None or state[0] < window - 1:
+                state = [window, 0, 0]
+            elif state[0] == window - 1:
+                state = [window, 0, state[1]]
+            state[1] += 1
+            self._local[key] = state
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_keys:
+                self._local.popitem(last=False)
+            return state[1], state[2]
+
+    def allow(self, key: str, limit: int) -> bool:
+        now = time.time()
+        window = int(now // _WINDOW_SECONDS)
+        elapsed = (now % _WINDOW_SECONDS) / _WINDOW_SECONDS
+        counts = self._counts_redis(key, window)
+        in_redis = counts is not None
+        if counts is None:
+            counts = self._counts_local(key, window)
+        current, previous = counts
+        if previous * (1.0 - elapsed) + current <= limit:
+            return True
+        # Rejected requests do not use up the window
+        if in_redis:
+            try:
+                self._redis.client.decr(self._redis_key(key, window))
+            except Exception as e:
+                self._redis.failed("rpm limiter", e)
+        else:
+            with self._lock:
+                if key in self._local:
+                    self._local[key][1] -= 1
+        return False
+
+
+class AuthState:
+    """Key cache, daily counters and RPM limiter sharing one Redis client."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        loader: Callable[[str], dict[str, Any] | None] | None = None,
+        flusher: Callable[[dict[tuple[str, str], int]], None] | None = None,
+    ):
+        if loader is None or flusher is None:
+            from pods.customer_ops.db_duck import add_api_key_counts, get_api_key
+
+            loader = loader or get_api_key
+            flusher = flusher or add_api_key_counts
+        redis_state = _FailOpen(client)
+        self.keys = KeyCache(loader, TenantGenerations(client, key_template="auth:keygen:{tenant}"))
+        self.counters = DailyCounters(redis_state)
+        self.rpm = RpmLimiter(redis_state)
+        self._flusher = flusher
+        self._flush_lock = threading.Lock()
+        self._flusher_thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> AuthState:
+        if not url or redis is None:
+            return cls(**kwargs)
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return cls(client, **kwargs)
+
+    def flush(self) -> None:
+        """Write buffered daily counts to DuckDB."""
+        with self._flush_lock:
+            pending = self.counters.drain()
+            if not pending:
+                return
+            try:
+                self._flusher(pending)
+                AUTH_COUNTER_FLUSHES.labels(outcome="ok").inc()
+            except Exception as e:
+                self.counters.restore(pending)
+                AUTH_COUNTER_FLUSHES.labels(outcome="error").inc()
+                log.warning("api key counter flush failed (will retry): %s", e)
+
+    def start_flusher(self, interval: float = AUTH_COUNTER_FLUSH_SECONDS) -> None:
+        """Flush counters every interval seconds on a daemon thread (idempotent)."""
+        if self._flusher_thread is not None and self._flusher_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                self.flush()
+
+        self._flusher_thread = threading.Thread(target=loop, name="auth-flush", daemon=True)
+        self._flusher_thread.start()
+
+    def stop_flusher(self) -> None:
+        """Stop the flusher thread and write out what is left."""
+        self._stop.set()
+        if self._flusher_thread is not None:
+            self._flusher_thread.join(timeout=5)
+            self._flusher_thread = None
+        self.flush()
+
+
+_state: AuthState | None = None
+_state_lock = threading.Lock()
+
+
+def get_auth_state() -> AuthState:
+    """Process-wide AuthState (Redis from REDIS_URL), with its flusher running."""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = AuthState.from_url(os.getenv("REDIS_URL", ""))
+                _state.start_flusher()
+    return _state
+
+
+def invalidate_api_key(key: str) -> None:
+    """Drop key's cached record in every worker (call after changing it)."""
+    get_auth_state().keys.invalidate(key)
+
+
+def flush_api_key_counters() -> None:
+    """Write buffered daily counts to DuckDB now (e.g. before listing keys)."""
+    if _state is not None:
+        _state.flush()
@@ -28,7 +28,8 @@ T = TypeVar("T")
 class _RedisShim:
     """Very small in-memory shim implementing the subset of Redis API used in tests.
 
-    Supports: get, set, setex, lpush, lrange, pipeline()
+    Supports: get, mget, set, setex, delete, exists, lpush, lrange, ltrim,
+    zadd, zrem, zcard, zrevrange, zrangebyscore, zrevrangebyscore, pipeline()
     """
 
     def __init__(self):
@@ -37,6 +38,9 @@ class _RedisShim:
     def get(self, key: str):
         return self._store.get(key)
 
+    def mget(self, keys: list[str]):
+        return [self.get(k) for k in keys]
+
     def set(self, key: str, value: str):
         self._store[key] = value
 
@@ -44,6 +48,12 @@ class _RedisShim:
         # ignore expiry in shim
         self._store[key] = value
 
+    def delete(self, *keys: str):
+        return sum(1 for k in keys if self._store.pop(k, None) is not None)
+
+    def exists(self, *keys: str):
+        return sum(1 for k in keys if k in self._store)
+
     def lpush(self, key: str, value: str):
         lst = self._store.get(key) or []
         if not isinstance(lst, list):
@@ -53,30 +63,82 @@ class _RedisShim:
 
     def lrange(self, key: str, start: int, end: int):
         lst = self._store.get(key) or []
-        return lst[start : end + 1]
-
-    def pipeline(self):
+        return lst[start : None if end == -1 else end + 1]
+
+    def ltrim(self, key: str, start: int, end: int):
+        self._store[key] = self.lrange(key, start, end)
+
+    # Sorted sets are dicts of member -> score
+    def zadd(self, key: str, mapping: dict):
+        zset = self._store.setdefault(key, {})
+        added = sum(1 for m in mapping if m not in zset)
+        zset.update(mapping)
+        return added
+
+    def zrem(self, key: str, *members: str):
+        zset = self._store.get(key) or {}
+        return sum(1 for m in members if zset.pop(m, None) is not None)
+
+    def zcard(self, key: str):
+        return len(self._store.get(key) or {})
+
+    def _zsorted(self, key: str, reverse: bool):
+        zset = self._store.get(key) or {}
+        return sorted(zset.items(), key=lambda e: (e[1], e[0]), reverse=reverse)
+
+    def zrevrange(self, key: str, start: int, end: int, withscores: bool = False):
+        items = self._zsorted(key, reverse=True)[start : None if end == -1 else end + 1]
+        return items if withscores else [m for m, _ in items]
+
+    @staticmethod
+    def _bound(v):
+        v = str(v)
+        if v in ("-inf", "+inf", "inf"):
+            return float(v), False
+        if v.startswith("("):
+            return float(v[1:]), True
+        return float(v), False
+
+    def _zbyscore(self, key, lo, hi, reverse, start, num, withscores):
+        (lo_v, lo_x), (hi_v, hi_x) = self._bound(lo), self._bound(hi)
+        items = [
+            (m, s)
+            for m, s in self._zsorted(key, reverse)
+            if (s > lo_v if lo_x else s >= lo_v) and (s < hi_v if hi_x else s <= hi_v)
+        ]
+        if start is not None and num is not None:
+            items = items[start : start + num]
+        return items if withscores else [m for m, _ in items]
+
+    def zrangebyscore(self, key, min, max, start=None, num=None, withscores=False):
+        return self._zbyscore(key, min, max, False, start, num, withscores)
+
+    def zrevrangebyscore(self, key, max, min, start=None, num=None, withscores=False):
+        return self._zbyscore(key, min, max, True, start, num, withscores)
+
+    def pipeline(self, transaction: bool = True):
         shim = self
 
         class Pipe:
-            def __init__(self, shim):
-                self._ops = []
-                self._shim = shim
+            """Queues calls and runs them against the shim on execute()."""
+
+            def __init__(self):
+                self._ops: list = []
+
+            def __getattr__(self, name):
+                method = getattr(shim, name)
 
-            def set(self, k, v):
-                self._ops.append(("set", k, v))
+                def queue(*args, **kwargs):
+                    self._ops.append((method, args, kwargs))
+                    return self
 
-            def lpush(self, k, v):
-                self._ops.append(("lpush", k, v))
+                return queue
 
             def execute(self):
-                for op, k, v in self._ops:
-                    if op == "set":
-                        self._shim.set(k, v)
-                    elif op == "lpush":
-                        self._shim.lpush(k, v)
+                ops, self._ops = self._ops, []
+                return [method(*args, **kwargs) for method, args, kwargs in ops]
 
-        return Pipe(shim)
+        return Pipe()
 
 
 def get_redis_client():
@@ -102,6 +102,11 @@ class Settings(BaseSettings):
     EMBED_MODEL: str = (
         "text-embedding-3-small"  # openai default; e.g., "nomic-embed-text" for ollama
     )
+    EMBED_BATCH_SIZE: int | None = None  # texts per request; None = provider default
+    EMBED_MAX_INFLIGHT: int = 4  # concurrent batch requests per embed call
+    EMBED_MAX_RETRIES: int = 3
+    EMBED_RETRY_BACKOFF: float = 0.5  # seconds, doubled per retry
+    EMBED_CACHE: str = "redis"  # "off" | "memory" | "redis" (memory LRU + shared redis tier)
 
     @property
     def cors_origins_list(self) -> list[str]:
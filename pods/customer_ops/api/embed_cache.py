@@ -0,0 +1,212 @@
+"""
+Content-addressed embedding cache.
+
+Vectors are keyed by (provider, model, sha256(text)), so the same string
+is embedded once no matter whether it arrives from ingest, /search or
+rerank. Two tiers sit in front of the provider:
+
+- memory: per-process LRU (EMBED_CACHE_MAX_ENTRIES vectors)
+- redis:  shared by the API and the ingest worker, float32 blobs with
+          EMBED_CACHE_TTL_SECONDS expiry
+
+The redis tier fails open: on a connection error it is skipped for
+EMBED_CACHE_REDIS_COOLDOWN seconds and lookups fall through to the provider.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from prometheus_client import Counter
+
+from .executor import run_blocking
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover
+    redis = None  # type: ignore
+
+log = logging.getLogger("embed_cache")
+
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "20000"))
+EMBED_CACHE_TTL_SECONDS = int(os.getenv("EMBED_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EMBED_CACHE_REDIS_COOLDOWN = float(os.getenv("EMBED_CACHE_REDIS_COOLDOWN", "30"))
+
+EMBED_CACHE_LOOKUPS = Counter(
+    "aether_embed_cache_lookups_total",
+    "Embedding cache lookups by tier and result",
+    ["tier", "result"],  # tier: memory, redis; result: hit, miss
+)
+
+
+def cache_key(provider: str, model: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"emb:{provider}:{model}:{digest}"
+
+
+class LRUVectors:
+    """Thread-safe LRU of key -> vector."""
+
+    def __init__(self, max_entries: int = EMBED_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._items: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for key in keys:
+                vec = self._items.get(key)
+                if vec is not None:
+                    self._items.move_to_end(key)
+                    found[key] = vec
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, vec in items.items():
+                self._items[key] = vec
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RedisVectors:
+    """Redis tier storing vectors as float32 bytes."""
+
+    def __init__(self, client: Any, ttl_seconds: int = EMBED_CACHE_TTL_SECONDS):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self._down_until = 0.0
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisVectors | None:
+        if not url or redis is None:
+            return None
+        client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        return cls(client)
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, e: Exception) -> None:
+        log.warning(
+            "embedding cache redis unavailable (%s); skipping for %.0fs",
+            e,
+            EMBED_CACHE_REDIS_COOLDOWN,
+        )
+        self._down_until = time.monotonic() + EMBED_CACHE_REDIS_COOLDOWN
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys or not self._available():
+            return {}
+        try:
+            blobs = self.client.mget(keys)
+        except Exception as e:
+            self._failed(e)
+            return {}
+        return {
+            key: np.frombuffer(blob, dtype=np.float32).tolist()
+            for key, blob in zip(keys, blobs, strict=True)
+            if blob
+        }
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        if not items or not self._available():
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, vec in items.items():
+                pipe.setex(key, self.ttl_seconds, np.asarray(vec, dtype=np.float32).tobytes())
+            pipe.execute()
+        except Exception as e:
+            self._failed(e)
+
+
+class CachedEmbedder:
+    """
+    Wraps an embedder with the memory and (optional) redis tiers.
+
+    Only texts missing from both tiers reach the provider, deduplicated
+    within the call; their vectors are written back to both tiers.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        provider: str,
+        model: str,
+        memory: LRUVectors | None = None,
+        persistent: RedisVectors | None = None,
+    ):
+        self.inner = inner
+        self.provider = provider
+        self.model = model
+        self.memory = memory if memory is not None else LRUVectors()
+        self.persistent = persistent
+
+    def _lookup_memory(self, texts: list[str]) -> tuple[dict[str, str], dict[str, list[float]]]:
+        keys = {text: cache_key(self.provider, self.model, text) for text in dict.fromkeys(texts)}
+        found = self.memory.get_many(list(keys.values()))
+        EMBED_CACHE_LOOKUPS.labels(tier="memory", result="hit").inc(len(found))
+        EMBED_CACHE_LOOKUPS.labels(tier="memory", result="miss").inc(len(keys) - len(found))
+        return keys, found
+
+    def _lookup_persistent(self, keys: list[str]) -> dict[str, list[float]]:
+        if self.persistent is None or not keys:
+            return {}
+        found = self.persistent.get_many(keys)
+        EMBED_CACHE_LOOKUPS.labels(tier="redis", result="hit").inc(len(found))
+        EMBED_CACHE_LOOKUPS.labels(tier="redis", result="miss").inc(len(keys) - len(found))
+        self.memory.put_many(found)
+        return found
+
+    def _store(self, fresh: dict[str, list[float]]) -> None:
+        self.memory.put_many(fresh)
+        if self.persistent is not None:
+            self.persistent.put_many(fresh)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        keys, found = self._lookup_memory(texts)
+        found.update(self._lookup_persistent([k for k in keys.values() if k not in found]))
+        missing = [text for text, key in keys.items() if key not in found]
+        if missing:
+            fresh = dict(zip((keys[t] for t in missing), self.inner.embed(missing), strict=True))
+            self._store(fresh)
+            found.update(fresh)
+        return [found[keys[text]] for text in texts]
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        keys, found = self._lookup_memory(texts)
+        pending = [k for k in keys.values() if k not in found]
+        if pending and self.persistent is not None:
+            found.update(await run_blocking("embed_cache", self._lookup_persistent, pending))
+        missing = [text for text, key in keys.items() if key not in found]
+        if missing:
+            vectors = await self.inner.aembed(missing)
+            fresh = dict(zip((keys[t] for t in missing), vectors, strict=True))
+            self.memory.put_many(fresh)
+            if self.persistent is not None:
+                await run_blocking("embed_cache", self.persistent.put_many, fresh)
+            found.update(fresh)
+        return [found[keys[text]] for text in texts]
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def close(self) -> None:
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
@@ -1,65 +1,357 @@
+"""
+Embedding providers.
+
+OpenAI and Ollama go through BatchingEmbedder: inputs are split into
+provider-sized batches (by count and by characters), up to max_inflight
+batches are sent concurrently over keep-alive connection pools, and
+transient failures (transport errors, 429, 5xx) are retried with
+exponential backoff. embed() serves sync callers such as the RQ worker;
+aembed() serves request handlers without touching the blocking pool.
+"""
+
 from __future__ import annotations
 
-import http.client
-import json
+import asyncio
+import logging
 import os
-import urllib.parse
+import random
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+from prometheus_client import Counter, Histogram
+
+from .embed_cache import CachedEmbedder, RedisVectors
+from .executor import run_blocking
+
+log = logging.getLogger("embeddings")
+
+EMBED_HTTP_TIMEOUT = float(os.getenv("EMBED_HTTP_TIMEOUT", "30"))
+EMBED_HTTP_MAX_CONNECTIONS = int(os.getenv("EMBED_HTTP_MAX_CONNECTIONS", "20"))
+
+EMBED_REQUESTS = Counter(
+    "aether_embed_requests_total",
+    "Embedding HTTP requests by provider and outcome",
+    ["provider", "outcome"],  # ok, retry, error
+)
+EMBED_TEXTS = Counter(
+    "aether_embed_texts_total",
+    "Texts embedded by provider",
+    ["provider"],
+)
+EMBED_BATCH_SECONDS = Histogram(
+    "aether_embed_batch_seconds",
+    "Latency of one successful embedding batch request",
+    ["provider"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+_RETRY_STATUS = {408, 429, 500, 502, 503, 504}
 
 
 class BaseEmbedder:
     def embed(self, texts: list[str]) -> list[list[float]]:
         raise NotImplementedError
 
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        # Sync-only embedders run on the bounded blocking pool
+        return await run_blocking("embed", self.embed, texts)
 
-class OpenAIEmbedder(BaseEmbedder):
-    def __init__(self, model: str, api_key: str):
-        self.model = model
-        self.api_key = api_key
+    async def aclose(self) -> None:
+        pass
+
+
+async def embed_async(embedder, texts: list[str]) -> list[list[float]]:
+    """Embed without blocking the event loop, whatever the embedder type."""
+    aembed = getattr(embedder, "aembed", None)
+    if aembed is not None:
+        return await aembed(texts)
+    return await run_blocking("embed", embedder.embed, texts)
+
+
+class BatchingEmbedder(BaseEmbedder):
+    """
+    HTTP embedder with batching, bounded concurrency and retries.
+
+    Subclasses describe one batch request (_request) and how to read its
+    response (_parse); this class owns the connection pools, splitting,
+    concurrency, retries and metrics.
+    """
+
+    provider = "http"
+    default_batch_size = 32
+    default_max_batch_chars: int | None = None
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: dict[str, str] | None = None,
+        batch_size: int | None = None,
+        max_batch_chars: int | None = None,
+        max_inflight: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        timeout: float = EMBED_HTTP_TIMEOUT,
+    ):
+        self.base_url = base_url
+        self.headers = headers or {}
+        self.batch_size = max(1, batch_size or self.default_batch_size)
+        self.max_batch_chars = max_batch_chars or self.default_max_batch_chars
+        self.max_inflight = max(1, max_inflight)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._aclient: httpx.AsyncClient | None = None
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
+
+    # --- provider hooks ---------------------------------------------------
+
+    def _request(self, batch: list[str]) -> tuple[str, dict[str, Any]]:
+        """(path, json body) for one batch."""
+        raise NotImplementedError
+
+    def _parse(self, data: dict[str, Any]) -> list[list[float]]:
+        raise NotImplementedError
+
+    # --- splitting ----------------------------------------------------------
+
+    def _batches(self, texts: list[str]) -> Iterator[list[str]]:
+        batch: list[str] = []
+        chars = 0
+        for text in texts:
+            over_chars = self.max_batch_chars and chars + len(text) > self.max_batch_chars
+            if batch and (len(batch) >= self.batch_size or over_chars):
+                yield batch
+                batch, chars = [], 0
+            batch.append(text)
+            chars += len(text)
+        if batch:
+            yield batch
+
+    # --- connection pools -------------------------------------------------
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=EMBED_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=EMBED_HTTP_MAX_CONNECTIONS,
+        )
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(
+                    base_url=self.base_url,
+                    headers=self.headers,
+                    timeout=self.timeout,
+                    limits=self._limits(),
+                )
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop or self._aclient.is_closed:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self._limits(),
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _batch_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_inflight, thread_name_prefix=f"embed-{self.provider}"
+                )
+            return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    async def aclose(self) -> None:
+        if self._aclient is not None and not self._aclient.is_closed:
+            await self._aclient.aclose()
+        self._aclient = None
+        self._aclient_loop = None
+        self.close()
+
+    # --- retries ------------------------------------------------------------
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float | None:
+        """Seconds to wait before retrying, or None if error is not retryable."""
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, httpx.HTTPStatusError):
+            if error.response.status_code not in _RETRY_STATUS:
+                return None
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        elif not isinstance(error, httpx.TransportError):
+            return None
+        return self.retry_backoff * (2**attempt) * (1 + random.random() * 0.1)
+
+    def _record(self, batch: list[str], start: float) -> None:
+        EMBED_REQUESTS.labels(provider=self.provider, outcome="ok").inc()
+        EMBED_TEXTS.labels(provider=self.provider).inc(len(batch))
+        EMBED_BATCH_SECONDS.labels(provider=self.provider).observe(time.perf_counter() - start)
+
+    def _failed(self, attempt: int, error: Exception) -> float:
+        delay = self._retry_delay(attempt, error)
+        if delay is None:
+            EMBED_REQUESTS.labels(provider=self.provider, outcome="error").inc()
+            raise error
+        EMBED_REQUESTS.labels(provider=self.provider, outcome="retry").inc()
+        log.warning(
+            "%s embed batch failed (%s); retry %d in %.2fs",
+            self.provider,
+            error,
+            attempt + 1,
+            delay,
+        )
+        return delay
+
+    def _post(self, batch: list[str]) -> list[list[float]]:
+        path, body = self._request(batch)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = self._sync_client().post(path, json=body)
+                resp.raise_for_status()
+                vectors = self._parse(resp.json())
+                self._record(batch, start)
+                return vectors
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                time.sleep(self._failed(attempt, e))
+                attempt += 1
+
+    async def _apost(self, batch: list[str]) -> list[list[float]]:
+        path, body = self._request(batch)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = await self._async_client().post(path, json=body)
+                resp.raise_for_status()
+                vectors = self._parse(resp.json())
+                self._record(batch, start)
+                return vectors
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                await asyncio.sleep(self._failed(attempt, e))
+                attempt += 1
+
+    # --- public API ---------------------------------------------------------
 
     def embed(self, texts: list[str]) -> list[list[float]]:
-        # Minimal, dependency-free HTTP client to avoid adding SDKs
-        body = json.dumps({"model": self.model, "input": texts})
-        conn = http.client.HTTPSConnection("api.openai.com")
-        conn.request(
-            "POST",
-            "/v1/embeddings",
-            body=body,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
+        batches = list(self._batches(texts))
+        if len(batches) <= 1:
+            return self._post(batches[0]) if batches else []
+        results = self._batch_pool().map(self._post, batches)
+        return [vec for vectors in results for vec in vectors]
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        inflight = asyncio.Semaphore(self.max_inflight)
+
+        async def send(batch: list[str]) -> list[list[float]]:
+            async with inflight:
+                return await self._apost(batch)
+
+        results = await asyncio.gather(*(send(b) for b in self._batches(texts)))
+        return [vec for vectors in results for vec in vectors]
+
+
+class OpenAIEmbedder(BatchingEmbedder):
+    provider = "openai"
+    # API allows 2048 inputs / ~300k tokens per request; stay well under both
+    default_batch_size = 256
+    default_max_batch_chars = 400_000
+
+    def __init__(self, model: str, api_key: str, **options: Any):
+        super().__init__(
+            "https://api.openai.com",
+            headers={"Authorization": f"Bearer {api_key}"},
+            **options,
         )
-        resp = conn.getresponse()
-        data = json.loads(resp.read().decode("utf-8"))
-        conn.close()
-        return [d["embedding"] for d in data["data"]]
+        self.model = model
+        self.api_key = api_key
 
+    def _request(self, batch: list[str]) -> tuple[str, dict[str, Any]]:
+        return "/v1/embeddings", {"model": self.model, "input": batch}
 
-class OllamaEmbedder(BaseEmbedder):
-    def __init__(self, model: str, base_url: str):
+    def _parse(self, data: dict[str, Any]) -> list[list[float]]:
+        return [d["embedding"] for d in sorted(data["data"], key=lambda d: d.get("index", 0))]
+
+
+class OllamaEmbedder(BatchingEmbedder):
+    """
+    Ollama embedder using the batched /api/embed endpoint.
+
+    Servers that predate /api/embed answer 404; the embedder then switches
+    to the legacy one-prompt /api/embeddings endpoint for good.
+    """
+
+    provider = "ollama"
+    default_batch_size = 32
+
+    def __init__(self, model: str, base_url: str, **options: Any):
+        super().__init__((base_url or "http://localhost:11434").rstrip("/"), **options)
         self.model = model
-        parsed = urllib.parse.urlparse(base_url or "http://localhost:11434")
-        self.host = parsed.hostname or "localhost"
-        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
-        self.scheme = parsed.scheme
+        self.legacy = False
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
-        # Ollama embeds endpoint
-        results: list[list[float]] = []
-        for t in texts:
-            body = json.dumps({"model": self.model, "prompt": t})
-            if self.scheme == "https":
-                conn = http.client.HTTPSConnection(self.host, self.port)
-            else:
-                conn = http.client.HTTPConnection(self.host, self.port)
-            conn.request(
-                "POST", "/api/embeddings", body=body, headers={"Content-Type": "application/json"}
-            )
-            resp = conn.getresponse()
-            data = json.loads(resp.read().decode("utf-8"))
-            conn.close()
-            results.append(data["embedding"])
-        return results
+    def _request(self, batch: list[str]) -> tuple[str, dict[str, Any]]:
+        if self.legacy:
+            return "/api/embeddings", {"model": self.model, "prompt": batch[0]}
+        return "/api/embed", {"model": self.model, "input": batch}
+
+    def _parse(self, data: dict[str, Any]) -> list[list[float]]:
+        if "embeddings" in data:
+            return data["embeddings"]
+        return [data["embedding"]]
+
+    def _use_legacy(self, error: httpx.HTTPStatusError) -> bool:
+        if self.legacy or error.response.status_code != 404:
+            return self.legacy
+        log.info("ollama /api/embed not available; using /api/embeddings")
+        self.legacy = True
+        return True
+
+    def _post(self, batch: list[str]) -> list[list[float]]:
+        if not self.legacy:
+            try:
+                return super()._post(batch)
+            except httpx.HTTPStatusError as e:
+                if not self._use_legacy(e):
+                    raise
+        # Sequential here: this may already run on a batch-pool thread
+        return [vec for t in batch for vec in BatchingEmbedder._post(self, [t])]
+
+    async def _apost(self, batch: list[str]) -> list[list[float]]:
+        if not self.legacy:
+            try:
+                return await super()._apost(batch)
+            except httpx.HTTPStatusError as e:
+                if not self._use_legacy(e):
+                    raise
+        if len(batch) == 1:
+            return await super()._apost(batch)
+        results = await asyncio.gather(*(BatchingEmbedder._apost(self, [t]) for t in batch))
+        return [vec for vectors in results for vec in vectors]
 
 
 class GeminiEmbedder(BaseEmbedder):
@@ -71,7 +363,6 @@ class GeminiEmbedder(BaseEmbedder):
     def embed(self, texts: list[str]) -> list[list[float]]:
         # For now, fallback: hash-based pseudo-embeddings to keep flow unblocked (replace with real Gemini Embeddings API when desired)
         import hashlib
-        import random
 
         random.seed(1337)
         vecs = []
@@ -83,18 +374,39 @@ class GeminiEmbedder(BaseEmbedder):
         return vecs
 
 
-def build_embedder(provider: str, model: str, settings) -> BaseEmbedder:
+def _batching_options(settings) -> dict[str, Any]:
+    return {
+        "batch_size": getattr(settings, "EMBED_BATCH_SIZE", None),
+        "max_inflight": getattr(settings, "EMBED_MAX_INFLIGHT", 4),
+        "max_retries": getattr(settings, "EMBED_MAX_RETRIES", 3),
+        "retry_backoff": getattr(settings, "EMBED_RETRY_BACKOFF", 0.5),
+    }
+
+
+def build_embedder(provider: str, model: str, settings) -> BaseEmbedder | CachedEmbedder:
+    embedder = _build_provider(provider, model, settings)
+    mode = str(getattr(settings, "EMBED_CACHE", "off") or "off").lower()
+    if mode == "off":
+        return embedder
+    persistent = None
+    if mode == "redis":
+        url = os.environ.get("REDIS_URL") or getattr(settings, "REDIS_URL", None) or ""
+        persistent = RedisVectors.from_url(str(url))
+    return CachedEmbedder(embedder, provider.lower(), model, persistent=persistent)
+
+
+def _build_provider(provider: str, model: str, settings) -> BaseEmbedder:
     p = provider.lower()
     if p == "openai":
         key = getattr(settings, "OPENAI_API_KEY", None) or os.environ.get("OPENAI_API_KEY")
         if not key:
             raise RuntimeError("OPENAI_API_KEY missing for openai embedder")
-        return OpenAIEmbedder(model, key)
+        return OpenAIEmbedder(model, key, **_batching_options(settings))
     if p == "ollama":
         base = getattr(settings, "OLLAMA_BASE_URL", None) or os.environ.get(
             "OLLAMA_BASE_URL", "http://localhost:11434"
         )
-        return OllamaEmbedder(model, base)
+        return OllamaEmbedder(model, base, **_batching_options(settings))
     if p == "gemini":
         key = getattr(settings, "GOOGLE_API_KEY", None) or os.environ.get("GOOGLE_API_KEY")
         if not key:
@@ -0,0 +1,112 @@
+"""
+Non-blocking execution layer for async endpoints.
+
+Synchronous work (DuckDB / SQLite searches, sync embedders, file parsing)
+is run with run_blocking() on a bounded thread pool, so it never stalls the
+event loop and never fans out into unbounded threads. Every call is timed
+per stage: aether_request_stage_seconds covers the work itself and
+aether_blocking_queue_wait_seconds the time spent waiting for a pool
+thread. monitor_event_loop_lag() samples how late the loop wakes up from a
+fixed sleep and exports it as aether_event_loop_lag_seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from prometheus_client import Gauge, Histogram
+
+BLOCKING_POOL_WORKERS = int(os.getenv("BLOCKING_POOL_WORKERS", "8"))
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+
+_STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_STAGE_SECONDS = Histogram(
+    "aether_request_stage_seconds",
+    "Latency of request stages run off the event loop",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+BLOCKING_QUEUE_WAIT_SECONDS = Histogram(
+    "aether_blocking_queue_wait_seconds",
+    "Time blocking calls waited for a pool thread",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+BLOCKING_INFLIGHT = Gauge(
+    "aether_blocking_inflight",
+    "Blocking calls queued or running on the bounded pool",
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "aether_event_loop_lag_seconds",
+    "How late the event loop woke up from a scheduled sleep",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The process-wide bounded pool (BLOCKING_POOL_WORKERS threads)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, BLOCKING_POOL_WORKERS), thread_name_prefix="blocking"
+                )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+@contextlib.contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Observe the duration of a block (sync or async code) as a request stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REQUEST_STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+async def run_blocking(stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) on the bounded pool and await its result."""
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+
+    def call() -> T:
+        BLOCKING_QUEUE_WAIT_SECONDS.labels(stage=stage).observe(time.perf_counter() - submitted)
+        with stage_timer(stage):
+            return fn(*args, **kwargs)
+
+    BLOCKING_INFLIGHT.inc()
+    try:
+        return await loop.run_in_executor(get_executor(), call)
+    finally:
+        BLOCKING_INFLIGHT.dec()
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL) -> None:
+    """Record event-loop lag every interval seconds until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - interval))
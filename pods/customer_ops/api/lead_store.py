@@ -1,3 +1,19 @@
+"""
+Lead and outcome storage in Redis.
+
+Layout:
+- lead:{id}                        JSON lead document
+- tenant:{tenant}:leads:by_time    ZSET lead id -> created_at (ms), newest first
+- outcome:{lead_id}                latest outcome record for a lead
+- outcomes:all                     LIST of recent outcome records (analytics)
+- outcomes:by_outcome:{outcome}    ZSET lead id -> recorded_at, one per lead
+
+Listing is keyset-paginated over the time index: a page is one pipelined
+range read plus one MGET, however large the page or the tenant. Tenants
+written by older versions (LPUSH onto tenant:{tenant}:leads) are moved to
+the time index on first read.
+"""
+
 import json
 import time
 import uuid
@@ -6,7 +22,8 @@ from typing import Any
 from .cache import get_redis_client
 
 LEAD_KEY = "lead:{id}"
-TENANT_LEADS = "tenant:{tenant}:leads"
+TENANT_LEADS = "tenant:{tenant}:leads"  # legacy list, migrated on read
+TENANT_LEADS_BY_TIME = "tenant:{tenant}:leads:by_time"
 
 # Cache the redis client per-module so repeated calls in a single test run share the
 # same backend instance. Tests may monkeypatch cache.get_redis_client to a factory;
@@ -21,9 +38,22 @@ def _get_client():
     return _CLIENT
 
 
+def _str(v: Any) -> str:
+    # Redis returns bytes unless decode_responses=True
+    return v.decode() if isinstance(v, (bytes, bytearray)) else v
+
+
 def _lead_id() -> str:
     # ULID-ish sortable id: ts + random suffix
-    return f"L{int(time.time()*1000)}-{uuid.uuid4().hex[:6]}"
+    return f"L{int(time.time() * 1000)}-{uuid.uuid4().hex[:6]}"
+
+
+def _id_millis(lead_id: str) -> int:
+    """created_at in ms as encoded in the id (0 if the id is not ours)."""
+    try:
+        return int(lead_id[1:].split("-", 1)[0])
+    except ValueError:
+        return 0
 
 
 def create_lead(tenant: str, name: str, phone: str, details: str = "") -> str:
@@ -36,22 +66,10 @@ def create_lead(tenant: str, name: str, phone: str, details: str = "") -> str:
         "details": details,
         "created_at": int(time.time()),
     }
-    r = _get_client()
-    pipe = r.pipeline()
+    pipe = _get_client().pipeline()
     pipe.set(LEAD_KEY.format(id=rid), json.dumps(doc))
-    pipe.lpush(TENANT_LEADS.format(tenant=tenant), rid)
+    pipe.zadd(TENANT_LEADS_BY_TIME.format(tenant=tenant), {rid: _id_millis(rid)})
     pipe.execute()
-    # Debug: print stored key and list length
-    try:
-        print(
-            "DEBUG: lead_created - key",
-            LEAD_KEY.format(id=rid),
-            "exists?",
-            bool(r.get(LEAD_KEY.format(id=rid))),
-        )
-        print("DEBUG: tenant list length", r.lrange(TENANT_LEADS.format(tenant=tenant), 0, -1))
-    except Exception as e:
-        print("DEBUG: lead_store debug failed", e)
     return rid
 
 
@@ -60,18 +78,93 @@ def get_lead(lead_id: str) -> dict[str, Any] | None:
     return json.loads(v) if v else None
 
 
-def list_leads(tenant: str, limit: int = 50) -> list[dict[str, Any]]:
+def get_leads(lead_ids: list[str]) -> list[dict[str, Any]]:
+    """Fetch many leads with one MGET, in the given order (missing ids are skipped)."""
+    if not lead_ids:
+        return []
+    raw = _get_client().mget([LEAD_KEY.format(id=lid) for lid in lead_ids])
+    return [json.loads(v) for v in raw if v]
+
+
+def _encode_cursor(lead_id: str, score: float) -> str:
+    return f"{int(score)}:{lead_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str]:
+    score, _, lead_id = cursor.partition(":")
+    return int(score), lead_id
+
+
+def _migrate_legacy(tenant: str) -> None:
+    """Move a tenant's legacy LPUSH list onto the time index."""
     r = _get_client()
-    ids = r.lrange(TENANT_LEADS.format(tenant=tenant), 0, max(0, limit - 1))
-    out = []
-    for lid in ids:
-        # Redis returns bytes unless decode_responses=True. Ensure lid is str.
-        if isinstance(lid, (bytes, bytearray)):
-            lid = lid.decode()
-        v = r.get(LEAD_KEY.format(id=lid))
-        if v:
-            out.append(json.loads(v))
-    return out
+    legacy = TENANT_LEADS.format(tenant=tenant)
+    ids = [_str(lid) for lid in r.lrange(legacy, 0, -1)]
+    pipe = r.pipeline()
+    if ids:
+        pipe.zadd(TENANT_LEADS_BY_TIME.format(tenant=tenant), {lid: _id_millis(lid) for lid in ids})
+    pipe.delete(legacy)
+    pipe.execute()
+
+
+def list_leads_page(
+    tenant: str, limit: int = 50, cursor: str | None = None
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    One page of a tenant's leads, newest first.
+
+    Args:
+        tenant: Tenant id
+        limit: Page size
+        cursor: next_cursor from the previous page (None for the first page)
+
+    Returns:
+        (leads, next_cursor); next_cursor is None on the last page
+    """
+    limit = max(1, limit)
+    r = _get_client()
+    index = TENANT_LEADS_BY_TIME.format(tenant=tenant)
+    pipe = r.pipeline()
+    if cursor:
+        score, after_id = _decode_cursor(cursor)
+        # Strictly older leads, plus leads created in the same millisecond
+        # that sort after the cursor (ZREVRANGE orders ties by id, descending)
+        pipe.zrevrangebyscore(index, f"({score}", "-inf", start=0, num=limit, withscores=True)
+        pipe.zrangebyscore(index, score, score, withscores=True)
+    else:
+        pipe.zrevrangebyscore(index, "+inf", "-inf", start=0, num=limit, withscores=True)
+        pipe.exists(TENANT_LEADS.format(tenant=tenant))
+    results = pipe.execute()
+
+    if cursor:
+        older, ties = results
+        same_ms = sorted(
+            ((_str(m), s) for m, s in ties if _str(m) < after_id), key=lambda e: e[0], reverse=True
+        )
+        entries = (same_ms + [(_str(m), s) for m, s in older])[:limit]
+    else:
+        entries, legacy = [(_str(m), s) for m, s in results[0]], results[1]
+        if legacy:
+            _migrate_legacy(tenant)
+            return list_leads_page(tenant, limit)
+
+    leads = get_leads([lid for lid, _ in entries])
+    next_cursor = _encode_cursor(*entries[-1]) if len(entries) == limit else None
+    return leads, next_cursor
+
+
+def count_leads(tenant: str) -> int:
+    """Number of leads stored for tenant."""
+    r = _get_client()
+    if r.exists(TENANT_LEADS.format(tenant=tenant)):
+        _migrate_legacy(tenant)
+    return int(r.zcard(TENANT_LEADS_BY_TIME.format(tenant=tenant)))
+
+
+def list_leads(tenant: str, limit: int = 50) -> list[dict[str, Any]]:
+    """The tenant's most recent leads (first page of list_leads_page)."""
+    leads, _ = list_leads_page(tenant, limit=limit)
+    return leads
 
 
 # ============================================================================
@@ -80,6 +173,7 @@ def list_leads(tenant: str, limit: int = 50) -> list[dict[str, Any]]:
 
 OUTCOME_KEY = "outcome:{lead_id}"
 OUTCOME_LIST = "outcomes:all"  # Global list of all outcome records
+OUTCOME_INDEX = "outcomes:by_outcome:{outcome}"  # Leads whose latest outcome is {outcome}
 
 
 def set_outcome(
@@ -100,9 +194,16 @@ def set_outcome(
         "time_to_conversion": time_to_conversion,
     }
     r = _get_client()
+    previous = r.get(OUTCOME_KEY.format(lead_id=lead_id))
     pipe = r.pipeline()
+    # A lead sits in the index of its latest outcome only
+    if previous:
+        old = json.loads(previous).get("outcome")
+        if old and old != outcome:
+            pipe.zrem(OUTCOME_INDEX.format(outcome=old), lead_id)
     # Store outcome keyed by lead_id
     pipe.set(OUTCOME_KEY.format(lead_id=lead_id), json.dumps(record))
+    pipe.zadd(OUTCOME_INDEX.format(outcome=outcome), {lead_id: record["recorded_at"]})
     # Append to global list for analytics
     pipe.lpush(OUTCOME_LIST, json.dumps(record))
     # Trim list to last 10k outcomes (adjust as needed)
@@ -117,13 +218,24 @@ def get_outcome(lead_id: str) -> dict[str, Any] | None:
     return json.loads(v) if v else None
 
 
-def list_outcomes(limit: int = 100) -> list[dict[str, Any]]:
-    """List recent outcomes across all leads (for analytics)."""
+def list_outcomes(limit: int = 100, outcome: str | None = None) -> list[dict[str, Any]]:
+    """
+    List recent outcomes (for analytics).
+
+    Args:
+        limit: Maximum records to return
+        outcome: Only leads whose latest outcome is this (via the secondary
+            index, newest first); None returns the global history list
+
+    Returns:
+        Outcome records, newest first
+    """
     r = _get_client()
-    raw = r.lrange(OUTCOME_LIST, 0, max(0, limit - 1))
-    out = []
-    for item in raw:
-        if isinstance(item, (bytes, bytearray)):
-            item = item.decode()
-        out.append(json.loads(item))
-    return out
+    if outcome is None:
+        raw = r.lrange(OUTCOME_LIST, 0, max(0, limit - 1))
+        return [json.loads(_str(item)) for item in raw]
+    ids = r.zrevrange(OUTCOME_INDEX.format(outcome=outcome), 0, max(0, limit - 1))
+    if not ids:
+        return []
+    raw = r.mget([OUTCOME_KEY.format(lead_id=_str(lid)) for lid in ids])
+    return [json.loads(v) for v in raw if v]
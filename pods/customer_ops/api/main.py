@@ -1,7 +1,7 @@
+import asyncio
 import contextlib
 import json
 import math
-import os
 import time
 from collections import deque
 from pathlib import Path
@@ -42,15 +42,18 @@ from .auth import (
     require_api_key_dynamic,
     require_role,
 )
+from .auth_cache import flush_api_key_counters, get_auth_state, invalidate_api_key
 from .config import get_settings, reload_settings
 from .crud import create_lead as create_lead_crud
 from .deps import get_db
-from .embeddings import build_embedder
+from .embeddings import build_embedder, embed_async
 from .enrich import enrich_text
 from .envelope import err, ok
+from .executor import monitor_event_loop_lag, run_blocking, shutdown_executor, stage_timer
 from .health import get_health
 from .lead_store import create_lead as store_create_lead
 from .lead_store import list_leads as store_list_leads
+from .lead_store import list_leads_page as store_list_leads_page
 from .limiter import chat_limit_dep, faq_limit_dep, init_rate_limiter, ops_limit_dep
 from .logger import log_chat, log_faq, logger
 from .logging_setup import setup_json_logging
@@ -61,6 +64,8 @@ from .middleware_pii import redact_json
 from .middleware_request_id import RequestIdMiddleware
 from .model_client import ToolSpec, build_model_client
 from .models import Base, ChatRequest, ChatResponse, FaqAnswer, FaqRequest
+from .response_cache import ResponseCache, bump_tenant_generation, tenant_generations
+from .retrieval import FUSION_STRATEGIES, HybridRetriever
 from .schemas import (
     AnalyticsResponse,
     LeadItem,
@@ -70,7 +75,7 @@ from .schemas import (
     OutcomeRequest,
     OutcomeResponse,
 )
-from .semcache import get_semcache, set_semcache
+from .semcache import configure_semcache, get_semcache, set_semcache
 from .session import engine
 from .tools import TOOL_FUNCS, TOOLS
 from .vector_store import SQLiteVectorStore
@@ -88,45 +93,42 @@ _search_rate_limiter: dict[str, deque] = {}
 SEARCH_RATE_LIMIT = 60  # requests per minute per IP
 SEARCH_WINDOW_SECONDS = 60
 
-# Hot query cache (per tenant, configurable TTL)
-# Maps (namespace, cache_key) -> (expiry_time, response)
-_CACHE_STORE: dict[tuple[str, tuple], tuple[float, dict[str, Any]]] = {}
-CACHE_TTL_SEC = int(os.getenv("ANSWER_CACHE_TTL", "60"))
+# Hot query cache for /search and /answer (bounded LRU/TTL, per-tenant generations)
+_RESPONSE_CACHE = ResponseCache(generations=tenant_generations())
 
-# Cache metrics (with tenant labels for per-tenant observability)
-AETHER_CACHE_HITS = Counter("aether_rag_cache_hits_total", "RAG cache hits", ["endpoint", "tenant"])
-AETHER_CACHE_MISSES = Counter(
-    "aether_rag_cache_misses_total", "RAG cache misses", ["endpoint", "tenant"]
-)
-
-# Hybrid search weighting (0.0 = all lexical, 1.0 = all semantic)
-HYBRID_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.6"))
 
+def _retriever() -> HybridRetriever:
+    """Hybrid retrieval engine over the DuckDB store (HYBRID_FUSION / HYBRID_ALPHA)."""
+    return HybridRetriever(app.state.EMBEDDER)
 
-def _cache_get(ns: str, key: tuple, tenant: str = "default") -> dict[str, Any] | None:
-    """Get cached response with metrics tracking"""
-    now = time.time()
-    cache_key = (ns, key)
-    entry = _CACHE_STORE.get(cache_key)
 
-    if not entry:
-        AETHER_CACHE_MISSES.labels(endpoint=ns, tenant=tenant).inc()
-        return None
+def _check_fusion(fusion: str | None) -> None:
+    if fusion is not None and fusion not in FUSION_STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fusion: {fusion}. Use one of {', '.join(FUSION_STRATEGIES)}",
+        )
 
-    expires_at, payload = entry
-    if now > expires_at:
-        _CACHE_STORE.pop(cache_key, None)
-        AETHER_CACHE_MISSES.labels(endpoint=ns, tenant=tenant).inc()
-        return None
 
-    AETHER_CACHE_HITS.labels(endpoint=ns, tenant=tenant).inc()
-    return payload
+async def _cache_get(
+    ns: str, key: tuple, tenant: str = "default"
+) -> tuple[dict[str, Any] | None, tuple[int, int]]:
+    """Get cached response, plus the generation to store a fresh response under"""
+    if _RESPONSE_CACHE.generations.remote_read_due(tenant):
+        # Generation refresh is a Redis GET; keep it off the event loop
+        return await run_blocking("cache_get", _RESPONSE_CACHE.lookup, ns, key, tenant)
+    return _RESPONSE_CACHE.lookup(ns, key, tenant)
 
 
-def _cache_put(ns: str, key: tuple, payload: dict[str, Any], tenant: str = "default"):
-    """Store response in cache with TTL"""
-    cache_key = (ns, key)
-    _CACHE_STORE[cache_key] = (time.time() + CACHE_TTL_SEC, payload)
+def _cache_put(
+    ns: str,
+    key: tuple,
+    payload: dict[str, Any],
+    tenant: str = "default",
+    generation: tuple[int, int] | None = None,
+):
+    """Store response in cache with TTL, under the generation read before computing it"""
+    _RESPONSE_CACHE.put(ns, key, payload, tenant=tenant, generation=generation)
 
 
 def rate_limit_search(request: Request):
@@ -168,10 +170,21 @@ async def lifespan(app: FastAPI):
     # RAG components
     app.state.VSTORE = SQLiteVectorStore(str(Path(__file__).parent / "rag.sqlite3"))
     app.state.EMBEDDER = build_embedder(settings.EMBED_PROVIDER, settings.EMBED_MODEL, settings)
+    # FAQ semantic cache matches questions with the same embedder (sync: /v1/faq runs in a thread)
+    configure_semcache(app.state.EMBEDDER.embed)
     app.state.RAG_ENABLED = settings.RAG_ENABLED
     app.state.RAG_TOP_K = settings.RAG_TOP_K
     app.state.RAG_MIN_SCORE = settings.RAG_MIN_SCORE
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
     yield
+    lag_monitor.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await lag_monitor
+    aclose = getattr(app.state.EMBEDDER, "aclose", None)
+    if aclose is not None:
+        await aclose()
+    get_auth_state().stop_flusher()
+    shutdown_executor()
 
 
 app = FastAPI(title="AetherLink CustomerOps API", lifespan=lifespan)
@@ -320,6 +333,35 @@ def _simple_chunk(text: str, max_len: int = 800) -> list[str]:
 
 
 # --- Tool helpers ---
+async def _rag_context_blocks(tenant: str, msg: str) -> list[str]:
+    """Retrieve RAG context for a chat message without blocking the event loop."""
+    context_blocks: list[str] = []
+    if not app.state.RAG_ENABLED:
+        return context_blocks
+    try:
+        start = time.perf_counter()
+        with stage_timer("chat_embed"):
+            q_vec = (await embed_async(app.state.EMBEDDER, [msg]))[0]
+        hits = await run_blocking(
+            "chat_vector_search",
+            app.state.VSTORE.search,
+            tenant,
+            q_vec,
+            top_k=app.state.RAG_TOP_K,
+            min_score=app.state.RAG_MIN_SCORE,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        RAG_RETRIEVAL_LATENCY.observe(elapsed_ms)
+        if hits:
+            RAG_HITS.labels(tenant=tenant).inc(len(hits))
+            for score, chunk, src in hits:
+                context_blocks.append(f"[score={score:.3f} source={src or 'N/A'}]\n{chunk}")
+    except Exception:
+        # don't block chat if retrieval fails
+        pass
+    return context_blocks
+
+
 def _tool_specs() -> list[ToolSpec]:
     """Convert registry to ToolSpec list"""
     return [
@@ -586,9 +628,11 @@ def export_outcomes_csv(tenant: str = Depends(ApiKeyRequired), limit: int = 1000
 
     from fastapi.responses import StreamingResponse
 
-    from .lead_store import list_outcomes
+    from .lead_store import get_leads, list_outcomes
 
     outcomes = list_outcomes(limit=limit)
+    lead_ids = list(dict.fromkeys(o["lead_id"] for o in outcomes if o.get("lead_id")))
+    leads = {lead["id"]: lead for lead in get_leads(lead_ids)}
     output = StringIO()
     writer = csv.DictWriter(
         output,
@@ -609,9 +653,7 @@ def export_outcomes_csv(tenant: str = Depends(ApiKeyRequired), limit: int = 1000
     for outcome_rec in outcomes:
         lead_id = outcome_rec.get("lead_id")
         outcome = outcome_rec.get("outcome", "unknown")
-        from .lead_store import get_lead
-
-        lead = get_lead(lead_id)
+        lead = leads.get(lead_id)
         if not lead:
             continue
         details = lead.get("details", "")
@@ -791,26 +833,7 @@ async def chat_endpoint(
     mc = request.app.state.model_client
 
     # RAG retrieval hook
-    context_blocks: list[str] = []
-    if app.state.RAG_ENABLED:
-        try:
-            start = time.perf_counter()
-            q_vec = app.state.EMBEDDER.embed([msg])[0]
-            hits = app.state.VSTORE.search(
-                tenant,
-                q_vec,
-                top_k=app.state.RAG_TOP_K,
-                min_score=app.state.RAG_MIN_SCORE,
-            )
-            elapsed_ms = (time.perf_counter() - start) * 1000.0
-            RAG_RETRIEVAL_LATENCY.observe(elapsed_ms)
-            if hits:
-                RAG_HITS.labels(tenant=tenant).inc(len(hits))
-                for score, chunk, src in hits:
-                    context_blocks.append(f"[score={score:.3f} source={src or 'N/A'}]\n{chunk}")
-        except Exception:
-            # don't block chat if retrieval fails
-            pass
+    context_blocks = await _rag_context_blocks(tenant, msg)
 
     # Prepend context for the model
     if context_blocks:
@@ -896,25 +919,7 @@ async def chat_stream_endpoint(
     mc = request.app.state.model_client
 
     # RAG retrieval hook (same as /chat)
-    context_blocks: list[str] = []
-    if app.state.RAG_ENABLED:
-        try:
-            start = time.perf_counter()
-            q_vec = app.state.EMBEDDER.embed([msg])[0]
-            hits = app.state.VSTORE.search(
-                tenant,
-                q_vec,
-                top_k=app.state.RAG_TOP_K,
-                min_score=app.state.RAG_MIN_SCORE,
-            )
-            elapsed_ms = (time.perf_counter() - start) * 1000.0
-            RAG_RETRIEVAL_LATENCY.observe(elapsed_ms)
-            if hits:
-                RAG_HITS.labels(tenant=tenant).inc(len(hits))
-                for score, chunk, src in hits:
-                    context_blocks.append(f"[score={score:.3f} source={src or 'N/A'}]\n{chunk}")
-        except Exception:
-            pass
+    context_blocks = await _rag_context_blocks(tenant, msg)
 
     if context_blocks:
         msg = (
@@ -965,9 +970,9 @@ async def knowledge_ingest(payload: dict, request: Request, tenant: str = Depend
     tenant_name = tenant or getattr(request.state, "tenant", None) or "unknown"
 
     chunks = _simple_chunk(text)
-    embedder = app.state.EMBEDDER
-    vectors = embedder.embed(chunks)
-    app.state.VSTORE.upsert(tenant_name, source, chunks, vectors)
+    vectors = await embed_async(app.state.EMBEDDER, chunks)
+    await run_blocking("ingest_upsert", app.state.VSTORE.upsert, tenant_name, source, chunks, vectors)
+    await run_blocking("cache_invalidate", bump_tenant_generation, tenant_name)
     return {"ok": True, "ingested_chunks": len(chunks), "source": source, "tenant": tenant_name}
 
 
@@ -992,6 +997,7 @@ async def knowledge_delete(ids: list[str] = Query(...), tenant: str = Depends(Ap
     """Delete knowledge entries by IDs for tenant."""
     vs = app.state.VSTORE  # type: ignore[attr-defined]
     deleted = vs.delete(tenant=tenant, ids=ids)
+    await run_blocking("cache_invalidate", bump_tenant_generation, tenant)
     return {"ok": True, "deleted": deleted}
 
 
@@ -1017,6 +1023,7 @@ async def semantic_search(
     mode: str = Query("hybrid", description="Search mode: 'semantic', 'lexical', or 'hybrid'"),
     rerank: bool = Query(False, description="Apply reranking to improve result quality"),
     rerank_topk: int = Query(10, ge=3, le=50, description="Number of candidates for reranking"),
+    fusion: str | None = Query(None, description="Hybrid fusion: 'weighted', 'max', or 'rrf'"),
     tenant: str | None = Depends(ApiKeyRequired),
 ):
     """
@@ -1027,14 +1034,12 @@ async def semantic_search(
         q: Search query text
         k: Maximum number of results (default: 5)
         mode: Search mode - "semantic" (vector only), "lexical" (keyword only), or "hybrid" (both)
+        fusion: Hybrid score fusion strategy (default: HYBRID_FUSION)
         tenant: Optional tenant filter (defaults to "default")
 
     Returns:
-        Results with id, content, metadata, and combined score
+        Results with id, content, metadata, and combined score, plus per-stage timings
     """
-    from pods.customer_ops.db_duck import query_embeddings as duck_query
-    from pods.customer_ops.db_duck import query_lexical
-
     # Apply rate limiting
     rate_limit_search(request)
 
@@ -1042,8 +1047,16 @@ async def semantic_search(
     tenant_id = tenant or "default"
 
     # Check cache
-    cache_key = (tenant_id, q.strip().lower(), mode, str(rerank), str(k), str(rerank_topk))
-    cached = _cache_get("search", cache_key, tenant=tenant_id)
+    cache_key = (
+        tenant_id,
+        q.strip().lower(),
+        mode,
+        str(rerank),
+        str(k),
+        str(rerank_topk),
+        fusion or "",
+    )
+    cached, cache_gen = await _cache_get("search", cache_key, tenant=tenant_id)
     if cached:
         return cached
 
@@ -1053,84 +1066,27 @@ async def semantic_search(
             status_code=400, detail=f"Invalid mode: {mode}. Use 'semantic', 'lexical', or 'hybrid'"
         )
 
-    results_dict = {}  # id -> {content, metadata, score_semantic, score_lex}
-
-    # Semantic search (vector similarity)
-    if mode in ["semantic", "hybrid"]:
-        embedder = app.state.EMBEDDER
-        query_vec = embedder.embed([q])[0]
-        semantic_rows = duck_query(
-            query_vec, tenant_id=tenant_id, top_k=k * 2
-        )  # Get more for merging
-
-        for row in semantic_rows:
-            doc_id = row["id"]
-            score_semantic = max(0.0, 1.0 - row["distance"])  # Convert distance to similarity
-
-            if doc_id not in results_dict:
-                results_dict[doc_id] = {
-                    "id": doc_id,
-                    "content": row["content"],
-                    "metadata": row["metadata"],
-                    "score_semantic": 0.0,
-                    "score_lex": 0.0,
-                }
-            results_dict[doc_id]["score_semantic"] = score_semantic
-
-    # Lexical search (keyword matching)
-    if mode in ["lexical", "hybrid"]:
-        lexical_rows = query_lexical(q, tenant_id=tenant_id, top_k=k * 2)
-
-        # Normalize lexical scores to 0-1 range
-        max_lex = max([r["score_lex"] for r in lexical_rows], default=1)
-
-        for row in lexical_rows:
-            doc_id = row["id"]
-            score_lex_normalized = row["score_lex"] / max_lex if max_lex > 0 else 0.0
-
-            if doc_id not in results_dict:
-                results_dict[doc_id] = {
-                    "id": doc_id,
-                    "content": row["content"],
-                    "metadata": row["metadata"],
-                    "score_semantic": 0.0,
-                    "score_lex": 0.0,
-                }
-            results_dict[doc_id]["score_lex"] = score_lex_normalized
-
-    # Combine scores and rank
-    results = []
-    for doc in results_dict.values():
-        if mode == "semantic":
-            final_score = doc["score_semantic"]
-        elif mode == "lexical":
-            final_score = doc["score_lex"]
-        else:  # hybrid
-            # Weighted blend: HYBRID_ALPHA controls semantic vs lexical balance
-            final_score = (
-                HYBRID_ALPHA * doc["score_semantic"] + (1 - HYBRID_ALPHA) * doc["score_lex"]
-            )
+    _check_fusion(fusion)
 
-        results.append(
-            {
-                "id": doc["id"],
-                "content": doc["content"],
-                "metadata": doc["metadata"],
-                "score": round(final_score, 4),
-                "score_semantic": round(doc["score_semantic"], 4),
-                "score_lex": round(doc["score_lex"], 4),
-            }
-        )
-
-    # Sort by final score
-    results.sort(key=lambda x: x["score"], reverse=True)
-    results = results[: k if not rerank else rerank_topk]
+    # Semantic and lexical legs run concurrently off the event loop
+    retrieval = await _retriever().search(q, tenant_id, mode=mode, top_k=k * 2, fusion=fusion)
+    results = [
+        {
+            "id": doc["id"],
+            "content": doc["content"],
+            "metadata": doc["metadata"],
+            "score": round(doc["score"], 4),
+            "score_semantic": round(doc["score_semantic"], 4),
+            "score_lex": round(doc["score_lex"], 4),
+        }
+        for doc in retrieval.results[: k if not rerank else rerank_topk]
+    ]
 
     # Apply reranking if requested
     rerank_used = "none"
     if rerank and results:
         try:
-            results = _rerank_embed(q, results, topk=rerank_topk)
+            results = await _rerank_embed(q, results, topk=rerank_topk)
             rerank_used = "embed"
         except Exception:
             results = _rerank_token(q, results, topk=rerank_topk)
@@ -1145,10 +1101,11 @@ async def semantic_search(
         "count": len(results),
         "reranked": rerank,
         "rerank_used": rerank_used,
+        "timings_ms": retrieval.timings,
     }
 
     # Cache response
-    _cache_put("search", cache_key, response, tenant=tenant_id)
+    _cache_put("search", cache_key, response, tenant=tenant_id, generation=cache_gen)
 
     return response
 
@@ -1168,24 +1125,40 @@ def _cosine(a: list[float], b: list[float]) -> float:
     return num / (da * db)
 
 
-def _rerank_embed(
+async def _rerank_embed(
     query: str, candidates: list[dict[str, Any]], topk: int = 10
 ) -> list[dict[str, Any]]:
     """
     Re-scores candidates by cosine(query_emb, passage_emb) using the existing embedder.
+    Passage vectors come from the chunks table; only passages without a stored
+    vector of the query's dimension are embedded.
     Only touches the top 'topk' items; preserves other fields; adds 'rerank_score'.
     """
+    from pods.customer_ops.db_duck import get_embeddings
+
     embedder = app.state.EMBEDDER
     if not embedder:
         raise RuntimeError("embedder-unavailable")
 
-    # Embed query
-    qv = embedder.embed([query])[0]
-
-    # Embed top-k passages
     pool = candidates[:topk]
-    passages = [c.get("content", "") for c in pool]
-    pv_list = embedder.embed(passages)
+    with stage_timer("rerank_embed"):
+        qv = (await embed_async(embedder, [query]))[0]
+        try:
+            stored = await run_blocking(
+                "rerank_vectors", get_embeddings, [c.get("id", "") for c in pool]
+            )
+        except Exception as e:
+            logger.warning(f"Stored vectors unavailable for rerank: {e}")
+            stored = {}
+        pv_list = [
+            v if (v := stored.get(c.get("id", ""))) is not None and len(v) == len(qv) else None
+            for c in pool
+        ]
+        missing = [i for i, v in enumerate(pv_list) if v is None]
+        if missing:
+            fresh = await embed_async(embedder, [pool[i].get("content", "") for i in missing])
+            for i, v in zip(missing, fresh, strict=True):
+                pv_list[i] = v
 
     # Compute cosine scores
     for c, pv in zip(pool, pv_list, strict=False):
@@ -1450,6 +1423,7 @@ async def answer_endpoint(
     mode: str = Query("hybrid", description="Search mode: semantic, lexical, or hybrid"),
     rerank: bool = Query(False, description="Apply reranking to improve result quality"),
     rerank_topk: int = Query(10, ge=3, le=50, description="Number of candidates for reranking"),
+    fusion: str | None = Query(None, description="Hybrid fusion: 'weighted', 'max', or 'rrf'"),
     tenant: str | None = Depends(ApiKeyRequired),
 ):
     """
@@ -1462,14 +1436,12 @@ async def answer_endpoint(
         mode: Search mode (semantic, lexical, hybrid)
         rerank: Apply reranking (embed strategy with token fallback)
         rerank_topk: Number of candidates to rerank
+        fusion: Hybrid score fusion strategy (default: HYBRID_FUSION)
         tenant: Tenant ID from API key
 
     Returns:
         Answer text with citations (url/source + snippet) and confidence score
     """
-    from pods.customer_ops.db_duck import query_embeddings as duck_query
-    from pods.customer_ops.db_duck import query_lexical
-
     # Apply rate limiting (reuse search rate limiter)
     rate_limit_search(request)
 
@@ -1477,8 +1449,16 @@ async def answer_endpoint(
     tenant_id = tenant or "default"
 
     # Check cache
-    cache_key = (tenant_id, q.strip().lower(), mode, str(rerank), str(k), str(rerank_topk))
-    cached = _cache_get("answer", cache_key, tenant=tenant_id)
+    cache_key = (
+        tenant_id,
+        q.strip().lower(),
+        mode,
+        str(rerank),
+        str(k),
+        str(rerank_topk),
+        fusion or "",
+    )
+    cached, cache_gen = await _cache_get("answer", cache_key, tenant=tenant_id)
     if cached:
         return cached
 
@@ -1486,75 +1466,19 @@ async def answer_endpoint(
     if mode not in ["semantic", "lexical", "hybrid"]:
         mode = "hybrid"
 
-    # Internal search (same logic as /search endpoint)
-    results_dict = {}
-
-    # Semantic search
-    if mode in ["semantic", "hybrid"]:
-        embedder = app.state.EMBEDDER
-        query_vec = embedder.embed([q])[0]
-        semantic_rows = duck_query(query_vec, tenant_id=tenant_id, top_k=max(k, 5) * 2)
-
-        for row in semantic_rows:
-            doc_id = row["id"]
-            score_semantic = max(0.0, 1.0 - row["distance"])
-
-            if doc_id not in results_dict:
-                results_dict[doc_id] = {
-                    "id": doc_id,
-                    "content": row["content"],
-                    "metadata": row["metadata"],
-                    "score_semantic": 0.0,
-                    "score_lex": 0.0,
-                }
-            results_dict[doc_id]["score_semantic"] = score_semantic
-
-    # Lexical search
-    if mode in ["lexical", "hybrid"]:
-        lexical_rows = query_lexical(q, tenant_id=tenant_id, top_k=max(k, 5) * 2)
-        max_lex = max([r["score_lex"] for r in lexical_rows], default=1)
-
-        for row in lexical_rows:
-            doc_id = row["id"]
-            score_lex_normalized = row["score_lex"] / max_lex if max_lex > 0 else 0.0
-
-            if doc_id not in results_dict:
-                results_dict[doc_id] = {
-                    "id": doc_id,
-                    "content": row["content"],
-                    "metadata": row["metadata"],
-                    "score_semantic": 0.0,
-                    "score_lex": 0.0,
-                }
-            results_dict[doc_id]["score_lex"] = score_lex_normalized
-
-    # Combine and rank
-    results = []
-    for doc in results_dict.values():
-        if mode == "semantic":
-            final_score = doc["score_semantic"]
-        elif mode == "lexical":
-            final_score = doc["score_lex"]
-        else:  # hybrid
-            final_score = max(doc["score_semantic"], doc["score_lex"])
-
-        results.append(
-            {
-                "id": doc["id"],
-                "content": doc["content"],
-                "metadata": doc["metadata"],
-                "score": final_score,
-            }
-        )
+    _check_fusion(fusion)
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    results = results[: max(k, 5) if not rerank else max(k, rerank_topk)]
+    # Internal search (same engine as /search)
+    retrieval = await _retriever().search(
+        q, tenant_id, mode=mode, top_k=max(k, 5) * 2, fusion=fusion
+    )
+    results = retrieval.results[: max(k, 5) if not rerank else max(k, rerank_topk)]
 
     # Rerank if requested
     rerank_used = "none"
     if rerank and results:
         try:
-            results = _rerank_embed(q, results, topk=rerank_topk)
+            results = await _rerank_embed(q, results, topk=rerank_topk)
             rerank_used = "embed"
         except Exception:
             results = _rerank_token(q, results, topk=rerank_topk)
@@ -1578,7 +1502,7 @@ async def answer_endpoint(
     # Enrich results with neighbor chunks (±1 for richer context)
     from pods.customer_ops.db_duck import get_conn as get_duck_conn
 
-    try:
+    def _enrich_neighbors() -> None:
         conn = get_duck_conn()
         for r in results[:5]:  # Only enrich top 5 for performance
             meta = r.get("metadata") or {}
@@ -1591,6 +1515,9 @@ async def answer_endpoint(
                 if neighbors:
                     # Append neighbor context to content (mark with separator)
                     r["content"] = r["content"] + "\n\n[Context] " + neighbors
+
+    try:
+        await run_blocking("answer_neighbors", _enrich_neighbors)
     except Exception as e:
         logger.warning(f"Failed to enrich with neighbor chunks: {e}")
 
@@ -1652,7 +1579,7 @@ async def answer_endpoint(
     }
 
     # Cache response
-    _cache_put("answer", cache_key, response, tenant=tenant_id)
+    _cache_put("answer", cache_key, response, tenant=tenant_id, generation=cache_gen)
 
     return response
 
@@ -1703,16 +1630,20 @@ async def knowledge_ingest_url(
         s = html.unescape(s)
         return re.sub(r"\s+", " ", s).strip()
 
+    def _fetch(u: str) -> bytes:
+        with urlopen(u, timeout=10) as resp:
+            return resp.read()
+
     try:
-        data = urlopen(url, timeout=10).read()
+        data = await run_blocking("ingest_fetch", _fetch, url)
         text = _strip_html(data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {str(e)}")
 
     chunks = _simple_chunk(text)
-    embedder = app.state.EMBEDDER
-    vectors = embedder.embed(chunks)
-    app.state.VSTORE.upsert(tenant, source, chunks, vectors)
+    vectors = await embed_async(app.state.EMBEDDER, chunks)
+    await run_blocking("ingest_upsert", app.state.VSTORE.upsert, tenant, source, chunks, vectors)
+    await run_blocking("cache_invalidate", bump_tenant_generation, tenant)
     return {"ok": True, "ingested_chunks": len(chunks), "source": source, "tenant": tenant}
 
 
@@ -1745,7 +1676,7 @@ async def knowledge_ingest_file(
     name = (file.filename or "").lower()
 
     if name.endswith(".pdf"):
-        text = _read_text_from_pdf(raw)
+        text = await run_blocking("ingest_parse", _read_text_from_pdf, raw)
     elif name.endswith(".txt") or name.endswith(".md"):
         text = raw.decode("utf-8", errors="ignore")
     elif name.endswith(".docx"):
@@ -1767,10 +1698,12 @@ async def knowledge_ingest_file(
         raise HTTPException(status_code=400, detail="No text extracted from file")
 
     chunks = _simple_chunk(text)
-    embedder = app.state.EMBEDDER
-    vectors = embedder.embed(chunks)
+    vectors = await embed_async(app.state.EMBEDDER, chunks)
     tenant_id = tenant or "default"
-    app.state.VSTORE.upsert(tenant_id, source or "upload", chunks, vectors)
+    await run_blocking(
+        "ingest_upsert", app.state.VSTORE.upsert, tenant_id, source or "upload", chunks, vectors
+    )
+    await run_blocking("cache_invalidate", bump_tenant_generation, tenant_id)
 
     return {
         "ok": True,
@@ -2345,6 +2278,7 @@ async def create_api_key(
         daily_quota=daily_quota,
         enabled=True,
     )
+    invalidate_api_key(key)
 
     return {"ok": True, "key": key_data}
 
@@ -2358,6 +2292,8 @@ async def list_api_keys(limit: int = Query(100, le=500)):
     """
     from pods.customer_ops.db_duck import list_api_keys as db_list_keys
 
+    # Include requests still buffered by the write-behind counters
+    await run_blocking("apikeys_flush", flush_api_key_counters)
     keys = db_list_keys(limit=limit)
 
     return {"ok": True, "count": len(keys), "keys": keys}
@@ -2391,6 +2327,7 @@ async def update_api_key(
     # Handle simple enabled toggle
     if enabled is not None and all(x is None for x in [name, role, rpm_limit, daily_quota]):
         set_api_key_enabled(key, enabled)
+        invalidate_api_key(key)
         return {"ok": True, "key": get_api_key(key)}
 
     # Full update
@@ -2403,6 +2340,7 @@ async def update_api_key(
         daily_quota=daily_quota if daily_quota is not None else key_data["daily_quota"],
         enabled=enabled if enabled is not None else key_data["enabled"],
     )
+    invalidate_api_key(key)
 
     return {"ok": True, "key": updated}
 
@@ -2422,6 +2360,7 @@ async def delete_api_key(key: str):
         raise HTTPException(status_code=404, detail="API key not found")
 
     db_delete_key(key)
+    invalidate_api_key(key)
 
     return {"ok": True, "deleted": key}
 
@@ -2606,9 +2545,19 @@ def create_lead(req: LeadRequest, request: Request, tenant: str = Depends(ApiKey
 
 
 @app.get("/v1/lead", response_model=dict, dependencies=[Depends(faq_limit_dep())])
-def list_lead(request: Request, tenant: str = Depends(ApiKeyRequired)):
+def list_lead(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    tenant: str = Depends(ApiKeyRequired),
+):
     request_id = getattr(request.state, "request_id", "n/a")
-    items = store_list_leads(tenant=tenant or "public", limit=50)
+    try:
+        items, next_cursor = store_list_leads_page(
+            tenant=tenant or "public", limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
     lead_items = []
     for item in items:
         lead_item = LeadItem(**item)
@@ -2623,7 +2572,7 @@ def list_lead(request: Request, tenant: str = Depends(ApiKeyRequired)):
     )
     return ok(
         request_id,
-        LeadListResponse(items=lead_items).model_dump(),
+        LeadListResponse(items=lead_items, next_cursor=next_cursor).model_dump(),
         intent="lead_list",
         confidence=1.0,
     )
@@ -2787,13 +2736,12 @@ def get_outcome_analytics(
     limit: int = 500,
     tenant: str = Depends(ApiKeyRequired),
 ):
-    from .lead_store import list_leads, list_outcomes
+    from .lead_store import count_leads, list_outcomes
 
     request_id = getattr(request.state, "request_id", "n/a")
     outcomes = list_outcomes(limit=limit)
     total_outcomes = len(outcomes)
-    all_leads = list_leads(tenant=tenant or "public", limit=5000)
-    total_leads = len(all_leads)
+    total_leads = count_leads(tenant or "public")
     breakdown: dict[str, int] = {}
     for outcome_rec in outcomes:
         outcome_type = outcome_rec.get("outcome", "unknown")
@@ -0,0 +1,245 @@
+"""
+Bounded response cache for /search and /answer.
+
+Entries live in one LRU bounded by count (ANSWER_CACHE_MAX_ENTRIES) and by
+approximate payload size (ANSWER_CACHE_MAX_BYTES), each with a TTL
+(ANSWER_CACHE_TTL). Every entry records its tenant's generation at write
+time; bump_tenant_generation() makes all of a tenant's entries stale at
+once, so ingest and delete invalidate cached answers immediately instead
+of waiting for the TTL.
+
+Generations are kept in-process and, when REDIS_URL is reachable, also in
+Redis (INCR respcache:gen:<tenant>), so a bump from the ingest worker
+reaches every API process within ANSWER_CACHE_GEN_REFRESH seconds. Redis
+errors fail open to the local counters.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover
+    redis = None  # type: ignore
+
+log = logging.getLogger("response_cache")
+
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "60"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+ANSWER_CACHE_MAX_BYTES = int(os.getenv("ANSWER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ANSWER_CACHE_GEN_REFRESH = float(os.getenv("ANSWER_CACHE_GEN_REFRESH", "1.0"))
+ANSWER_CACHE_REDIS_COOLDOWN = float(os.getenv("ANSWER_CACHE_REDIS_COOLDOWN", "30"))
+
+CACHE_HITS = Counter("aether_rag_cache_hits_total", "RAG cache hits", ["endpoint", "tenant"])
+CACHE_MISSES = Counter("aether_rag_cache_misses_total", "RAG cache misses", ["endpoint", "tenant"])
+CACHE_EVICTIONS = Counter(
+    "aether_rag_cache_evictions_total",
+    "RAG cache entries removed before being served",
+    ["tenant", "reason"],  # lru, expired, invalidated
+)
+CACHE_ENTRIES = Gauge("aether_rag_cache_entries", "RAG cache entries held")
+CACHE_BYTES = Gauge("aether_rag_cache_bytes", "Approximate RAG cache payload bytes held")
+
+_GEN_KEY = "respcache:gen:{tenant}"
+
+
+class TenantGenerations:
+    """Per-tenant generation counters, optionally mirrored in Redis."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        refresh_seconds: float = ANSWER_CACHE_GEN_REFRESH,
+        key_template: str = _GEN_KEY,
+    ):
+        self.client = client
+        self.refresh_seconds = refresh_seconds
+        self.key_template = key_template
+        self._local: dict[str, int] = {}
+        # tenant -> (checked_at, generation) read from Redis
+        self._remote: dict[str, tuple[float, int]] = {}
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> TenantGenerations:
+        if not url or redis is None:
+            return cls(**kwargs)
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return cls(client, **kwargs)
+
+    def _read_remote(self, tenant: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._remote.get(tenant)
+        fresh = cached is not None and now - cached[0] < self.refresh_seconds
+        if fresh or now < self._down_until:
+            return cached[1] if cached is not None else 0
+        try:
+            gen = int(self.client.get(self.key_template.format(tenant=tenant)) or 0)
+        except Exception as e:
+            log.warning("generation read failed (%s); using local generations for now", e)
+            self._down_until = now + ANSWER_CACHE_REDIS_COOLDOWN
+            gen = cached[1] if cached is not None else 0
+        with self._lock:
+            self._remote[tenant] = (now, gen)
+        return gen
+
+    def remote_read_due(self, tenant: str) -> bool:
+        """True when current(tenant) would block on a Redis GET."""
+        if self.client is None:
+            return False
+        now = time.monotonic()
+        if now < self._down_until:
+            return False
+        with self._lock:
+            cached = self._remote.get(tenant)
+        return cached is None or now - cached[0] >= self.refresh_seconds
+
+    def current(self, tenant: str) -> tuple[int, int]:
+        with self._lock:
+            local = self._local.get(tenant, 0)
+        remote = self._read_remote(tenant) if self.client is not None else 0
+        return (local, remote)
+
+    def bump(self, tenant: str) -> None:
+        with self._lock:
+            self._local[tenant] = self._local.get(tenant, 0) + 1
+        if self.client is None:
+            return
+        try:
+            gen = int(self.client.incr(self.key_template.format(tenant=tenant)))
+            with self._lock:
+                self._remote[tenant] = (time.monotonic(), gen)
+        except Exception as e:
+            log.warning("generation bump for %s not shared via redis: %s", tenant, e)
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache of JSON payloads keyed per tenant."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = ANSWER_CACHE_TTL,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        max_bytes: int = ANSWER_CACHE_MAX_BYTES,
+        generations: TenantGenerations | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generations = generations or TenantGenerations()
+        # (ns, tenant, key) -> (expires_at, generation, size, payload)
+        self._entries: OrderedDict[tuple, tuple[float, tuple[int, int], int, dict]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, cache_key: tuple, reason: str) -> None:
+        _, _, size, _ = self._entries.pop(cache_key)
+        self._bytes -= size
+        CACHE_EVICTIONS.labels(tenant=cache_key[1], reason=reason).inc()
+
+    def _publish_size(self) -> None:
+        CACHE_ENTRIES.set(len(self._entries))
+        CACHE_BYTES.set(self._bytes)
+
+    def get(self, ns: str, key: tuple, tenant: str = "default") -> dict[str, Any] | None:
+        return self.lookup(ns, key, tenant)[0]
+
+    def lookup(
+        self, ns: str, key: tuple, tenant: str = "default"
+    ) -> tuple[dict[str, Any] | None, tuple[int, int]]:
+        """
+        Cached payload (or None) and the tenant generation it was checked against.
+
+        Pass that generation to put() for the freshly computed response, so an
+        ingest that lands while it is being computed leaves it already stale.
+        """
+        cache_key = (ns, tenant, key)
+        generation = self.generations.current(tenant)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                expires_at, entry_gen, _, payload = entry
+                if entry_gen != generation:
+                    self._drop(cache_key, "invalidated")
+                elif time.monotonic() > expires_at:
+                    self._drop(cache_key, "expired")
+                else:
+                    self._entries.move_to_end(cache_key)
+                    CACHE_HITS.labels(endpoint=ns, tenant=tenant).inc()
+                    return payload, generation
+                self._publish_size()
+        CACHE_MISSES.labels(endpoint=ns, tenant=tenant).inc()
+        return None, generation
+
+    def put(
+        self,
+        ns: str,
+        key: tuple,
+        payload: dict[str, Any],
+        tenant: str = "default",
+        generation: tuple[int, int] | None = None,
+    ) -> None:
+        """Store payload under generation (from lookup(); defaults to the current one)."""
+        size = len(json.dumps(payload, default=str))
+        if size > self.max_bytes:
+            return
+        cache_key = (ns, tenant, key)
+        if generation is None:
+            generation = self.generations.current(tenant)
+        now = time.monotonic()
+        with self._lock:
+            if cache_key in self._entries:
+                self._bytes -= self._entries.pop(cache_key)[2]
+            self._entries[cache_key] = (now + self.ttl_seconds, generation, size, payload)
+            self._bytes += size
+            # Expired entries collect at the cold end; clear them before
+            # evicting anything still live
+            while self._entries:
+                oldest = next(iter(self._entries))
+                if self._entries[oldest][0] < now:
+                    self._drop(oldest, "expired")
+                elif len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    self._drop(oldest, "lru")
+                else:
+                    break
+            self._publish_size()
+
+    def invalidate_tenant(self, tenant: str) -> None:
+        """Make every cached response for tenant stale (new generation)."""
+        self.generations.bump(tenant)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._publish_size()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_generations: TenantGenerations | None = None
+
+
+def tenant_generations() -> TenantGenerations:
+    """Process-wide generations (shared via REDIS_URL when set)."""
+    global _generations
+    if _generations is None:
+        _generations = TenantGenerations.from_url(os.getenv("REDIS_URL", ""))
+    return _generations
+
+
+def bump_tenant_generation(tenant: str | None) -> None:
+    """Invalidate cached /search and /answer responses for tenant (e.g. after ingest)."""
+    tenant_generations().bump(tenant or "default")
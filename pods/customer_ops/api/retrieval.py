@@ -0,0 +1,267 @@
+"""
+Hybrid retrieval engine shared by /search and /answer.
+
+The semantic leg (embed the query, then vector search) and the lexical leg
+(BM25) run concurrently; the embedder is awaited natively and the searches
+run on the bounded blocking pool (see executor.py), so neither blocks the
+event loop. Their hits are fused with one of three strategies:
+
+- weighted: alpha * semantic + (1 - alpha) * lexical (lexical max-normalized)
+- max:      the larger of the two normalized scores
+- rrf:      reciprocal-rank fusion, sum of 1 / (rrf_k + rank) over both legs
+
+Every call reports per-stage timings in milliseconds (embed, semantic,
+lexical, fuse, total), which are also exported as a Prometheus histogram.
+The search backends are injectable, so the engine can be benchmarked on
+its own (see benchmark() and `python -m pods.customer_ops.api.retrieval`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from prometheus_client import Histogram
+
+from .embeddings import embed_async
+from .executor import run_blocking
+
+MODES = ("semantic", "lexical", "hybrid")
+FUSION_STRATEGIES = ("weighted", "max", "rrf")
+
+HYBRID_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.6"))
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "weighted")
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+
+RETRIEVAL_STAGE_SECONDS = Histogram(
+    "aether_rag_retrieval_stage_seconds",
+    "Hybrid retrieval latency per stage",
+    ["stage"],  # embed, semantic, lexical, fuse, total
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+SemanticSearch = Callable[[list[float], str | None, int], list[dict[str, Any]]]
+LexicalSearch = Callable[[str, str | None, int], list[dict[str, Any]]]
+
+
+def _duck_semantic(query_vec: list[float], tenant_id: str | None, top_k: int):
+    from pods.customer_ops.db_duck import query_embeddings
+
+    return query_embeddings(query_vec, tenant_id=tenant_id, top_k=top_k)
+
+
+def _duck_lexical(query: str, tenant_id: str | None, top_k: int):
+    from pods.customer_ops.db_duck import query_lexical
+
+    return query_lexical(query, tenant_id=tenant_id, top_k=top_k)
+
+
+@dataclass
+class Retrieval:
+    """Fused hits (best first) and per-stage timings in milliseconds."""
+
+    results: list[dict[str, Any]]
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class HybridRetriever:
+    """Runs the semantic and lexical legs concurrently and fuses their hits."""
+
+    def __init__(
+        self,
+        embedder: Any,
+        semantic_search: SemanticSearch = _duck_semantic,
+        lexical_search: LexicalSearch = _duck_lexical,
+        fusion: str = HYBRID_FUSION,
+        alpha: float = HYBRID_ALPHA,
+        rrf_k: int = HYBRID_RRF_K,
+    ) -> None:
+        if fusion not in FUSION_STRATEGIES:
+            raise ValueError(f"Unknown fusion strategy: {fusion}")
+        self.embedder = embedder
+        self.semantic_search = semantic_search
+        self.lexical_search = lexical_search
+        self.fusion = fusion
+        self.alpha = alpha
+        self.rrf_k = rrf_k
+
+    async def search(
+        self,
+        query: str,
+        tenant_id: str | None,
+        mode: str = "hybrid",
+        top_k: int = 10,
+        fusion: str | None = None,
+    ) -> Retrieval:
+        """
+        Retrieve up to top_k fused hits.
+
+        Args:
+            query: Query text
+            tenant_id: Tenant partition to search
+            mode: "semantic", "lexical" or "hybrid"
+            top_k: Candidates fetched per leg and returned after fusion
+            fusion: Override the engine's fusion strategy for this call
+
+        Returns:
+            Retrieval with results {id, content, metadata, score,
+            score_semantic, score_lex} sorted by score
+        """
+        if mode not in MODES:
+            raise ValueError(f"Invalid mode: {mode}. Use 'semantic', 'lexical', or 'hybrid'")
+        fusion = fusion or self.fusion
+        if fusion not in FUSION_STRATEGIES:
+            raise ValueError(f"Unknown fusion strategy: {fusion}")
+
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        legs = []
+        if mode in ("semantic", "hybrid"):
+            legs.append(self._semantic_leg(query, tenant_id, top_k, timings))
+        if mode in ("lexical", "hybrid"):
+            legs.append(self._lexical_leg(query, tenant_id, top_k, timings))
+        hits = await asyncio.gather(*legs)
+
+        semantic = hits[0] if mode in ("semantic", "hybrid") else []
+        lexical = hits[-1] if mode in ("lexical", "hybrid") else []
+
+        fuse_start = time.perf_counter()
+        results = self.fuse(semantic, lexical, mode, fusion)[:top_k]
+        timings["fuse"] = (time.perf_counter() - fuse_start) * 1000
+        timings["total"] = (time.perf_counter() - start) * 1000
+
+        for stage, ms in timings.items():
+            RETRIEVAL_STAGE_SECONDS.labels(stage=stage).observe(ms / 1000)
+        return Retrieval(results, {stage: round(ms, 3) for stage, ms in timings.items()})
+
+    async def _semantic_leg(
+        self, query: str, tenant_id: str | None, top_k: int, timings: dict[str, float]
+    ) -> list[dict[str, Any]]:
+        start = time.perf_counter()
+        query_vec = (await embed_async(self.embedder, [query]))[0]
+        embedded = time.perf_counter()
+        rows = await run_blocking(
+            "semantic_search", self.semantic_search, query_vec, tenant_id, top_k
+        )
+        timings["embed"] = (embedded - start) * 1000
+        timings["semantic"] = (time.perf_counter() - embedded) * 1000
+        return rows
+
+    async def _lexical_leg(
+        self, query: str, tenant_id: str | None, top_k: int, timings: dict[str, float]
+    ) -> list[dict[str, Any]]:
+        start = time.perf_counter()
+        rows = await run_blocking("lexical_search", self.lexical_search, query, tenant_id, top_k)
+        timings["lexical"] = (time.perf_counter() - start) * 1000
+        return rows
+
+    def fuse(
+        self,
+        semantic: list[dict[str, Any]],
+        lexical: list[dict[str, Any]],
+        mode: str,
+        fusion: str,
+    ) -> list[dict[str, Any]]:
+        """Merge both legs' rows by id and score them; best first."""
+        docs: dict[str, dict[str, Any]] = {}
+
+        def doc_for(row: dict[str, Any]) -> dict[str, Any]:
+            doc = docs.get(row["id"])
+            if doc is None:
+                doc = docs[row["id"]] = {
+                    "id": row["id"],
+                    "content": row["content"],
+                    "metadata": row["metadata"],
+                    "score_semantic": 0.0,
+                    "score_lex": 0.0,
+                    "rrf": 0.0,
+                }
+            return doc
+
+        for rank, row in enumerate(semantic, start=1):
+            doc = doc_for(row)
+            # Convert distance to similarity
+            doc["score_semantic"] = max(0.0, 1.0 - row["distance"])
+            doc["rrf"] += 1.0 / (self.rrf_k + rank)
+
+        # Normalize lexical scores to 0-1 range
+        max_lex = max((row["score_lex"] for row in lexical), default=0.0)
+        for rank, row in enumerate(lexical, start=1):
+            doc = doc_for(row)
+            doc["score_lex"] = row["score_lex"] / max_lex if max_lex > 0 else 0.0
+            doc["rrf"] += 1.0 / (self.rrf_k + rank)
+
+        for doc in docs.values():
+            rrf = doc.pop("rrf")
+            if mode == "semantic":
+                doc["score"] = doc["score_semantic"]
+            elif mode == "lexical":
+                doc["score"] = doc["score_lex"]
+            elif fusion == "weighted":
+                doc["score"] = (
+                    self.alpha * doc["score_semantic"] + (1 - self.alpha) * doc["score_lex"]
+                )
+            elif fusion == "max":
+                doc["score"] = max(doc["score_semantic"], doc["score_lex"])
+            else:  # rrf
+                doc["score"] = rrf
+
+        return sorted(docs.values(), key=lambda d: d["score"], reverse=True)
+
+
+def benchmark(
+    retriever: HybridRetriever,
+    queries: list[str],
+    tenant_id: str | None = None,
+    mode: str = "hybrid",
+    top_k: int = 10,
+    rounds: int = 3,
+) -> dict[str, dict[str, float]]:
+    """Run queries through the retriever and return p50/p95/max ms per stage."""
+
+    async def run() -> list[dict[str, float]]:
+        samples = []
+        for _ in range(rounds):
+            for query in queries:
+                retrieval = await retriever.search(query, tenant_id, mode=mode, top_k=top_k)
+                samples.append(retrieval.timings)
+        return samples
+
+    samples = asyncio.run(run())
+    report: dict[str, dict[str, float]] = {}
+    for stage in sorted({stage for sample in samples for stage in sample}):
+        values = sorted(sample[stage] for sample in samples if stage in sample)
+        report[stage] = {
+            "p50": round(statistics.median(values), 3),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+            "max": round(values[-1], 3),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from .config import get_settings
+    from .embeddings import build_embedder
+
+    parser = argparse.ArgumentParser(description="Benchmark hybrid retrieval")
+    parser.add_argument("queries", nargs="+", help="Query texts")
+    parser.add_argument("--tenant", default="default")
+    parser.add_argument("--mode", default="hybrid", choices=MODES)
+    parser.add_argument("--fusion", default=HYBRID_FUSION, choices=FUSION_STRATEGIES)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    embedder = build_embedder(settings.EMBED_PROVIDER, settings.EMBED_MODEL, settings)
+    engine = HybridRetriever(embedder, fusion=args.fusion)
+    report = benchmark(engine, args.queries, args.tenant, args.mode, args.k, args.rounds)
+    print(json.dumps(report, indent=2))
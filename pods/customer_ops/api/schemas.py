@@ -32,6 +32,7 @@ class LeadItem(BaseModel):
 
 class LeadListResponse(BaseModel):
     items: list[LeadItem]
+    next_cursor: str | None = None
 
 
 class OutcomeRequest(BaseModel):
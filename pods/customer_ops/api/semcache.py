@@ -1,6 +1,33 @@
+"""
+Semantic FAQ answer cache.
+
+Answers are stored twice:
+
+- exact tier: Redis (or fakeredis / an in-memory shim) under
+  semfaq:{tenant}:{normalized query}, shared across processes, as before
+- semantic tier: a per-tenant in-process index of normalized query
+  embeddings; a lookup that misses the exact tier returns the answer of the
+  nearest cached question if its cosine similarity is >= SEMCACHE_THRESHOLD
+
+The semantic index is a fixed-capacity float32 matrix per tenant
+(SEMCACHE_MAX_ENTRIES rows) searched with one matrix-vector product; at
+that size an exact scan is sub-millisecond, so no ANN library is needed.
+Expired rows are skipped and reused first, then the least recently used
+row is evicted. aether_semcache_distance records the distance of the best
+candidate for hits and misses alike, to tune the threshold.
+"""
+
 from __future__ import annotations
 
 import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+import numpy as np
+from prometheus_client import Counter, Histogram
 
 from .config import get_settings
 
@@ -19,6 +46,25 @@ try:
 except Exception:
     HAVE_FAKEREDIS = False
 
+log = logging.getLogger("semcache")
+
+SEMCACHE_THRESHOLD = float(os.getenv("SEMCACHE_THRESHOLD", "0.92"))
+SEMCACHE_MAX_ENTRIES = int(os.getenv("SEMCACHE_MAX_ENTRIES", "2000"))
+
+SEMCACHE_LOOKUPS = Counter(
+    "aether_semcache_lookups_total",
+    "Semantic cache lookups by result",
+    ["result"],  # exact, semantic, miss
+)
+SEMCACHE_DISTANCE = Histogram(
+    "aether_semcache_distance",
+    "Cosine distance to the nearest cached question",
+    ["result"],  # hit, miss
+    buckets=(0.01, 0.02, 0.04, 0.06, 0.08, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+
+Embed = Callable[[list[str]], list[list[float]]]
+
 
 # Minimal in-memory shim (last resort)
 class _Mem:
@@ -48,9 +94,135 @@ def _make_client():
 _client = _make_client()
 
 
+def _normalize(query: str) -> str:
+    return query.strip().lower()
+
+
 def _key(tenant: str | None, query: str) -> str:
     tenant = tenant or "public"
-    return f"semfaq:{tenant}:{query.strip().lower()}"
+    return f"semfaq:{tenant}:{_normalize(query)}"
+
+
+class _TenantIndex:
+    """Fixed-capacity matrix of unit query vectors with TTL and LRU slots."""
+
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.expires = np.zeros(capacity, dtype=np.float64)  # 0 = free slot
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.queries: list[str | None] = [None] * capacity
+        self.payloads: list[dict | None] = [None] * capacity
+        self.slots: dict[str, int] = {}
+
+    def nearest(self, vec: np.ndarray, now: float) -> tuple[int, float] | None:
+        live = self.expires > now
+        if not live.any():
+            return None
+        sims = np.where(live, self.vectors @ vec, -np.inf)
+        slot = int(np.argmax(sims))
+        return slot, float(sims[slot])
+
+    def insert(self, query: str, vec: np.ndarray, payload: dict, expires_at: float, now: float):
+        slot = self.slots.get(query)
+        if slot is None:
+            free = np.flatnonzero(self.expires <= now)
+            slot = int(free[0]) if free.size else int(np.argmin(self.last_used))
+            old = self.queries[slot]
+            if old is not None:
+                self.slots.pop(old, None)
+            self.slots[query] = slot
+        self.vectors[slot] = vec
+        self.expires[slot] = expires_at
+        self.last_used[slot] = now
+        self.queries[slot] = query
+        self.payloads[slot] = payload
+
+
+class SemanticCache:
+    """Per-tenant nearest-question lookup over query embeddings."""
+
+    def __init__(
+        self,
+        embed: Embed | None = None,
+        threshold: float = SEMCACHE_THRESHOLD,
+        max_entries: int = SEMCACHE_MAX_ENTRIES,
+    ):
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self._indexes: dict[str, _TenantIndex] = {}
+        self._lock = threading.Lock()
+
+    def _embedding(self, query: str) -> np.ndarray | None:
+        if self._embed is None:
+            return None
+        try:
+            vec = np.asarray(self._embed([query])[0], dtype=np.float32)
+        except Exception as e:
+            log.debug("semcache embed failed: %s", e)
+            return None
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    def get(self, tenant: str, query: str) -> dict | None:
+        vec = self._embedding(query)
+        if vec is None:
+            return None
+        now = time.time()
+        with self._lock:
+            index = self._indexes.get(tenant)
+            if index is None or index.vectors.shape[1] != vec.shape[0]:
+                return None
+            best = index.nearest(vec, now)
+            if best is None:
+                return None
+            slot, sim = best
+            distance = max(0.0, 1.0 - sim)
+            if sim < self.threshold:
+                SEMCACHE_DISTANCE.labels(result="miss").observe(distance)
+                return None
+            index.last_used[slot] = now
+            SEMCACHE_DISTANCE.labels(result="hit").observe(distance)
+            return index.payloads[slot]
+
+    def put(self, tenant: str, query: str, payload: dict, ttl_seconds: int) -> None:
+        vec = self._embedding(query)
+        if vec is None:
+            return
+        now = time.time()
+        with self._lock:
+            index = self._indexes.get(tenant)
+            if index is None or index.vectors.shape[1] != vec.shape[0]:
+                # First entry, or the embedding model changed: start over
+                index = self._indexes[tenant] = _TenantIndex(vec.shape[0], self.max_entries)
+            index.insert(_normalize(query), vec, payload, now + ttl_seconds, now)
+
+
+def _default_embed() -> Embed | None:
+    try:
+        from .embeddings import build_embedder
+
+        s = get_settings()
+        return build_embedder(s.EMBED_PROVIDER, s.EMBED_MODEL, s).embed
+    except Exception as e:
+        log.warning("semcache running exact-match only (no embedder): %s", e)
+        return None
+
+
+_semantic: SemanticCache | None = None
+
+
+def configure_semcache(embed: Embed | None) -> SemanticCache:
+    """Use embed (e.g. the app's shared embedder) for the semantic tier."""
+    global _semantic
+    _semantic = SemanticCache(embed)
+    return _semantic
+
+
+def _semantic_cache() -> SemanticCache:
+    if _semantic is None:
+        return configure_semcache(_default_embed())
+    return _semantic
 
 
 def get_semcache(a: str, b: str | None = None) -> dict | None:
@@ -65,12 +237,16 @@ def get_semcache(a: str, b: str | None = None) -> dict | None:
         tenant = a
         query = b
     raw = _client.get(_key(tenant, query))
-    if not raw:
-        return None
-    try:
-        return json.loads(raw)
-    except Exception:
-        return None
+    if raw:
+        try:
+            payload = json.loads(raw)
+            SEMCACHE_LOOKUPS.labels(result="exact").inc()
+            return payload
+        except Exception:
+            pass
+    payload = _semantic_cache().get(tenant or "public", query)
+    SEMCACHE_LOOKUPS.labels(result="semantic" if payload is not None else "miss").inc()
+    return payload
 
 
 def set_semcache(
@@ -90,3 +266,4 @@ def set_semcache(
         query = b or ""
         payload = value
     _client.setex(_key(tenant, query), ttl_seconds, json.dumps(payload))
+    _semantic_cache().put(tenant or "public", query, payload, ttl_seconds)
@@ -1,84 +1,216 @@
+"""
+SQLite knowledge store used by the /chat RAG hook.
+
+Vectors are stored as float32 BLOBs (legacy rows hold JSON text and are
+still readable). For search, each tenant's vectors are loaded once into an
+in-memory matrix with unit-normalized rows, kept in sync by upsert() and
+delete(); a query is one matrix-vector product plus argpartition for the
+top k. Writes from other connections (e.g. the ingest worker) are noticed
+via PRAGMA data_version and drop the cached matrices.
+"""
+
 from __future__ import annotations
 
 import json
-import math
+import logging
 import sqlite3
+import threading
 import time
 from pathlib import Path
 
+import numpy as np
+
+log = logging.getLogger("vector_store")
+
+
+def _encode(vec: list[float]) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def _decode(raw: bytes | str | None) -> np.ndarray | None:
+    if not raw:
+        return None
+    if isinstance(raw, bytes | memoryview):
+        return np.frombuffer(raw, dtype=np.float32)
+    return np.asarray(json.loads(raw), dtype=np.float32)  # legacy JSON text
+
+
+class _TenantMatrix:
+    """Unit-normalized vectors of one tenant, one row per knowledge id."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.chunks: list[str] = []
+        self.sources: list[str | None] = []
 
-def _cosine(a: list[float], b: list[float]) -> float:
-    num = sum(x * y for x, y in zip(a, b, strict=False))
-    da = math.sqrt(sum(x * x for x in a))
-    db = math.sqrt(sum(x * x for x in b))
-    return 0.0 if (da == 0 or db == 0) else num / (da * db)
+    def add(self, ids: list[int], vectors: list[np.ndarray], chunks: list[str], sources: list):
+        rows = np.vstack(vectors).astype(np.float32, copy=False)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows = rows / np.where(norms == 0, 1.0, norms)
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        self.matrix = np.vstack([self.matrix, rows])
+        self.chunks.extend(chunks)
+        self.sources.extend(sources)
+
+    def remove(self, ids: list[int]) -> None:
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        if keep.all():
+            return
+        self.ids = self.ids[keep]
+        self.matrix = self.matrix[keep]
+        self.chunks = [c for c, k in zip(self.chunks, keep, strict=True) if k]
+        self.sources = [s for s, k in zip(self.sources, keep, strict=True) if k]
+
+    def search(
+        self, query: np.ndarray, top_k: int, min_score: float
+    ) -> list[tuple[float, str, str | None]]:
+        n = len(self.ids)
+        if n == 0 or top_k <= 0:
+            return []
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+        scores = self.matrix @ (query / norm)
+        if top_k < n:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (float(scores[i]), self.chunks[i], self.sources[i])
+            for i in top
+            if scores[i] >= min_score
+        ]
 
 
 class SQLiteVectorStore:
     def __init__(self, db_path: str):
         self.path = Path(db_path)
-        self.conn = sqlite3.connect(self.path)
+        # Shared by request handlers on the blocking pool; guarded by _lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._matrices: dict[str, _TenantMatrix] = {}
         self.conn.execute("""
         CREATE TABLE IF NOT EXISTS knowledge (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             tenant TEXT NOT NULL,
             source TEXT,
             chunk TEXT NOT NULL,
-            vector TEXT NOT NULL,
+            vector BLOB NOT NULL,
             created_at REAL NOT NULL
         )
         """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_knowledge_tenant ON knowledge(tenant)")
         self.conn.commit()
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self) -> None:
+        """Drop cached matrices if another connection committed since last check."""
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._matrices.clear()
+
+    def _load(self, tenant: str, dim: int) -> _TenantMatrix:
+        """Build the tenant matrix from SQLite (rows of another dimension are skipped)."""
+        matrix = _TenantMatrix(dim)
+        ids, vectors, chunks, sources = [], [], [], []
+        skipped = 0
+        for rid, chunk, raw, src in self.conn.execute(
+            "SELECT id, chunk, vector, source FROM knowledge WHERE tenant = ? ORDER BY id",
+            (tenant,),
+        ):
+            vec = _decode(raw)
+            if vec is None or vec.shape[0] != dim:
+                skipped += 1
+                continue
+            ids.append(rid)
+            vectors.append(vec)
+            chunks.append(chunk)
+            sources.append(src)
+        if skipped:
+            log.warning(
+                "tenant %s: %d vectors without dimension %d not searchable", tenant, skipped, dim
+            )
+        if ids:
+            matrix.add(ids, vectors, chunks, sources)
+        self._matrices[tenant] = matrix
+        return matrix
+
+    def _matrix(self, tenant: str, dim: int) -> _TenantMatrix:
+        matrix = self._matrices.get(tenant)
+        if matrix is None or matrix.dim != dim:
+            matrix = self._load(tenant, dim)
+        return matrix
 
     def upsert(
         self, tenant: str, source: str | None, chunks: list[str], vectors: list[list[float]]
     ):
         now = time.time()
-        with self.conn:
-            for c, v in zip(chunks, vectors, strict=False):
-                self.conn.execute(
-                    "INSERT INTO knowledge (tenant, source, chunk, vector, created_at) VALUES (?, ?, ?, ?, ?)",
-                    (tenant, source, c, json.dumps(v), now),
-                )
+        with self._lock:
+            self._check_external_writes()
+            ids, rows = [], []
+            with self.conn:
+                for c, v in zip(chunks, vectors, strict=False):
+                    vec = np.asarray(v, dtype=np.float32)
+                    cur = self.conn.execute(
+                        "INSERT INTO knowledge (tenant, source, chunk, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (tenant, source, c, vec.tobytes(), now),
+                    )
+                    ids.append(cur.lastrowid)
+                    rows.append(vec)
+            matrix = self._matrices.get(tenant)
+            if matrix is not None and rows:
+                if all(r.shape[0] == matrix.dim for r in rows):
+                    matrix.add(ids, rows, list(chunks[: len(rows)]), [source] * len(rows))
+                else:
+                    self._matrices.pop(tenant)
 
     def search(
         self, tenant: str, query_vec: list[float], top_k: int = 4, min_score: float = 0.15
     ) -> list[tuple[float, str, str | None]]:
-        rows = self.conn.execute(
-            "SELECT chunk, vector, source FROM knowledge WHERE tenant = ?", (tenant,)
-        ).fetchall()
-        scored: list[tuple[float, str, str | None]] = []
-        for chunk, v_json, src in rows:
-            vec = json.loads(v_json)
-            s = _cosine(query_vec, vec)
-            if s >= min_score:
-                scored.append((s, chunk, src))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[:top_k]
+        query = np.asarray(query_vec, dtype=np.float32)
+        with self._lock:
+            self._check_external_writes()
+            matrix = self._matrix(tenant, query.shape[0])
+            return matrix.search(query, top_k, min_score)
 
     def list(self, tenant: str, limit: int = 50, q: str | None = None):
         """List knowledge entries for a tenant with optional text search."""
-        cur = self.conn.cursor()
-        if q:
-            cur.execute(
-                "SELECT id, source, chunk, created_at FROM knowledge WHERE tenant = ? AND chunk LIKE ? ORDER BY created_at DESC LIMIT ?",
-                (tenant, f"%{q}%", limit),
-            )
-        else:
-            cur.execute(
-                "SELECT id, source, chunk, created_at FROM knowledge WHERE tenant = ? ORDER BY created_at DESC LIMIT ?",
-                (tenant, limit),
-            )
-        rows = cur.fetchall()
+        with self._lock:
+            cur = self.conn.cursor()
+            if q:
+                cur.execute(
+                    "SELECT id, source, chunk, created_at FROM knowledge WHERE tenant = ? AND chunk LIKE ? ORDER BY created_at DESC LIMIT ?",
+                    (tenant, f"%{q}%", limit),
+                )
+            else:
+                cur.execute(
+                    "SELECT id, source, chunk, created_at FROM knowledge WHERE tenant = ? ORDER BY created_at DESC LIMIT ?",
+                    (tenant, limit),
+                )
+            rows = cur.fetchall()
         return [{"id": r[0], "source": r[1], "text": r[2], "created_at": r[3]} for r in rows]
 
     def delete(self, tenant: str, ids: list[str]):
         """Delete knowledge entries by IDs for a tenant."""
-        cur = self.conn.cursor()
-        qmarks = ",".join("?" for _ in ids)
-        cur.execute(f"DELETE FROM knowledge WHERE tenant = ? AND id IN ({qmarks})", [tenant, *ids])
-        self.conn.commit()
-        return cur.rowcount
+        with self._lock:
+            self._check_external_writes()
+            cur = self.conn.cursor()
+            qmarks = ",".join("?" for _ in ids)
+            cur.execute(
+                f"DELETE FROM knowledge WHERE tenant = ? AND id IN ({qmarks})", [tenant, *ids]
+            )
+            self.conn.commit()
+            matrix = self._matrices.get(tenant)
+            if matrix is not None:
+                matrix.remove([int(i) for i in ids if str(i).lstrip("-").isdigit()])
+            return cur.rowcount
 
     def export_csv(self, tenant: str) -> str:
         """Export knowledge entries as CSV."""
@@ -94,20 +226,16 @@ class SQLiteVectorStore:
 
     def project_umap(self, tenant: str, k: int = 200):
         """Project embeddings to 2D using UMAP or PCA fallback."""
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT id, source, chunk, vector FROM knowledge WHERE tenant = ? ORDER BY created_at DESC LIMIT ?",
-            (tenant, k),
-        )
-        rows = cur.fetchall()
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                "SELECT id, source, chunk, vector FROM knowledge WHERE tenant = ? ORDER BY created_at DESC LIMIT ?",
+                (tenant, k),
+            )
+            rows = cur.fetchall()
         if not rows:
             return []
 
-        try:
-            import numpy as np
-        except ImportError:
-            return []
-
         try:
             import umap
 
@@ -118,9 +246,9 @@ class SQLiteVectorStore:
         embs = []
         meta = []
         for rid, source, text, emb_json in rows:
-            e = json.loads(emb_json) if emb_json else None
+            e = _decode(emb_json)
             if e is not None:
-                embs.append(np.array(e, dtype=float))
+                embs.append(e.astype(float))
                 meta.append((rid, source, text))
 
         if not embs:
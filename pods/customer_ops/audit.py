@@ -9,15 +9,38 @@ Each event is appended to ops.jsonl with:
 
 This creates a blockchain-like chain where tampering with any entry
 breaks the hash chain, making it immediately detectable.
+
+Appends cost the same however long the log gets:
+- The chain tip (last hash and the active file's size) is cached in memory
+  and in a sidecar, ops.jsonl.chain.json. On a cold start, or after
+  another process appended, only the file's last line is read.
+- When ops.jsonl reaches AUDIT_SEGMENT_MAX_BYTES it is sealed as
+  ops.000001.jsonl, ops.000002.jsonl, ... The chain continues across
+  segments. Each sealed segment records its entry count, last hash, file
+  digest and a checkpoint hash: sha256(previous checkpoint + last hash +
+  digest).
+- verify_chain(file, incremental=True) resumes from the last verified
+  position recorded in the sidecar. Left at the default, it re-verifies
+  everything, including each sealed segment's digest and checkpoint.
 """
 
+import contextlib
 import hashlib
 import json
 import os
+import threading
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+AUDIT_SEGMENT_MAX_BYTES = int(os.getenv("AUDIT_SEGMENT_MAX_BYTES", str(16 * 1024 * 1024)))
+
 
 def ensure_audit_dir(path: str = "data/audit") -> None:
     """
@@ -29,6 +52,341 @@ def ensure_audit_dir(path: str = "data/audit") -> None:
     Path(path).mkdir(parents=True, exist_ok=True)
 
 
+def _entry_hash(payload: dict[str, Any]) -> str:
+    """SHA-256 of the deterministic serialization (sorted keys, no spaces)."""
+    payload_str = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(payload_str.encode("utf-8")).hexdigest()
+
+
+def _read_last_line(path: str, block: int = 4096) -> str | None:
+    """Return the last non-empty line of a file, reading backwards from the end."""
+    try:
+        with open(path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            buf = b""
+            pos = end
+            while pos > 0:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+                stripped = buf.rstrip(b"\r\n")
+                if b"\n" in stripped:
+                    return stripped.rsplit(b"\n", 1)[1].decode("utf-8")
+            stripped = buf.strip()
+            return stripped.decode("utf-8") if stripped else None
+    except FileNotFoundError:
+        return None
+
+
+def _hash_of_line(line: str | None) -> str | None:
+    if not line:
+        return None
+    try:
+        return json.loads(line).get("hash")
+    except Exception:
+        return None
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _checkpoint(prev_checkpoint: str | None, last_hash: str | None, digest: str) -> str:
+    return hashlib.sha256(f"{prev_checkpoint or ''}{last_hash or ''}{digest}".encode()).hexdigest()
+
+
+class AuditLog:
+    """Append / verify engine for one audit log path (see module docstring)."""
+
+    def __init__(self, file: str, max_segment_bytes: int = AUDIT_SEGMENT_MAX_BYTES):
+        self.file = file
+        self.max_segment_bytes = max_segment_bytes
+        self.sidecar = f"{file}.chain.json"
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] | None = None
+        self._sidecar_stamp: tuple[int, int] | None = None
+
+    # --- state ----------------------------------------------------------
+
+    def segment_path(self, n: int) -> str:
+        base, ext = os.path.splitext(self.file)
+        return f"{base}.{n:06d}{ext}"
+
+    @staticmethod
+    def _empty_state() -> dict[str, Any]:
+        return {"tip": None, "offset": 0, "segments": [], "verified": None}
+
+    def _stamp(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.sidecar)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _load_state(self) -> dict[str, Any]:
+        """Cached state, re-read only if another process rewrote the sidecar."""
+        stamp = self._stamp()
+        if self._state is None or stamp != self._sidecar_stamp:
+            state = self._empty_state()
+            if stamp is not None:
+                try:
+                    with open(self.sidecar) as f:
+                        state.update(json.load(f))
+                except (OSError, ValueError):
+                    pass  # rebuilt from the log below
+            self._state = state
+            self._sidecar_stamp = stamp
+        return self._state
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        tmp = f"{self.sidecar}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, self.sidecar)
+        self._state = state
+        self._sidecar_stamp = self._stamp()
+
+    def _sync_tip(self, state: dict[str, Any]) -> None:
+        """Re-read the last line if the active file changed behind the cached tip."""
+        try:
+            size = os.path.getsize(self.file)
+        except FileNotFoundError:
+            size = 0
+        if size != state["offset"]:
+            if size > 0:
+                state["tip"] = _hash_of_line(_read_last_line(self.file))
+            elif not state["segments"]:
+                state["tip"] = None
+            state["offset"] = size
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """In-process lock plus an advisory file lock shared with other processes."""
+        with self._lock:
+            ensure_audit_dir(os.path.dirname(self.file) or ".")
+            with open(f"{self.file}.lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # --- append -----------------------------------------------------------
+
+    def tip(self) -> str | None:
+        with self._lock:
+            state = self._load_state()
+            self._sync_tip(state)
+            return state["tip"]
+
+    def append(self, event: dict[str, Any]) -> str:
+        with self._locked():
+            state = self._load_state()
+            self._sync_tip(state)
+
+            payload = {
+                "ts": datetime.now(UTC).isoformat(),
+                "event": event,
+                "prev_hash": state["tip"],
+            }
+            entry_hash = _entry_hash(payload)
+            payload["hash"] = entry_hash
+            line = (json.dumps(payload, separators=(",", ":"), sort_keys=True) + "\n").encode()
+
+            with open(self.file, "ab") as f:
+                f.write(line)
+                f.flush()
+                offset = f.tell()
+
+            state["tip"] = entry_hash
+            state["offset"] = offset
+            if offset >= self.max_segment_bytes:
+                self._seal(state)
+            self._save_state(state)
+            return entry_hash
+
+    def _seal(self, state: dict[str, Any]) -> None:
+        """Rotate the active file into the next sealed segment."""
+        segments = state["segments"]
+        n = len(segments) + 1
+        path = self.segment_path(n)
+        os.replace(self.file, path)
+        with open(path, "rb") as f:
+            entries = sum(1 for raw in f if raw.strip())
+        digest = _file_digest(path)
+        prev_checkpoint = segments[-1]["checkpoint"] if segments else None
+        segments.append(
+            {
+                "file": os.path.basename(path),
+                "entries": entries,
+                "last_hash": state["tip"],
+                "sha256": digest,
+                "checkpoint": _checkpoint(prev_checkpoint, state["tip"], digest),
+            }
+        )
+        state["offset"] = 0
+
+    # --- verify -----------------------------------------------------------
+
+    def verify(self, incremental: bool = False) -> dict[str, Any]:
+        with self._lock:
+            state = self._load_state()
+            segments = list(state["segments"])
+            files = [os.path.join(os.path.dirname(self.file), seg["file"]) for seg in segments] + [
+                self.file
+            ]
+
+            start = state.get("verified") if incremental else None
+            seg_index = start["segment"] if start else 0
+            offset = start["offset"] if start else 0
+            prev_hash = start["hash"] if start else None
+            index = start["entries"] if start else 0
+            prev_checkpoint = segments[seg_index - 1]["checkpoint"] if seg_index else None
+
+            if not any(os.path.exists(p) for p in files):
+                return {
+                    "valid": True,
+                    "total_entries": 0,
+                    "message": "No audit log file exists yet",
+                }
+
+            active_offset = offset
+            for i in range(seg_index, len(files)):
+                path = files[i]
+                sealed = i < len(segments)
+                if not os.path.exists(path):
+                    if sealed:
+                        return self._error(index, index, f"Sealed segment missing: {path}")
+                    active_offset = 0
+                    continue
+                result = self._verify_file(path, offset if i == seg_index else 0, prev_hash, index)
+                if result.get("error_message"):
+                    return result
+                prev_hash, index, active_offset = (
+                    result["hash"],
+                    result["entries"],
+                    result["offset"],
+                )
+                if sealed:
+                    seg = segments[i]
+                    if prev_hash != seg["last_hash"]:
+                        return self._error(
+                            index,
+                            index,
+                            f"Segment {seg['file']} last hash does not match its checkpoint",
+                        )
+                    if not incremental:
+                        digest = _file_digest(path)
+                        if _checkpoint(prev_checkpoint, prev_hash, digest) != seg["checkpoint"]:
+                            return self._error(
+                                index, index, f"Segment {seg['file']} checkpoint mismatch"
+                            )
+                    prev_checkpoint = seg["checkpoint"]
+
+            if index == 0:
+                return {"valid": True, "total_entries": 0, "message": "Audit log is empty"}
+
+        # Remember where verification got to (under the append lock, so the
+        # sidecar is not overwritten with a stale tip)
+        with self._locked():
+            current = self._load_state()
+            if len(current["segments"]) == len(segments):
+                current["verified"] = {
+                    "segment": len(segments),
+                    "offset": active_offset,
+                    "hash": prev_hash,
+                    "entries": index,
+                }
+                self._save_state(current)
+
+        return {
+            "valid": True,
+            "total_entries": index,
+            "message": f"All {index} entries verified successfully",
+        }
+
+    @staticmethod
+    def _error(total: int, i: int, message: str) -> dict[str, Any]:
+        return {
+            "valid": False,
+            "total_entries": total,
+            "first_error_index": i,
+            "error_message": message,
+        }
+
+    def _verify_file(
+        self, path: str, offset: int, prev_hash: str | None, index: int
+    ) -> dict[str, Any]:
+        """Check complete lines from offset on; returns the new hash/entries/offset or an error."""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            raw_lines = f.read().split(b"\n")
+        # The last element is a partial line (an append in progress) or b""
+        partial = raw_lines.pop()
+        lines = [raw.decode("utf-8").strip() for raw in raw_lines]
+        total = index + sum(1 for line in lines if line)
+        consumed = offset
+        for raw, line in zip(raw_lines, lines, strict=True):
+            consumed += len(raw) + 1
+            if not line:
+                continue
+            i = index
+            try:
+                entry = json.loads(line)
+
+                # Check prev_hash matches chain
+                if entry.get("prev_hash") != prev_hash:
+                    return self._error(
+                        total,
+                        i,
+                        f"Hash chain broken at entry {i}: expected prev_hash={prev_hash}, got={entry.get('prev_hash')}",
+                    )
+
+                # Verify entry hash
+                stored_hash = entry.get("hash")
+                if not stored_hash:
+                    return self._error(total, i, f"Entry {i} missing hash field")
+
+                # Recompute hash (without the hash field itself)
+                computed_hash = _entry_hash({k: v for k, v in entry.items() if k != "hash"})
+                if computed_hash != stored_hash:
+                    return self._error(
+                        total,
+                        i,
+                        f"Entry {i} hash mismatch: computed={computed_hash[:16]}..., stored={stored_hash[:16]}...",
+                    )
+
+                prev_hash = stored_hash
+                index += 1
+            except json.JSONDecodeError as e:
+                return self._error(total, i, f"Entry {i} invalid JSON: {e}")
+            except Exception as e:
+                return self._error(total, i, f"Entry {i} verification error: {e}")
+        del partial
+        return {"hash": prev_hash, "entries": index, "offset": consumed}
+
+
+_logs: dict[str, AuditLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_audit_log(file: str = "data/audit/ops.jsonl") -> AuditLog:
+    """Process-wide AuditLog for a path (keyed by absolute path)."""
+    key = os.path.abspath(file)
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = AuditLog(file)
+        return log
+
+
 def read_last_hash(file: str = "data/audit/ops.jsonl") -> str | None:
     """
     Read the hash of the last entry in the audit log.
@@ -39,25 +397,11 @@ def read_last_hash(file: str = "data/audit/ops.jsonl") -> str | None:
     Returns:
         Hash string of last entry, or None if file empty/doesn't exist
     """
-    if not os.path.exists(file):
-        return None
-
     try:
-        with open(file) as f:
-            lines = f.readlines()
-            if not lines:
-                return None
-
-            # Parse last line
-            last_line = lines[-1].strip()
-            if last_line:
-                entry = json.loads(last_line)
-                return entry.get("hash")
+        return get_audit_log(file).tip()
     except Exception:
         return None
 
-    return None
-
 
 def append_event(event: dict[str, Any], file: str = "data/audit/ops.jsonl") -> str:
     """
@@ -70,38 +414,17 @@ def append_event(event: dict[str, Any], file: str = "data/audit/ops.jsonl") -> s
     Returns:
         Hash of the appended entry
     """
-    # Ensure directory exists
-    ensure_audit_dir(os.path.dirname(file))
-
-    # Get last hash for chain
-    prev_hash = read_last_hash(file)
-
-    # Build payload
-    payload = {"ts": datetime.now(UTC).isoformat(), "event": event, "prev_hash": prev_hash}
-
-    # Serialize payload (deterministic - sorted keys, no spaces)
-    payload_str = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return get_audit_log(file).append(event)
 
-    # Compute hash
-    entry_hash = hashlib.sha256(payload_str.encode("utf-8")).hexdigest()
 
-    # Add hash to payload
-    payload["hash"] = entry_hash
-
-    # Write to file (append mode)
-    with open(file, "a") as f:
-        f.write(json.dumps(payload, separators=(",", ":"), sort_keys=True) + "\n")
-        f.flush()
-
-    return entry_hash
-
-
-def verify_chain(file: str = "data/audit/ops.jsonl") -> dict[str, Any]:
+def verify_chain(file: str = "data/audit/ops.jsonl", incremental: bool = False) -> dict[str, Any]:
     """
-    Verify integrity of the entire audit log hash chain.
+    Verify integrity of the audit log hash chain (sealed segments + active file).
 
     Args:
         file: Path to audit log file
+        incremental: Only verify entries appended since the last successful
+            verification (recorded in the sidecar)
 
     Returns:
         Dict with verification results:
@@ -110,73 +433,4 @@ def verify_chain(file: str = "data/audit/ops.jsonl") -> dict[str, Any]:
         - first_error_index: Optional[int]
         - error_message: Optional[str]
     """
-    if not os.path.exists(file):
-        return {"valid": True, "total_entries": 0, "message": "No audit log file exists yet"}
-
-    with open(file) as f:
-        lines = [line.strip() for line in f if line.strip()]
-
-    if not lines:
-        return {"valid": True, "total_entries": 0, "message": "Audit log is empty"}
-
-    prev_hash_expected = None
-
-    for i, line in enumerate(lines):
-        try:
-            entry = json.loads(line)
-
-            # Check prev_hash matches chain
-            if entry.get("prev_hash") != prev_hash_expected:
-                return {
-                    "valid": False,
-                    "total_entries": len(lines),
-                    "first_error_index": i,
-                    "error_message": f"Hash chain broken at entry {i}: expected prev_hash={prev_hash_expected}, got={entry.get('prev_hash')}",
-                }
-
-            # Verify entry hash
-            stored_hash = entry.get("hash")
-            if not stored_hash:
-                return {
-                    "valid": False,
-                    "total_entries": len(lines),
-                    "first_error_index": i,
-                    "error_message": f"Entry {i} missing hash field",
-                }
-
-            # Recompute hash (without the hash field itself)
-            payload_without_hash = {k: v for k, v in entry.items() if k != "hash"}
-            payload_str = json.dumps(payload_without_hash, separators=(",", ":"), sort_keys=True)
-            computed_hash = hashlib.sha256(payload_str.encode("utf-8")).hexdigest()
-
-            if computed_hash != stored_hash:
-                return {
-                    "valid": False,
-                    "total_entries": len(lines),
-                    "first_error_index": i,
-                    "error_message": f"Entry {i} hash mismatch: computed={computed_hash[:16]}..., stored={stored_hash[:16]}...",
-                }
-
-            # Update expected prev_hash for next iteration
-            prev_hash_expected = stored_hash
-
-        except json.JSONDecodeError as e:
-            return {
-                "valid": False,
-                "total_entries": len(lines),
-                "first_error_index": i,
-                "error_message": f"Entry {i} invalid JSON: {e}",
-            }
-        except Exception as e:
-            return {
-                "valid": False,
-                "total_entries": len(lines),
-                "first_error_index": i,
-                "error_message": f"Entry {i} verification error: {e}",
-            }
-
-    return {
-        "valid": True,
-        "total_entries": len(lines),
-        "message": f"All {len(lines)} entries verified successfully",
-    }
+    return get_audit_log(file).verify(incremental=incremental)
@@ -3,7 +3,9 @@
 Audit log verifier: checks integrity of hash chain in ops.jsonl.
 
 Usage:
-    python audit_verify.py [path/to/ops.jsonl]
+    python audit_verify.py [path/to/ops.jsonl] [--incremental]
+
+--incremental only checks entries appended since the last successful run.
 
 Returns exit code 0 if valid, 1 if tampered/invalid.
 """
@@ -19,8 +21,10 @@ from pods.customer_ops.audit import verify_chain
 
 def main():
     # Get file path from args or use default
-    if len(sys.argv) > 1:
-        audit_file = sys.argv[1]
+    args = [a for a in sys.argv[1:] if a != "--incremental"]
+    incremental = "--incremental" in sys.argv[1:]
+    if args:
+        audit_file = args[0]
     else:
         audit_file = "data/audit/ops.jsonl"
 
@@ -30,7 +34,7 @@ def main():
     print(f"\nFile: {audit_file}\n")
 
     # Verify chain
-    result = verify_chain(audit_file)
+    result = verify_chain(audit_file, incremental=incremental)
 
     # Print results
     print(f"Total Entries: {result.get('total_entries', 0)}")
@@ -2,104 +2,406 @@
 DuckDB + VSS vector store for scalable semantic search.
 
 Provides:
-- get_conn() - Get/create DuckDB connection with VSS extension
+- get_conn() - Cursor on the shared DuckDB connection (VSS loaded, schema ready)
 - upsert_chunks() - Insert or replace chunks with embeddings
 - query_embeddings() - Semantic search with cosine similarity
+
+Each database file gets one long-lived connection, bootstrapped once per
+process (VSS extension, embedding dimension probe, DDL). Every thread then
+works through its own cursor on that connection. upsert_chunks() stages a
+whole batch as columnar NumPy arrays (Arrow when pyarrow is installed) and
+replaces it with a single set-based DELETE + INSERT ... SELECT.
+
+Lexical search uses a BM25 inverted index kept next to the chunks:
+lex_postings holds (term, chunk, tf, doc length) rows keyed by
+"<tenant>\x1f<term>", lex_docs the indexed chunks, and lex_stats the
+per-tenant document count and total length. upsert_chunks() maintains all
+three incrementally. A query looks up one index key per query term, so it
+reads only the postings of those terms instead of scanning every chunk.
 """
 
 import json
+import logging
 import os
+import re
+import threading
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any
 
 import duckdb
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: faster staging for large batches
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "data/knowledge.duckdb"
+
+# BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+_TOKEN_RE = re.compile(r"\w+")
+# Separates the tenant partition from the term in lex_postings.term_key
+_KEY_SEP = "\x1f"
+
+
+def _db_path() -> str:
+    return os.getenv("DUCKDB_PATH", DEFAULT_DB_PATH)
+
+
+def _load_vss(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Load the VSS extension, installing it first if needed."""
+    try:
+        conn.execute("LOAD vss;")
+        return True
+    except duckdb.Error:
+        pass
+    try:
+        conn.execute("INSTALL vss;")
+        conn.execute("LOAD vss;")
+        return True
+    except duckdb.Error as e:
+        # array_cosine_distance is built in; only the HNSW index needs VSS
+        logger.warning("DuckDB VSS extension unavailable, using exact search: %s", e)
+        return False
+
+
+def _existing_embedding_dim(conn: duckdb.DuckDBPyConnection) -> int | None:
+    """Dimension of chunks.embedding if the table exists (from its declared type)."""
+    row = conn.execute(
+        """
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'chunks' AND column_name = 'embedding'
+        """
+    ).fetchone()
+    match = re.search(r"\[(\d+)\]", row[0]) if row else None
+    return int(match.group(1)) if match else None
+
+
+class DuckDBManager:
+    """One long-lived DuckDB connection per file, with a cursor per thread."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.embedding_dim: int | None = None
+        self.vss_loaded = False
+        self._conn: duckdb.DuckDBPyConnection | None = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def connection(self, embedding_dim: int | None = None) -> duckdb.DuckDBPyConnection:
+        """The shared connection, opened and bootstrapped on first use."""
+        if self._conn is not None and not os.path.exists(self.db_path):
+            # File removed under us (reset/tests): start over on a fresh file
+            self.close()
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self._bootstrap(embedding_dim)
+        return self._conn
+
+    def cursor(self, embedding_dim: int | None = None) -> duckdb.DuckDBPyConnection:
+        """This thread's cursor (DuckDB connections must not be shared across threads)."""
+        conn = self.connection(embedding_dim)
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.cursor = conn.cursor()
+            local.generation = self._generation
+        return local.cursor
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._generation += 1
+
+    def _bootstrap(self, embedding_dim: int | None) -> duckdb.DuckDBPyConnection:
+        # Ensure parent directory exists
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = duckdb.connect(self.db_path)
+        self.vss_loaded = _load_vss(conn)
+
+        # The existing table's dimension wins; otherwise caller, env, default
+        embedding_dim = (
+            _existing_embedding_dim(conn) or embedding_dim or int(os.getenv("EMBEDDING_DIM", "768"))
+        )
+
+        # Create chunks table if not exists
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS chunks(
+                id TEXT PRIMARY KEY,
+                tenant_id TEXT,
+                content TEXT,
+                metadata JSON,
+                embedding FLOAT[{embedding_dim}]
+            );
+        """)
+
+        # Create VSS index if not exists (cosine similarity)
+        if self.vss_loaded:
+            try:
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS chunks_vss
+                    ON chunks USING HNSW(embedding)
+                    WITH (metric='cosine');
+                """)
+            except Exception:
+                # Index might already exist, ignore error
+                pass
+
+        # Create API keys table if not exists
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_keys(
+                key TEXT PRIMARY KEY,
+                tenant_id TEXT,
+                role TEXT,
+                name TEXT,
+                created_at TIMESTAMP DEFAULT current_timestamp,
+                enabled BOOLEAN DEFAULT TRUE,
+                rpm_limit INTEGER,
+                daily_quota INTEGER,
+                daily_count INTEGER DEFAULT 0,
+                daily_reset DATE DEFAULT current_date
+            );
+        """)
+
+        # BM25 inverted index (per-tenant partitions, '' = no tenant)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lex_postings(
+                term_key TEXT,
+                chunk_id TEXT,
+                tf INTEGER,
+                doc_len INTEGER
+            );
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS lex_postings_term ON lex_postings(term_key);")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lex_docs(
+                chunk_id TEXT,
+                partition TEXT,
+                doc_len INTEGER
+            );
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lex_stats(
+                partition TEXT PRIMARY KEY,
+                n_docs BIGINT,
+                total_len BIGINT
+            );
+        """)
+        if not conn.execute("SELECT 1 FROM lex_docs LIMIT 1;").fetchone():
+            _rebuild_lexical_index(conn)
+
+        self.embedding_dim = embedding_dim
+        return conn
+
+
+_managers: dict[str, DuckDBManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str | None = None) -> DuckDBManager:
+    """Process-wide manager for a DuckDB file (DUCKDB_PATH by default)."""
+    key = os.path.abspath(db_path or _db_path())
+    manager = _managers.get(key)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.setdefault(key, DuckDBManager(key))
+    return manager
+
+
+def close_all() -> None:
+    """Close every managed connection (shutdown, tests)."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.close()
+
+
+def _cursor(embedding_dim: int | None = None) -> duckdb.DuckDBPyConnection:
+    return get_manager().cursor(embedding_dim)
 
 
 def get_conn(
-    db_path: str = "data/knowledge.duckdb", embedding_dim: int | None = None
+    db_path: str | None = None, embedding_dim: int | None = None
 ) -> duckdb.DuckDBPyConnection:
     """
-    Get or create DuckDB connection with VSS extension loaded.
+    Get a cursor on the shared DuckDB connection (VSS loaded, schema created).
 
     Args:
-        db_path: Path to DuckDB file (default: data/knowledge.duckdb)
-        embedding_dim: Embedding dimension (auto-detected if None)
+        db_path: Path to DuckDB file (default: DUCKDB_PATH or data/knowledge.duckdb)
+        embedding_dim: Embedding dimension for a new chunks table (auto-detected if None)
 
     Returns:
-        DuckDB connection with VSS extension loaded
+        A new cursor; closing it leaves the shared connection open
     """
-    # Ensure parent directory exists
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    return get_manager(db_path).connection(embedding_dim).cursor()
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, as indexed and queried by the BM25 index."""
+    return _TOKEN_RE.findall(text.lower())
 
-    # Connect to DuckDB
-    conn = duckdb.connect(db_path)
 
-    # Install and load VSS extension
-    conn.execute("INSTALL vss;")
-    conn.execute("LOAD vss;")
+def _partition(tenant_id: str | None) -> str:
+    return tenant_id or ""
 
-    # Detect existing embedding dimension or use default
-    if embedding_dim is None:
-        # Try to detect from existing table
+
+def _index_lexical(conn: duckdb.DuckDBPyConnection, docs: list[tuple[str, str, str]]) -> None:
+    """
+    Replace the postings of docs [(chunk_id, partition, content)].
+
+    Old postings for the same chunk ids are removed first, and lex_stats is
+    adjusted by the net change per partition. Run inside a transaction.
+    """
+    deltas: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+    conn.register("lex_staged_ids", {"chunk_id": np.array([d[0] for d in docs], dtype=str)})
+    try:
+        removed = conn.execute("""
+            SELECT d.partition, COUNT(*), SUM(d.doc_len)
+            FROM lex_docs d JOIN lex_staged_ids s USING (chunk_id)
+            GROUP BY d.partition;
+        """).fetchall()
+        conn.execute(
+            "DELETE FROM lex_postings USING lex_staged_ids s WHERE lex_postings.chunk_id = s.chunk_id;"
+        )
+        conn.execute(
+            "DELETE FROM lex_docs USING lex_staged_ids s WHERE lex_docs.chunk_id = s.chunk_id;"
+        )
+    finally:
+        conn.unregister("lex_staged_ids")
+    for partition, n_docs, total_len in removed:
+        deltas[partition][0] -= n_docs
+        deltas[partition][1] -= total_len
+
+    postings: dict[str, list] = {"term_key": [], "chunk_id": [], "tf": [], "doc_len": []}
+    indexed: dict[str, list] = {"chunk_id": [], "partition": [], "doc_len": []}
+    for chunk_id, partition, content in docs:
+        counts = Counter(tokenize(content))
+        if not counts:
+            continue
+        doc_len = sum(counts.values())
+        for term, tf in counts.items():
+            postings["term_key"].append(f"{partition}{_KEY_SEP}{term}")
+            postings["chunk_id"].append(chunk_id)
+            postings["tf"].append(tf)
+            postings["doc_len"].append(doc_len)
+        indexed["chunk_id"].append(chunk_id)
+        indexed["partition"].append(partition)
+        indexed["doc_len"].append(doc_len)
+        deltas[partition][0] += 1
+        deltas[partition][1] += doc_len
+
+    if indexed["chunk_id"]:
+        conn.register(
+            "lex_staged_postings",
+            {
+                "term_key": np.array(postings["term_key"], dtype=str),
+                "chunk_id": np.array(postings["chunk_id"], dtype=str),
+                "tf": np.array(postings["tf"], dtype=np.int32),
+                "doc_len": np.array(postings["doc_len"], dtype=np.int32),
+            },
+        )
+        conn.register(
+            "lex_staged_docs",
+            {
+                "chunk_id": np.array(indexed["chunk_id"], dtype=str),
+                "partition": np.array(indexed["partition"], dtype=str),
+                "doc_len": np.array(indexed["doc_len"], dtype=np.int32),
+            },
+        )
         try:
-            result = conn.execute("SELECT COUNT(*) as cnt FROM chunks LIMIT 1;").fetchone()
-            # Table exists, get dimension from first row
-            first_row = conn.execute("SELECT embedding FROM chunks LIMIT 1;").fetchone()
-            if first_row and first_row[0]:
-                embedding_dim = len(first_row[0])
-            else:
-                # Table exists but empty, use environment variable or default
-                embedding_dim = int(os.getenv("EMBEDDING_DIM", "768"))
-        except:
-            # Table doesn't exist yet, use environment variable or default
-            embedding_dim = int(os.getenv("EMBEDDING_DIM", "768"))
-
-    # Create chunks table if not exists
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS chunks(
-            id TEXT PRIMARY KEY,
-            tenant_id TEXT,
-            content TEXT,
-            metadata JSON,
-            embedding FLOAT[{embedding_dim}]
-        );
-    """)
-
-    # Create VSS index if not exists (cosine similarity)
+            conn.execute(
+                "INSERT INTO lex_postings SELECT term_key, chunk_id, tf, doc_len FROM lex_staged_postings;"
+            )
+            conn.execute(
+                "INSERT INTO lex_docs SELECT chunk_id, partition, doc_len FROM lex_staged_docs;"
+            )
+        finally:
+            conn.unregister("lex_staged_postings")
+            conn.unregister("lex_staged_docs")
+
+    for partition, (n_docs, total_len) in deltas.items():
+        if n_docs or total_len:
+            conn.execute(
+                """
+                INSERT INTO lex_stats (partition, n_docs, total_len) VALUES (?, ?, ?)
+                ON CONFLICT (partition) DO UPDATE SET
+                    n_docs = lex_stats.n_docs + excluded.n_docs,
+                    total_len = lex_stats.total_len + excluded.total_len;
+            """,
+                [partition, n_docs, total_len],
+            )
+
+
+def _rebuild_lexical_index(conn: duckdb.DuckDBPyConnection) -> None:
+    """Index every chunk from scratch (new index on an existing knowledge base)."""
+    rows = conn.execute("SELECT id, tenant_id, content FROM chunks;").fetchall()
+    if not rows:
+        return
+    # Cleared in its own commit: lex_stats keys are re-inserted below
+    conn.execute("DELETE FROM lex_postings;")
+    conn.execute("DELETE FROM lex_docs;")
+    conn.execute("DELETE FROM lex_stats;")
+    conn.execute("BEGIN TRANSACTION;")
     try:
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS chunks_vss
-            ON chunks USING HNSW(embedding)
-            WITH (metric='cosine');
-        """)
+        _index_lexical(conn, [(r[0], _partition(r[1]), r[2] or "") for r in rows])
+        conn.execute("COMMIT;")
     except Exception:
-        # Index might already exist, ignore error
-        pass
+        conn.execute("ROLLBACK;")
+        raise
+    logger.info("Built BM25 lexical index for %d chunks", len(rows))
 
-    # Create API keys table if not exists
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS api_keys(
-            key TEXT PRIMARY KEY,
-            tenant_id TEXT,
-            role TEXT,
-            name TEXT,
-            created_at TIMESTAMP DEFAULT current_timestamp,
-            enabled BOOLEAN DEFAULT TRUE,
-            rpm_limit INTEGER,
-            daily_quota INTEGER,
-            daily_count INTEGER DEFAULT 0,
-            daily_reset DATE DEFAULT current_date
-        );
-    """)
-
-    return conn
+
+def _stage_chunks(
+    rows: list[dict[str, Any]], metadata: dict[str, Any], embedding_dim: int
+) -> dict[str, Any]:
+    """Columnar staging tables for a batch of chunks with distinct ids."""
+    n = len(rows)
+
+    embeddings = np.asarray([chunk.get("embedding", []) for chunk in rows], dtype=np.float32)
+    if embeddings.shape != (n, embedding_dim):
+        raise ValueError(
+            f"Expected {embedding_dim}-dim embeddings, got array of shape {embeddings.shape}"
+        )
+
+    columns = {
+        "row": np.arange(n),
+        "id": np.array([str(chunk["id"]) for chunk in rows], dtype=str),
+        "content": np.array([chunk.get("content") or "" for chunk in rows], dtype=str),
+        # Merge metadata per-chunk
+        "metadata": np.array(
+            [json.dumps({**metadata, **chunk.get("metadata", {})}) for chunk in rows], dtype=str
+        ),
+    }
+    if pa is not None:
+        columns["embedding"] = pa.FixedSizeListArray.from_arrays(
+            pa.array(embeddings.reshape(-1)), embedding_dim
+        )
+        return {"staged_chunks": pa.table(columns)}
+    # Without Arrow, vectors go in flattened and are regrouped in SQL
+    vectors = {
+        "row": np.repeat(np.arange(n), embedding_dim),
+        "pos": np.tile(np.arange(embedding_dim), n),
+        "v": embeddings.reshape(-1),
+    }
+    return {"staged_chunks": columns, "staged_vectors": vectors}
 
 
 def upsert_chunks(
     chunks: list[dict[str, Any]], metadata: dict[str, Any], tenant_id: str | None = None
 ) -> int:
     """
-    Insert or replace chunks with embeddings into DuckDB.
+    Insert or replace chunks with embeddings into DuckDB, and update their
+    BM25 postings.
 
     Args:
         chunks: List of dicts with {id, content, embedding}
@@ -112,37 +414,56 @@ def upsert_chunks(
     if not chunks:
         return 0
 
-    # Get connection from environment or default
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-
-    # Detect embedding dimension from first chunk
-    embedding_dim = len(chunks[0].get("embedding", [])) if chunks else None
-    conn = get_conn(db_path, embedding_dim=embedding_dim)
+    # Detect embedding dimension from first chunk (used if the table is new)
+    manager = get_manager()
+    conn = manager.cursor(embedding_dim=len(chunks[0].get("embedding", [])) or None)
+    embedding_dim = manager.embedding_dim
+    # Later duplicates of an id win
+    latest = {chunk.get("id"): chunk for chunk in chunks}
+    if None in latest:
+        raise ValueError("Every chunk needs an id")
+    rows = list(latest.values())
+    staged = _stage_chunks(rows, metadata, embedding_dim)
+    for name, data in staged.items():
+        conn.register(name, data)
+
+    if "staged_vectors" not in staged:
+        select = "SELECT id, ?, content, metadata, embedding FROM staged_chunks"
+    else:
+        select = f"""
+            SELECT c.id, ?, c.content, c.metadata, v.embedding
+            FROM staged_chunks c
+            JOIN (
+                SELECT row, list(v ORDER BY pos)::FLOAT[{embedding_dim}] AS embedding
+                FROM staged_vectors
+                GROUP BY row
+            ) v USING (row)
+        """
 
+    # DuckDB supports neither INSERT OR REPLACE nor UPDATE on array columns,
+    # and its ART index rejects re-inserting a key deleted in the same
+    # transaction, so the batch is one committed DELETE ... USING followed by
+    # one INSERT ... SELECT (the per-chunk DELETE + INSERT pattern, set-based),
+    # committed together with the postings update
     try:
-        # Prepare rows for insertion
-        for chunk in chunks:
-            chunk_id = chunk.get("id")
-            content = chunk.get("content", "")
-            embedding = chunk.get("embedding", [])
-
-            # Merge metadata per-chunk
-            chunk_metadata = {**metadata, **chunk.get("metadata", {})}
-
-            # DuckDB doesn't support INSERT OR REPLACE with array types
-            # Use DELETE + INSERT pattern instead
-            conn.execute("DELETE FROM chunks WHERE id = ?;", [chunk_id])
+        conn.execute("DELETE FROM chunks USING staged_chunks s WHERE chunks.id = s.id;")
+        conn.execute("BEGIN TRANSACTION;")
+        try:
             conn.execute(
-                """
-                INSERT INTO chunks (id, tenant_id, content, metadata, embedding)
-                VALUES (?, ?, ?, ?, ?);
-            """,
-                [chunk_id, tenant_id, content, json.dumps(chunk_metadata), embedding],
+                f"INSERT INTO chunks (id, tenant_id, content, metadata, embedding) {select};",
+                [tenant_id],
             )
-
-        return len(chunks)
+            partition = _partition(tenant_id)
+            _index_lexical(conn, [(str(c["id"]), partition, c.get("content") or "") for c in rows])
+            conn.execute("COMMIT;")
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
     finally:
-        conn.close()
+        for name in staged:
+            conn.unregister(name)
+
+    return len(rows)
 
 
 def query_embeddings(
@@ -159,130 +480,147 @@ def query_embeddings(
     Returns:
         List of dicts with {id, content, metadata, distance}
     """
-    # Get connection from environment or default
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-
     # Detect embedding dimension from query vector
     embedding_dim = len(query_vec)
-    conn = get_conn(db_path, embedding_dim=embedding_dim)
+    conn = _cursor(embedding_dim=embedding_dim)
 
-    try:
-        # Build query with optional tenant filter (dynamic embedding dimension)
-        if tenant_id is None:
-            result = conn.execute(
-                f"""
-                SELECT id, content, metadata, array_cosine_distance(embedding, ?::FLOAT[{embedding_dim}]) AS distance
-                FROM chunks
-                WHERE tenant_id IS NULL
-                ORDER BY distance
-                LIMIT ?;
-            """,
-                [query_vec, top_k],
-            ).fetchall()
-        else:
-            result = conn.execute(
-                f"""
-                SELECT id, content, metadata, array_cosine_distance(embedding, ?::FLOAT[{embedding_dim}]) AS distance
-                FROM chunks
-                WHERE tenant_id = ?
-                ORDER BY distance
-                LIMIT ?;
-            """,
-                [query_vec, tenant_id, top_k],
-            ).fetchall()
-
-        # Convert to list of dicts
-        rows = []
-        for row in result:
-            rows.append(
-                {
-                    "id": row[0],
-                    "content": row[1],
-                    "metadata": json.loads(row[2]) if row[2] else {},
-                    "distance": float(row[3]),
-                }
-            )
+    # Build query with optional tenant filter (dynamic embedding dimension)
+    if tenant_id is None:
+        result = conn.execute(
+            f"""
+            SELECT id, content, metadata, array_cosine_distance(embedding, ?::FLOAT[{embedding_dim}]) AS distance
+            FROM chunks
+            WHERE tenant_id IS NULL
+            ORDER BY distance
+            LIMIT ?;
+        """,
+            [query_vec, top_k],
+        ).fetchall()
+    else:
+        result = conn.execute(
+            f"""
+            SELECT id, content, metadata, array_cosine_distance(embedding, ?::FLOAT[{embedding_dim}]) AS distance
+            FROM chunks
+            WHERE tenant_id = ?
+            ORDER BY distance
+            LIMIT ?;
+        """,
+            [query_vec, tenant_id, top_k],
+        ).fetchall()
 
-        return rows
-    finally:
-        conn.close()
+    # Convert to list of dicts
+    rows = []
+    for row in result:
+        rows.append(
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]) if row[2] else {},
+                "distance": float(row[3]),
+            }
+        )
+
+    return rows
 
 
 def query_lexical(
     query: str, tenant_id: str | None = None, top_k: int = 20
 ) -> list[dict[str, Any]]:
     """
-    Lexical/keyword search using LIKE queries on content.
-    Tokenizes query and counts matches for BM25-style scoring.
+    Lexical/keyword search scored with BM25 over the inverted index.
 
     Args:
-        query: Search query text (tokenized by whitespace)
-        tenant_id: Optional tenant filter (None = no filter)
+        query: Search query text (tokenized like indexed content)
+        tenant_id: Optional tenant filter (None = chunks without a tenant)
         top_k: Maximum number of results to return
 
     Returns:
         List of dicts with {id, content, metadata, score_lex}
-        where score_lex is the number of matched tokens
+        where score_lex is the BM25 score
     """
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    conn = _cursor()
+
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    partition = _partition(tenant_id)
+    stats = conn.execute(
+        "SELECT n_docs, total_len FROM lex_stats WHERE partition = ?;", [partition]
+    ).fetchone()
+    if not stats or stats[0] <= 0:
+        return []
+    n_docs, total_len = stats
+    avg_len = total_len / n_docs
+
+    # One equality lookup per term so each is served by the lex_postings_term
+    # index (an IN list would scan the table)
+    lookups = " UNION ALL ".join(
+        ["SELECT term_key, chunk_id, tf, doc_len FROM lex_postings WHERE term_key = ?"] * len(terms)
+    )
+    # Corpus statistics and BM25 parameters are numbers computed here, so they
+    # are inlined; only the term keys and limit are bound
+    k1, b = float(BM25_K1), float(BM25_B)
+    scored = conn.execute(
+        f"""
+        WITH postings AS ({lookups}),
+        weighted AS (
+            SELECT chunk_id, tf, doc_len, COUNT(*) OVER (PARTITION BY term_key) AS df
+            FROM postings
+        )
+        SELECT chunk_id,
+               SUM(
+                   ln(1 + ({float(n_docs)} - df + 0.5) / (df + 0.5))
+                   * tf * ({k1} + 1)
+                   / (tf + {k1} * (1 - {b} + {b} * doc_len / {float(avg_len)}))
+               ) AS score
+        FROM weighted
+        GROUP BY chunk_id
+        ORDER BY score DESC, chunk_id
+        LIMIT ?;
+    """,
+        [f"{partition}{_KEY_SEP}{term}" for term in terms] + [top_k],
+    ).fetchall()
+    if not scored:
+        return []
+
+    # Fetch the winning chunks by primary key
+    fetch = " UNION ALL ".join(
+        ["SELECT id, content, metadata FROM chunks WHERE id = ?"] * len(scored)
+    )
+    chunks = {row[0]: row for row in conn.execute(fetch, [row[0] for row in scored]).fetchall()}
+
+    # Convert to list of dicts
+    rows = []
+    for chunk_id, score in scored:
+        row = chunks.get(chunk_id)
+        if row is None:
+            continue
+        rows.append(
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]) if row[2] else {},
+                "score_lex": float(score),
+            }
+        )
 
-    try:
-        # Tokenize query (simple whitespace split, lowercase)
-        tokens = [t.strip().lower() for t in query.split() if t.strip()]
-        if not tokens:
-            return []
-
-        # Build LIKE clauses for each token
-        # Score = count of matching tokens
-        like_conditions = []
-        for token in tokens:
-            # Escape special LIKE characters
-            escaped = token.replace("%", "\\%").replace("_", "\\_")
-            like_conditions.append(f"LOWER(content) LIKE '%{escaped}%'")
-
-        # Build score expression: sum of CAST(condition AS INTEGER)
-        score_parts = [f"CAST({cond} AS INTEGER)" for cond in like_conditions]
-        score_expr = " + ".join(score_parts)
-
-        # Build WHERE clause: at least one token must match
-        where_clause = " OR ".join(like_conditions)
-
-        # Add tenant filter
-        if tenant_id is not None:
-            where_clause = f"tenant_id = ? AND ({where_clause})"
-        else:
-            where_clause = f"tenant_id IS NULL AND ({where_clause})"
-
-        # Execute query
-        sql = f"""
-            SELECT id, content, metadata, ({score_expr}) AS score_lex
-            FROM chunks
-            WHERE {where_clause}
-            ORDER BY score_lex DESC
-            LIMIT ?;
-        """
+    return rows
 
-        if tenant_id is not None:
-            result = conn.execute(sql, [tenant_id, top_k]).fetchall()
-        else:
-            result = conn.execute(sql, [top_k]).fetchall()
-
-        # Convert to list of dicts
-        rows = []
-        for row in result:
-            rows.append(
-                {
-                    "id": row[0],
-                    "content": row[1],
-                    "metadata": json.loads(row[2]) if row[2] else {},
-                    "score_lex": int(row[3]),
-                }
-            )
 
-        return rows
-    finally:
-        conn.close()
+def get_embeddings(ids: list[str]) -> dict[str, list[float]]:
+    """
+    Stored embedding vectors by chunk id (ids not found are omitted).
+
+    Lets callers such as rerank reuse ingest-time vectors instead of
+    embedding the chunk text again.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i))
+    if not ids:
+        return {}
+    conn = _cursor()
+    fetch = " UNION ALL ".join(["SELECT id, embedding FROM chunks WHERE id = ?"] * len(ids))
+    return {row[0]: list(row[1]) for row in conn.execute(fetch, ids).fetchall()}
 
 
 def recent_ingests(limit: int = 20) -> list[dict[str, Any]]:
@@ -295,76 +633,72 @@ def recent_ingests(limit: int = 20) -> list[dict[str, Any]]:
     Returns:
         List of dicts with document metadata and stats
     """
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    conn = _cursor()
 
-    try:
-        # Aggregate chunks by source document (url or source field)
-        result = conn.execute(
-            """
-            WITH chunk_metadata AS (
-                SELECT
-                    id,
-                    tenant_id,
-                    content,
-                    metadata,
-                    COALESCE(
-                        json_extract_string(metadata, '$.url'),
-                        json_extract_string(metadata, '$.source'),
-                        'unknown'
-                    ) AS doc_key,
-                    json_extract_string(metadata, '$.title') AS title,
-                    json_extract_string(metadata, '$.lang') AS lang,
-                    json_extract_string(metadata, '$.published') AS published,
-                    json_extract_string(metadata, '$.url') AS url,
-                    json_extract_string(metadata, '$.extraction') AS extraction,
-                    COALESCE(
-                        CAST(json_extract(metadata, '$.ingested_at') AS DOUBLE),
-                        0.0
-                    ) AS ingested_at,
-                    LENGTH(content) AS content_len
-                FROM chunks
-            )
+    # Aggregate chunks by source document (url or source field)
+    result = conn.execute(
+        """
+        WITH chunk_metadata AS (
             SELECT
-                doc_key,
-                ANY_VALUE(title) AS title,
-                ANY_VALUE(lang) AS lang,
-                ANY_VALUE(published) AS published,
-                ANY_VALUE(url) AS url,
-                ANY_VALUE(extraction) AS extraction,
-                ANY_VALUE(tenant_id) AS tenant_id,
-                COUNT(*) AS chunks,
-                SUM(content_len) AS total_chars,
-                MAX(ingested_at) AS latest_ingest
-            FROM chunk_metadata
-            GROUP BY doc_key
-            ORDER BY latest_ingest DESC
-            LIMIT ?;
-        """,
-            [limit],
-        ).fetchall()
-
-        # Convert to list of dicts
-        docs = []
-        for row in result:
-            docs.append(
-                {
-                    "doc_key": row[0],
-                    "title": row[1],
-                    "lang": row[2],
-                    "published": row[3],
-                    "url": row[4],
-                    "extraction": row[5],
-                    "tenant_id": row[6],
-                    "chunks": int(row[7]),
-                    "total_chars": int(row[8]),
-                    "ingested_at": float(row[9]) if row[9] else None,
-                }
-            )
+                id,
+                tenant_id,
+                content,
+                metadata,
+                COALESCE(
+                    json_extract_string(metadata, '$.url'),
+                    json_extract_string(metadata, '$.source'),
+                    'unknown'
+                ) AS doc_key,
+                json_extract_string(metadata, '$.title') AS title,
+                json_extract_string(metadata, '$.lang') AS lang,
+                json_extract_string(metadata, '$.published') AS published,
+                json_extract_string(metadata, '$.url') AS url,
+                json_extract_string(metadata, '$.extraction') AS extraction,
+                COALESCE(
+                    CAST(json_extract(metadata, '$.ingested_at') AS DOUBLE),
+                    0.0
+                ) AS ingested_at,
+                LENGTH(content) AS content_len
+            FROM chunks
+        )
+        SELECT
+            doc_key,
+            ANY_VALUE(title) AS title,
+            ANY_VALUE(lang) AS lang,
+            ANY_VALUE(published) AS published,
+            ANY_VALUE(url) AS url,
+            ANY_VALUE(extraction) AS extraction,
+            ANY_VALUE(tenant_id) AS tenant_id,
+            COUNT(*) AS chunks,
+            SUM(content_len) AS total_chars,
+            MAX(ingested_at) AS latest_ingest
+        FROM chunk_metadata
+        GROUP BY doc_key
+        ORDER BY latest_ingest DESC
+        LIMIT ?;
+    """,
+        [limit],
+    ).fetchall()
+
+    # Convert to list of dicts
+    docs = []
+    for row in result:
+        docs.append(
+            {
+                "doc_key": row[0],
+                "title": row[1],
+                "lang": row[2],
+                "published": row[3],
+                "url": row[4],
+                "extraction": row[5],
+                "tenant_id": row[6],
+                "chunks": int(row[7]),
+                "total_chars": int(row[8]),
+                "ingested_at": float(row[9]) if row[9] else None,
+            }
+        )
 
-        return docs
-    finally:
-        conn.close()
+    return docs
 
 
 # ============================================================================
@@ -396,188 +730,145 @@ def upsert_api_key(
     Returns:
         Dict with key details
     """
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
-
-    try:
-        conn.execute(
-            """
-            INSERT INTO api_keys (key, tenant_id, role, name, rpm_limit, daily_quota, enabled)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(key) DO UPDATE SET
-                tenant_id = excluded.tenant_id,
-                role = excluded.role,
-                name = excluded.name,
-                rpm_limit = excluded.rpm_limit,
-                daily_quota = excluded.daily_quota,
-                enabled = excluded.enabled;
-        """,
-            [key, tenant_id, role, name, rpm_limit, daily_quota, enabled],
-        )
+    conn = _cursor()
 
-        return get_api_key(key)
-    finally:
-        conn.close()
+    conn.execute(
+        """
+        INSERT INTO api_keys (key, tenant_id, role, name, rpm_limit, daily_quota, enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            tenant_id = excluded.tenant_id,
+            role = excluded.role,
+            name = excluded.name,
+            rpm_limit = excluded.rpm_limit,
+            daily_quota = excluded.daily_quota,
+            enabled = excluded.enabled;
+    """,
+        [key, tenant_id, role, name, rpm_limit, daily_quota, enabled],
+    )
+
+    return get_api_key(key)
 
 
 def get_api_key(key: str) -> dict[str, Any] | None:
     """Get API key details by key string."""
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    conn = _cursor()
 
-    try:
-        row = conn.execute(
-            """
-            SELECT key, tenant_id, role, name, created_at, enabled,
-                   rpm_limit, daily_quota, daily_count, daily_reset
-            FROM api_keys
-            WHERE key = ?
-        """,
-            [key],
-        ).fetchone()
-
-        if not row:
-            return None
-
-        return {
-            "key": row[0],
-            "tenant_id": row[1],
-            "role": row[2],
-            "name": row[3],
-            "created_at": row[4].isoformat() if row[4] else None,
-            "enabled": bool(row[5]),
-            "rpm_limit": row[6],
-            "daily_quota": row[7],
-            "daily_count": row[8],
-            "daily_reset": row[9].isoformat() if row[9] else None,
-        }
-    finally:
-        conn.close()
+    row = conn.execute(
+        """
+        SELECT key, tenant_id, role, name, created_at, enabled,
+               rpm_limit, daily_quota, daily_count, daily_reset
+        FROM api_keys
+        WHERE key = ?
+    """,
+        [key],
+    ).fetchone()
+
+    if not row:
+        return None
+
+    return {
+        "key": row[0],
+        "tenant_id": row[1],
+        "role": row[2],
+        "name": row[3],
+        "created_at": row[4].isoformat() if row[4] else None,
+        "enabled": bool(row[5]),
+        "rpm_limit": row[6],
+        "daily_quota": row[7],
+        "daily_count": row[8],
+        "daily_reset": row[9].isoformat() if row[9] else None,
+    }
 
 
 def list_api_keys(limit: int = 100) -> list[dict[str, Any]]:
     """List all API keys."""
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
-
-    try:
-        rows = conn.execute(
-            """
-            SELECT key, tenant_id, role, name, created_at, enabled,
-                   rpm_limit, daily_quota, daily_count, daily_reset
-            FROM api_keys
-            ORDER BY created_at DESC
-            LIMIT ?
-        """,
-            [limit],
-        ).fetchall()
+    conn = _cursor()
 
-        keys = []
-        for row in rows:
-            keys.append(
-                {
-                    "key": row[0],
-                    "tenant_id": row[1],
-                    "role": row[2],
-                    "name": row[3],
-                    "created_at": row[4].isoformat() if row[4] else None,
-                    "enabled": bool(row[5]),
-                    "rpm_limit": row[6],
-                    "daily_quota": row[7],
-                    "daily_count": row[8],
-                    "daily_reset": row[9].isoformat() if row[9] else None,
-                }
-            )
+    rows = conn.execute(
+        """
+        SELECT key, tenant_id, role, name, created_at, enabled,
+               rpm_limit, daily_quota, daily_count, daily_reset
+        FROM api_keys
+        ORDER BY created_at DESC
+        LIMIT ?
+    """,
+        [limit],
+    ).fetchall()
+
+    keys = []
+    for row in rows:
+        keys.append(
+            {
+                "key": row[0],
+                "tenant_id": row[1],
+                "role": row[2],
+                "name": row[3],
+                "created_at": row[4].isoformat() if row[4] else None,
+                "enabled": bool(row[5]),
+                "rpm_limit": row[6],
+                "daily_quota": row[7],
+                "daily_count": row[8],
+                "daily_reset": row[9].isoformat() if row[9] else None,
+            }
+        )
 
-        return keys
-    finally:
-        conn.close()
+    return keys
 
 
 def set_api_key_enabled(key: str, enabled: bool) -> bool:
     """Enable or disable an API key."""
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    conn = _cursor()
 
-    try:
-        conn.execute(
-            """
-            UPDATE api_keys SET enabled = ? WHERE key = ?
-        """,
-            [enabled, key],
-        )
-        return True
-    finally:
-        conn.close()
+    conn.execute(
+        """
+        UPDATE api_keys SET enabled = ? WHERE key = ?
+    """,
+        [enabled, key],
+    )
+    return True
 
 
 def delete_api_key(key: str) -> bool:
     """Delete an API key."""
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    conn = _cursor()
 
-    try:
-        conn.execute("DELETE FROM api_keys WHERE key = ?", [key])
-        return True
-    finally:
-        conn.close()
+    conn.execute("DELETE FROM api_keys WHERE key = ?", [key])
+    return True
 
 
-def bump_api_key_counters(key: str) -> tuple[bool, str | None]:
+def add_api_key_counts(counts: dict[tuple[str, str], int]) -> None:
     """
-    Increment API key usage counters and check quotas.
+    Add buffered request counts to api_keys.daily_count in one batch.
 
-    Returns:
-        (ok, reason) - (True, None) if within limits, (False, reason) if exceeded
+    Args:
+        counts: {(key, ISO day): requests} accumulated since the last flush.
+            A day newer than a key's daily_reset starts a fresh count; counts
+            for a day older than daily_reset are dropped.
     """
     import datetime
 
-    db_path = os.getenv("DUCKDB_PATH", "data/knowledge.duckdb")
-    conn = get_conn(db_path)
+    rows = []
+    for (key, day), n in counts.items():
+        if n:
+            d = datetime.date.fromisoformat(day)
+            rows.append([d, n, n, d, key, d])
+    if not rows:
+        return
 
+    conn = _cursor()
+    conn.execute("BEGIN TRANSACTION;")
     try:
-        # Get current state
-        row = conn.execute(
-            """
-            SELECT daily_quota, daily_count, daily_reset
-            FROM api_keys
-            WHERE key = ?
-        """,
-            [key],
-        ).fetchone()
-
-        if not row:
-            return (False, "key_not_found")
-
-        daily_quota, daily_count, daily_reset = row[0], row[1], row[2]
-        today = datetime.date.today()
-
-        # Reset counter if new day
-        if daily_reset != today:
-            conn.execute(
-                """
-                UPDATE api_keys
-                SET daily_count = 0, daily_reset = ?
-                WHERE key = ?
-            """,
-                [today, key],
-            )
-            daily_count = 0
-
-        # Check quota
-        if daily_quota is not None and daily_count >= daily_quota:
-            return (False, "daily_quota_exceeded")
-
-        # Increment counter
-        conn.execute(
+        conn.executemany(
             """
             UPDATE api_keys
-            SET daily_count = daily_count + 1
-            WHERE key = ?
+            SET daily_count = CASE WHEN daily_reset = ? THEN daily_count + ? ELSE ? END,
+                daily_reset = ?
+            WHERE key = ? AND (daily_reset IS NULL OR daily_reset <= ?)
         """,
-            [key],
+            rows,
         )
-
-        return (True, None)
-    finally:
-        conn.close()
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
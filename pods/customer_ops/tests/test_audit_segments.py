@@ -0,0 +1,86 @@
+import json
+import os
+
+from pods.customer_ops.audit import AuditLog
+
+
+def lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_cold_start_links_to_last_line_only(tmp_path):
+    path = str(tmp_path / "ops.jsonl")
+    first = AuditLog(path)
+    hashes = [first.append({"i": i}) for i in range(20)]
+    os.remove(first.sidecar)
+
+    # A fresh engine with no sidecar picks up the tip from the last line
+    assert AuditLog(path).append({"i": 20}) != hashes[-1]
+    assert lines(path)[-1]["prev_hash"] == hashes[-1]
+    assert AuditLog(path).verify()["total_entries"] == 21
+
+
+def test_interleaved_writers_keep_one_chain(tmp_path):
+    path = str(tmp_path / "ops.jsonl")
+    api, worker = AuditLog(path), AuditLog(path)
+    for i in range(5):
+        api.append({"from": "api", "i": i})
+        worker.append({"from": "worker", "i": i})
+
+    result = AuditLog(path).verify()
+    assert result["valid"], result
+    assert result["total_entries"] == 10
+
+
+def test_rotates_into_sealed_segments_with_checkpoints(tmp_path):
+    path = str(tmp_path / "ops.jsonl")
+    log = AuditLog(path, max_segment_bytes=500)
+    for i in range(12):
+        log.append({"type": "ingest", "i": i})
+
+    with open(log.sidecar) as f:
+        segments = json.load(f)["segments"]
+    assert len(segments) >= 2
+    assert all(os.path.exists(tmp_path / seg["file"]) for seg in segments)
+    active = lines(path) if os.path.exists(path) else []
+    assert sum(seg["entries"] for seg in segments) + len(active) == 12
+    assert log.tip() == (active[-1]["hash"] if active else segments[-1]["last_hash"])
+
+    result = AuditLog(path).verify()
+    assert result["valid"], result
+    assert result["total_entries"] == 12
+
+
+def test_sealed_segment_tampering_detected(tmp_path):
+    path = str(tmp_path / "ops.jsonl")
+    log = AuditLog(path, max_segment_bytes=500)
+    for i in range(12):
+        log.append({"i": i})
+    assert log.verify()["valid"]
+
+    with open(log.segment_path(1), "a") as f:
+        f.write("\n")  # chain still links, but the sealed bytes changed
+    result = log.verify()
+    assert not result["valid"]
+    assert "checkpoint mismatch" in result["error_message"]
+
+
+def test_incremental_verify_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / "ops.jsonl")
+    log = AuditLog(path)
+    for i in range(5):
+        log.append({"i": i})
+    assert log.verify()["total_entries"] == 5
+
+    entries = lines(path)
+    entries[0]["event"]["i"] = 9  # same-size tamper of an already verified entry
+    with open(path, "w") as f:
+        f.writelines(json.dumps(e, separators=(",", ":"), sort_keys=True) + "\n" for e in entries)
+    for i in range(5, 15):
+        log.append({"i": i})
+
+    incremental = log.verify(incremental=True)
+    assert incremental["valid"] and incremental["total_entries"] == 15
+    full = log.verify()
+    assert not full["valid"] and full["first_error_index"] == 0
@@ -0,0 +1,94 @@
+import datetime
+
+import fakeredis
+
+from pods.customer_ops.api.auth_cache import AuthState
+
+TODAY = datetime.date.today().isoformat()
+
+
+class _Store:
+    """In-memory stand-in for the api_keys table."""
+
+    def __init__(self, **records):
+        self.records = records
+        self.loads = 0
+        self.flushed: list[dict] = []
+
+    def load(self, key):
+        self.loads += 1
+        return self.records.get(key)
+
+    def flush(self, counts):
+        self.flushed.append(counts)
+
+
+def _workers(store, n=2, client=None):
+    client = client or fakeredis.FakeRedis()
+    return [AuthState(client, loader=store.load, flusher=store.flush) for _ in range(n)]
+
+
+def test_key_records_cached_until_invalidated_in_any_worker():
+    store = _Store(k={"tenant_id": "acme", "enabled": True})
+    a, b = _workers(store)
+    for _ in range(5):
+        assert a.keys.get("k")["tenant_id"] == "acme"
+    assert store.loads == 1
+
+    store.records["k"] = {"tenant_id": "acme", "enabled": False}
+    b.keys.invalidate("k")
+    a.keys.generations.refresh_seconds = 0
+    assert a.keys.get("k")["enabled"] is False
+    assert store.loads == 2
+
+
+def test_daily_quota_shared_across_workers_and_flushed_in_batches():
+    record = {"daily_quota": 5, "daily_count": 2, "daily_reset": TODAY}
+    store = _Store()
+    a, b = _workers(store)
+
+    results = [w.counters.hit("k", record) for w in (a, b, a, b)]
+    assert results == [True, True, True, False]  # seeded with the stored 2
+
+    a.flush()
+    b.flush()
+    a.flush()  # nothing pending
+    assert store.flushed == [{("k", TODAY): 2}, {("k", TODAY): 1}]
+
+
+def test_failed_flush_is_retried():
+    store = _Store()
+    (worker,) = _workers(store, n=1)
+    worker.counters.hit("k", {"daily_quota": None})
+
+    def boom(counts):
+        raise RuntimeError("db locked")
+
+    worker._flusher = boom
+    worker.flush()
+    worker._flusher = store.flush
+    worker.flush()
+    assert store.flushed == [{("k", TODAY): 1}]
+
+
+def test_rpm_limit_holds_across_workers_and_without_redis():
+    a, b = _workers(_Store())
+    allowed = [w.rpm.allow("k", 3) for w in (a, b, a, b)]
+    assert allowed == [True, True, True, False]
+
+    local = AuthState(None, loader=lambda k: None, flusher=lambda c: None)
+    assert [local.rpm.allow("k", 2) for _ in range(3)] == [True, True, False]
+    assert len(local.rpm._local) == 1
+
+
+def test_redis_key_names_do_not_contain_api_keys():
+    client = fakeredis.FakeRedis()
+    (state,) = _workers(_Store(), n=1, client=client)
+    secret = "sk-live-secret"
+    state.counters.hit(secret, {"daily_quota": 10})
+    state.rpm.allow(secret, 10)
+    state.keys.invalidate(secret)
+
+    names = [k.decode() for k in client.keys("*")]
+    assert {n.split(":")[1] for n in names} == {"daily", "rpm", "keygen"}
+    assert not any(secret in n for n in names)
@@ -0,0 +1,153 @@
+import threading
+
+import duckdb
+import pytest
+
+from pods.customer_ops import db_duck
+
+DIM = 8
+
+
+@pytest.fixture
+def duck(tmp_path, monkeypatch):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "knowledge.duckdb"))
+    yield db_duck
+    db_duck.close_all()
+
+
+def vec(i: int) -> list[float]:
+    v = [0.0] * DIM
+    v[i % DIM] = 1.0
+    return v
+
+
+def chunk(i: int, content: str | None = None) -> dict:
+    return {"id": f"c{i}", "content": content or f"chunk {i}", "embedding": vec(i)}
+
+
+def test_schema_bootstrapped_once(duck, monkeypatch):
+    connects = []
+    real_connect = duckdb.connect
+    monkeypatch.setattr(
+        duck.duckdb, "connect", lambda *a, **k: connects.append(a) or real_connect(*a, **k)
+    )
+
+    duck.upsert_chunks([chunk(1)], metadata={})
+    duck.query_embeddings(vec(1), top_k=1)
+    duck.list_api_keys()
+    assert len(connects) == 1
+    assert duck.get_manager().embedding_dim == DIM
+
+
+def test_bulk_upsert_replaces_existing_ids(duck):
+    assert duck.upsert_chunks([chunk(i) for i in range(5)], metadata={"source": "v1"}) == 5
+    # c2 appears twice in the batch: the later copy wins
+    batch = [chunk(2, "dup"), chunk(2, "updated"), chunk(7)]
+    assert duck.upsert_chunks(batch, metadata={"source": "v2"}, tenant_id=None) == 2
+
+    results = duck.query_embeddings(vec(2), top_k=10)
+    assert len(results) == 6
+    top = results[0]
+    assert (top["id"], top["content"], top["metadata"]["source"]) == ("c2", "updated", "v2")
+
+
+def test_dimension_mismatch_rejected(duck):
+    duck.upsert_chunks([chunk(1)], metadata={})
+    with pytest.raises(ValueError):
+        duck.upsert_chunks([{"id": "bad", "content": "x", "embedding": [1.0, 0.0]}], metadata={})
+
+
+def test_get_embeddings_returns_stored_vectors(duck):
+    duck.upsert_chunks([chunk(i) for i in range(3)], metadata={})
+    stored = duck.get_embeddings(["c2", "c0", "missing", "c2"])
+    assert stored == {"c0": vec(0), "c2": vec(2)}
+    assert duck.get_embeddings([]) == {}
+
+
+def test_threads_get_their_own_cursor(duck):
+    duck.upsert_chunks([chunk(i) for i in range(3)], metadata={}, tenant_id="acme")
+    cursors, errors = [], []
+
+    def search():
+        try:
+            cursors.append(duck.get_manager().cursor())
+            assert len(duck.query_embeddings(vec(0), tenant_id="acme", top_k=3)) == 3
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len({id(c) for c in cursors}) == 4
+
+
+def lexical_ids(duck, query, tenant_id=None):
+    return [r["id"] for r in duck.query_lexical(query, tenant_id=tenant_id)]
+
+
+def test_bm25_ranks_rare_terms_and_short_docs_higher(duck):
+    docs = [
+        {"id": "refund", "content": "How do I get a refund for my order", "embedding": vec(0)},
+        {"id": "order", "content": "Track my order status online", "embedding": vec(1)},
+        {
+            "id": "long",
+            "content": "order " + "details about shipping and delivery windows " * 10,
+            "embedding": vec(2),
+        },
+        {"id": "other", "content": "Opening hours and holidays", "embedding": vec(3)},
+    ]
+    duck.upsert_chunks(docs, metadata={}, tenant_id="acme")
+
+    results = duck.query_lexical("refund order", tenant_id="acme")
+    assert [r["id"] for r in results] == ["refund", "order", "long"]
+    assert results[0]["score_lex"] > results[1]["score_lex"] > results[2]["score_lex"] > 0
+
+
+def test_lexical_index_is_partitioned_by_tenant(duck):
+    duck.upsert_chunks([chunk(1, "reset password")], metadata={}, tenant_id="acme")
+    duck.upsert_chunks([chunk(2, "reset password")], metadata={}, tenant_id="globex")
+    duck.upsert_chunks([chunk(3, "reset password")], metadata={})
+
+    assert lexical_ids(duck, "password", "acme") == ["c1"]
+    assert lexical_ids(duck, "password", "globex") == ["c2"]
+    assert lexical_ids(duck, "password") == ["c3"]
+    assert lexical_ids(duck, "password", "initech") == []
+
+
+def test_reupsert_replaces_postings(duck):
+    duck.upsert_chunks([chunk(1, "billing invoice"), chunk(2, "billing")], metadata={})
+    duck.upsert_chunks([chunk(1, "shipping label")], metadata={})
+
+    assert lexical_ids(duck, "invoice") == []
+    assert lexical_ids(duck, "shipping") == ["c1"]
+    conn = duck.get_manager().cursor()
+    assert conn.execute("SELECT n_docs, total_len FROM lex_stats").fetchall() == [(2, 3)]
+
+
+def test_existing_chunks_are_indexed_on_bootstrap(duck):
+    duck.upsert_chunks([chunk(1, "warranty claim"), chunk(2, "claim form")], metadata={})
+    conn = duck.get_manager().cursor()
+    for table in ("lex_postings", "lex_docs", "lex_stats"):
+        conn.execute(f"DELETE FROM {table}")
+    duck.close_all()
+
+    assert lexical_ids(duck, "warranty claim") == ["c1", "c2"]
+
+
+def test_add_api_key_counts_batches_by_day(duck):
+    import datetime
+
+    today = datetime.date.today()
+    yesterday = (today - datetime.timedelta(days=1)).isoformat()
+    duck.upsert_api_key("k1", "acme", "viewer")
+    duck.upsert_api_key("k2", "acme", "viewer")
+
+    duck.add_api_key_counts({("k1", today.isoformat()): 3, ("k2", today.isoformat()): 1})
+    duck.add_api_key_counts({("k1", today.isoformat()): 2, ("k1", yesterday): 7})
+
+    assert duck.get_api_key("k1")["daily_count"] == 5  # yesterday's late count is dropped
+    assert duck.get_api_key("k2")["daily_count"] == 1
+    assert duck.get_api_key("k1")["daily_reset"] == today.isoformat()
@@ -0,0 +1,79 @@
+import asyncio
+
+import fakeredis
+
+from pods.customer_ops.api.embed_cache import CachedEmbedder, LRUVectors, RedisVectors
+from pods.customer_ops.api.embeddings import BaseEmbedder
+
+
+class CountingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_only_misses_reach_the_provider():
+    inner = CountingEmbedder()
+    embedder = CachedEmbedder(inner, "fake", "m")
+
+    assert embedder.embed(["a", "bb", "a"]) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert embedder.embed(["bb", "ccc"]) == [[2.0, 1.0], [3.0, 1.0]]
+    assert asyncio.run(embedder.aembed(["a", "ccc"])) == [[1.0, 1.0], [3.0, 1.0]]
+    assert inner.calls == [["a", "bb"], ["ccc"]]
+
+
+def test_keys_include_provider_and_model():
+    inner = CountingEmbedder()
+    memory = LRUVectors()
+    CachedEmbedder(inner, "fake", "m1", memory=memory).embed(["a"])
+    CachedEmbedder(inner, "fake", "m2", memory=memory).embed(["a"])
+    assert len(inner.calls) == 2
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUVectors(max_entries=2)
+    lru.put_many({"a": [1.0], "b": [2.0]})
+    lru.get_many(["a"])
+    lru.put_many({"c": [3.0]})
+    assert set(lru.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_redis_tier_is_shared_between_processes():
+    server = fakeredis.FakeServer()
+    worker = CachedEmbedder(
+        CountingEmbedder(), "fake", "m", persistent=RedisVectors(fakeredis.FakeRedis(server=server))
+    )
+    worker.embed(["shared text"])
+
+    api_inner = CountingEmbedder()
+    api = CachedEmbedder(
+        api_inner, "fake", "m", persistent=RedisVectors(fakeredis.FakeRedis(server=server))
+    )
+    assert asyncio.run(api.aembed(["shared text"])) == [[11.0, 1.0]]
+    assert api_inner.calls == []
+
+
+def test_redis_errors_fail_open():
+    class Down:
+        def mget(self, keys):
+            raise ConnectionError("down")
+
+        def pipeline(self, transaction=False):
+            raise ConnectionError("down")
+
+    inner = CountingEmbedder()
+    persistent = RedisVectors(Down())
+    embedder = CachedEmbedder(inner, "fake", "m", memory=LRUVectors(0), persistent=persistent)
+    assert embedder.embed(["x"]) == [[1.0, 1.0]]
+    assert embedder.embed(["x"]) == [[1.0, 1.0]]
+    assert len(inner.calls) == 2
+    assert not persistent._available()
+
+
+def test_stored_vectors_roundtrip_as_float32():
+    tier = RedisVectors(fakeredis.FakeRedis())
+    tier.put_many({"k": [0.5, -2.0]})
+    assert tier.get_many(["k", "missing"]) == {"k": [0.5, -2.0]}
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from pods.customer_ops.api.embeddings import OllamaEmbedder, OpenAIEmbedder
+
+
+def mock_client(embedder, handler):
+    embedder._client = httpx.Client(
+        base_url=embedder.base_url, transport=httpx.MockTransport(handler)
+    )
+    return embedder
+
+
+def openai_handler(calls):
+    def handler(request):
+        texts = json.loads(request.content)["input"]
+        calls.append(len(texts))
+        data = [{"index": i, "embedding": [float(t)]} for i, t in enumerate(texts)]
+        return httpx.Response(200, json={"data": list(reversed(data))})
+
+    return handler
+
+
+def test_openai_splits_into_batches_and_keeps_order():
+    calls = []
+    embedder = mock_client(OpenAIEmbedder("m", "k", batch_size=4), openai_handler(calls))
+    texts = [str(i) for i in range(10)]
+
+    assert embedder.embed(texts) == [[float(i)] for i in range(10)]
+    assert sorted(calls) == [2, 4, 4]
+    embedder.close()
+
+
+def test_batches_respect_character_budget():
+    embedder = OpenAIEmbedder("m", "k", batch_size=100, max_batch_chars=10)
+    assert [len(b) for b in embedder._batches(["aaaa"] * 5)] == [2, 2, 1]
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) < 3:
+            return httpx.Response(503)
+        return openai_handler([])(request)
+
+    embedder = mock_client(OpenAIEmbedder("m", "k", retry_backoff=0), handler)
+    assert embedder.embed(["1"]) == [[1.0]]
+    assert len(attempts) == 3
+
+
+def test_client_errors_are_not_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        return httpx.Response(400, json={"error": "bad input"})
+
+    embedder = mock_client(OpenAIEmbedder("m", "k", retry_backoff=0), handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        embedder.embed(["1"])
+    assert len(attempts) == 1
+
+
+def test_ollama_falls_back_to_legacy_endpoint():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/api/embed":
+            return httpx.Response(404)
+        prompt = json.loads(request.content)["prompt"]
+        return httpx.Response(200, json={"embedding": [float(len(prompt))]})
+
+    embedder = mock_client(OllamaEmbedder("m", "http://ollama:11434"), handler)
+    assert embedder.embed(["a", "bb"]) == [[1.0], [2.0]]
+    assert embedder.embed(["ccc"]) == [[3.0]]
+    assert paths == ["/api/embed", "/api/embeddings", "/api/embeddings", "/api/embeddings"]
+
+
+def test_aembed_bounds_inflight_batches():
+    inflight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal inflight, peak
+        inflight += 1
+        peak = max(peak, inflight)
+        await asyncio.sleep(0.02)
+        inflight -= 1
+        texts = json.loads(request.content)["input"]
+        return httpx.Response(200, json={"embeddings": [[float(t)] for t in texts]})
+
+    async def scenario():
+        embedder = OllamaEmbedder("m", "http://ollama:11434", batch_size=2, max_inflight=3)
+        embedder._aclient = httpx.AsyncClient(
+            base_url=embedder.base_url, transport=httpx.MockTransport(handler)
+        )
+        embedder._aclient_loop = asyncio.get_running_loop()
+        vectors = await embedder.aembed([str(i) for i in range(12)])
+        await embedder.aclose()
+        return vectors
+
+    assert asyncio.run(scenario()) == [[float(i)] for i in range(12)]
+    assert peak == 3
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from pods.customer_ops.api import executor
+from pods.customer_ops.api.embeddings import BaseEmbedder, embed_async
+
+
+class SlowEmbedder(BaseEmbedder):
+    def embed(self, texts):
+        time.sleep(0.1)  # blocking I/O, like the http.client embedders
+        return [[float(len(t))] for t in texts]
+
+
+def sample_count(histogram, **labels):
+    for metric in histogram.collect():
+        for s in metric.samples:
+            if s.name.endswith("_count") and all(s.labels.get(k) == v for k, v in labels.items()):
+                return s.value
+    return 0.0
+
+
+def test_run_blocking_records_stage_metrics():
+    before = sample_count(executor.REQUEST_STAGE_SECONDS, stage="unit")
+    waits = sample_count(executor.BLOCKING_QUEUE_WAIT_SECONDS, stage="unit")
+
+    assert asyncio.run(executor.run_blocking("unit", lambda a, b=0: a + b, 2, b=3)) == 5
+    assert sample_count(executor.REQUEST_STAGE_SECONDS, stage="unit") == before + 1
+    assert sample_count(executor.BLOCKING_QUEUE_WAIT_SECONDS, stage="unit") == waits + 1
+
+
+def test_sync_embedder_does_not_stall_event_loop():
+    async def scenario():
+        embedder = SlowEmbedder()
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        vectors = await asyncio.gather(*(embed_async(embedder, ["abc"]) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+        beat.cancel()
+        return vectors, elapsed, ticks
+
+    vectors, elapsed, ticks = asyncio.run(scenario())
+    assert vectors == [[[3.0]]] * 4
+    # Four 100ms embeds overlap on the pool and the loop keeps ticking meanwhile
+    assert elapsed < 0.3
+    assert ticks >= 5
+
+
+def test_embed_async_falls_back_for_plain_embedders():
+    class Plain:
+        def embed(self, texts):
+            return [[1.0] for _ in texts]
+
+    assert asyncio.run(embed_async(Plain(), ["a", "b"])) == [[1.0], [1.0]]
@@ -23,3 +23,79 @@ def test_lead_roundtrip(monkeypatch):
 
     items = lead_store.list_leads(tenant="acme", limit=10)
     assert any(i["id"] == lid for i in items)
+
+
+def _round_trips(client):
+    """Count commands that reach the server (a pipeline counts once)."""
+    calls = {"n": 0}
+    execute = client.execute_command
+
+    def counting(*args, **kwargs):
+        calls["n"] += 1
+        return execute(*args, **kwargs)
+
+    client.execute_command = counting
+    pipeline = client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        run = pipe.execute
+
+        def execute_once(*a, **kw):
+            calls["n"] += 1
+            return run(*a, **kw)
+
+        pipe.execute = execute_once
+        return pipe
+
+    client.pipeline = counting_pipeline
+    return calls
+
+
+def test_list_leads_pages_with_constant_round_trips(monkeypatch):
+    from pods.customer_ops.api import cache
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "get_redis_client", lambda: client)
+    importlib.reload(lead_store)
+
+    ids = [lead_store.create_lead("acme", f"n{i}", "555") for i in range(25)]
+    calls = _round_trips(client)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        before = calls["n"]
+        items, cursor = lead_store.list_leads_page("acme", limit=10, cursor=cursor)
+        assert calls["n"] - before == 2  # one pipelined range read + one MGET
+        seen += [i["id"] for i in items]
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == sorted(ids, key=lambda i: (lead_store._id_millis(i), i), reverse=True)
+    assert lead_store.count_leads("acme") == 25
+
+
+def test_legacy_list_is_migrated_and_outcomes_indexed(monkeypatch):
+    import json
+
+    from pods.customer_ops.api import cache
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "get_redis_client", lambda: client)
+    importlib.reload(lead_store)
+
+    old = "L1700000000000-abcdef"
+    client.set(f"lead:{old}", json.dumps({"id": old, "tenant": "acme", "name": "Old"}))
+    client.lpush("tenant:acme:leads", old)
+    new = lead_store.create_lead("acme", "New", "555")
+
+    assert [i["id"] for i in lead_store.list_leads("acme")] == [new, old]
+    assert not client.exists("tenant:acme:leads")
+
+    lead_store.set_outcome(old, "qualified")
+    lead_store.set_outcome(new, "booked")
+    lead_store.set_outcome(old, "booked")
+    assert {r["lead_id"] for r in lead_store.list_outcomes(outcome="booked")} == {old, new}
+    assert lead_store.list_outcomes(outcome="qualified") == []
+    assert len(lead_store.list_outcomes()) == 3
@@ -0,0 +1,75 @@
+import fakeredis
+
+from pods.customer_ops.api.response_cache import ResponseCache, TenantGenerations
+
+
+def test_lru_bound_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("search", ("a",), {"v": 1}, tenant="acme")
+    cache.put("search", ("b",), {"v": 2}, tenant="acme")
+    assert cache.get("search", ("a",), tenant="acme") == {"v": 1}
+    cache.put("search", ("c",), {"v": 3}, tenant="acme")
+
+    assert len(cache) == 2
+    assert cache.get("search", ("b",), tenant="acme") is None
+    assert cache.get("search", ("a",), tenant="acme") == {"v": 1}
+
+
+def test_byte_bound_and_oversized_payloads():
+    cache = ResponseCache(max_bytes=40)
+    cache.put("answer", ("big",), {"text": "x" * 100})
+    assert len(cache) == 0
+
+    cache.put("answer", ("a",), {"text": "x" * 10})
+    cache.put("answer", ("b",), {"text": "y" * 10})
+    assert cache.get("answer", ("a",)) is None
+    assert cache.get("answer", ("b",)) == {"text": "y" * 10}
+
+
+def test_expired_entries_are_dropped():
+    cache = ResponseCache(ttl_seconds=0)
+    cache.put("search", ("a",), {"v": 1})
+    assert cache.get("search", ("a",)) is None
+    assert len(cache) == 0
+
+
+def test_generation_bump_invalidates_only_that_tenant():
+    cache = ResponseCache()
+    cache.put("search", ("q",), {"v": "acme"}, tenant="acme")
+    cache.put("search", ("q",), {"v": "globex"}, tenant="globex")
+
+    cache.invalidate_tenant("acme")
+    assert cache.get("search", ("q",), tenant="acme") is None
+    assert cache.get("search", ("q",), tenant="globex") == {"v": "globex"}
+
+
+def test_generations_shared_through_redis():
+    server = fakeredis.FakeServer()
+    api = ResponseCache(
+        generations=TenantGenerations(fakeredis.FakeRedis(server=server), refresh_seconds=0)
+    )
+    worker = TenantGenerations(fakeredis.FakeRedis(server=server))
+    api.put("answer", ("q",), {"v": 1}, tenant="acme")
+    assert api.get("answer", ("q",), tenant="acme") == {"v": 1}
+
+    worker.bump("acme")
+    assert api.get("answer", ("q",), tenant="acme") is None
+
+
+def test_put_uses_generation_read_before_retrieval():
+    cache = ResponseCache()
+    cached, generation = cache.lookup("search", ("q",), tenant="acme")
+    assert cached is None
+
+    cache.invalidate_tenant("acme")  # ingest lands while the search runs
+    cache.put("search", ("q",), {"v": "stale"}, tenant="acme", generation=generation)
+    assert cache.get("search", ("q",), tenant="acme") is None
+
+
+def test_remote_read_due_only_when_redis_refresh_needed():
+    assert not TenantGenerations().remote_read_due("acme")
+
+    gens = TenantGenerations(fakeredis.FakeRedis(), refresh_seconds=60)
+    assert gens.remote_read_due("acme")
+    gens.current("acme")
+    assert not gens.remote_read_due("acme")
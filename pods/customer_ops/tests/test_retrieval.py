@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from pods.customer_ops.api.retrieval import HybridRetriever, benchmark
+
+
+class FakeEmbedder:
+    def embed(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+
+def row(doc_id, **scores):
+    return {"id": doc_id, "content": f"text {doc_id}", "metadata": {}, **scores}
+
+
+def semantic(query_vec, tenant_id, top_k):
+    time.sleep(0.2)
+    return [row("a", distance=0.1), row("b", distance=0.3), row("c", distance=0.5)][:top_k]
+
+
+def lexical(query, tenant_id, top_k):
+    time.sleep(0.2)
+    return [row("c", score_lex=8.0), row("d", score_lex=4.0)][:top_k]
+
+
+def make(fusion="weighted", **kwargs):
+    return HybridRetriever(
+        FakeEmbedder(), semantic_search=semantic, lexical_search=lexical, fusion=fusion, **kwargs
+    )
+
+
+def ids(retrieval):
+    return [doc["id"] for doc in retrieval.results]
+
+
+def test_legs_run_concurrently_and_report_timings():
+    start = time.perf_counter()
+    retrieval = asyncio.run(make().search("q", "acme", top_k=10))
+    assert time.perf_counter() - start < 0.35
+    assert set(retrieval.timings) == {"embed", "semantic", "lexical", "fuse", "total"}
+    assert retrieval.timings["semantic"] >= 190 and retrieval.timings["lexical"] >= 190
+
+
+def test_fusion_strategies():
+    weighted = asyncio.run(make("weighted", alpha=0.6).search("q", None))
+    assert ids(weighted) == ["c", "a", "b", "d"]
+    c = weighted.results[0]
+    assert c["score"] == pytest.approx(0.6 * 0.5 + 0.4 * 1.0)
+
+    assert ids(asyncio.run(make("max").search("q", None))) == ["c", "a", "b", "d"]
+
+    # c is ranked by both legs, so RRF puts it first
+    rrf = asyncio.run(make("rrf", rrf_k=60).search("q", None))
+    assert ids(rrf)[:2] == ["c", "a"]
+    assert rrf.results[0]["score"] == pytest.approx(1 / 63 + 1 / 61)
+    # Second place in either leg scores the same
+    assert rrf.results[2]["score"] == rrf.results[3]["score"] == pytest.approx(1 / 62)
+
+
+def test_single_leg_modes_and_overrides():
+    lexical_only = asyncio.run(make().search("q", None, mode="lexical"))
+    assert ids(lexical_only) == ["c", "d"]
+    assert "embed" not in lexical_only.timings
+
+    semantic_only = asyncio.run(make().search("q", None, mode="semantic", top_k=2))
+    assert ids(semantic_only) == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        asyncio.run(make().search("q", None, fusion="nope"))
+
+
+def test_benchmark_reports_stage_percentiles():
+    report = benchmark(make(), ["q1", "q2"], rounds=1)
+    assert set(report["total"]) == {"p50", "p95", "max"}
+    assert report["total"]["p50"] >= 190
@@ -0,0 +1,50 @@
+from pods.customer_ops.api import semcache
+from pods.customer_ops.api.semcache import SemanticCache
+
+VECTORS = {
+    "how much is a roof inspection": [1.0, 0.0, 0.0],
+    "roof inspection cost?": [0.98, 0.2, 0.0],
+    "do you repair gutters": [0.0, 1.0, 0.0],
+    "gutter cleaning price": [0.0, 0.0, 1.0],
+}
+
+
+def embed(texts):
+    return [VECTORS[t.strip().lower()] for t in texts]
+
+
+def test_paraphrase_hits_within_threshold():
+    cache = SemanticCache(embed, threshold=0.9)
+    cache.put("acme", "How much is a roof inspection", {"answer": "$199"}, ttl_seconds=60)
+
+    assert cache.get("acme", "roof inspection cost?") == {"answer": "$199"}
+    assert cache.get("acme", "do you repair gutters") is None
+    assert cache.get("globex", "roof inspection cost?") is None
+
+
+def test_expired_entries_do_not_match():
+    cache = SemanticCache(embed, threshold=0.9)
+    cache.put("acme", "how much is a roof inspection", {"answer": "$199"}, ttl_seconds=-1)
+    assert cache.get("acme", "how much is a roof inspection") is None
+
+
+def test_lru_slot_is_reused_when_full():
+    cache = SemanticCache(embed, threshold=0.99, max_entries=2)
+    cache.put("acme", "how much is a roof inspection", {"answer": "roof"}, ttl_seconds=60)
+    cache.put("acme", "do you repair gutters", {"answer": "gutters"}, ttl_seconds=60)
+    assert cache.get("acme", "how much is a roof inspection") == {"answer": "roof"}
+
+    cache.put("acme", "gutter cleaning price", {"answer": "cleaning"}, ttl_seconds=60)
+    assert cache.get("acme", "do you repair gutters") is None
+    assert cache.get("acme", "how much is a roof inspection") == {"answer": "roof"}
+    assert cache.get("acme", "gutter cleaning price") == {"answer": "cleaning"}
+
+
+def test_wrappers_fall_back_to_semantic_tier(monkeypatch):
+    monkeypatch.setattr(semcache, "_client", semcache._Mem())
+    monkeypatch.setattr(semcache, "_semantic", SemanticCache(embed, threshold=0.9))
+    semcache.set_semcache("acme", "How much is a roof inspection", {"answer": "$199"})
+
+    assert semcache.get_semcache("acme", "how much is a roof inspection ") == {"answer": "$199"}
+    assert semcache.get_semcache("acme", "roof inspection cost?") == {"answer": "$199"}
+    assert semcache.get_semcache("acme", "gutter cleaning price") is None
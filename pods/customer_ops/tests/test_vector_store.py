@@ -0,0 +1,98 @@
+import asyncio
+import json
+import sqlite3
+import threading
+
+import numpy as np
+
+from pods.customer_ops.api.executor import run_blocking
+from pods.customer_ops.api.vector_store import SQLiteVectorStore
+
+
+def unit(i, dim=4):
+    v = [0.0] * dim
+    v[i] = 1.0
+    return v
+
+
+def test_search_ranks_by_cosine_and_applies_min_score(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "rag.sqlite3"))
+    store.upsert("acme", "faq", ["a", "b", "c"], [[1, 0, 0, 0], [1, 1, 0, 0], [0, 0, 1, 0]])
+    store.upsert("globex", "faq", ["g"], [[1, 0, 0, 0]])
+
+    hits = store.search("acme", [2.0, 0, 0, 0], top_k=2, min_score=0.1)
+    assert [(round(s, 3), c, src) for s, c, src in hits] == [(1.0, "a", "faq"), (0.707, "b", "faq")]
+    assert [c for _, c, _ in store.search("acme", unit(2), top_k=10, min_score=0.5)] == ["c"]
+
+
+def test_vectors_are_stored_as_float32_blobs(tmp_path):
+    path = tmp_path / "rag.sqlite3"
+    SQLiteVectorStore(str(path)).upsert("acme", None, ["a"], [[0.5, 0.25]])
+    raw = sqlite3.connect(path).execute("SELECT vector FROM knowledge").fetchone()[0]
+    assert np.frombuffer(raw, dtype=np.float32).tolist() == [0.5, 0.25]
+
+
+def test_matrix_tracks_upsert_and_delete(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "rag.sqlite3"))
+    store.upsert("acme", None, ["a"], [unit(0)])
+    assert len(store.search("acme", unit(1), min_score=-1)) == 1
+
+    store.upsert("acme", None, ["b"], [unit(1)])
+    assert store.search("acme", unit(1), top_k=1)[0][1] == "b"
+
+    b_id = next(row["id"] for row in store.list("acme") if row["text"] == "b")
+    assert store.delete("acme", [str(b_id)]) == 1
+    assert [c for _, c, _ in store.search("acme", unit(1), min_score=-1)] == ["a"]
+
+
+def test_legacy_json_rows_and_external_writes(tmp_path):
+    path = tmp_path / "rag.sqlite3"
+    store = SQLiteVectorStore(str(path))
+    assert store.search("acme", unit(0)) == []
+
+    # Another process (old format) writes a row behind the store's back
+    other = sqlite3.connect(path)
+    other.execute(
+        "INSERT INTO knowledge (tenant, source, chunk, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+        ("acme", "legacy", "old", json.dumps(unit(0)), 0.0),
+    )
+    other.commit()
+    assert store.search("acme", unit(0)) == [(1.0, "old", "legacy")]
+
+
+def test_usable_from_worker_threads(tmp_path):
+    store = SQLiteVectorStore(str(tmp_path / "rag.sqlite3"))
+    store.upsert("acme", None, ["a"], [unit(0)])
+    errors = []
+
+    def search():
+        try:
+            assert store.search("acme", unit(0))[0][1] == "a"
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_ingest_and_search_through_blocking_pool(tmp_path):
+    # The /knowledge/ingest* and RAG paths call the store via run_blocking
+    store = SQLiteVectorStore(str(tmp_path / "rag.sqlite3"))
+
+    async def scenario():
+        await asyncio.gather(
+            *(
+                run_blocking("vector_upsert", store.upsert, "acme", "faq", [f"c{i}"], [unit(i % 4)])
+                for i in range(8)
+            )
+        )
+        return await asyncio.gather(
+            *(run_blocking("vector_search", store.search, "acme", unit(i)) for i in range(4))
+        )
+
+    results = asyncio.run(scenario())
+    assert all(len(hits) == 2 for hits in results)
@@ -11,6 +11,8 @@ import redis
 from prometheus_client import Counter, Gauge, start_http_server
 from rq import Queue, Worker
 
+from pods.customer_ops.api.response_cache import bump_tenant_generation
+
 # Import DuckDB vector store functions
 from pods.customer_ops.db_duck import upsert_chunks as duck_upsert
 
@@ -58,15 +60,21 @@ def _store():
     return SQLiteVectorStore(db_path=DB_PATH)
 
 
+_EMBEDDER = None
+
+
 def _embedder():
-    """Get embedder instance."""
-    from pods.customer_ops.api.config import get_settings
-    from pods.customer_ops.api.embeddings import build_embedder
+    """Get the worker's embedder (built once so its connection pool is reused across jobs)."""
+    global _EMBEDDER
+    if _EMBEDDER is None:
+        from pods.customer_ops.api.config import get_settings
+        from pods.customer_ops.api.embeddings import build_embedder
 
-    settings = get_settings()
-    provider = os.getenv("EMBED_PROVIDER", "gemini")
-    model = os.getenv("EMBED_MODEL", "text-embedding-3-small")
-    return build_embedder(provider, model, settings)
+        settings = get_settings()
+        provider = os.getenv("EMBED_PROVIDER", "gemini")
+        model = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+        _EMBEDDER = build_embedder(provider, model, settings)
+    return _EMBEDDER
 
 
 def _chunk(text: str, max_len: int = 800):
@@ -124,6 +132,8 @@ def ingest_text_job(text: str, source: str, tenant: str = "default") -> dict[str
         }
         duck_count = duck_upsert(duck_chunks, metadata=metadata, tenant_id=tenant)
         log.info("DuckDB upsert: %d chunks", duck_count)
+        # New knowledge: drop this tenant's cached /search and /answer responses
+        bump_tenant_generation(tenant)
 
         # Mirror to SQLite if feature flag enabled
         if os.getenv("DUCKDB_MIRROR_SQLITE", "0") == "1":
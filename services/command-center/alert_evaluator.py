@@ -4,17 +4,36 @@ Alert Rule Evaluator
 Phase VI M6: Evaluates alert rules against event store and emits ops.alert.raised events.
 Phase VII M1: Integrated with notification_dispatcher for webhook delivery.
 Phase VII M5: Reliable alert delivery via queue-based dispatcher with retries.
+Rule counts are served from incremental sliding-window counters (event_window).
+Queued deliveries are sent by a concurrent worker pool (delivery_worker).
 """
 
 import asyncio
+import time
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import alert_store
 import event_store
-import httpx
 import notification_dispatcher
+from delivery_worker import delivery_pool
+from event_window import event_window_index
+from prometheus_client import Gauge, Histogram
+
+alert_eval_seconds = Histogram(
+    "aetherlink_alert_eval_seconds",
+    "Latency of one alert rule evaluation pass",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+alert_eval_lag_seconds = Gauge(
+    "aetherlink_alert_eval_lag_seconds",
+    "Age of the oldest newly saved event when it was folded into the rule counters",
+)
+alert_eval_rules = Gauge(
+    "aetherlink_alert_eval_rules",
+    "Enabled alert rules evaluated in the last pass",
+)
 
 
 async def evaluate_rules_once() -> dict[str, Any]:
@@ -24,13 +43,25 @@ async def evaluate_rules_once() -> dict[str, Any]:
     Phase VI M6: Checks each rule against the event store and emits
     ops.alert.raised events when thresholds are exceeded.
 
+    Rule counts come from the incremental sliding-window index, which is
+    caught up with newly saved events once per tick; rules whose window is
+    longer than the index horizon fall back to event_store.count_events.
+
     Returns:
         Dictionary with evaluation summary
     """
+    started = time.perf_counter()
     rules = alert_store.list_rules()
     triggered = []
     evaluated = 0
 
+    # Fold events saved since the last tick into the window counters
+    await asyncio.to_thread(event_window_index.catch_up)
+    alert_eval_lag_seconds.set(event_window_index.last_lag_seconds)
+
+    now = datetime.now(UTC).replace(microsecond=0)
+    webhook_urls: list[str] | None = None
+
     for rule in rules:
         if not rule["enabled"]:
             continue
@@ -39,25 +70,28 @@ async def evaluate_rules_once() -> dict[str, Any]:
 
         # Build time window
         window_seconds = rule["window_seconds"]
-        since = datetime.now(UTC)
-        since = since.replace(microsecond=0)
-        # Subtract window_seconds
-        from datetime import timedelta
-
-        since = since - timedelta(seconds=window_seconds)
-        since_iso = since.isoformat()
+        since = now - timedelta(seconds=window_seconds)
 
         # Phase VII M3: Pass rule's tenant_id to filter events by tenant
         rule_tenant_id = rule.get("tenant_id")
 
         # Count matching events in window
-        count = event_store.count_events(
-            event_type=rule["event_type"],
-            source=rule["source"],
-            severity=rule["severity"],
-            since=since_iso,
-            tenant_id=rule_tenant_id,
-        )
+        if event_window_index.covers(window_seconds):
+            count = event_window_index.count(
+                rule["event_type"],
+                rule["source"],
+                rule["severity"],
+                rule_tenant_id,
+                int(since.timestamp()),
+            )
+        else:
+            count = event_store.count_events(
+                event_type=rule["event_type"],
+                source=rule["source"],
+                severity=rule["severity"],
+                since=since.isoformat(),
+                tenant_id=rule_tenant_id,
+            )
 
         # Check if threshold exceeded
         if count >= rule["threshold"]:
@@ -91,31 +125,29 @@ async def evaluate_rules_once() -> dict[str, Any]:
             event_store.save_event(alert_event)
 
             # Phase VII M5: Enqueue alert for reliable delivery instead of immediate dispatch
-            # Check dedup window first: only enqueue if not sent recently
-            if event_store.check_dedup_window(rule["name"], rule_tenant_id or "system"):
-                # Get configured webhooks
+            if webhook_urls is None:
                 webhook_urls = notification_dispatcher.get_configured_webhooks()
 
-                if len(webhook_urls) > 0:
-                    # Enqueue for each webhook URL
-                    for webhook_url in webhook_urls:
-                        event_store.enqueue_alert_delivery(
-                            alert_event_id=alert_event["event_id"],
-                            alert_payload=alert_event,
-                            webhook_url=webhook_url,
-                            max_attempts=5,
-                        )
-
-                    # Update dedup history (prevents re-enqueueing same alert within window)
-                    event_store.update_dedup_history(rule["name"], rule_tenant_id or "system")
-
+            if len(webhook_urls) > 0:
+                # Dedup check + enqueue per webhook + dedup history in one transaction
+                enqueued = event_store.enqueue_alert_with_dedup(
+                    rule_name=rule["name"],
+                    tenant_id=rule_tenant_id or "system",
+                    alert_event_id=alert_event["event_id"],
+                    alert_payload=alert_event,
+                    webhook_urls=webhook_urls,
+                    max_attempts=5,
+                )
+                if enqueued:
                     print(
-                        f"[alert_evaluator] � Alert '{rule['name']}' enqueued for delivery to {len(webhook_urls)} webhook(s)"
+                        f"[alert_evaluator] 📨 Alert '{rule['name']}' enqueued for delivery to {len(webhook_urls)} webhook(s)"
                     )
                 else:
-                    print(f"[alert_evaluator] ⚠️  No webhooks configured for alert '{rule['name']}'")
+                    print(
+                        f"[alert_evaluator] 🔕 Alert '{rule['name']}' skipped (dedup window active)"
+                    )
             else:
-                print(f"[alert_evaluator] 🔕 Alert '{rule['name']}' skipped (dedup window active)")
+                print(f"[alert_evaluator] ⚠️  No webhooks configured for alert '{rule['name']}'")
 
             triggered.append(
                 {
@@ -126,6 +158,9 @@ async def evaluate_rules_once() -> dict[str, Any]:
                 }
             )
 
+    alert_eval_seconds.observe(time.perf_counter() - started)
+    alert_eval_rules.set(evaluated)
+
     return {
         "status": "ok",
         "evaluated": evaluated,
@@ -164,177 +199,17 @@ async def delivery_dispatcher_loop():
     Phase VII M5: Pulls pending deliveries from the queue and attempts webhook POST.
     Implements retry logic with exponential backoff and dead letter handling.
 
-    Architecture:
-    - Every 30 seconds, fetch up to 50 pending deliveries
-    - Attempt POST to webhook_url with 10-second timeout
+    Architecture (see delivery_worker.DeliveryWorkerPool):
+    - Ready rows are claimed atomically under a lease, woken immediately on enqueue
+    - POSTs run concurrently, with a per-destination in-flight limit
     - On success: entry removed from queue
     - On failure: exponential backoff with capped retry (30s, 2m, 5m, cap at 30m)
     - After max_attempts (default 5): emit ops.alert.delivery.failed and remove from queue
+    - Attempt outcomes are written back in batches
     """
     print("[delivery_dispatcher] 📮 Starting delivery dispatcher loop")
 
     # Wait 10 seconds before first check (allow system startup)
     await asyncio.sleep(10)
 
-    # Create persistent HTTP client with connection pooling
-    async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-        while True:
-            try:
-                # Fetch deliveries where next_attempt_at <= now
-                deliveries = event_store.get_pending_deliveries(limit=50)
-
-                if len(deliveries) > 0:
-                    print(
-                        f"[delivery_dispatcher] 📤 Processing {len(deliveries)} pending delivery(ies)"
-                    )
-
-                for delivery in deliveries:
-                    delivery_id = delivery["id"]
-                    webhook_url = delivery["webhook_url"]
-                    alert_payload = delivery["alert_payload"]
-                    attempt_count = delivery["attempt_count"]
-                    max_attempts = delivery["max_attempts"]
-
-                    try:
-                        # Attempt webhook POST
-                        response = await client.post(
-                            webhook_url,
-                            json=alert_payload,
-                            headers={"Content-Type": "application/json"},
-                        )
-
-                        # Success: 2xx status code
-                        if 200 <= response.status_code < 300:
-                            event_store.update_delivery_attempt(
-                                delivery_id, success=True, error_message=None
-                            )
-                            print(
-                                f"[delivery_dispatcher] ✅ Delivered alert to {webhook_url} (status {response.status_code})"
-                            )
-                        else:
-                            # HTTP error (4xx, 5xx)
-                            error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
-                            event_store.update_delivery_attempt(
-                                delivery_id, success=False, error_message=error_msg
-                            )
-
-                            # Check if max attempts reached (after update)
-                            new_attempt_count = attempt_count + 1
-                            if new_attempt_count >= max_attempts:
-                                # Emit dead letter event
-                                dead_letter_event = {
-                                    "event_id": str(uuid.uuid4()),
-                                    "event_type": "ops.alert.delivery.failed",
-                                    "source": "aether-command-center",
-                                    "severity": "error",
-                                    "timestamp": datetime.now(UTC).isoformat(),
-                                    "tenant_id": alert_payload.get("tenant_id", "system"),
-                                    "payload": {
-                                        "alert_event_id": delivery["alert_event_id"],
-                                        "webhook_url": webhook_url,
-                                        "attempts": new_attempt_count,
-                                        "last_error": error_msg,
-                                        "alert_rule_name": alert_payload.get("payload", {}).get(
-                                            "rule_name", "unknown"
-                                        ),
-                                    },
-                                    "_meta": {
-                                        "received_at": datetime.now(UTC).isoformat(),
-                                        "client_ip": "127.0.0.1",
-                                    },
-                                }
-                                event_store.save_event(dead_letter_event)
-                                print(
-                                    f"[delivery_dispatcher] ☠️  Dead letter: Alert delivery failed after {new_attempt_count} attempts to {webhook_url}"
-                                )
-                            else:
-                                print(
-                                    f"[delivery_dispatcher] 🔄 Retry scheduled for {webhook_url} (attempt {new_attempt_count}/{max_attempts})"
-                                )
-
-                    except httpx.TimeoutException:
-                        # Timeout
-                        error_msg = "Request timeout (>10s)"
-                        event_store.update_delivery_attempt(
-                            delivery_id, success=False, error_message=error_msg
-                        )
-
-                        new_attempt_count = attempt_count + 1
-                        if new_attempt_count >= max_attempts:
-                            # Emit dead letter event
-                            dead_letter_event = {
-                                "event_id": str(uuid.uuid4()),
-                                "event_type": "ops.alert.delivery.failed",
-                                "source": "aether-command-center",
-                                "severity": "error",
-                                "timestamp": datetime.now(UTC).isoformat(),
-                                "tenant_id": alert_payload.get("tenant_id", "system"),
-                                "payload": {
-                                    "alert_event_id": delivery["alert_event_id"],
-                                    "webhook_url": webhook_url,
-                                    "attempts": new_attempt_count,
-                                    "last_error": error_msg,
-                                    "alert_rule_name": alert_payload.get("payload", {}).get(
-                                        "rule_name", "unknown"
-                                    ),
-                                },
-                                "_meta": {
-                                    "received_at": datetime.now(UTC).isoformat(),
-                                    "client_ip": "127.0.0.1",
-                                },
-                            }
-                            event_store.save_event(dead_letter_event)
-                            print(
-                                f"[delivery_dispatcher] ☠️  Dead letter: Alert delivery timed out after {new_attempt_count} attempts to {webhook_url}"
-                            )
-                        else:
-                            print(
-                                f"[delivery_dispatcher] ⏱️  Timeout for {webhook_url}, retry scheduled"
-                            )
-
-                    except Exception as e:
-                        # Network error, connection refused, etc.
-                        error_msg = f"{type(e).__name__}: {str(e)}"
-                        event_store.update_delivery_attempt(
-                            delivery_id, success=False, error_message=error_msg
-                        )
-
-                        new_attempt_count = attempt_count + 1
-                        if new_attempt_count >= max_attempts:
-                            # Emit dead letter event
-                            dead_letter_event = {
-                                "event_id": str(uuid.uuid4()),
-                                "event_type": "ops.alert.delivery.failed",
-                                "source": "aether-command-center",
-                                "severity": "error",
-                                "timestamp": datetime.now(UTC).isoformat(),
-                                "tenant_id": alert_payload.get("tenant_id", "system"),
-                                "payload": {
-                                    "alert_event_id": delivery["alert_event_id"],
-                                    "webhook_url": webhook_url,
-                                    "attempts": new_attempt_count,
-                                    "last_error": error_msg,
-                                    "alert_rule_name": alert_payload.get("payload", {}).get(
-                                        "rule_name", "unknown"
-                                    ),
-                                },
-                                "_meta": {
-                                    "received_at": datetime.now(UTC).isoformat(),
-                                    "client_ip": "127.0.0.1",
-                                },
-                            }
-                            event_store.save_event(dead_letter_event)
-                            print(
-                                f"[delivery_dispatcher] ☠️  Dead letter: Alert delivery failed after {new_attempt_count} attempts to {webhook_url} - {error_msg}"
-                            )
-                        else:
-                            print(
-                                f"[delivery_dispatcher] ⚠️  Error for {webhook_url}: {error_msg}, retry scheduled"
-                            )
-
-            except Exception as e:
-                # Catch-all for dispatcher loop errors
-                print(f"[delivery_dispatcher] ❌ Dispatcher loop error: {e}")
-
-            # Wait 30 seconds before next batch
-            await asyncio.sleep(30)
+    await delivery_pool.run()
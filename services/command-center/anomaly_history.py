@@ -1,41 +1,394 @@
 # services/command-center/anomaly_history.py
+"""
+Anomaly/remediation history store.
+
+Records are appended as JSON lines to HISTORY_PATH, the active segment.
+When it reaches ANOMALY_HISTORY_SEGMENT_BYTES, or was started more than
+ANOMALY_HISTORY_SEGMENT_SECONDS ago, it is renamed to a numbered segment
+(anomaly_history.000001.jsonl, ...) and a fresh active file is started.
+ANOMALY_HISTORY_MAX_SEGMENTS (0 = unlimited) caps how many rotated
+segments are kept.
+
+A SQLite sidecar index maps every record to (segment, offset, length),
+keyed by id and by (tenant, ts), so id lookups and tenant-scoped reads
+seek straight to the matching lines. Unfiltered reads walk the segments
+backwards with a block-wise tail reader. Neither path loads a whole file.
+Lines appended without being indexed (legacy files, crashes) are indexed
+on open.
+"""
+
 from __future__ import annotations
+
 import json
+import os
+import threading
 import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any
+
+from sqlite_pool import SQLitePool
 
 HISTORY_PATH = Path("data/anomaly_history.jsonl")
 HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-def append_anomaly_record(record: Dict[str, Any]) -> None:
+SEGMENT_BYTES = int(os.getenv("ANOMALY_HISTORY_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+SEGMENT_SECONDS = int(os.getenv("ANOMALY_HISTORY_SEGMENT_SECONDS", "86400"))
+MAX_SEGMENTS = int(os.getenv("ANOMALY_HISTORY_MAX_SEGMENTS", "0"))
+TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def _as_ts(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_lines_reverse(path: Path, block_size: int = TAIL_BLOCK_BYTES) -> Iterator[bytes]:
+    """Yield the non-empty lines of a file last-to-first, reading fixed-size blocks from the end."""
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)  # may continue in the previous block
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+class AnomalyHistoryStore:
+    """Segmented JSONL history with a SQLite (id, tenant+ts) index."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index = SQLitePool(
+            str(self.path.with_suffix(".idx.sqlite")), name="anomaly_history", readers=2
+        )
+        self._lock = threading.Lock()
+        with self.index.write("init") as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS segments (
+                    name TEXT PRIMARY KEY,
+                    seq INTEGER NOT NULL,
+                    indexed_bytes INTEGER NOT NULL DEFAULT 0,
+                    first_ts REAL,
+                    last_ts REAL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    record_id TEXT,
+                    tenant TEXT,
+                    ts REAL,
+                    segment TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_record_id ON records(record_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_tenant_ts ON records(tenant, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_segment ON records(segment)")
+        self._reconcile()
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, name: str) -> Path:
+        return self.path.parent / name
+
+    def _rotated_name(self, seq: int) -> str:
+        return f"{self.path.stem}.{seq:06d}{self.path.suffix}"
+
+    def _segments_newest_first(self) -> list[str]:
+        with self.index.read("segments") as conn:
+            rows = conn.execute("SELECT name FROM segments ORDER BY seq DESC").fetchall()
+        return [row["name"] for row in rows]
+
+    def _reconcile(self) -> None:
+        """Index lines appended to any segment but not yet indexed, drop vanished segments."""
+        on_disk = {
+            p.name
+            for p in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}")
+            if p.name[len(self.path.stem) + 1 : -len(self.path.suffix)].isdigit()
+        }
+        if self.path.exists():
+            on_disk.add(self.path.name)
+        with self.index.write("reconcile") as conn:
+            known = {row["name"] for row in conn.execute("SELECT name FROM segments").fetchall()}
+            for name in known - on_disk:
+                conn.execute("DELETE FROM records WHERE segment = ?", (name,))
+                conn.execute("DELETE FROM segments WHERE name = ?", (name,))
+            for name in sorted(on_disk):
+                if name == self.path.name:
+                    seq = 1 << 62  # active segment sorts newest
+                else:
+                    seq = int(name[len(self.path.stem) + 1 : -len(self.path.suffix)])
+                conn.execute(
+                    "INSERT OR IGNORE INTO segments (name, seq, created_at) VALUES (?, ?, ?)",
+                    (name, seq, self._segment_path(name).stat().st_mtime),
+                )
+                self._index_tail(conn, name)
+
+    def _index_tail(self, conn, name: str) -> None:
+        row = conn.execute(
+            "SELECT indexed_bytes, first_ts FROM segments WHERE name = ?", (name,)
+        ).fetchone()
+        offset = row["indexed_bytes"]
+        first_ts = row["first_ts"]
+        if self._segment_path(name).stat().st_size < offset:
+            # File was truncated or replaced under us: index it from scratch
+            conn.execute("DELETE FROM records WHERE segment = ?", (name,))
+            offset, first_ts = 0, None
+            conn.execute(
+                "UPDATE segments SET indexed_bytes = 0, first_ts = NULL, last_ts = NULL WHERE name = ?",
+                (name,),
+            )
+        last_ts = None
+        entries = []
+        with self._segment_path(name).open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial write; picked up once completed
+                try:
+                    item = json.loads(line)
+                except Exception:
+                    item = None
+                if isinstance(item, dict):
+                    ts = _as_ts(item.get("ts"))
+                    record_id = item.get("id")
+                    entries.append(
+                        (
+                            None if record_id is None else str(record_id),
+                            item.get("tenant"),
+                            ts,
+                            name,
+                            offset,
+                            len(line),
+                        )
+                    )
+                    if ts is not None:
+                        first_ts = ts if first_ts is None else first_ts
+                        last_ts = ts
+                offset += len(line)
+        conn.executemany(
+            "INSERT INTO records (record_id, tenant, ts, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?)",
+            entries,
+        )
+        conn.execute(
+            """
+            UPDATE segments SET indexed_bytes = ?, first_ts = ?, last_ts = COALESCE(?, last_ts)
+            WHERE name = ?
+            """,
+            (offset, first_ts, last_ts, name),
+        )
+
+    def _maybe_rotate(self, now: float) -> None:
+        with self.index.read("rotate_check") as conn:
+            row = conn.execute(
+                "SELECT indexed_bytes, created_at FROM segments WHERE name = ?", (self.path.name,)
+            ).fetchone()
+        if row is None or row["indexed_bytes"] == 0:
+            return
+        too_big = row["indexed_bytes"] >= SEGMENT_BYTES
+        too_old = now - row["created_at"] >= SEGMENT_SECONDS
+        if not (too_big or too_old):
+            return
+
+        with self.index.write("rotate") as conn:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 AS seq FROM segments WHERE name != ?",
+                (self.path.name,),
+            ).fetchone()["seq"]
+            rotated = self._rotated_name(seq)
+            self.path.rename(self._segment_path(rotated))
+            conn.execute("UPDATE records SET segment = ? WHERE segment = ?", (rotated, self.path.name))
+            conn.execute(
+                "UPDATE segments SET name = ?, seq = ? WHERE name = ?",
+                (rotated, seq, self.path.name),
+            )
+            conn.execute(
+                "INSERT INTO segments (name, seq, created_at) VALUES (?, ?, ?)",
+                (self.path.name, 1 << 62, now),
+            )
+
+            if MAX_SEGMENTS > 0:
+                expired = conn.execute(
+                    "SELECT name FROM segments WHERE name != ? ORDER BY seq DESC LIMIT -1 OFFSET ?",
+                    (self.path.name, MAX_SEGMENTS),
+                ).fetchall()
+                for old in expired:
+                    conn.execute("DELETE FROM records WHERE segment = ?", (old["name"],))
+                    conn.execute("DELETE FROM segments WHERE name = ?", (old["name"],))
+                    self._segment_path(old["name"]).unlink(missing_ok=True)
+        print(f"[anomaly_history] 🔄 Rotated history segment to {rotated}")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, record: dict[str, Any]) -> None:
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        ts = _as_ts(record.get("ts"))
+        with self._lock:
+            now = time.time()
+            self._maybe_rotate(now)
+            with self.path.open("ab") as f:
+                offset = f.tell()
+                f.write(line)
+            record_id = record.get("id")
+            with self.index.write("append") as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO segments (name, seq, created_at) VALUES (?, ?, ?)",
+                    (self.path.name, 1 << 62, now),
+                )
+                conn.execute(
+                    "INSERT INTO records (record_id, tenant, ts, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        None if record_id is None else str(record_id),
+                        record.get("tenant"),
+                        ts,
+                        self.path.name,
+                        offset,
+                        len(line),
+                    ),
+                )
+                conn.execute(
+                    """
+                    UPDATE segments
+                    SET indexed_bytes = ?, first_ts = COALESCE(first_ts, ?),
+                        last_ts = COALESCE(?, last_ts)
+                    WHERE name = ?
+                    """,
+                    (offset + len(line), ts, ts, self.path.name),
+                )
+
+    def read(
+        self, tenant: str | None = None, since_ts: float | None = None, limit: int = 500
+    ) -> list[dict[str, Any]]:
+        if limit <= 0:
+            return []
+        if tenant:
+            return self._read_indexed(tenant, since_ts, limit)
+        return self._read_tail(since_ts, limit)
+
+    def get(self, record_id: Any) -> dict[str, Any] | None:
+        with self.index.read("get") as conn:
+            row = conn.execute(
+                """
+                SELECT segment, offset, length FROM records
+                WHERE record_id = ? ORDER BY id DESC LIMIT 1
+                """,
+                (str(record_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        items = self._load([row])
+        return items[0] if items else None
+
+    def _read_indexed(self, tenant: str, since_ts: float | None, limit: int) -> list[dict[str, Any]]:
+        query = "SELECT segment, offset, length FROM records WHERE tenant = ?"
+        params: list[Any] = [tenant]
+        if since_ts:
+            query += " AND ts >= ?"
+            params.append(since_ts)
+        query += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self.index.read("read") as conn:
+            rows = conn.execute(query, params).fetchall()
+        return self._load(rows)
+
+    def _read_tail(self, since_ts: float | None, limit: int) -> list[dict[str, Any]]:
+        """Newest-first walk; history is append-ordered, so stop at the first record before since_ts."""
+        results: list[dict[str, Any]] = []
+        for name in self._segments_newest_first():
+            path = self._segment_path(name)
+            if not path.exists():
+                continue
+            for line in iter_lines_reverse(path):
+                try:
+                    item = json.loads(line)
+                except Exception:
+                    continue
+                if since_ts and (_as_ts(item.get("ts")) or 0) < since_ts:
+                    return results
+                results.append(item)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _load(self, rows) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        handles: dict[str, Any] = {}
+        try:
+            for row in rows:
+                f = handles.get(row["segment"])
+                if f is None:
+                    path = self._segment_path(row["segment"])
+                    if not path.exists():
+                        continue
+                    f = handles[row["segment"]] = path.open("rb")
+                f.seek(row["offset"])
+                try:
+                    items.append(json.loads(f.read(row["length"])))
+                except Exception:
+                    continue
+        finally:
+            for f in handles.values():
+                f.close()
+        return items
+
+    def close(self) -> None:
+        self.index.close()
+
+
+_STORE: AnomalyHistoryStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> AnomalyHistoryStore:
+    """Shared store for HISTORY_PATH, rebuilt if HISTORY_PATH is repointed."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != Path(HISTORY_PATH):
+            if _STORE is not None:
+                _STORE.close()
+            _STORE = AnomalyHistoryStore(Path(HISTORY_PATH))
+        return _STORE
+
+
+def append_anomaly_record(record: dict[str, Any]) -> None:
     """Append a single anomaly/remediation record to history."""
     # add server-side timestamp
     record = dict(record)
     record.setdefault("ts", time.time())
-    with HISTORY_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
+    get_store().append(record)
+
 
 def read_anomaly_records(
     tenant: str | None = None,
     since_ts: float | None = None,
     limit: int = 500,
-) -> List[Dict[str, Any]]:
-    """Read history, optionally filter by tenant and time."""
-    results: List[Dict[str, Any]] = []
-    if not HISTORY_PATH.exists():
-        return results
-    with HISTORY_PATH.open("r", encoding="utf-8") as f:
-        for line in reversed(list(f.readlines())):
-            try:
-                item = json.loads(line)
-            except Exception:
-                continue
-            if tenant and item.get("tenant") != tenant:
-                continue
-            if since_ts and item.get("ts", 0) < since_ts:
-                continue
-            results.append(item)
-            if len(results) >= limit:
-                break
-    return results
\ No newline at end of file
+) -> list[dict[str, Any]]:
+    """Read history (newest first), optionally filter by tenant and time."""
+    return get_store().read(tenant=tenant, since_ts=since_ts, limit=limit)
+
+
+def get_anomaly_record(record_id: Any) -> dict[str, Any] | None:
+    """Look up the most recent record with the given id."""
+    return get_store().get(record_id)
@@ -457,7 +457,7 @@ async def retention_worker():
     while True:
         try:
             # Phase VII M4: Use per-tenant retention with fallback to global
-            results = event_store.prune_old_events_with_per_tenant()
+            results = await asyncio.to_thread(event_store.prune_old_events_with_per_tenant)
 
             total_pruned = sum(r["pruned_count"] for r in results)
 
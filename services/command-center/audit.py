@@ -18,7 +18,6 @@ This provides operational visibility into:
 Phase XX M4: Enhanced with WebSocket broadcasting for live operator activity feed
 """
 
-import asyncio
 import json
 import logging
 from datetime import datetime
@@ -47,12 +46,12 @@ except ImportError:
     operator_activity_ws_manager = None
 
 
-async def _broadcast_operator_activity(payload: dict[str, Any]) -> None:
-    """Broadcast operator activity to WebSocket subscribers."""
+def _broadcast_operator_activity(payload: dict[str, Any]) -> None:
+    """Broadcast operator activity to WebSocket subscribers (queues only, never blocks)."""
     if operator_activity_ws_manager is None:
         return
     try:
-        await operator_activity_ws_manager.broadcast(
+        operator_activity_ws_manager.publish(
             {
                 "type": "operator_activity",
                 "payload": payload,
@@ -121,8 +120,8 @@ async def audit_middleware(request: Request, call_next):
             or request.headers.get("x-user-roles")
             or "unknown",
         }
-        # Fire-and-forget so we don't block the request
-        asyncio.create_task(_broadcast_operator_activity(activity_payload))
+        # Only queues the message, so this doesn't block the request
+        _broadcast_operator_activity(activity_payload)
 
     return response
 
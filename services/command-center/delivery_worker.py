@@ -0,0 +1,300 @@
+"""
+Concurrent webhook delivery pool for the alert delivery queue.
+
+Ready rows are claimed atomically from alert_delivery_queue (the claim
+pushes next_attempt_at out by a lease so other dispatchers skip them),
+POSTed by up to ALERT_DELIVERY_WORKERS concurrent tasks with at most
+ALERT_DELIVERY_PER_DESTINATION in flight per webhook URL, and their
+outcomes are written back in batches every ALERT_DELIVERY_FLUSH_MS.
+
+The pool wakes as soon as event_store enqueues a delivery, when a slot
+frees up, or when the next retry comes due, instead of polling every 30 s.
+A slow webhook only ties up its own destination's slots.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import defaultdict, deque
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import event_store
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+
+ALERT_DELIVERY_WORKERS = int(os.getenv("ALERT_DELIVERY_WORKERS", "8"))
+ALERT_DELIVERY_PER_DESTINATION = int(os.getenv("ALERT_DELIVERY_PER_DESTINATION", "2"))
+ALERT_DELIVERY_LEASE_SECONDS = int(os.getenv("ALERT_DELIVERY_LEASE_SECONDS", "120"))
+ALERT_DELIVERY_POLL_SECONDS = float(os.getenv("ALERT_DELIVERY_POLL_SECONDS", "30"))
+ALERT_DELIVERY_FLUSH_MS = int(os.getenv("ALERT_DELIVERY_FLUSH_MS", "200"))
+ALERT_DELIVERY_TIMEOUT_SECONDS = float(os.getenv("ALERT_DELIVERY_TIMEOUT_SECONDS", "10"))
+
+alert_delivery_latency_seconds = Histogram(
+    "aetherlink_alert_delivery_latency_seconds",
+    "Time from enqueue to successful webhook delivery",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0),
+)
+alert_delivery_latency_p50_seconds = Gauge(
+    "aetherlink_alert_delivery_latency_p50_seconds",
+    "Median enqueue-to-delivery latency over the last 1000 deliveries",
+)
+alert_delivery_latency_p99_seconds = Gauge(
+    "aetherlink_alert_delivery_latency_p99_seconds",
+    "p99 enqueue-to-delivery latency over the last 1000 deliveries",
+)
+alert_delivery_inflight = Gauge(
+    "aetherlink_alert_delivery_inflight",
+    "Claimed deliveries currently being attempted",
+)
+alert_delivery_attempts_total = Counter(
+    "aetherlink_alert_delivery_attempts_total",
+    "Webhook delivery attempts by outcome",
+    ["outcome"],  # delivered, retry, dead_letter
+)
+
+# (delivery_id, success, error_message) as taken by update_delivery_attempts
+_Outcome = tuple[int, bool, str | None]
+
+
+def _dead_letter_event(delivery: dict[str, Any], attempts: int, error_msg: str) -> dict[str, Any]:
+    """Build the ops.alert.delivery.failed event for an exhausted delivery."""
+    alert_payload = delivery["alert_payload"]
+    return {
+        "event_id": str(uuid.uuid4()),
+        "event_type": "ops.alert.delivery.failed",
+        "source": "aether-command-center",
+        "severity": "error",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "tenant_id": alert_payload.get("tenant_id", "system"),
+        "payload": {
+            "alert_event_id": delivery["alert_event_id"],
+            "webhook_url": delivery["webhook_url"],
+            "attempts": attempts,
+            "last_error": error_msg,
+            "alert_rule_name": alert_payload.get("payload", {}).get("rule_name", "unknown"),
+        },
+        "_meta": {
+            "received_at": datetime.now(UTC).isoformat(),
+            "client_ip": "127.0.0.1",
+        },
+    }
+
+
+class DeliveryWorkerPool:
+    """Claims queued alert deliveries and POSTs them concurrently."""
+
+    def __init__(
+        self,
+        workers: int = ALERT_DELIVERY_WORKERS,
+        per_destination: int = ALERT_DELIVERY_PER_DESTINATION,
+        lease_seconds: int = ALERT_DELIVERY_LEASE_SECONDS,
+        poll_seconds: float = ALERT_DELIVERY_POLL_SECONDS,
+        flush_ms: int = ALERT_DELIVERY_FLUSH_MS,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.per_destination = max(1, per_destination)
+        # Claim at most this many rows ahead of the workers, so rows waiting on
+        # a busy destination are attempted well within their lease
+        self.max_claimed = self.workers * 2
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.flush_seconds = max(1, flush_ms) / 1000
+        self._client_factory = client_factory or self._default_client
+
+        self._slots: asyncio.Semaphore | None = None
+        self._destinations: dict[str, asyncio.Semaphore] = {}
+        self._claimed_by_url: dict[str, int] = defaultdict(int)
+        self._tasks: set[asyncio.Task] = set()
+        self._outcomes: list[_Outcome] = []
+        self._dead_letters: list[dict[str, Any]] = []
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._wake: asyncio.Event | None = None
+
+    def _default_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=ALERT_DELIVERY_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.workers),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """In-flight count and recent enqueue-to-delivery latency quantiles."""
+        p50, p99 = self._quantiles()
+        return {
+            "inflight": len(self._tasks),
+            "latency_p50_seconds": p50,
+            "latency_p99_seconds": p99,
+        }
+
+    async def run(self) -> None:
+        """Dispatch deliveries until cancelled."""
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._destinations = {}
+
+        def on_enqueue() -> None:
+            loop.call_soon_threadsafe(self._wake.set)
+
+        event_store.add_delivery_listener(on_enqueue)
+        flusher = asyncio.create_task(self._flush_loop(), name="alert-delivery-flusher")
+        try:
+            async with self._client_factory() as client:
+                while True:
+                    self._wake.clear()
+                    try:
+                        claimed = await self._dispatch_ready(client)
+                    except Exception as e:
+                        print(f"[delivery_dispatcher] ❌ Dispatcher loop error: {e}")
+                        claimed = 0
+                    if claimed and len(self._tasks) < self.max_claimed:
+                        continue  # more rows may be ready
+                    await self._sleep_until_due()
+        finally:
+            event_store.remove_delivery_listener(on_enqueue)
+            flusher.cancel()
+            # Unfinished attempts are abandoned; their rows retry once the lease expires
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered attempt outcomes and dead-letter events in one go."""
+        if not self._outcomes and not self._dead_letters:
+            return
+        outcomes, self._outcomes = self._outcomes, []
+        dead_letters, self._dead_letters = self._dead_letters, []
+        try:
+            await asyncio.to_thread(self._commit, outcomes, dead_letters)
+        except Exception as e:
+            # Rows stay leased and are retried once the lease expires
+            print(f"[delivery_dispatcher] ⚠️  Failed to record {len(outcomes)} outcome(s): {e}")
+
+    @staticmethod
+    def _commit(outcomes: list[_Outcome], dead_letters: list[dict[str, Any]]) -> None:
+        event_store.update_delivery_attempts(outcomes)
+        event_store.save_events(dead_letters)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    async def _dispatch_ready(self, client: httpx.AsyncClient) -> int:
+        free = self.max_claimed - len(self._tasks)
+        if free <= 0:
+            return 0
+        busy = [url for url, n in self._claimed_by_url.items() if n >= self.per_destination]
+        deliveries = await asyncio.to_thread(
+            event_store.claim_pending_deliveries, free, self.lease_seconds, busy
+        )
+        if deliveries:
+            print(f"[delivery_dispatcher] 📤 Processing {len(deliveries)} pending delivery(ies)")
+        for delivery in deliveries:
+            url = delivery["webhook_url"]
+            self._claimed_by_url[url] += 1
+            task = asyncio.create_task(self._deliver(client, delivery))
+            self._tasks.add(task)
+            task.add_done_callback(lambda t, url=url: self._task_done(t, url))
+        alert_delivery_inflight.set(len(self._tasks))
+        return len(deliveries)
+
+    def _task_done(self, task: asyncio.Task, url: str) -> None:
+        self._tasks.discard(task)
+        self._claimed_by_url[url] -= 1
+        if self._claimed_by_url[url] <= 0:
+            del self._claimed_by_url[url]
+        alert_delivery_inflight.set(len(self._tasks))
+        if self._wake is not None:
+            self._wake.set()  # a slot (or destination) freed up
+
+    async def _sleep_until_due(self) -> None:
+        timeout = self.poll_seconds
+        try:
+            due = await asyncio.to_thread(event_store.next_delivery_due)
+        except Exception:
+            due = None
+        if due:
+            delay = (datetime.fromisoformat(due) - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                timeout = min(timeout, delay)
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    async def _deliver(self, client: httpx.AsyncClient, delivery: dict[str, Any]) -> None:
+        url = delivery["webhook_url"]
+        destination = self._destinations.setdefault(url, asyncio.Semaphore(self.per_destination))
+        async with destination, self._slots:
+            error_msg = await self._post(client, delivery)
+        self._record(delivery, error_msg)
+
+    @staticmethod
+    async def _post(client: httpx.AsyncClient, delivery: dict[str, Any]) -> str | None:
+        """POST one delivery; returns None on success, else the error message."""
+        try:
+            response = await client.post(
+                delivery["webhook_url"],
+                json=delivery["alert_payload"],
+                headers={"Content-Type": "application/json"},
+            )
+        except httpx.TimeoutException:
+            return f"Request timeout (>{ALERT_DELIVERY_TIMEOUT_SECONDS:g}s)"
+        except Exception as e:
+            # Network error, connection refused, etc.
+            return f"{type(e).__name__}: {str(e)}"
+        if 200 <= response.status_code < 300:
+            return None
+        return f"HTTP {response.status_code}: {response.text[:200]}"
+
+    def _record(self, delivery: dict[str, Any], error_msg: str | None) -> None:
+        url = delivery["webhook_url"]
+        self._outcomes.append((delivery["id"], error_msg is None, error_msg))
+
+        if error_msg is None:
+            alert_delivery_attempts_total.labels(outcome="delivered").inc()
+            self._observe_latency(delivery["created_at"])
+            print(f"[delivery_dispatcher] ✅ Delivered alert to {url}")
+            return
+
+        new_attempt_count = delivery["attempt_count"] + 1
+        if new_attempt_count >= delivery["max_attempts"]:
+            alert_delivery_attempts_total.labels(outcome="dead_letter").inc()
+            self._dead_letters.append(_dead_letter_event(delivery, new_attempt_count, error_msg))
+            print(
+                f"[delivery_dispatcher] ☠️  Dead letter: Alert delivery failed after {new_attempt_count} attempts to {url} - {error_msg}"
+            )
+        else:
+            alert_delivery_attempts_total.labels(outcome="retry").inc()
+            print(
+                f"[delivery_dispatcher] 🔄 Retry scheduled for {url} (attempt {new_attempt_count}/{delivery['max_attempts']}): {error_msg}"
+            )
+
+    def _observe_latency(self, created_at: str) -> None:
+        try:
+            latency = (datetime.now(UTC) - datetime.fromisoformat(created_at)).total_seconds()
+        except (TypeError, ValueError):
+            return
+        latency = max(0.0, latency)
+        alert_delivery_latency_seconds.observe(latency)
+        self._latencies.append(latency)
+        p50, p99 = self._quantiles()
+        alert_delivery_latency_p50_seconds.set(p50)
+        alert_delivery_latency_p99_seconds.set(p99)
+
+    def _quantiles(self) -> tuple[float, float]:
+        if not self._latencies:
+            return 0.0, 0.0
+        ordered = sorted(self._latencies)
+        last = len(ordered) - 1
+        return ordered[round(last * 0.5)], ordered[round(last * 0.99)]
+
+
+# Process-wide pool run by alert_evaluator.delivery_dispatcher_loop
+delivery_pool = DeliveryWorkerPool()
@@ -0,0 +1,204 @@
+"""
+Batched, group-commit ingestion path for the event store.
+
+Events are pushed onto a bounded asyncio queue and a single background
+task commits them to SQLite with one executemany transaction every
+EVENT_INGEST_BATCH_SIZE events or EVENT_INGEST_FLUSH_MS milliseconds,
+whichever comes first. When the queue is full, producers wait
+(backpressure) instead of growing memory without bound.
+
+The writer is started and stopped from the FastAPI lifespan; stop()
+drains the queue so buffered events are durably flushed on shutdown.
+Commit listeners (e.g. the SSE broadcaster) are called on the event loop
+with each committed batch, after save_events has stamped the store ids.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+import event_store
+from prometheus_client import Counter, Gauge, Histogram
+
+EVENT_INGEST_BATCH_SIZE = int(os.getenv("EVENT_INGEST_BATCH_SIZE", "200"))
+EVENT_INGEST_FLUSH_MS = int(os.getenv("EVENT_INGEST_FLUSH_MS", "50"))
+EVENT_INGEST_QUEUE_MAX = int(os.getenv("EVENT_INGEST_QUEUE_MAX", "10000"))
+
+event_ingest_queue_depth = Gauge(
+    "aetherlink_event_ingest_queue_depth",
+    "Events buffered in the ingest queue awaiting group commit",
+)
+event_ingest_backpressure_total = Counter(
+    "aetherlink_event_ingest_backpressure_total",
+    "Submissions that had to wait because the ingest queue was full",
+)
+event_ingest_events_total = Counter(
+    "aetherlink_event_ingest_events_total",
+    "Events committed through the batched ingest path",
+)
+event_ingest_failures_total = Counter(
+    "aetherlink_event_ingest_failures_total",
+    "Events whose batch commit failed",
+)
+event_ingest_batch_size = Histogram(
+    "aetherlink_event_ingest_batch_size",
+    "Events per group commit",
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500, 1000),
+)
+event_ingest_flush_seconds = Histogram(
+    "aetherlink_event_ingest_flush_seconds",
+    "Latency of one group commit",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Queue item: (event, future resolved once committed, or None for fire-and-forget)
+_Item = tuple[dict[str, Any], asyncio.Future | None]
+_STOP = object()
+
+
+class EventBatchWriter:
+    """Single-consumer group-commit writer for event_store."""
+
+    def __init__(
+        self,
+        save_batch: Callable[[list[dict[str, Any]]], Any] | None = None,
+        max_batch: int = EVENT_INGEST_BATCH_SIZE,
+        flush_ms: int = EVENT_INGEST_FLUSH_MS,
+        max_queue: int = EVENT_INGEST_QUEUE_MAX,
+    ) -> None:
+        self._save_batch = save_batch or event_store.save_events
+        self.max_batch = max(1, max_batch)
+        self.flush_seconds = max(0, flush_ms) / 1000
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._listeners: list[Callable[[list[dict[str, Any]]], Any]] = []
+
+    def add_commit_listener(self, callback: Callable[[list[dict[str, Any]]], Any]) -> None:
+        """Call callback(events) on the event loop after every committed batch."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_commit_listener(self, callback: Callable[[list[dict[str, Any]]], Any]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, events: list[dict[str, Any]]) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"[event_ingest] ⚠️  Commit listener failed: {e}")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background commit task (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="event-batch-writer")
+
+    async def stop(self) -> None:
+        """Flush everything still buffered, then stop the commit task."""
+        if not self.running or self._queue is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, event: dict[str, Any], wait: bool = False) -> None:
+        """
+        Queue one event for group commit.
+
+        Args:
+            event: Normalized event (same shape as event_store.save_event)
+            wait: If True, return only after the event's batch is committed
+        """
+        await self.submit_many([event], wait=wait)
+
+    async def submit_many(self, events: list[dict[str, Any]], wait: bool = False) -> None:
+        """Queue several events; optionally wait until all are committed."""
+        if not events:
+            return
+        if not self.running or self._queue is None:
+            # Writer not started (scripts, tests): commit directly, off the loop
+            await asyncio.to_thread(self._save_batch, events)
+            event_ingest_events_total.inc(len(events))
+            self._notify(events)
+            return
+
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future] = []
+        for event in events:
+            fut = loop.create_future() if wait else None
+            if fut is not None:
+                futures.append(fut)
+            if self._queue.full():
+                event_ingest_backpressure_total.inc()
+            await self._queue.put((event, fut))
+        event_ingest_queue_depth.set(self._queue.qsize())
+
+        if futures:
+            await asyncio.gather(*futures)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch: list[_Item] = [first]
+            deadline = loop.time() + self.flush_seconds
+
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            event_ingest_queue_depth.set(self._queue.qsize())
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[_Item]) -> None:
+        events = [event for event, _ in batch]
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._save_batch, events)
+        except Exception as e:
+            event_ingest_failures_total.inc(len(events))
+            print(f"[event_ingest] ⚠️  Group commit of {len(events)} events failed: {e}")
+            for _, fut in batch:
+                if fut is not None and not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            event_ingest_flush_seconds.observe(time.perf_counter() - start)
+            event_ingest_batch_size.observe(len(events))
+
+        event_ingest_events_total.inc(len(events))
+        self._notify(events)
+        for _, fut in batch:
+            if fut is not None and not fut.done():
+                fut.set_result(None)
+
+
+# Process-wide writer used by routers and the app lifespan
+event_writer = EventBatchWriter()
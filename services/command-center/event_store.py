@@ -4,29 +4,74 @@ Event storage layer for Command Center.
 Phase VI M2: Persistent event storage using SQLite.
 """
 
+import base64
+import gzip
+import io
 import json
 import os
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from prometheus_client import Counter, Gauge, Histogram
+from sqlite_pool import SQLitePool
+
+try:
+    import zstandard
+except ImportError:  # optional: EVENT_ARCHIVE_COMPRESSION=zstd falls back to gzip
+    zstandard = None
+
 DB_PATH = os.getenv("EVENT_DB_PATH", "/data/events.db")
+EVENT_DB_READERS = int(os.getenv("EVENT_DB_READERS", "4"))
+# Per-minute rollups are trimmed after this many hours (per-hour rollups follow
+# event retention). At least 24h so the dashboard's last_24h stays answerable.
+EVENT_ROLLUP_MINUTE_HOURS = max(24, int(os.getenv("EVENT_ROLLUP_MINUTE_HOURS", "48")))
+
+_POOL: SQLitePool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> SQLitePool:
+    """
+    Get the shared connection pool for the events database.
+
+    The pool is (re)built lazily whenever DB_PATH changes, so tests and
+    tools that repoint DB_PATH keep working.
+    """
+    global _POOL
+    pool = _POOL
+    if pool is not None and pool.path == DB_PATH:
+        return pool
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.path != DB_PATH:
+            if _POOL is not None:
+                _POOL.close()
+            _POOL = SQLitePool(DB_PATH, name="events", readers=EVENT_DB_READERS)
+        return _POOL
 
 
 def get_conn():
-    """Get SQLite connection with dict row factory."""
-    # Ensure folder exists
-    Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+    """
+    Get a standalone SQLite connection with dict row factory.
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    Kept for scripts and ad-hoc access; the store itself uses get_pool().
+    The caller owns the connection and must close it.
+    """
+    return get_pool().connect()
 
 
 def init_db():
     """Initialize events database schema."""
-    conn = get_conn()
+    with get_pool().write("init_db") as conn:
+        _create_schema(conn)
+    print("[event_store] ✅ Database initialized")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS events (
@@ -47,6 +92,15 @@ def init_db():
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events(event_type, timestamp)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source_ts ON events(source, timestamp)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_tenant_ts ON events(tenant_id, timestamp)")
+    # Event browsing (browse_events): one index per real filter combination, each
+    # ending in timestamp so the (timestamp, id) keyset order is read straight off it
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(timestamp)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_tenant_sev_ts ON events(tenant_id, severity, timestamp)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_type_tenant_ts ON events(event_type, tenant_id, timestamp)"
+    )
 
     # Phase VII M4: Per-tenant retention policies
     conn.execute(
@@ -96,9 +150,168 @@ def init_db():
         """
     )
 
-    conn.commit()
-    conn.close()
-    print("[event_store] ✅ Database initialized")
+    # Resumable pruning: one row per scope while a prune pass is in flight
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS prune_checkpoint (
+            scope TEXT PRIMARY KEY,
+            cutoff TEXT NOT NULL,
+            last_id INTEGER NOT NULL,
+            pruned_count INTEGER NOT NULL,
+            archived_count INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+    # Event count rollups (per minute / per hour). NULL tenant_id and severity
+    # are stored as '' so they take part in the primary key.
+    for table, _ in _ROLLUP_TABLES:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                bucket INTEGER NOT NULL,
+                tenant_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                cnt INTEGER NOT NULL,
+                PRIMARY KEY (bucket, tenant_id, event_type, source, severity)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_tenant ON {table}(tenant_id, bucket)")
+
+    # Backfill rollups for databases created before they existed
+    if conn.execute("SELECT 1 FROM event_rollup_hour LIMIT 1").fetchone() is None:
+        if conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() is not None:
+            _apply_rollups(conn, "1=1", ())
+            print("[event_store] 📊 Backfilled event rollups")
+
+
+# ============================================================================
+# Event count rollups
+# ============================================================================
+
+# (table, bucket width in seconds)
+_ROLLUP_TABLES = (("event_rollup_minute", 60), ("event_rollup_hour", 3600))
+
+
+def _apply_rollups(conn: sqlite3.Connection, where: str, params: tuple, sign: int = 1) -> None:
+    """
+    Add (sign=1) or subtract (sign=-1) the events matching `where` to the rollups.
+
+    Must run inside the write transaction that inserts or deletes those
+    events so rollups and the events table never disagree. Buckets are
+    computed by SQLite from the stored timestamp; unparseable timestamps
+    are not rolled up.
+    """
+    for table, width in _ROLLUP_TABLES:
+        conn.execute(
+            f"""
+            INSERT INTO {table} (bucket, tenant_id, event_type, source, severity, cnt)
+            SELECT CAST(strftime('%s', timestamp) AS INTEGER) / {width} * {width},
+                   COALESCE(tenant_id, ''), event_type, source, COALESCE(severity, ''),
+                   {sign} * COUNT(*)
+            FROM events
+            WHERE ({where}) AND strftime('%s', timestamp) IS NOT NULL
+            GROUP BY 1, 2, 3, 4, 5
+            ON CONFLICT (bucket, tenant_id, event_type, source, severity)
+            DO UPDATE SET cnt = cnt + excluded.cnt
+            """,
+            params,
+        )
+
+
+def _trim_rollups(conn: sqlite3.Connection, now: datetime) -> None:
+    """Drop emptied rollup rows and minute buckets past EVENT_ROLLUP_MINUTE_HOURS."""
+    minute_cutoff = int(now.timestamp()) - EVENT_ROLLUP_MINUTE_HOURS * 3600
+    conn.execute("DELETE FROM event_rollup_minute WHERE bucket < ?", (minute_cutoff,))
+    for table, _ in _ROLLUP_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE cnt <= 0")
+
+
+def _rollup_for_since(since: str | None) -> tuple[str, int | None] | None:
+    """
+    Pick the rollup table that answers `timestamp >= since` exactly.
+
+    Returns (table, first_bucket), or None when since is not a UTC instant on
+    a bucket boundary (or predates the retained minute buckets) and the
+    query has to go to the events table.
+    """
+    if not since:
+        return "event_rollup_hour", None
+    try:
+        dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    if dt.utcoffset() or dt.microsecond or dt.second:
+        return None
+    sec = int(dt.timestamp())
+    if sec % 3600 == 0:
+        return "event_rollup_hour", sec
+    if sec >= time.time() - EVENT_ROLLUP_MINUTE_HOURS * 3600:
+        return "event_rollup_minute", sec
+    return None
+
+
+def _rollup_filters(
+    event_type: str | None,
+    source: str | None,
+    tenant_id: str | None,
+    severity: str | None,
+) -> tuple[str, list]:
+    """WHERE fragment over a rollup table mirroring the events-table filters."""
+    clause = ""
+    params: list = []
+    if event_type:
+        clause += " AND event_type = ?"
+        params.append(event_type)
+    if source:
+        clause += " AND source = ?"
+        params.append(source)
+    # System events (NULL tenant) are rolled up under ''
+    if tenant_id:
+        clause += " AND (tenant_id = ? OR tenant_id = '')"
+        params.append(tenant_id)
+    if severity:
+        clause += " AND severity = ?"
+        params.append(severity.lower())
+    return clause, params
+
+
+def get_event_rollups(since_sec: int, tenant_id: str | None = None) -> list[dict[str, Any]]:
+    """
+    Event counts per (tenant_id, event_type, source, severity) from the
+    hourly rollups, for buckets starting at or after since_sec.
+
+    since_sec is rounded down to the hour. System events report tenant_id None.
+    """
+    clause, params = _rollup_filters(None, None, tenant_id, None)
+    with get_pool().read("get_event_rollups") as conn:
+        rows = conn.execute(
+            f"""
+            SELECT tenant_id, event_type, source, severity, SUM(cnt) AS cnt
+            FROM event_rollup_hour
+            WHERE bucket >= ?{clause}
+            GROUP BY tenant_id, event_type, source, severity
+            """,
+            [since_sec // 3600 * 3600, *params],
+        ).fetchall()
+    return [
+        {
+            "tenant_id": row["tenant_id"] or None,
+            "event_type": row["event_type"],
+            "source": row["source"],
+            "severity": row["severity"] or None,
+            "count": row["cnt"],
+        }
+        for row in rows
+        if row["cnt"] > 0
+    ]
 
 
 def json_dumps_safe(obj: Any) -> str:
@@ -117,31 +330,297 @@ def json_loads_safe(s: str) -> Any:
         return {}
 
 
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (
+        event_id, event_type, source, tenant_id, severity,
+        timestamp, payload, received_at, client_ip
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _event_row(event: dict[str, Any]) -> tuple:
+    """Map an event dict onto the events table column order."""
+    return (
+        event.get("event_id"),
+        event["event_type"],
+        event["source"],
+        event.get("tenant_id", "default"),
+        event.get("severity", "info"),
+        event["timestamp"],
+        json_dumps_safe(event.get("payload")),
+        event["_meta"]["received_at"],
+        event["_meta"].get("client_ip"),
+    )
+
+
 def save_event(event: dict[str, Any]):
     """Save event to persistent storage."""
-    conn = get_conn()
-    conn.execute(
-        """
-        INSERT INTO events (
-            event_id, event_type, source, tenant_id, severity,
-            timestamp, payload, received_at, client_ip
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            event.get("event_id"),
-            event["event_type"],
-            event["source"],
-            event.get("tenant_id", "default"),
-            event.get("severity", "info"),
-            event["timestamp"],
-            json_dumps_safe(event.get("payload")),
-            event["_meta"]["received_at"],
-            event["_meta"].get("client_ip"),
-        ),
+    save_events([event])
+
+
+def save_events(events: list[dict[str, Any]]) -> int:
+    """
+    Save a batch of events in a single transaction (group commit).
+
+    Used by the batched ingest writer so a burst of events pays for one
+    fsync instead of one per event. Each event dict gets its store "id"
+    (the SSE event id that clients resume from).
+
+    Returns:
+        Number of events written
+    """
+    if not events:
+        return 0
+    rows = [_event_row(event) for event in events]
+    with get_pool().write("save_events") as conn:
+        # Single writer: the batch gets the ids right after the current max
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        conn.executemany(_INSERT_EVENT_SQL, rows)
+        ids = conn.execute("SELECT id FROM events WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+        _apply_rollups(conn, "id > ?", (last_id,))
+    for event, row in zip(events, ids, strict=False):
+        event["id"] = row[0]
+    return len(rows)
+
+
+def _event_dict(r: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "id": r["id"],
+        "event_id": r["event_id"],
+        "event_type": r["event_type"],
+        "source": r["source"],
+        "tenant_id": r["tenant_id"],
+        "severity": r["severity"],
+        "timestamp": r["timestamp"],
+        "payload": json_loads_safe(r["payload"]),
+        "received_at": r["received_at"],
+        "_meta": {
+            "received_at": r["received_at"],
+            "client_ip": r["client_ip"],
+        },
+    }
+
+
+def list_after(after_id: int, limit: int = 1000) -> list[dict[str, Any]]:
+    """
+    Events stored after a given id, oldest first (SSE Last-Event-ID resume).
+
+    Args:
+        after_id: Last event id the client received
+        limit: Maximum number of events to return
+
+    Returns:
+        List of events (same shape as list_recent)
+    """
+    with get_pool().read("list_after") as conn:
+        rows = conn.execute(
+            """
+            SELECT id, event_id, event_type, source, tenant_id, severity,
+                   timestamp, payload, received_at, client_ip
+            FROM events
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+            """,
+            (after_id, limit),
+        ).fetchall()
+    return [_event_dict(r) for r in rows]
+
+
+# ============================================================================
+# Event browsing: keyset pagination, light projection, NDJSON export
+# ============================================================================
+
+BROWSE_MAX_LIMIT = int(os.getenv("EVENT_BROWSE_MAX_LIMIT", "500"))
+EXPORT_BATCH_SIZE = int(os.getenv("EVENT_EXPORT_BATCH_SIZE", "1000"))
+
+_LIGHT_COLUMNS = "id, event_id, event_type, source, tenant_id, severity, timestamp, received_at"
+_FULL_COLUMNS = f"{_LIGHT_COLUMNS}, payload, client_ip"
+
+
+def encode_cursor(timestamp: str, event_id: int) -> str:
+    """Opaque keyset cursor for the position after (timestamp, id)."""
+    raw = json.dumps([timestamp, event_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, event_id = json.loads(raw)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(timestamp, str) or not isinstance(event_id, int):
+        raise ValueError("invalid cursor")
+    return timestamp, event_id
+
+
+def _browse_row(r: sqlite3.Row, full: bool) -> dict[str, Any]:
+    if full:
+        return _event_dict(r)
+    return {key: r[key] for key in r.keys()}
+
+
+def _browse_query(
+    *,
+    full: bool,
+    limit: int,
+    after: tuple[str, int] | None,
+    tenant_id: str | None,
+    include_system: bool,
+    event_type: str | None,
+    source: str | None,
+    severity: str | None,
+    since: str | None,
+    until: str | None,
+) -> tuple[str, list[Any]]:
+    """
+    SQL for one page, newest first by (timestamp, id).
+
+    The tenant filter is split into "tenant_id = ?" and "tenant_id IS NULL"
+    branches (UNION ALL, each with its own ORDER BY/LIMIT) so both can seek
+    an index; an OR across the two cannot.
+    """
+    clause = ""
+    params: list[Any] = []
+    if event_type:
+        clause += " AND event_type = ?"
+        params.append(event_type)
+    if source:
+        clause += " AND source = ?"
+        params.append(source)
+    if severity:
+        clause += " AND severity = ?"
+        params.append(severity.lower())
+    if since:
+        clause += " AND timestamp >= ?"
+        params.append(since)
+    if until:
+        clause += " AND timestamp < ?"
+        params.append(until)
+    if after is not None:
+        clause += " AND (timestamp, id) < (?, ?)"
+        params.extend(after)
+
+    columns = _FULL_COLUMNS if full else _LIGHT_COLUMNS
+    order = "ORDER BY timestamp DESC, id DESC LIMIT ?"
+
+    def branch(tenant_clause: str, tenant_params: list[Any]) -> tuple[str, list[Any]]:
+        sql = f"SELECT {columns} FROM events WHERE 1=1{tenant_clause}{clause} {order}"
+        return sql, [*tenant_params, *params, limit]
+
+    if not tenant_id:
+        return branch("", [])
+    tenant_sql, tenant_params = branch(" AND tenant_id = ?", [tenant_id])
+    if not include_system:
+        return tenant_sql, tenant_params
+    system_sql, system_params = branch(" AND tenant_id IS NULL", [])
+    sql = (
+        f"SELECT * FROM (SELECT * FROM ({tenant_sql}) UNION ALL SELECT * FROM ({system_sql})) "
+        f"{order}"
+    )
+    return sql, [*tenant_params, *system_params, limit]
+
+
+def browse_events(
+    limit: int = 50,
+    cursor: str | None = None,
+    tenant_id: str | None = None,
+    include_system: bool = True,
+    event_type: str | None = None,
+    source: str | None = None,
+    severity: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    fields: str = "light",
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    One page of events, newest first, with an opaque keyset cursor.
+
+    Args:
+        limit: Page size (capped at EVENT_BROWSE_MAX_LIMIT)
+        cursor: next_cursor from the previous page
+        tenant_id: Filter by tenant (plus system events unless include_system=False)
+        include_system: Include events without a tenant when filtering by tenant
+        event_type: Filter by event type
+        source: Filter by source service
+        severity: Filter by severity level
+        since: Only events with timestamp >= since (ISO string)
+        until: Only events with timestamp < until (ISO string)
+        fields: "light" (header columns, payload not read) or "full"
+
+    Returns:
+        (events, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: Invalid cursor or fields
+    """
+    if fields not in ("light", "full"):
+        raise ValueError("fields must be 'light' or 'full'")
+    limit = max(1, min(limit, BROWSE_MAX_LIMIT))
+    full = fields == "full"
+    sql, params = _browse_query(
+        full=full,
+        limit=limit,
+        after=decode_cursor(cursor) if cursor else None,
+        tenant_id=tenant_id,
+        include_system=include_system,
+        event_type=event_type,
+        source=source,
+        severity=severity,
+        since=since,
+        until=until,
     )
-    conn.commit()
-    conn.close()
+    with get_pool().read("browse_events") as conn:
+        rows = conn.execute(sql, params).fetchall()
+    events = [_browse_row(r, full) for r in rows]
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    return events, next_cursor
+
+
+def iter_events(
+    tenant_id: str | None = None,
+    include_system: bool = True,
+    event_type: str | None = None,
+    source: str | None = None,
+    severity: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    fields: str = "full",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Every matching event, newest first, for exports of any size.
+
+    Reads keyset pages of batch_size, borrowing a reader connection only
+    while each page is fetched, so a slow consumer never pins one.
+    """
+    full = fields == "full"
+    after: tuple[str, int] | None = None
+    while True:
+        sql, params = _browse_query(
+            full=full,
+            limit=batch_size,
+            after=after,
+            tenant_id=tenant_id,
+            include_system=include_system,
+            event_type=event_type,
+            source=source,
+            severity=severity,
+            since=since,
+            until=until,
+        )
+        with get_pool().read("iter_events") as conn:
+            rows = conn.execute(sql, params).fetchall()
+        for r in rows:
+            yield _browse_row(r, full)
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1]["timestamp"], rows[-1]["id"])
 
 
 def list_recent(
@@ -166,8 +645,6 @@ def list_recent(
     Returns:
         List of events (newest first)
     """
-    conn = get_conn()
-
     # Build query with optional filters
     query = """
         SELECT id, event_id, event_type, source, tenant_id, severity,
@@ -203,31 +680,10 @@ def list_recent(
     query += " ORDER BY id DESC LIMIT ?"
     params.append(limit)
 
-    cur = conn.execute(query, params)
-    rows = cur.fetchall()
-    conn.close()
+    with get_pool().read("list_recent") as conn:
+        rows = conn.execute(query, params).fetchall()
 
-    out = []
-    for r in rows:
-        out.append(
-            {
-                "id": r["id"],
-                "event_id": r["event_id"],
-                "event_type": r["event_type"],
-                "source": r["source"],
-                "tenant_id": r["tenant_id"],
-                "severity": r["severity"],
-                "timestamp": r["timestamp"],
-                "payload": json_loads_safe(r["payload"]),
-                "received_at": r["received_at"],
-                "_meta": {
-                    "received_at": r["received_at"],
-                    "client_ip": r["client_ip"],
-                },
-            }
-        )
-
-    return out
+    return [_event_dict(r) for r in rows]
 
 
 def count_events(
@@ -241,8 +697,20 @@ def count_events(
     Count total events with optional filters.
 
     Phase VI M6: Added severity and since for alert evaluation.
+    Served from the rollups when since is empty or falls on a bucket boundary.
     """
-    conn = get_conn()
+    rollup = _rollup_for_since(since)
+    if rollup is not None:
+        table, first_bucket = rollup
+        clause, params = _rollup_filters(event_type, source, tenant_id, severity)
+        if first_bucket is not None:
+            clause += " AND bucket >= ?"
+            params.append(first_bucket)
+        with get_pool().read("count_events") as conn:
+            result = conn.execute(
+                f"SELECT COALESCE(SUM(cnt), 0) AS cnt FROM {table} WHERE 1=1{clause}", params
+            ).fetchone()
+        return result["cnt"]
 
     query = "SELECT COUNT(*) as cnt FROM events WHERE 1=1"
     params = []
@@ -268,9 +736,8 @@ def count_events(
         query += " AND timestamp >= ?"
         params.append(since)
 
-    cur = conn.execute(query, params)
-    result = cur.fetchone()
-    conn.close()
+    with get_pool().read("count_events") as conn:
+        result = conn.execute(query, params).fetchone()
 
     return result["cnt"] if result else 0
 
@@ -282,55 +749,43 @@ def get_event_stats(tenant_id: str | None = None) -> dict[str, Any]:
     Phase VI M5: Returns total events, last 24h count, and breakdown by severity.
     Phase VII M3: Added tenant_id filtering for multi-tenant stats.
 
+    Read from the rollups: totals from the hourly buckets, last_24h from the
+    minute buckets (window starts on the minute 24h ago).
+
     Args:
         tenant_id: Filter stats by tenant ID (optional)
 
     Returns:
         Dictionary with stats including total, last_24h, and by_severity
     """
-    conn = get_conn()
-
-    # Build WHERE clause for tenant filtering (includes NULL tenant_id for system events)
-    tenant_filter = ""
-    params = []
-    if tenant_id:
-        tenant_filter = " WHERE (tenant_id = ? OR tenant_id IS NULL)"
-        params = [tenant_id]
-
-    # Total events
-    total_query = f"SELECT COUNT(*) as cnt FROM events{tenant_filter}"
-    total_result = conn.execute(total_query, params).fetchone()
-    total = total_result["cnt"] if total_result else 0
-
-    # Events by severity
-    severity_query = f"""
-        SELECT severity, COUNT(*) as cnt
-        FROM events
-        {tenant_filter}
-        GROUP BY severity
-    """
-    severity_cur = conn.execute(severity_query, params)
-    by_severity = {row["severity"]: row["cnt"] for row in severity_cur.fetchall()}
-
-    # Last 24 hours
-    last_24h_where = (
-        " AND timestamp >= datetime('now', '-1 day')"
-        if tenant_id
-        else " WHERE timestamp >= datetime('now', '-1 day')"
-    )
-    last_24h_query = f"""
-        SELECT COUNT(*) as cnt
-        FROM events
-        {tenant_filter}{last_24h_where if not tenant_id else " AND timestamp >= datetime('now', '-1 day')"}
-    """
-    last_24h_params = params if tenant_id else []
-    last_24h_result = conn.execute(last_24h_query, last_24h_params).fetchone()
-    last_24h = last_24h_result["cnt"] if last_24h_result else 0
+    # Tenant filtering includes system events (NULL tenant, rolled up as '')
+    clause, params = _rollup_filters(None, None, tenant_id, None)
+    last_24h_from = (int(time.time()) - 86400) // 60 * 60
+
+    with get_pool().read("get_event_stats") as conn:
+        # Events by severity
+        severity_cur = conn.execute(
+            f"""
+            SELECT severity, SUM(cnt) AS cnt
+            FROM event_rollup_hour
+            WHERE 1=1{clause}
+            GROUP BY severity
+            """,
+            params,
+        )
+        by_severity = {
+            row["severity"] or None: row["cnt"] for row in severity_cur.fetchall() if row["cnt"]
+        }
 
-    conn.close()
+        # Last 24 hours
+        last_24h_result = conn.execute(
+            f"SELECT COALESCE(SUM(cnt), 0) AS cnt FROM event_rollup_minute WHERE bucket >= ?{clause}",
+            [last_24h_from, *params],
+        ).fetchone()
+        last_24h = last_24h_result["cnt"]
 
     return {
-        "total": total,
+        "total": sum(by_severity.values()),
         "last_24h": last_24h,
         "by_severity": by_severity,
     }
@@ -343,6 +798,31 @@ def get_event_stats(tenant_id: str | None = None) -> dict[str, Any]:
 RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DAYS", "7"))
 ARCHIVE_ENABLED = os.getenv("EVENT_ARCHIVE_ENABLED", "false").lower() == "true"
 ARCHIVE_DIR = os.getenv("EVENT_ARCHIVE_DIR", "/app/data/archive")
+ARCHIVE_COMPRESSION = os.getenv("EVENT_ARCHIVE_COMPRESSION", "gzip").lower()  # gzip|zstd|none
+PRUNE_BATCH_SIZE = int(os.getenv("EVENT_PRUNE_BATCH_SIZE", "5000"))
+PRUNE_PAUSE_MS = int(os.getenv("EVENT_PRUNE_PAUSE_MS", "50"))
+
+event_prune_rows_total = Counter(
+    "aetherlink_event_prune_rows_total",
+    "Events deleted by the retention pruner",
+)
+event_prune_archived_total = Counter(
+    "aetherlink_event_prune_archived_total",
+    "Events written to the NDJSON archive before pruning",
+)
+event_prune_batch_seconds = Histogram(
+    "aetherlink_event_prune_batch_seconds",
+    "Latency of one prune batch (archive + delete)",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+event_prune_progress_rows = Gauge(
+    "aetherlink_event_prune_progress_rows",
+    "Events pruned so far in the scope currently being pruned",
+)
+event_prune_rows_per_second = Gauge(
+    "aetherlink_event_prune_rows_per_second",
+    "Delete throughput of the most recent prune pass",
+)
 
 
 # ============================================================================
@@ -360,13 +840,9 @@ def get_tenant_retention_map() -> dict[str, int]:
     Returns:
         Dictionary mapping tenant_id to retention_days
     """
-    conn = get_conn()
-    try:
-        cur = conn.execute("SELECT tenant_id, retention_days FROM tenant_retention")
-        rows = cur.fetchall()
-        return {row["tenant_id"]: row["retention_days"] for row in rows}
-    finally:
-        conn.close()
+    with get_pool().read("get_tenant_retention_map") as conn:
+        rows = conn.execute("SELECT tenant_id, retention_days FROM tenant_retention").fetchall()
+    return {row["tenant_id"]: row["retention_days"] for row in rows}
 
 
 def set_tenant_retention(tenant_id: str, retention_days: int) -> dict[str, Any]:
@@ -380,10 +856,9 @@ def set_tenant_retention(tenant_id: str, retention_days: int) -> dict[str, Any]:
     Returns:
         Summary with tenant_id and retention_days
     """
-    conn = get_conn()
     now = datetime.now(UTC).isoformat()
 
-    try:
+    with get_pool().write("set_tenant_retention") as conn:
         # Upsert tenant retention policy
         conn.execute(
             """
@@ -395,10 +870,7 @@ def set_tenant_retention(tenant_id: str, retention_days: int) -> dict[str, Any]:
             """,
             (tenant_id, retention_days, now, now),
         )
-        conn.commit()
-        return {"tenant_id": tenant_id, "retention_days": retention_days, "updated_at": now}
-    finally:
-        conn.close()
+    return {"tenant_id": tenant_id, "retention_days": retention_days, "updated_at": now}
 
 
 def delete_tenant_retention(tenant_id: str) -> dict[str, Any]:
@@ -411,13 +883,183 @@ def delete_tenant_retention(tenant_id: str) -> dict[str, Any]:
     Returns:
         Summary with deleted tenant_id
     """
-    conn = get_conn()
-    try:
+    with get_pool().write("delete_tenant_retention") as conn:
         conn.execute("DELETE FROM tenant_retention WHERE tenant_id = ?", (tenant_id,))
-        conn.commit()
-        return {"tenant_id": tenant_id, "reverted_to_global": True}
+    return {"tenant_id": tenant_id, "reverted_to_global": True}
+
+
+def _open_archive(cutoff: str):
+    """Open the archive file for a cutoff date in append mode, compressed per ARCHIVE_COMPRESSION."""
+    Path(ARCHIVE_DIR).mkdir(parents=True, exist_ok=True)
+    path = Path(ARCHIVE_DIR) / f"events-{cutoff[:10]}.ndjson"
+    compression = ARCHIVE_COMPRESSION
+    if compression == "zstd" and zstandard is None:
+        print("[event_store] ⚠️  zstandard not installed, archiving with gzip")
+        compression = "gzip"
+
+    # Appending adds a new gzip member / zstd frame; readers decode them back to back
+    if compression == "zstd":
+        path = path.with_name(path.name + ".zst")
+        writer = zstandard.ZstdCompressor().stream_writer(path.open("ab"))
+        return path, io.TextIOWrapper(writer, encoding="utf-8")
+    if compression == "gzip":
+        path = path.with_name(path.name + ".gz")
+        return path, gzip.open(path, "at", encoding="utf-8")
+    return path, path.open("a", encoding="utf-8")
+
+
+def _archive_rows(conn: sqlite3.Connection, f, where: str, params: tuple) -> int:
+    """Stream matching events to an open archive file through a cursor."""
+    written = 0
+    cur = conn.execute(
+        f"""
+        SELECT event_id, event_type, source, severity, tenant_id,
+               payload, timestamp, received_at, client_ip
+        FROM events
+        WHERE {where}
+        ORDER BY id
+        """,
+        params,
+    )
+    for row in cur:
+        event_dict = {
+            "event_id": row["event_id"],
+            "event_type": row["event_type"],
+            "source": row["source"],
+            "severity": row["severity"],
+            "tenant_id": row["tenant_id"],
+            "payload": row["payload"],
+            "timestamp": row["timestamp"],
+            "received_at": row["received_at"],
+            "client_ip": row["client_ip"],
+        }
+        f.write(json.dumps(event_dict) + "\n")
+        written += 1
+    f.flush()
+    return written
+
+
+def _prune_in_batches(scope: str, where: str, params: tuple, cutoff: datetime) -> dict[str, Any]:
+    """
+    Delete events matching `where AND timestamp < cutoff`, PRUNE_BATCH_SIZE rows at a time.
+
+    Each batch takes its ids from the tenant/timestamp indexes. Rows pruned
+    by earlier batches are already gone, so a batch only visits the rows it
+    deletes, however the scope's rows are spread over the table. The batch
+    is archived (optional), then deleted together with its rollup counts
+    and a checkpoint row in one short write transaction, and the pruner
+    sleeps PRUNE_PAUSE_MS between full batches so ingest is not starved. A
+    scope with nothing expired takes no write lock and never sleeps.
+    An interrupted pass resumes from its checkpoint (same cutoff and counts);
+    a batch archived just before a crash may be archived twice.
+
+    Returns:
+        Summary with cutoff, pruned/archived counts, throughput and whether
+        the pass was resumed
+    """
+    pool = get_pool()
+    with pool.read("prune_checkpoint") as conn:
+        cp = conn.execute("SELECT * FROM prune_checkpoint WHERE scope = ?", (scope,)).fetchone()
+
+    resumed = cp is not None
+    cutoff_iso = cp["cutoff"] if cp else cutoff.isoformat()
+    last_id = cp["last_id"] if cp else 0
+    pruned = cp["pruned_count"] if cp else 0
+    archived = cp["archived_count"] if cp else 0
+    started_at = cp["started_at"] if cp else datetime.now(UTC).isoformat()
+    if resumed:
+        print(f"[event_store] ↩️  Resuming {scope} prune ({pruned} done, cutoff {cutoff_iso})")
+
+    select_batch = f"SELECT id FROM events WHERE ({where}) AND timestamp < ? LIMIT ?"
+    select_params = (*params, cutoff_iso, PRUNE_BATCH_SIZE)
+    archive = ARCHIVE_ENABLED
+    archive_file = None
+    archive_path = None
+    run_pruned = 0
+    run_start = time.perf_counter()
+
+    try:
+        while True:
+            batch_start = time.perf_counter()
+            with pool.read("prune_events") as conn:
+                ids = [row["id"] for row in conn.execute(select_batch, select_params)]
+            if not ids:
+                break
+            batch_where = f"id IN ({', '.join('?' * len(ids))})"
+            batch_params = tuple(ids)
+
+            if archive:
+                try:
+                    if archive_file is None:
+                        archive_path, archive_file = _open_archive(cutoff_iso)
+                    with pool.read("prune_archive") as conn:
+                        n_archived = _archive_rows(conn, archive_file, batch_where, batch_params)
+                    archived += n_archived
+                    event_prune_archived_total.inc(n_archived)
+                except Exception as e:
+                    print(f"[event_store] ⚠️  Archive failed: {e}")
+                    # Continue with deletion even if archive fails
+                    archive = False
+
+            last_id = max(last_id, *ids)
+            with pool.write("prune_events") as conn:
+                _apply_rollups(conn, batch_where, batch_params, sign=-1)
+                deleted = conn.execute(
+                    f"DELETE FROM events WHERE {batch_where}", batch_params
+                ).rowcount
+                conn.execute(
+                    """
+                    INSERT INTO prune_checkpoint (
+                        scope, cutoff, last_id, pruned_count, archived_count, started_at, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(scope) DO UPDATE SET
+                        last_id = excluded.last_id,
+                        pruned_count = excluded.pruned_count,
+                        archived_count = excluded.archived_count,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        scope,
+                        cutoff_iso,
+                        last_id,
+                        pruned + deleted,
+                        archived,
+                        started_at,
+                        datetime.now(UTC).isoformat(),
+                    ),
+                )
+
+            pruned += deleted
+            run_pruned += deleted
+            event_prune_rows_total.inc(deleted)
+            event_prune_progress_rows.set(pruned)
+            event_prune_batch_seconds.observe(time.perf_counter() - batch_start)
+
+            if len(ids) < PRUNE_BATCH_SIZE:
+                break  # a short batch was the last of the expired rows
+            time.sleep(PRUNE_PAUSE_MS / 1000)
     finally:
-        conn.close()
+        if archive_file is not None:
+            archive_file.close()
+
+    with pool.write("prune_checkpoint") as conn:
+        conn.execute("DELETE FROM prune_checkpoint WHERE scope = ?", (scope,))
+
+    elapsed = time.perf_counter() - run_start
+    rows_per_second = round(run_pruned / elapsed, 1) if run_pruned and elapsed > 0 else 0.0
+    if run_pruned:
+        event_prune_rows_per_second.set(rows_per_second)
+    if archived and archive_path is not None:
+        print(f"[event_store] 📦 Archived {archived} events to {archive_path}")
+
+    return {
+        "cutoff": cutoff_iso,
+        "pruned_count": pruned,
+        "archived_count": archived,
+        "rows_per_second": rows_per_second,
+        "resumed": resumed,
+    }
 
 
 def prune_old_events_with_per_tenant() -> list[dict[str, Any]]:
@@ -426,7 +1068,9 @@ def prune_old_events_with_per_tenant() -> list[dict[str, Any]]:
 
     Phase VII M4: Prunes system events using global retention, then prunes
     each tenant's events using their custom retention policy (if set) or
-    global default.
+    global default. Each scope is pruned in resumable batches.
+
+    Blocking (sleeps between batches): call from a worker thread.
 
     Returns:
         List of pruning results, one per scope (global/system and per tenant)
@@ -434,70 +1078,64 @@ def prune_old_events_with_per_tenant() -> list[dict[str, Any]]:
     results = []
     tenant_map = get_tenant_retention_map()
     now = datetime.now(UTC)
-    conn = get_conn()
-
-    try:
-        # 1) Prune system/global events (tenant_id IS NULL) using global retention
-        cutoff_global = now - timedelta(days=RETENTION_DAYS)
-        cutoff_global_iso = cutoff_global.isoformat()
+    pool = get_pool()
 
-        cur = conn.execute(
-            "DELETE FROM events WHERE (tenant_id IS NULL OR tenant_id = 'system') AND timestamp < ?",
-            (cutoff_global_iso,),
-        )
-        conn.commit()
-        global_pruned = cur.rowcount
+    # 1) Prune system/global events (tenant_id IS NULL) using global retention
+    cutoff_global = now - timedelta(days=RETENTION_DAYS)
+    summary = _prune_in_batches(
+        "system", "tenant_id IS NULL OR tenant_id = 'system'", (), cutoff_global
+    )
+    global_pruned = summary["pruned_count"]
 
-        results.append(
-            {
-                "scope": "system",
-                "retention_days": RETENTION_DAYS,
-                "cutoff": cutoff_global_iso,
-                "pruned_count": global_pruned,
-            }
-        )
+    results.append(
+        {
+            "scope": "system",
+            "retention_days": RETENTION_DAYS,
+            **summary,
+        }
+    )
 
-        print(
-            f"[event_store] 🗑️  Pruned {global_pruned} system events (retention: {RETENTION_DAYS}d)"
-        )
+    print(f"[event_store] 🗑️  Pruned {global_pruned} system events (retention: {RETENTION_DAYS}d)")
 
-        # 2) Get all distinct tenant_ids from events (excluding NULL/system)
+    # 2) Get all distinct tenant_ids from events (excluding NULL/system), plus
+    #    tenants whose interrupted pass left a checkpoint behind
+    with pool.read("prune_events") as conn:
         tenant_rows = conn.execute(
             "SELECT DISTINCT tenant_id FROM events WHERE tenant_id IS NOT NULL AND tenant_id != 'system'"
         ).fetchall()
-        active_tenants = {row["tenant_id"] for row in tenant_rows}
+        checkpoint_rows = conn.execute(
+            "SELECT scope FROM prune_checkpoint WHERE scope LIKE 'tenant:%'"
+        ).fetchall()
+    active_tenants = {row["tenant_id"] for row in tenant_rows}
+    active_tenants |= {row["scope"][len("tenant:") :] for row in checkpoint_rows}
+
+    # 3) Prune per tenant (use override if exists, else global default)
+    for tenant_id in active_tenants:
+        retention_days = tenant_map.get(tenant_id, RETENTION_DAYS)
+        cutoff_tenant = now - timedelta(days=retention_days)
+        summary = _prune_in_batches(
+            f"tenant:{tenant_id}", "tenant_id = ?", (tenant_id,), cutoff_tenant
+        )
+        tenant_pruned = summary["pruned_count"]
 
-        # 3) Prune per tenant (use override if exists, else global default)
-        for tenant_id in active_tenants:
-            retention_days = tenant_map.get(tenant_id, RETENTION_DAYS)
-            cutoff_tenant = now - timedelta(days=retention_days)
-            cutoff_tenant_iso = cutoff_tenant.isoformat()
+        results.append(
+            {
+                "scope": tenant_id,
+                "retention_days": retention_days,
+                **summary,
+            }
+        )
 
-            cur = conn.execute(
-                "DELETE FROM events WHERE tenant_id = ? AND timestamp < ?",
-                (tenant_id, cutoff_tenant_iso),
+        if tenant_pruned > 0:
+            print(
+                f"[event_store] 🗑️  Pruned {tenant_pruned} events for {tenant_id} "
+                f"(retention: {retention_days}d, {summary['rows_per_second']} rows/s)"
             )
-            conn.commit()
-            tenant_pruned = cur.rowcount
-
-            results.append(
-                {
-                    "scope": tenant_id,
-                    "retention_days": retention_days,
-                    "cutoff": cutoff_tenant_iso,
-                    "pruned_count": tenant_pruned,
-                }
-            )
-
-            if tenant_pruned > 0:
-                print(
-                    f"[event_store] 🗑️  Pruned {tenant_pruned} events for {tenant_id} (retention: {retention_days}d)"
-                )
 
-        return results
+    with pool.write("prune_rollups") as conn:
+        _trim_rollups(conn, now)
 
-    finally:
-        conn.close()
+    return results
 
 
 def prune_old_events() -> dict[str, Any]:
@@ -505,83 +1143,33 @@ def prune_old_events() -> dict[str, Any]:
     Prune events older than retention window.
 
     Phase VII M2: Deletes events older than EVENT_RETENTION_DAYS.
-    Optionally archives them to NDJSON before deletion.
+    Optionally archives them to compressed NDJSON before deletion.
+    Runs in resumable batches; call from a worker thread.
 
     Returns:
         Pruning summary with cutoff timestamp and counts
     """
     cutoff = datetime.now(UTC) - timedelta(days=RETENTION_DAYS)
-    cutoff_iso = cutoff.isoformat()
-
-    conn = get_conn()
-
-    # Count events to be pruned
-    count_result = conn.execute(
-        "SELECT COUNT(*) as cnt FROM events WHERE timestamp < ?", (cutoff_iso,)
-    ).fetchone()
-    prune_count = count_result["cnt"] if count_result else 0
-
-    archived_count = 0
-
-    # Optional: Archive before deletion
-    if ARCHIVE_ENABLED and prune_count > 0:
-        try:
-            Path(ARCHIVE_DIR).mkdir(parents=True, exist_ok=True)
-
-            # Fetch rows to archive
-            rows = conn.execute(
-                """
-                SELECT event_id, event_type, source, severity, tenant_id,
-                       payload, timestamp, received_at, client_ip
-                FROM events
-                WHERE timestamp < ?
-                ORDER BY timestamp ASC
-                """,
-                (cutoff_iso,),
-            ).fetchall()
-
-            if rows:
-                # Create archive file with cutoff date
-                archive_filename = f"events-{cutoff.date()}.ndjson"
-                archive_path = Path(ARCHIVE_DIR) / archive_filename
-
-                with archive_path.open("a", encoding="utf-8") as f:
-                    for row in rows:
-                        event_dict = {
-                            "event_id": row["event_id"],
-                            "event_type": row["event_type"],
-                            "source": row["source"],
-                            "severity": row["severity"],
-                            "tenant_id": row["tenant_id"],
-                            "payload": row["payload"],
-                            "timestamp": row["timestamp"],
-                            "received_at": row["received_at"],
-                            "client_ip": row["client_ip"],
-                        }
-                        f.write(json.dumps(event_dict) + "\n")
-                        archived_count += 1
-
-                print(f"[event_store] 📦 Archived {archived_count} events to {archive_path}")
+    summary = _prune_in_batches("all", "1=1", (), cutoff)
 
-        except Exception as e:
-            print(f"[event_store] ⚠️  Archive failed: {e}")
-            # Continue with deletion even if archive fails
-
-    # Delete old events
-    conn.execute("DELETE FROM events WHERE timestamp < ?", (cutoff_iso,))
-    conn.commit()
-    conn.close()
+    with get_pool().write("prune_rollups") as conn:
+        _trim_rollups(conn, datetime.now(UTC))
 
-    print(f"[event_store] 🗑️  Pruned {prune_count} events older than {cutoff.date()}")
+    print(
+        f"[event_store] 🗑️  Pruned {summary['pruned_count']} events older than "
+        f"{summary['cutoff'][:10]} ({summary['rows_per_second']} rows/s)"
+    )
 
     return {
         "status": "ok",
-        "cutoff": cutoff_iso,
+        "cutoff": summary["cutoff"],
         "retention_days": RETENTION_DAYS,
-        "pruned_count": prune_count,
+        "pruned_count": summary["pruned_count"],
         "archived": ARCHIVE_ENABLED,
-        "archived_count": archived_count if ARCHIVE_ENABLED else None,
+        "archived_count": summary["archived_count"] if ARCHIVE_ENABLED else None,
         "archive_dir": ARCHIVE_DIR if ARCHIVE_ENABLED else None,
+        "rows_per_second": summary["rows_per_second"],
+        "resumed": summary["resumed"],
     }
 
 
@@ -599,6 +1187,8 @@ def get_retention_settings() -> dict[str, Any]:
         "interval_seconds": int(os.getenv("EVENT_RETENTION_CRON_SECONDS", "3600")),
         "archive_enabled": ARCHIVE_ENABLED,
         "archive_dir": ARCHIVE_DIR,
+        "archive_compression": ARCHIVE_COMPRESSION,
+        "prune_batch_size": PRUNE_BATCH_SIZE,
     }
 
 
@@ -608,6 +1198,28 @@ def get_retention_settings() -> dict[str, Any]:
 
 DEDUP_WINDOW_SECONDS = int(os.getenv("ALERT_DEDUP_WINDOW_SECONDS", "300"))  # 5 minutes default
 
+# Callbacks run (on the enqueueing thread) after new deliveries are committed,
+# so the delivery pool can wake up instead of waiting for its next poll
+_delivery_listeners: list[Callable[[], None]] = []
+
+
+def add_delivery_listener(callback: Callable[[], None]) -> None:
+    """Register a callback fired whenever alert deliveries are enqueued."""
+    _delivery_listeners.append(callback)
+
+
+def remove_delivery_listener(callback: Callable[[], None]) -> None:
+    if callback in _delivery_listeners:
+        _delivery_listeners.remove(callback)
+
+
+def _notify_delivery_listeners() -> None:
+    for callback in list(_delivery_listeners):
+        try:
+            callback()
+        except Exception as e:
+            print(f"[event_store] ⚠️  Delivery listener failed: {e}")
+
 
 def check_dedup_window(rule_name: str, tenant_id: str) -> bool:
     """
@@ -623,25 +1235,20 @@ def check_dedup_window(rule_name: str, tenant_id: str) -> bool:
     Returns:
         True if alert should be sent (not a duplicate), False if should skip
     """
-    conn = get_conn()
-    try:
-        cur = conn.execute(
+    with get_pool().read("check_dedup_window") as conn:
+        row = conn.execute(
             "SELECT last_sent_at FROM alert_delivery_history WHERE rule_name = ? AND tenant_id = ?",
             (rule_name, tenant_id),
-        )
-        row = cur.fetchone()
-
-        if not row:
-            return True  # Never sent before, allow
+        ).fetchone()
 
-        last_sent = datetime.fromisoformat(row["last_sent_at"])
-        now = datetime.now(UTC)
-        elapsed = (now - last_sent).total_seconds()
+    if not row:
+        return True  # Never sent before, allow
 
-        return elapsed >= DEDUP_WINDOW_SECONDS
+    last_sent = datetime.fromisoformat(row["last_sent_at"])
+    now = datetime.now(UTC)
+    elapsed = (now - last_sent).total_seconds()
 
-    finally:
-        conn.close()
+    return elapsed >= DEDUP_WINDOW_SECONDS
 
 
 def update_dedup_history(rule_name: str, tenant_id: str):
@@ -652,10 +1259,9 @@ def update_dedup_history(rule_name: str, tenant_id: str):
         rule_name: Alert rule name
         tenant_id: Tenant identifier
     """
-    conn = get_conn()
     now = datetime.now(UTC).isoformat()
 
-    try:
+    with get_pool().write("update_dedup_history") as conn:
         conn.execute(
             """
             INSERT INTO alert_delivery_history (rule_name, tenant_id, last_sent_at)
@@ -665,9 +1271,6 @@ def update_dedup_history(rule_name: str, tenant_id: str):
             """,
             (rule_name, tenant_id, now),
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def enqueue_alert_delivery(
@@ -687,10 +1290,9 @@ def enqueue_alert_delivery(
     Returns:
         Queue entry ID
     """
-    conn = get_conn()
     now = datetime.now(UTC).isoformat()
 
-    try:
+    with get_pool().write("enqueue_alert_delivery") as conn:
         cur = conn.execute(
             """
             INSERT INTO alert_delivery_queue (
@@ -710,10 +1312,67 @@ def enqueue_alert_delivery(
                 now,
             ),
         )
-        conn.commit()
-        return cur.lastrowid
-    finally:
-        conn.close()
+    _notify_delivery_listeners()
+    return cur.lastrowid
+
+
+def enqueue_alert_with_dedup(
+    rule_name: str,
+    tenant_id: str,
+    alert_event_id: str,
+    alert_payload: dict[str, Any],
+    webhook_urls: list[str],
+    max_attempts: int = 5,
+) -> bool:
+    """
+    Dedup-check, enqueue and record an alert in a single transaction.
+
+    Equivalent to check_dedup_window() + enqueue_alert_delivery() per URL +
+    update_dedup_history(), but in one writer round-trip, and atomic so two
+    evaluators cannot both pass the dedup check.
+
+    Returns:
+        True if the alert was enqueued, False if suppressed by the dedup window
+    """
+    now = datetime.now(UTC)
+    now_iso = now.isoformat()
+    payload_json = json.dumps(alert_payload)
+
+    with get_pool().write("enqueue_alert_with_dedup") as conn:
+        row = conn.execute(
+            "SELECT last_sent_at FROM alert_delivery_history WHERE rule_name = ? AND tenant_id = ?",
+            (rule_name, tenant_id),
+        ).fetchone()
+        if row:
+            elapsed = (now - datetime.fromisoformat(row["last_sent_at"])).total_seconds()
+            if elapsed < DEDUP_WINDOW_SECONDS:
+                return False
+
+        conn.executemany(
+            """
+            INSERT INTO alert_delivery_queue (
+                alert_event_id, alert_payload, webhook_url,
+                attempt_count, max_attempts, next_attempt_at,
+                created_at, updated_at
+            )
+            VALUES (?, ?, ?, 0, ?, ?, ?, ?)
+            """,
+            [
+                (alert_event_id, payload_json, url, max_attempts, now_iso, now_iso, now_iso)
+                for url in webhook_urls
+            ],
+        )
+        conn.execute(
+            """
+            INSERT INTO alert_delivery_history (rule_name, tenant_id, last_sent_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(rule_name, tenant_id) DO UPDATE SET
+                last_sent_at = excluded.last_sent_at
+            """,
+            (rule_name, tenant_id, now_iso),
+        )
+    _notify_delivery_listeners()
+    return True
 
 
 def get_pending_deliveries(limit: int = 50) -> list[dict[str, Any]]:
@@ -729,10 +1388,9 @@ def get_pending_deliveries(limit: int = 50) -> list[dict[str, Any]]:
     Returns:
         List of delivery queue entries
     """
-    conn = get_conn()
     now = datetime.now(UTC).isoformat()
 
-    try:
+    with get_pool().read("get_pending_deliveries") as conn:
         cur = conn.execute(
             """
             SELECT id, alert_event_id, alert_payload, webhook_url,
@@ -747,23 +1405,86 @@ def get_pending_deliveries(limit: int = 50) -> list[dict[str, Any]]:
         )
         rows = cur.fetchall()
 
-        return [
-            {
-                "id": row["id"],
-                "alert_event_id": row["alert_event_id"],
-                "alert_payload": json.loads(row["alert_payload"]),
-                "webhook_url": row["webhook_url"],
-                "attempt_count": row["attempt_count"],
-                "max_attempts": row["max_attempts"],
-                "next_attempt_at": row["next_attempt_at"],
-                "last_error": row["last_error"],
-                "created_at": row["created_at"],
-                "updated_at": row["updated_at"],
-            }
-            for row in rows
-        ]
-    finally:
-        conn.close()
+    return [_delivery_dict(row) for row in rows]
+
+
+_DELIVERY_COLUMNS = """
+    id, alert_event_id, alert_payload, webhook_url,
+    attempt_count, max_attempts, next_attempt_at,
+    last_error, created_at, updated_at
+"""
+
+
+def _delivery_dict(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "alert_event_id": row["alert_event_id"],
+        "alert_payload": json.loads(row["alert_payload"]),
+        "webhook_url": row["webhook_url"],
+        "attempt_count": row["attempt_count"],
+        "max_attempts": row["max_attempts"],
+        "next_attempt_at": row["next_attempt_at"],
+        "last_error": row["last_error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def claim_pending_deliveries(
+    limit: int = 50, lease_seconds: int = 120, exclude_urls: list[str] | None = None
+) -> list[dict[str, Any]]:
+    """
+    Atomically claim deliveries that are ready for attempt.
+
+    Claimed rows get next_attempt_at pushed out by lease_seconds in the same
+    write transaction, so concurrent dispatchers (or a restarted one) skip
+    them until the lease expires. Completing the attempt through
+    update_delivery_attempts() deletes or reschedules the row.
+
+    Args:
+        limit: Maximum number of deliveries to claim
+        lease_seconds: How long the claim hides the rows from other claimers
+        exclude_urls: Webhook URLs to skip (destinations already saturated)
+
+    Returns:
+        Claimed delivery queue entries (pre-lease next_attempt_at)
+    """
+    now = datetime.now(UTC)
+    lease_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+    exclude_urls = exclude_urls or []
+
+    query = f"""
+        SELECT {_DELIVERY_COLUMNS}
+        FROM alert_delivery_queue
+        WHERE next_attempt_at <= ? AND attempt_count < max_attempts
+    """
+    params: list[Any] = [now.isoformat()]
+    if exclude_urls:
+        query += f" AND webhook_url NOT IN ({', '.join('?' * len(exclude_urls))})"
+        params.extend(exclude_urls)
+    query += " ORDER BY next_attempt_at ASC LIMIT ?"
+    params.append(limit)
+
+    with get_pool().write("claim_pending_deliveries") as conn:
+        rows = conn.execute(query, params).fetchall()
+        conn.executemany(
+            "UPDATE alert_delivery_queue SET next_attempt_at = ? WHERE id = ?",
+            [(lease_until, row["id"]) for row in rows],
+        )
+    return [_delivery_dict(row) for row in rows]
+
+
+def next_delivery_due() -> str | None:
+    """Earliest next_attempt_at among deliveries that still have attempts left."""
+    with get_pool().read("next_delivery_due") as conn:
+        row = conn.execute(
+            """
+            SELECT MIN(next_attempt_at) AS due
+            FROM alert_delivery_queue
+            WHERE attempt_count < max_attempts
+            """
+        ).fetchone()
+    return row["due"] if row else None
 
 
 def update_delivery_attempt(delivery_id: int, success: bool, error_message: str | None = None):
@@ -778,56 +1499,70 @@ def update_delivery_attempt(delivery_id: int, success: bool, error_message: str
         success: Whether delivery succeeded
         error_message: Error message if delivery failed
     """
-    conn = get_conn()
-    now = datetime.now(UTC)
+    update_delivery_attempts([(delivery_id, success, error_message)])
 
-    try:
-        if success:
-            # Remove from queue on success
-            conn.execute("DELETE FROM alert_delivery_queue WHERE id = ?", (delivery_id,))
-        else:
-            # Get current attempt count
-            cur = conn.execute(
-                "SELECT attempt_count, max_attempts FROM alert_delivery_queue WHERE id = ?",
-                (delivery_id,),
-            )
-            row = cur.fetchone()
 
-            if not row:
-                return
+def update_delivery_attempts(outcomes: list[tuple[int, bool, str | None]]) -> None:
+    """
+    Apply many delivery attempt outcomes in one transaction.
 
-            new_attempt_count = row["attempt_count"] + 1
-            max_attempts = row["max_attempts"]
+    Same rules as update_delivery_attempt: successes and exhausted entries
+    are removed from the queue, other failures are rescheduled with backoff.
 
-            if new_attempt_count >= max_attempts:
-                # Max attempts reached, delete from queue (will emit failure event separately)
-                conn.execute("DELETE FROM alert_delivery_queue WHERE id = ?", (delivery_id,))
-            else:
+    Args:
+        outcomes: (delivery_id, success, error_message) per attempt
+    """
+    if not outcomes:
+        return
+    now = datetime.now(UTC)
+    now_iso = now.isoformat()
+    failed = {delivery_id: error for delivery_id, success, error in outcomes if not success}
+    delete_ids = [delivery_id for delivery_id, success, _ in outcomes if success]
+    retries = []
+
+    with get_pool().write("update_delivery_attempts") as conn:
+        if failed:
+            # Get current attempt counts
+            rows = conn.execute(
+                f"""
+                SELECT id, attempt_count, max_attempts FROM alert_delivery_queue
+                WHERE id IN ({', '.join('?' * len(failed))})
+                """,
+                list(failed),
+            ).fetchall()
+            for row in rows:
+                new_attempt_count = row["attempt_count"] + 1
+                if new_attempt_count >= row["max_attempts"]:
+                    # Max attempts reached, delete from queue (failure event emitted by caller)
+                    delete_ids.append(row["id"])
+                    continue
                 # Calculate backoff: 30s, 2m, 5m, 15m, 30m
                 backoff_seconds = min(30 * (2**new_attempt_count), 1800)  # Cap at 30 minutes
                 next_attempt = now + timedelta(seconds=backoff_seconds)
-
-                conn.execute(
-                    """
-                    UPDATE alert_delivery_queue
-                    SET attempt_count = ?,
-                        next_attempt_at = ?,
-                        last_error = ?,
-                        updated_at = ?
-                    WHERE id = ?
-                    """,
+                retries.append(
                     (
                         new_attempt_count,
                         next_attempt.isoformat(),
-                        error_message,
-                        now.isoformat(),
-                        delivery_id,
-                    ),
+                        failed[row["id"]],
+                        now_iso,
+                        row["id"],
+                    )
                 )
 
-        conn.commit()
-    finally:
-        conn.close()
+        conn.executemany(
+            "DELETE FROM alert_delivery_queue WHERE id = ?", [(i,) for i in delete_ids]
+        )
+        conn.executemany(
+            """
+            UPDATE alert_delivery_queue
+            SET attempt_count = ?,
+                next_attempt_at = ?,
+                last_error = ?,
+                updated_at = ?
+            WHERE id = ?
+            """,
+            retries,
+        )
 
 
 def get_delivery_stats() -> dict[str, Any]:
@@ -839,10 +1574,9 @@ def get_delivery_stats() -> dict[str, Any]:
     Returns:
         Statistics dictionary
     """
-    conn = get_conn()
     now = datetime.now(UTC).isoformat()
 
-    try:
+    with get_pool().read("get_delivery_stats") as conn:
         # Total queued
         total_result = conn.execute("SELECT COUNT(*) as cnt FROM alert_delivery_queue").fetchone()
         total = total_result["cnt"] if total_result else 0
@@ -859,15 +1593,12 @@ def get_delivery_stats() -> dict[str, Any]:
         ).fetchone()
         failing = failing_result["cnt"] if failing_result else 0
 
-        return {
-            "total_queued": total,
-            "pending_now": pending,
-            "near_failure": failing,
-            "dedup_window_seconds": DEDUP_WINDOW_SECONDS,
-        }
-
-    finally:
-        conn.close()
+    return {
+        "total_queued": total,
+        "pending_now": pending,
+        "near_failure": failing,
+        "dedup_window_seconds": DEDUP_WINDOW_SECONDS,
+    }
 
 
 def get_delivery_queue(limit: int = 100) -> list[dict[str, Any]]:
@@ -880,9 +1611,7 @@ def get_delivery_queue(limit: int = 100) -> list[dict[str, Any]]:
     Returns:
         List of delivery queue entries
     """
-    conn = get_conn()
-
-    try:
+    with get_pool().read("get_delivery_queue") as conn:
         cur = conn.execute(
             """
             SELECT id, alert_event_id, webhook_url, attempt_count,
@@ -896,19 +1625,17 @@ def get_delivery_queue(limit: int = 100) -> list[dict[str, Any]]:
         )
         rows = cur.fetchall()
 
-        return [
-            {
-                "id": row["id"],
-                "alert_event_id": row["alert_event_id"],
-                "webhook_url": row["webhook_url"],
-                "attempt_count": row["attempt_count"],
-                "max_attempts": row["max_attempts"],
-                "next_attempt_at": row["next_attempt_at"],
-                "last_error": row["last_error"],
-                "created_at": row["created_at"],
-                "updated_at": row["updated_at"],
-            }
-            for row in rows
-        ]
-    finally:
-        conn.close()
+    return [
+        {
+            "id": row["id"],
+            "alert_event_id": row["alert_event_id"],
+            "webhook_url": row["webhook_url"],
+            "attempt_count": row["attempt_count"],
+            "max_attempts": row["max_attempts"],
+            "next_attempt_at": row["next_attempt_at"],
+            "last_error": row["last_error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,242 @@
+"""
+Incremental sliding-window event counters for alert rule evaluation.
+
+Keeps per-second event counts keyed by (event_type, source, severity,
+tenant_id) so alert rules can be evaluated with in-memory lookups instead
+of one COUNT(*) over the events table per rule per tick.
+
+Every event is counted under all 16 wildcard projections of its key, so a
+rule that leaves some filters empty is still a single lookup. Counters are
+fed by tailing the events table by primary key (catch_up), which picks up
+events saved by any code path or worker process, and are trimmed to
+EVENT_WINDOW_HORIZON_SECONDS. Rules with longer windows fall back to SQL.
+"""
+
+import bisect
+import itertools
+import os
+import threading
+import time
+from datetime import UTC, datetime
+
+import event_store
+from prometheus_client import Counter, Gauge
+
+EVENT_WINDOW_HORIZON_SECONDS = int(os.getenv("EVENT_WINDOW_HORIZON_SECONDS", "3600"))
+CATCH_UP_BATCH = 5000
+
+# Wildcard marker for "no filter on this dimension" (cannot collide with real values)
+ANY = "\x00*"
+
+event_window_events_total = Counter(
+    "aetherlink_event_window_events_total",
+    "Events folded into the in-memory sliding-window counters",
+)
+event_window_series = Gauge(
+    "aetherlink_event_window_series",
+    "Number of (event_type, source, severity, tenant) counter series held in memory",
+)
+
+
+def _to_epoch(ts: str | None) -> int | None:
+    """Parse an ISO timestamp (Z, offset or naive=UTC) to epoch seconds."""
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return int(dt.timestamp())
+
+
+class _Series:
+    """Per-second counts for one key, kept sorted by second."""
+
+    __slots__ = ("secs", "counts")
+
+    def __init__(self) -> None:
+        self.secs: list[int] = []
+        self.counts: list[int] = []
+
+    def add(self, sec: int, n: int) -> None:
+        if not self.secs or sec > self.secs[-1]:
+            self.secs.append(sec)
+            self.counts.append(n)
+            return
+        i = bisect.bisect_left(self.secs, sec)
+        if i < len(self.secs) and self.secs[i] == sec:
+            self.counts[i] += n
+        else:
+            self.secs.insert(i, sec)
+            self.counts.insert(i, n)
+
+    def since(self, sec: int) -> int:
+        i = bisect.bisect_left(self.secs, sec)
+        return sum(self.counts[i:])
+
+    def trim(self, before: int) -> None:
+        i = bisect.bisect_left(self.secs, before)
+        if i:
+            del self.secs[:i]
+            del self.counts[:i]
+
+
+class SlidingWindowCounters:
+    """In-memory per-second counters with wildcard projections."""
+
+    def __init__(self, horizon_seconds: int = EVENT_WINDOW_HORIZON_SECONDS) -> None:
+        self.horizon_seconds = horizon_seconds
+        self._series: dict[tuple, _Series] = {}
+
+    def add(
+        self,
+        event_type: str | None,
+        source: str | None,
+        severity: str | None,
+        tenant_id: str | None,
+        sec: int,
+        n: int = 1,
+    ) -> None:
+        """Count an event under every wildcard projection of its key."""
+        dims = (event_type, source, severity, tenant_id)
+        for mask in itertools.product((False, True), repeat=4):
+            key = tuple(ANY if wild else value for wild, value in zip(mask, dims, strict=True))
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.add(sec, n)
+
+    def count(
+        self,
+        event_type: str | None,
+        source: str | None,
+        severity: str | None,
+        tenant_id: str | None,
+        since_sec: int,
+    ) -> int:
+        """
+        Count events at or after since_sec, mirroring event_store.count_events.
+
+        Empty filters match everything; a tenant filter also matches system
+        events stored with a NULL tenant_id.
+        """
+        base = (event_type or ANY, source or ANY, severity.lower() if severity else ANY)
+        if not tenant_id:
+            return self._count(base + (ANY,), since_sec)
+        return self._count(base + (tenant_id,), since_sec) + self._count(base + (None,), since_sec)
+
+    def _count(self, key: tuple, since_sec: int) -> int:
+        series = self._series.get(key)
+        return series.since(since_sec) if series is not None else 0
+
+    def trim(self, now_sec: int) -> None:
+        """Drop buckets older than the horizon and empty series."""
+        before = now_sec - self.horizon_seconds
+        for key in list(self._series):
+            series = self._series[key]
+            series.trim(before)
+            if not series.secs:
+                del self._series[key]
+        event_window_series.set(len(self._series))
+
+
+class EventWindowIndex:
+    """Sliding-window counters kept current by tailing the events table."""
+
+    def __init__(self, horizon_seconds: int = EVENT_WINDOW_HORIZON_SECONDS) -> None:
+        self.counters = SlidingWindowCounters(horizon_seconds)
+        self.horizon_seconds = horizon_seconds
+        self.last_id: int | None = None
+        self.db_path: str | None = None
+        self.last_lag_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def covers(self, window_seconds: int) -> bool:
+        return window_seconds <= self.horizon_seconds
+
+    def catch_up(self) -> int:
+        """
+        Fold events saved since the last call into the counters.
+
+        The first call (or a DB_PATH change) bootstraps from the rows inside
+        the horizon. Returns the number of events applied.
+        """
+        with self._lock:
+            now = int(time.time())
+            pool = event_store.get_pool()
+            if self.db_path != pool.path:
+                self._reset(pool.path)
+
+            applied = 0
+            oldest_received: int | None = None
+            with pool.read("event_window_catch_up") as conn:
+                if self.last_id is None:
+                    row = conn.execute("SELECT COALESCE(MAX(id), 0) AS hi FROM events").fetchone()
+                    cutoff = datetime.fromtimestamp(now - self.horizon_seconds, UTC).isoformat()
+                    rows = conn.execute(
+                        """
+                        SELECT id, event_type, source, severity, tenant_id, timestamp, received_at
+                        FROM events
+                        WHERE id <= ? AND timestamp >= ?
+                        """,
+                        (row["hi"], cutoff),
+                    ).fetchall()
+                    self.last_id = row["hi"]
+                    applied += self._apply(rows)
+                else:
+                    while True:
+                        rows = conn.execute(
+                            """
+                            SELECT id, event_type, source, severity, tenant_id, timestamp,
+                                   received_at
+                            FROM events
+                            WHERE id > ?
+                            ORDER BY id
+                            LIMIT ?
+                            """,
+                            (self.last_id, CATCH_UP_BATCH),
+                        ).fetchall()
+                        if not rows:
+                            break
+                        self.last_id = rows[-1]["id"]
+                        received = _to_epoch(rows[0]["received_at"])
+                        if received is not None and oldest_received is None:
+                            oldest_received = received
+                        applied += self._apply(rows)
+                        if len(rows) < CATCH_UP_BATCH:
+                            break
+
+            self.last_lag_seconds = max(0, now - oldest_received) if oldest_received else 0.0
+            self.counters.trim(now)
+            return applied
+
+    def count(
+        self,
+        event_type: str | None,
+        source: str | None,
+        severity: str | None,
+        tenant_id: str | None,
+        since_sec: int,
+    ) -> int:
+        with self._lock:
+            return self.counters.count(event_type, source, severity, tenant_id, since_sec)
+
+    def _reset(self, db_path: str) -> None:
+        self.counters = SlidingWindowCounters(self.horizon_seconds)
+        self.last_id = None
+        self.db_path = db_path
+
+    def _apply(self, rows) -> int:
+        for r in rows:
+            sec = _to_epoch(r["timestamp"]) or _to_epoch(r["received_at"])
+            if sec is None:
+                continue
+            self.counters.add(r["event_type"], r["source"], r["severity"], r["tenant_id"], sec)
+        event_window_events_total.inc(len(rows))
+        return len(rows)
+
+
+# Process-wide index used by the alert evaluator
+event_window_index = EventWindowIndex()
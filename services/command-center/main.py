@@ -52,6 +52,17 @@ except ImportError:
 
 # Phase XXXV: Anomaly History & Insights
 from anomaly_history import append_anomaly_record
+from remediation_timeline import (
+    detect_timeline_anomalies,
+    get_timeline,
+    invalidate_timeline_cache,
+)
+
+# Group-commit event ingest writer (started/flushed by lifespan)
+try:
+    from event_ingest import event_writer
+except ImportError:
+    event_writer = None
 
 RECOVERY_DB = Path("monitoring/recovery_events.sqlite")
 
@@ -102,6 +113,9 @@ def record_remediation_event(
     finally:
         conn.close()
     if row_id is not None:
+        # New event: cached timeline buckets are stale
+        invalidate_timeline_cache()
+
         # Track timeline WS event metrics (Phase XX M8)
         timeline_ws_events_total.labels(tenant=tenant or "unknown").inc()
 
@@ -123,22 +137,21 @@ def record_remediation_event(
         # Increment anomaly events counter for correlation dashboard
         anomaly_events_total.labels(tenant=tenant or "unknown").inc()
 
-        asyncio.create_task(
-            remediation_ws_manager.broadcast(
-                {
-                    "type": "remediation_event",
-                    "payload": {
-                        "id": row_id,
-                        "ts": occurred_at,
-                        "alertname": alertname,
-                        "tenant": tenant,
-                        "action": action,
-                        "status": status,
-                        "details": details[:500],
-                        "occurred_at": occurred_at,  # Include for WS handler
-                    },
-                }
-            )
+        # Queued per subscribed connection; no running loop needed here
+        remediation_ws_manager.publish(
+            {
+                "type": "remediation_event",
+                "payload": {
+                    "id": row_id,
+                    "ts": occurred_at,
+                    "alertname": alertname,
+                    "tenant": tenant,
+                    "action": action,
+                    "status": status,
+                    "details": details[:500],
+                    "occurred_at": occurred_at,  # Include for WS handler
+                },
+            }
         )
 
 
@@ -184,15 +197,38 @@ except ImportError:
     resume_job = None
 
 
+# Phase XVII-B: Single-writer delta persistence (schedules, local runs)
+try:
+    from .persistence import DeltaWriter
+except ImportError:
+    DeltaWriter = None
+
+
+def _mark_persistence_degraded(message: str) -> None:
+    global DEGRADED_FLAG, PERSISTENCE_LAST_ERROR
+    DEGRADED_FLAG = True
+    PERSISTENCE_LAST_ERROR = message
+
+
 # Adapter that provides the thin synchronous API the rest of main.py expects.
-# It schedules async persistence tasks to the real async backends so existing
-# code that calls DB_STORE.save_schedule(), append_event(), etc. can remain
-# mostly unchanged.
+# Schedule and local run changes are recorded as deltas on a single
+# coalescing writer task, so existing code that calls DB_STORE.save_schedule(),
+# append_local_run(), etc. can remain mostly unchanged.
 class PersistenceAdapter:
     def __init__(self, sqlite_backend=None, json_backend=None, dual_write: bool = False):
         self.sqlite = sqlite_backend
         self.json = json_backend
         self.dual = dual_write
+        backends = []
+        if self.sqlite:
+            backends.append(("sqlite", self.sqlite))
+        if self.dual and self.json:
+            backends.append(("json", self.json))
+        self.writer = (
+            DeltaWriter(backends, on_error=_mark_persistence_degraded)
+            if DeltaWriter is not None and backends
+            else None
+        )
 
     def append_event(self, ev: dict[str, Any]) -> None:
         try:
@@ -201,39 +237,30 @@ class PersistenceAdapter:
             if self.dual and self.json:
                 asyncio.create_task(self.json.save_event(ev))
         except Exception as e:
-            global DEGRADED_FLAG, PERSISTENCE_LAST_ERROR
-            DEGRADED_FLAG = True
-            PERSISTENCE_LAST_ERROR = f"Event persistence failed: {e}"
+            _mark_persistence_degraded(f"Event persistence failed: {e}")
 
     def save_schedule(self, tenant: str, schedule: dict[str, Any]) -> None:
-        # Persist full schedules snapshot (safer) from in-memory global
-        try:
-            if self.sqlite:
-                asyncio.create_task(self.sqlite.save_schedules(ACCU_IMPORT_SCHEDULES))
-            if self.dual and self.json:
-                asyncio.create_task(self.json.save_schedules(ACCU_IMPORT_SCHEDULES))
-        except Exception as e:
-            global DEGRADED_FLAG, PERSISTENCE_LAST_ERROR
-            DEGRADED_FLAG = True
-            PERSISTENCE_LAST_ERROR = f"Schedule persistence failed: {e}"
+        # Upsert just this tenant's schedule
+        if self.writer is not None:
+            self.writer.upsert_schedule(tenant, schedule)
 
     def delete_schedule(self, tenant: str) -> None:
-        # After in-memory deletion, persist full snapshot
-        try:
-            self.save_schedule(tenant, {})  # This will handle the exception
-        except Exception:
-            pass  # Already handled in save_schedule
+        if self.writer is not None:
+            self.writer.delete_schedule(tenant)
 
     def append_local_run(self, run: dict[str, Any]) -> None:
-        try:
-            if self.sqlite:
-                asyncio.create_task(self.sqlite.save_local_action_runs(LOCAL_ACTION_RUNS))
-            if self.dual and self.json:
-                asyncio.create_task(self.json.save_local_action_runs(LOCAL_ACTION_RUNS))
-        except Exception as e:
-            global DEGRADED_FLAG, PERSISTENCE_LAST_ERROR
-            DEGRADED_FLAG = True
-            PERSISTENCE_LAST_ERROR = f"Local run persistence failed: {e}"
+        # Append just the new run
+        if self.writer is not None:
+            self.writer.append_run(run)
+
+    async def start(self) -> None:
+        if self.writer is not None:
+            await self.writer.start()
+
+    async def stop(self) -> None:
+        """Flush pending schedule/run changes and stop the writer."""
+        if self.writer is not None:
+            await self.writer.stop()
 
     def list_audit(self, limit: int = 1000) -> list[dict[str, Any]]:
         # Prefer in-memory audit for immediate reads
@@ -395,6 +422,9 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Max number of timestamped JSON backups to retain (per file)
 MAX_JSON_SNAPSHOTS = int(os.getenv("COMMAND_CENTER_MAX_SNAPSHOTS", "3"))
+# Min seconds between timestamped backups of the same file
+JSON_SNAPSHOT_INTERVAL = float(os.getenv("COMMAND_CENTER_SNAPSHOT_INTERVAL", "300"))
+_LAST_JSON_SNAPSHOT: dict[Path, float] = {}
 
 SCHEDULES_FILE = DATA_DIR / "acculynx_schedules.json"
 AUDIT_FILE = DATA_DIR / "acculynx_audit.json"
@@ -492,7 +522,13 @@ def save_json_safe(path: Path, payload, max_snapshots: int | None = None):
             pass
         return
 
-    # rotation - best effort, never crash
+    # rotation - best effort, never crash; at most one backup per interval,
+    # so a burst of saves doesn't copy the file and glob the directory each time
+    now = time.monotonic()
+    last = _LAST_JSON_SNAPSHOT.get(path)
+    if last is not None and now - last < JSON_SNAPSHOT_INTERVAL:
+        return
+    _LAST_JSON_SNAPSHOT[path] = now
     try:
         ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
         snapshot_path = path.with_suffix(path.suffix + f".{ts}.bak")
@@ -956,6 +992,7 @@ async def lifespan(app: FastAPI):
             # wire DB_STORE adapter for legacy callsites (synchronous API)
             global DB_STORE
             DB_STORE = PersistenceAdapter(_SQLITE_BACKEND, _JSON_BACKEND, dual_write=DUAL_WRITE)
+            await DB_STORE.start()
 
             # expose primary/fallback stores on app.state for new codepaths
             try:
@@ -1103,11 +1140,35 @@ async def lifespan(app: FastAPI):
         else:
             print("[startup] Adaptive auto-responder not available")
 
+        # Start group-commit event ingest writer
+        if event_writer is not None:
+            try:
+                await event_writer.start()
+                print("[startup] Event batch writer started")
+            except Exception as e:
+                print(f"[startup] Event batch writer failed to start: {e}")
+
         print("[startup] All startup tasks completed")
 
         yield
 
         print("[shutdown] Lifespan shutting down")
+
+        # Durably flush buffered events before exit
+        if event_writer is not None:
+            try:
+                await event_writer.stop()
+                print("[shutdown] Event batch writer flushed")
+            except Exception as e:
+                print(f"[shutdown] Event batch writer flush failed: {e}")
+
+        # Flush pending schedule/local run deltas
+        if DB_STORE is not None:
+            try:
+                await DB_STORE.stop()
+                print("[shutdown] Persistence writer flushed")
+            except Exception as e:
+                print(f"[shutdown] Persistence writer flush failed: {e}")
     except Exception as e:
         print(f"[startup] Lifespan exception: {e}")
         import traceback
@@ -1230,76 +1291,12 @@ async def get_remediation_timeline(
     """
     Return time-bucketed remediation counts for timeline charts.
     Used by RemediationTimeline component for visual trend analysis.
+    Aggregated in SQL and cached briefly (see remediation_timeline).
     """
-    from datetime import timedelta
-
-    now = datetime.now(UTC)
-    start = now - timedelta(minutes=window_minutes)
-
-    db_path = RECOVERY_DB
-    if not db_path.exists():
-        return {"timeline": []}
-
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    try:
-        params: list[Any] = [start.isoformat().replace("+00:00", "Z")]
-        tenant_clause = ""
-        if tenant and tenant != "all":
-            tenant_clause = "AND tenant = ?"
-            params.append(tenant)
-
-        cur.execute(
-            f"""
-            SELECT ts, tenant
-            FROM remediation_events
-            WHERE datetime(ts) >= datetime(?)
-            {tenant_clause}
-            ORDER BY ts ASC
-            """,
-            params,
-        )
-        rows = cur.fetchall()
-
-        # Build time buckets
-        buckets: dict[str, int] = {}
-        step = timedelta(minutes=bucket_minutes)
-
-        # Normalize start to bucket boundary (round down to nearest bucket)
-        bucket_start = start.replace(second=0, microsecond=0)
-        minutes_offset = bucket_start.minute % bucket_minutes
-        bucket_start = bucket_start - timedelta(minutes=minutes_offset)
-
-        # Create all buckets from start to now
-        cursor = bucket_start
-        while cursor <= now:
-            buckets[cursor.isoformat().replace("+00:00", "Z")] = 0
-            cursor += step
-
-        # Fill buckets with actual counts
-        for r in rows:
-            ts_str = r["ts"]
-            # Parse timestamp (handle both with and without timezone)
-            ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=UTC)
-
-            # Snap to bucket
-            elapsed = (ts - bucket_start).total_seconds()
-            offset = int(elapsed // (bucket_minutes * 60))
-            b_time = bucket_start + offset * step
-            key = b_time.isoformat().replace("+00:00", "Z")
-
-            if key in buckets:
-                buckets[key] += 1
-
-        # Return as ordered list
-        timeline = [{"ts": k, "count": buckets[k]} for k in sorted(buckets.keys())]
-        return {"timeline": timeline}
-    finally:
-        conn.close()
+    timeline = await asyncio.to_thread(
+        get_timeline, RECOVERY_DB, tenant, window_minutes, bucket_minutes
+    )
+    return {"timeline": timeline}
 
 
 @app.get("/ops/remediations/timeline/anomalies")
@@ -1317,52 +1314,14 @@ async def get_remediation_timeline_anomalies(
     Anomaly rule: count >= min_count AND count > avg * multiplier
     Quiet period: count == 0
     """
-    # Reuse existing timeline logic
-    base = await get_remediation_timeline(
-        tenant=tenant,
-        window_minutes=window_minutes,
-        bucket_minutes=bucket_minutes,
+    # Same cached timeline as /ops/remediations/timeline
+    timeline = await asyncio.to_thread(
+        get_timeline, RECOVERY_DB, tenant, window_minutes, bucket_minutes
     )
-    timeline = base["timeline"]
-
-    anomalies: list[dict[str, Any]] = []
-    quiet: list[dict[str, Any]] = []
 
     # Rolling baseline configuration
     window_size = 4  # Look back 4 buckets for baseline
-
-    for i, point in enumerate(timeline):
-        ts = point["ts"]
-        count = int(point["count"])  # Ensure integer type
-
-        # Identify quiet periods (count == 0)
-        if count == 0:
-            quiet.append({"ts": ts, "count": count})
-            continue
-
-        # Calculate rolling baseline (average of previous window_size buckets)
-        if i < window_size:
-            # Not enough history, use what we have
-            baseline_counts = [int(p["count"]) for p in timeline[:i]]
-        else:
-            baseline_counts = [int(timeline[j]["count"]) for j in range(i - window_size, i)]
-
-        if not baseline_counts:
-            # First bucket, no baseline yet
-            continue
-
-        avg = sum(baseline_counts) / len(baseline_counts)
-
-        # Anomaly detection: count >= min_count AND count > avg * multiplier
-        if count >= min_count and count > avg * multiplier:
-            anomalies.append(
-                {
-                    "ts": ts,
-                    "count": count,
-                    "baseline": round(avg, 2),
-                    "factor": round(count / avg, 2) if avg > 0 else float(count),
-                }
-            )
+    anomalies, quiet = detect_timeline_anomalies(timeline, multiplier, min_count, window_size)
 
     return {
         "anomalies": anomalies,
@@ -1443,22 +1402,21 @@ async def get_anomaly_detail(anomaly_id: int):
     import time
     start_time = time.time()
     
-    from anomaly_history import read_anomaly_records
+    from anomaly_history import get_anomaly_record
     
-    # Read all recent records and find the one with matching ID
-    items = read_anomaly_records(limit=1000)  # Get enough records to find the ID
-    for item in items:
-        if item.get("id") == anomaly_id:
-            # Record API latency
-            duration = time.time() - start_time
-            anomaly_api_latency_seconds.labels(endpoint="/ops/anomaly/{id}", method="GET").observe(duration)
-            return item
+    # O(1) lookup through the history id index
+    item = get_anomaly_record(anomaly_id)
+    if item is not None:
+        # Record API latency
+        duration = time.time() - start_time
+        anomaly_api_latency_seconds.labels(endpoint="/ops/anomaly/{id}", method="GET").observe(duration)
+        return item
     
     # Record API latency for not found case too
     duration = time.time() - start_time
     anomaly_api_latency_seconds.labels(endpoint="/ops/anomaly/{id}", method="GET").observe(duration)
     
-    # If not found in recent history, return 404
+    # If not found in history, return 404
     return {"error": "Anomaly not found", "id": anomaly_id}, 404
 
 
@@ -1467,8 +1425,10 @@ async def ws_remediations(websocket: WebSocket):
     """WebSocket endpoint for live remediation timeline events.
 
     Phase XX M9: Now bidirectional - accepts heartbeat messages from clients.
+    Phase XX M14: ?tenant=a,b limits the stream to those tenants; a
+    {"type": "subscribe", "tenants": [...]} message changes it later.
     """
-    await remediation_ws_manager.connect(websocket)
+    await remediation_ws_manager.connect(websocket, tenants=websocket.query_params.get("tenant"))
     try:
         while True:
             msg_text = await websocket.receive_text()
@@ -1479,8 +1439,10 @@ async def ws_remediations(websocket: WebSocket):
                     # Extract tenant from heartbeat payload if available
                     tenant = msg.get("tenant", "unknown")
                     remediation_ws_manager.record_heartbeat(websocket, tenant=tenant)
-                    # Send pong response
-                    await websocket.send_text(json.dumps({"type": "pong"}))
+                    # Send pong response (queued behind pending events)
+                    await remediation_ws_manager.send_personal(websocket, {"type": "pong"})
+                elif msg.get("type") == "subscribe":
+                    remediation_ws_manager.set_tenants(websocket, msg.get("tenants"))
             except (json.JSONDecodeError, KeyError):
                 # Ignore malformed messages
                 pass
@@ -1492,8 +1454,10 @@ async def ws_remediations(websocket: WebSocket):
 
 @app.websocket("/ws/operator-activity")
 async def ws_operator_activity(websocket: WebSocket):
-    """WebSocket endpoint for live operator activity stream."""
-    await operator_activity_ws_manager.connect(websocket)
+    """WebSocket endpoint for live operator activity stream (?tenant=a,b to filter)."""
+    await operator_activity_ws_manager.connect(
+        websocket, tenants=websocket.query_params.get("tenant")
+    )
     try:
         while True:
             # Keep connection alive, we don't expect client messages
@@ -1741,6 +1705,9 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Max number of timestamped JSON backups to retain (per file)
 MAX_JSON_SNAPSHOTS = int(os.getenv("COMMAND_CENTER_MAX_SNAPSHOTS", "3"))
+# Min seconds between timestamped backups of the same file
+JSON_SNAPSHOT_INTERVAL = float(os.getenv("COMMAND_CENTER_SNAPSHOT_INTERVAL", "300"))
+_LAST_JSON_SNAPSHOT: dict[Path, float] = {}
 
 SCHEDULES_FILE = DATA_DIR / "acculynx_schedules.json"
 AUDIT_FILE = DATA_DIR / "acculynx_audit.json"
@@ -1838,7 +1805,13 @@ def save_json_safe(path: Path, payload, max_snapshots: int | None = None):
             pass
         return
 
-    # rotation - best effort, never crash
+    # rotation - best effort, never crash; at most one backup per interval,
+    # so a burst of saves doesn't copy the file and glob the directory each time
+    now = time.monotonic()
+    last = _LAST_JSON_SNAPSHOT.get(path)
+    if last is not None and now - last < JSON_SNAPSHOT_INTERVAL:
+        return
+    _LAST_JSON_SNAPSHOT[path] = now
     try:
         ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
         snapshot_path = path.with_suffix(path.suffix + f".{ts}.bak")
@@ -5,7 +5,8 @@ Phase XVII-B: Unified persistence layer supporting multiple backends.
 """
 
 from .base import PersistenceBackend
+from .delta_writer import DeltaWriter
 from .json_fallback import JSONBackend
 from .sqlite import SQLiteBackend
 
-__all__ = ["PersistenceBackend", "SQLiteBackend", "JSONBackend"]
+__all__ = ["PersistenceBackend", "SQLiteBackend", "JSONBackend", "DeltaWriter"]
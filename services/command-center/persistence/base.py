@@ -32,6 +32,30 @@ class PersistenceBackend(ABC):
         """Load tenant import schedules."""
         pass
 
+    async def apply_delta(
+        self,
+        schedules: dict[str, dict[str, Any] | None],
+        runs: list[dict[str, Any]],
+    ) -> None:
+        """
+        Apply a coalesced batch of changes.
+
+        schedules maps tenant -> latest schedule (None means deleted); runs are
+        new local action runs, oldest first. This default merges into full
+        snapshots; backends that can write single records should override it.
+        """
+        if schedules:
+            current = await self.load_schedules()
+            for tenant, schedule in schedules.items():
+                if schedule is None:
+                    current.pop(tenant, None)
+                else:
+                    current[tenant] = schedule
+            await self.save_schedules(current)
+        if runs:
+            existing = await self.load_local_action_runs()
+            await self.save_local_action_runs(existing + runs)
+
     @abstractmethod
     async def save_audit_entries(self, entries: list[dict[str, Any]]) -> None:
         """Save audit log entries."""
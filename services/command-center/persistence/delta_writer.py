@@ -0,0 +1,196 @@
+"""
+Delta Persistence Writer
+
+Single-writer task that persists only the records that changed.
+
+Callers record upserts/deletes of individual schedules and appends of
+individual local action runs; nothing is written inline. Changes are
+coalesced in memory (the last write per tenant wins) and one background
+task hands each burst to every backend's apply_delta() in a single call,
+so write cost follows the size of the change rather than the size of the
+history, and no task is spawned per change.
+
+A delta a backend fails to apply is kept for that backend alone and goes
+out ahead of its next delta (newer schedule changes win), so a transient
+failure loses nothing and a healthy backend never sees a run twice.
+
+Pending depth is bounded: schedules by the number of tenants, runs by
+COMMAND_CENTER_PERSIST_MAX_PENDING (oldest unflushed runs are dropped and
+counted when a stalled backend lets that fill up).
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from .base import PersistenceBackend
+
+PERSIST_MAX_PENDING = int(os.getenv("COMMAND_CENTER_PERSIST_MAX_PENDING", "1000"))
+PERSIST_FLUSH_MS = int(os.getenv("COMMAND_CENTER_PERSIST_FLUSH_MS", "100"))
+
+persist_pending_writes = Gauge(
+    "aetherlink_persist_pending_writes",
+    "Schedule and local run changes waiting for the persistence writer",
+)
+persist_flush_seconds = Histogram(
+    "aetherlink_persist_flush_seconds",
+    "Latency of one delta flush to a persistence backend",
+    ["backend"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+persist_coalesced_total = Counter(
+    "aetherlink_persist_coalesced_total",
+    "Schedule changes superseded by a newer change before they were flushed",
+)
+persist_dropped_total = Counter(
+    "aetherlink_persist_dropped_total",
+    "Local action runs dropped because the pending-write bound was reached",
+)
+persist_failures_total = Counter(
+    "aetherlink_persist_failures_total",
+    "Delta flushes that failed",
+    ["backend"],
+)
+
+
+class DeltaWriter:
+    """Coalescing single-writer for schedule and local run deltas."""
+
+    def __init__(
+        self,
+        backends: list[tuple[str, PersistenceBackend]],
+        max_pending: int = PERSIST_MAX_PENDING,
+        flush_ms: int = PERSIST_FLUSH_MS,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        self.backends = backends
+        self.max_pending = max(1, max_pending)
+        self.flush_seconds = max(0, flush_ms) / 1000
+        self.on_error = on_error
+        # tenant -> schedule, or None for a delete
+        self._schedules: dict[str, dict[str, Any] | None] = {}
+        self._runs: list[dict[str, Any]] = []
+        # backend name -> delta it failed to apply, retried with its next flush
+        self._failed: dict[str, tuple[dict[str, dict[str, Any] | None], list[dict[str, Any]]]] = {}
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        retry = sum(len(s) + len(r) for s, r in self._failed.values())
+        return len(self._schedules) + len(self._runs) + retry
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def upsert_schedule(self, tenant: str, schedule: dict[str, Any]) -> None:
+        """Record the latest schedule for a tenant."""
+        self._set_schedule(tenant, dict(schedule))
+
+    def delete_schedule(self, tenant: str) -> None:
+        """Record that a tenant's schedule was removed."""
+        self._set_schedule(tenant, None)
+
+    def append_run(self, run: dict[str, Any]) -> None:
+        """Record one new local action run."""
+        if len(self._runs) >= self.max_pending:
+            self._runs.pop(0)
+            persist_dropped_total.inc()
+            print(f"[persist] ⚠️  Pending run bound ({self.max_pending}) reached, dropped oldest")
+        self._runs.append(dict(run))
+        self._changed()
+
+    def _set_schedule(self, tenant: str, schedule: dict[str, Any] | None) -> None:
+        if tenant in self._schedules:
+            persist_coalesced_total.inc()
+        self._schedules[tenant] = schedule
+        self._changed()
+
+    def _changed(self) -> None:
+        persist_pending_writes.set(self.pending)
+        if not self.running and not self._stopping:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No loop yet: stays pending until start() or flush()
+            self._task = loop.create_task(self._run(), name="persist-delta-writer")
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start the writer task (idempotent)."""
+        self._stopping = False
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="persist-delta-writer")
+        if self.pending:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Flush everything still pending, then stop the writer task."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending changes now (serialized with the writer task)."""
+        async with self._lock:
+            schedules, runs = self._schedules, self._runs
+            if not schedules and not runs and not self._failed:
+                return
+            self._schedules, self._runs = {}, []
+
+            for name, backend in self.backends:
+                delta_schedules, delta_runs = self._with_failed(name, schedules, runs)
+                if not delta_schedules and not delta_runs:
+                    continue
+                start = time.perf_counter()
+                try:
+                    await backend.apply_delta(delta_schedules, delta_runs)
+                except Exception as e:
+                    self._failed[name] = (delta_schedules, delta_runs)
+                    persist_failures_total.labels(backend=name).inc()
+                    message = f"{name} delta flush failed: {e}"
+                    print(f"[persist] ⚠️  {message}")
+                    if self.on_error is not None:
+                        self.on_error(message)
+                finally:
+                    persist_flush_seconds.labels(backend=name).observe(time.perf_counter() - start)
+            persist_pending_writes.set(self.pending)
+
+    def _with_failed(
+        self,
+        name: str,
+        schedules: dict[str, dict[str, Any] | None],
+        runs: list[dict[str, Any]],
+    ) -> tuple[dict[str, dict[str, Any] | None], list[dict[str, Any]]]:
+        """This backend's delta: anything it failed to apply before, then the new changes."""
+        if name not in self._failed:
+            return schedules, runs
+        failed_schedules, failed_runs = self._failed.pop(name)
+        runs = failed_runs + runs
+        if len(runs) > self.max_pending:
+            dropped = len(runs) - self.max_pending
+            runs = runs[dropped:]
+            persist_dropped_total.inc(dropped)
+            print(f"[persist] ⚠️  {name} retry bound reached, dropped {dropped} oldest runs")
+        return {**failed_schedules, **schedules}, runs
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._wakeup.wait()
+            if self.flush_seconds and not self._stopping:
+                # Let the rest of a burst land so it goes out as one delta
+                await asyncio.sleep(self.flush_seconds)
+            self._wakeup.clear()
+            if self._schedules or self._runs:
+                # A failed delta alone waits for the next change (or flush/stop)
+                await self.flush()
@@ -3,15 +3,50 @@ JSON Fallback Persistence Backend
 
 Phase XVII-B: JSON file-based implementation for backward compatibility.
 Used when SQLite is not available or during migration.
+
+Each collection is an append-only log of JSON lines under
+<data_dir>/log/<collection>/, split into numbered segments. A write appends
+one line; nothing is rewritten. Segments roll over at
+COMMAND_CENTER_JSON_SEGMENT_BYTES. Once COMMAND_CENTER_JSON_COMPACT_SEGMENTS
+sealed segments exist, the in-memory state (bounded by each collection's
+retention) is written as an atomic snapshot and the segments it covers
+are deleted. Reads are served from that in-memory state.
+
+On startup the snapshot is loaded and newer segments are replayed. A torn
+last line (crash mid-append) is truncated away; a corrupt line elsewhere is
+skipped and counted. On first start a collection is seeded from its legacy
+whole-file JSON (acculynx_schedules.json, events.json, ...).
 """
 
 import asyncio
+import copy
 import json
+import os
+import threading
+from collections import deque
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
+from prometheus_client import Counter
+
 from .base import PersistenceBackend
 
+JSON_SEGMENT_BYTES = int(os.getenv("COMMAND_CENTER_JSON_SEGMENT_BYTES", str(1024 * 1024)))
+JSON_COMPACT_SEGMENTS = int(os.getenv("COMMAND_CENTER_JSON_COMPACT_SEGMENTS", "4"))
+JSON_FSYNC = os.getenv("COMMAND_CENTER_JSON_FSYNC", "false").lower() in ("1", "true", "yes")
+
+json_log_compactions_total = Counter(
+    "aetherlink_json_log_compactions_total",
+    "Snapshots written by the JSON fallback log (segments folded and deleted)",
+    ["log"],
+)
+json_log_recovered_lines_total = Counter(
+    "aetherlink_json_log_recovered_lines_total",
+    "Lines dropped while replaying the JSON fallback log",
+    ["log", "kind"],  # torn_tail, corrupt
+)
+
 
 def load_json_self_heal(file_path: Path, default: Any) -> Any:
     """Load JSON file with self-healing for corrupted files."""
@@ -46,14 +81,251 @@ def save_json_atomic(file_path: Path, data: Any) -> None:
         raise
 
 
+class SegmentedLog:
+    """Append-only segmented JSON-lines log; subclasses hold the materialized state."""
+
+    def __init__(
+        self,
+        directory: Path,
+        seed: Callable[[], Any] | None = None,
+        segment_bytes: int = JSON_SEGMENT_BYTES,
+        compact_segments: int = JSON_COMPACT_SEGMENTS,
+        fsync: bool = JSON_FSYNC,
+    ):
+        self.directory = directory
+        self.name = directory.name
+        self.seed = seed
+        self.segment_bytes = max(1, segment_bytes)
+        self.compact_segments = max(1, compact_segments)
+        self.fsync = fsync
+        self.snapshot_file = directory / "snapshot.json"
+        self._lock = threading.RLock()
+        self._segments: list[int] = []  # sealed segments, then the active one
+        self._active = None
+        self._active_size = 0
+
+    # State hooks
+    def _reset_state(self, state: Any) -> None:
+        raise NotImplementedError
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _snapshot_state(self) -> Any:
+        raise NotImplementedError
+
+    @property
+    def is_open(self) -> bool:
+        return self._active is not None
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{seq:06d}.jsonl"
+
+    def open(self) -> None:
+        """Load the snapshot, replay newer segments and open the active segment."""
+        with self._lock:
+            if self.is_open:
+                return
+            fresh = not self.directory.exists()
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            snapshot = load_json_self_heal(self.snapshot_file, None)
+            covered = 0
+            if snapshot is not None:
+                covered = snapshot.get("seq", 0)
+                self._reset_state(snapshot.get("state"))
+            else:
+                self._reset_state(self.seed() if fresh and self.seed else None)
+
+            seqs = sorted(int(p.stem) for p in self.directory.glob("*.jsonl") if p.stem.isdigit())
+            self._segments = []
+            for seq in seqs:
+                if seq <= covered:
+                    # Left behind by a compaction interrupted after its snapshot
+                    self._segment_path(seq).unlink(missing_ok=True)
+                    continue
+                self._replay(seq, last=seq == seqs[-1])
+                self._segments.append(seq)
+
+            self._open_segment(self._segments[-1] if self._segments else covered + 1)
+            if fresh and self.seed:
+                self._write_snapshot(covered)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+    def _replay(self, seq: int, last: bool) -> None:
+        path = self._segment_path(seq)
+        data = path.read_bytes()
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            end = offset + len(line)
+            if line.strip():
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    record = json.loads(line)
+                except ValueError as e:
+                    if last and end == len(data):
+                        # Crash mid-append: drop the partial record
+                        os.truncate(path, offset)
+                        json_log_recovered_lines_total.labels(log=self.name, kind="torn_tail").inc()
+                        print(f"[persist] ⚠️  {path}: truncated torn tail at byte {offset}")
+                        break
+                    json_log_recovered_lines_total.labels(log=self.name, kind="corrupt").inc()
+                    print(f"[persist] ⚠️  {path}: skipped corrupt line at byte {offset}: {e}")
+                else:
+                    self._apply(record)
+            offset = end
+
+    def _open_segment(self, seq: int) -> None:
+        if not self._segments or self._segments[-1] != seq:
+            self._segments.append(seq)
+        path = self._segment_path(seq)
+        self._active = open(path, "ab")
+        self._active_size = self._active.tell()
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        """Durably append records, then apply them to the in-memory state."""
+        if not records:
+            return
+        lines = [json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in records]
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        with self._lock:
+            self.open()
+            self._active.write(data)
+            self._active.flush()
+            if self.fsync:
+                os.fsync(self._active.fileno())
+            self._active_size += len(data)
+            # Apply what was written (decoded), so memory always matches disk
+            for line in lines:
+                self._apply(json.loads(line))
+            if self._active_size >= self.segment_bytes:
+                self._roll()
+                if len(self._segments) > self.compact_segments:
+                    self.compact()
+
+    def _roll(self) -> None:
+        self._active.close()
+        self._open_segment(self._segments[-1] + 1)
+
+    def compact(self) -> None:
+        """Snapshot the current state and delete every segment it covers."""
+        with self._lock:
+            self.open()
+            if self._active_size:
+                self._roll()
+            sealed = self._segments[:-1]
+            if not sealed:
+                return
+            self._write_snapshot(sealed[-1])
+            for seq in sealed:
+                self._segment_path(seq).unlink(missing_ok=True)
+            self._segments = self._segments[-1:]
+            json_log_compactions_total.labels(log=self.name).inc()
+
+    def _write_snapshot(self, covered: int) -> None:
+        save_json_atomic(self.snapshot_file, {"seq": covered, "state": self._snapshot_state()})
+
+
+class TailLog(SegmentedLog):
+    """List collection keeping the newest `keep` items (all of them if None)."""
+
+    def __init__(self, directory: Path, keep: int | None = None, **kwargs):
+        self.keep = keep
+        self._items: deque = deque(maxlen=keep)
+        super().__init__(directory, **kwargs)
+
+    def _reset_state(self, state: Any) -> None:
+        self._items = deque(state or [], maxlen=self.keep)
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        if record["op"] == "add":
+            self._items.append(record["v"])
+        elif record["op"] == "reset":
+            self._reset_state(record["v"])
+
+    def _snapshot_state(self) -> Any:
+        return list(self._items)
+
+    def extend(self, items: list[Any]) -> None:
+        self.append([{"op": "add", "v": item} for item in items])
+
+    def replace(self, items: list[Any]) -> None:
+        with self._lock:
+            self.append([{"op": "reset", "v": items}])
+            self.compact()  # Everything before the reset is garbage
+
+    def tail(self, limit: int | None = None) -> list[Any]:
+        """Copy of the newest `limit` items (all if None), oldest first."""
+        with self._lock:
+            self.open()
+            items = list(self._items)
+        return copy.deepcopy(items[-limit:] if limit else items)
+
+
+class MapLog(SegmentedLog):
+    """Keyed collection; "push" appends to a per-key list capped at `keep_per_key`."""
+
+    def __init__(self, directory: Path, keep_per_key: int | None = None, **kwargs):
+        self.keep_per_key = keep_per_key
+        self._map: dict[str, Any] = {}
+        super().__init__(directory, **kwargs)
+
+    def _reset_state(self, state: Any) -> None:
+        self._map = dict(state or {})
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "set":
+            self._map[record["k"]] = record["v"]
+        elif op == "del":
+            self._map.pop(record["k"], None)
+        elif op == "push":
+            values = self._map.setdefault(record["k"], [])
+            values.append(record["v"])
+            if self.keep_per_key and len(values) > self.keep_per_key:
+                del values[: len(values) - self.keep_per_key]
+        elif op == "reset":
+            self._reset_state(record["v"])
+
+    def _snapshot_state(self) -> Any:
+        return self._map
+
+    def set(self, key: str, value: Any) -> None:
+        self.append([{"op": "set", "k": key, "v": value}])
+
+    def push(self, key: str, value: Any) -> None:
+        self.append([{"op": "push", "k": key, "v": value}])
+
+    def replace(self, mapping: dict[str, Any]) -> None:
+        with self._lock:
+            self.append([{"op": "reset", "v": mapping}])
+            self.compact()  # Everything before the reset is garbage
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self.open()
+            return copy.deepcopy(self._map.get(key, default))
+
+    def all(self) -> dict[str, Any]:
+        with self._lock:
+            self.open()
+            return copy.deepcopy(self._map)
+
+
 class JSONBackend(PersistenceBackend):
-    """JSON file-based persistence backend for backward compatibility."""
+    """Append-only JSON log persistence backend for backward compatibility."""
 
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # File paths
+        # Legacy whole-file JSON, read once to seed a fresh log
         self.schedules_file = self.data_dir / "acculynx_schedules.json"
         self.audit_file = self.data_dir / "acculynx_audit.json"
         self.local_runs_file = self.data_dir / "local_action_runs.json"
@@ -62,150 +334,140 @@ class JSONBackend(PersistenceBackend):
         self.alerts_file = self.data_dir / "alerts.json"
         self.tenants_file = self.data_dir / "tenants.json"
 
+        log_dir = self.data_dir / "log"
+
+        def seed(path: Path, default: Any) -> Callable[[], Any]:
+            return lambda: load_json_self_heal(path, default)
+
+        self.schedules = MapLog(log_dir / "schedules", seed=seed(self.schedules_file, {}))
+        self.audit = TailLog(log_dir / "audit", seed=seed(self.audit_file, []))
+        # Keep only last 1000 runs
+        self.local_runs = TailLog(
+            log_dir / "local_action_runs", keep=1000, seed=seed(self.local_runs_file, [])
+        )
+        # Keep only last 100 imports per tenant
+        self.imports = MapLog(
+            log_dir / "import_history", keep_per_key=100, seed=seed(self.imports_file, {})
+        )
+        # Keep only last 1000 events
+        self.events = TailLog(log_dir / "events", keep=1000, seed=seed(self.events_file, []))
+        # Keep only last 500 alerts
+        self.alerts = TailLog(log_dir / "alerts", keep=500, seed=seed(self.alerts_file, []))
+        self.tenants = MapLog(log_dir / "tenants", seed=seed(self.tenants_file, {}))
+
+    @property
+    def _logs(self) -> list[SegmentedLog]:
+        return [
+            self.schedules,
+            self.audit,
+            self.local_runs,
+            self.imports,
+            self.events,
+            self.alerts,
+            self.tenants,
+        ]
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        return await asyncio.get_event_loop().run_in_executor(None, fn, *args)
+
+    async def _ready(self, log: SegmentedLog) -> SegmentedLog:
+        """Open (recover) a log off the event loop before serving it from memory."""
+        if not log.is_open:
+            await self._run(log.open)
+        return log
+
     async def initialize(self) -> None:
-        """Initialize JSON backend - no-op since files are created on demand."""
-        pass
+        """Recover every log (snapshot + segment replay)."""
+        for log in self._logs:
+            await self._run(log.open)
 
     async def close(self) -> None:
-        """Close JSON backend - no-op."""
-        pass
+        """Close the active segment files."""
+        for log in self._logs:
+            await self._run(log.close)
+
+    async def compact(self) -> None:
+        """Snapshot every log and drop the segments the snapshots cover."""
+        for log in self._logs:
+            await self._run(log.compact)
 
     async def save_schedules(self, schedules: dict[str, Any]) -> None:
         """Save tenant import schedules."""
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.schedules_file, schedules
-        )
+        await self._run(self.schedules.replace, schedules)
 
     async def load_schedules(self) -> dict[str, Any]:
         """Load tenant import schedules."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.schedules_file, {}
-        )
+        return (await self._ready(self.schedules)).all()
+
+    async def apply_delta(
+        self,
+        schedules: dict[str, dict[str, Any] | None],
+        runs: list[dict[str, Any]],
+    ) -> None:
+        """Append schedule upserts/deletes and new runs to their logs."""
+        if schedules:
+            await self._run(
+                self.schedules.append,
+                [
+                    {"op": "del", "k": tenant}
+                    if schedule is None
+                    else {"op": "set", "k": tenant, "v": schedule}
+                    for tenant, schedule in schedules.items()
+                ],
+            )
+        if runs:
+            await self._run(self.local_runs.extend, runs)
 
     async def save_audit_entries(self, entries: list[dict[str, Any]]) -> None:
         """Save audit log entries."""
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.audit_file, entries
-        )
+        await self._run(self.audit.replace, entries)
 
     async def load_audit_entries(self, limit: int | None = None) -> list[dict[str, Any]]:
         """Load audit log entries."""
-        entries = await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.audit_file, []
-        )
-        if limit:
-            entries = entries[-limit:]  # Get most recent
-        return entries
+        return (await self._ready(self.audit)).tail(limit)  # Get most recent
 
     async def save_local_action_runs(self, runs: list[dict[str, Any]]) -> None:
         """Save local action execution runs."""
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.local_runs_file, runs
-        )
+        await self._run(self.local_runs.replace, runs)
 
     async def load_local_action_runs(self, limit: int | None = None) -> list[dict[str, Any]]:
         """Load local action execution runs."""
-        runs = await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.local_runs_file, []
-        )
-        if limit:
-            runs = runs[-limit:]  # Get most recent
-        return runs
+        return (await self._ready(self.local_runs)).tail(limit)  # Get most recent
 
     async def save_import_record(self, tenant: str, import_data: dict[str, Any]) -> None:
         """Save a completed import record."""
-        # Load existing imports
-        imports = await self._load_imports()
-        if tenant not in imports:
-            imports[tenant] = []
-
-        # Add new record
-        imports[tenant].append(import_data)
-
-        # Keep only last 100 per tenant
-        imports[tenant] = imports[tenant][-100:]
-
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.imports_file, imports
-        )
+        await self._run(self.imports.push, tenant, import_data)
 
     async def get_import_history(self, tenant: str, limit: int = 50) -> list[dict[str, Any]]:
         """Get import history for a tenant."""
-        imports = await self._load_imports()
-        tenant_imports = imports.get(tenant, [])
+        tenant_imports = (await self._ready(self.imports)).get(tenant, [])
         return tenant_imports[-limit:]  # Most recent first
 
-    async def _load_imports(self) -> dict[str, list[dict[str, Any]]]:
-        """Load import history."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.imports_file, {}
-        )
-
     async def save_event(self, event: dict[str, Any]) -> None:
         """Save an event record."""
-        events = await self._load_events()
-        events.append(event)
-
-        # Keep only last 1000 events
-        events = events[-1000:]
-
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.events_file, events
-        )
+        await self._run(self.events.extend, [event])
 
     async def get_recent_events(self, limit: int = 100) -> list[dict[str, Any]]:
         """Get recent events."""
-        events = await self._load_events()
-        return events[-limit:]  # Most recent
-
-    async def _load_events(self) -> list[dict[str, Any]]:
-        """Load events."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.events_file, []
-        )
+        return (await self._ready(self.events)).tail(limit)  # Most recent
 
     async def save_alert(self, alert: dict[str, Any]) -> None:
         """Save an alert record."""
-        alerts = await self._load_alerts()
-        alerts.append(alert)
-
-        # Keep only last 500 alerts
-        alerts = alerts[-500:]
-
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.alerts_file, alerts
-        )
+        await self._run(self.alerts.extend, [alert])
 
     async def get_active_alerts(self) -> list[dict[str, Any]]:
         """Get currently active alerts."""
-        alerts = await self._load_alerts()
+        alerts = (await self._ready(self.alerts)).tail()
         return [alert for alert in alerts if alert.get("resolved_at") is None]
 
-    async def _load_alerts(self) -> list[dict[str, Any]]:
-        """Load alerts."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.alerts_file, []
-        )
-
     async def update_tenant_config(self, tenant: str, config: dict[str, Any]) -> None:
         """Update tenant configuration."""
-        tenants = await self._load_tenants()
-        tenants[tenant] = config
-        await asyncio.get_event_loop().run_in_executor(
-            None, save_json_atomic, self.tenants_file, tenants
-        )
+        await self._run(self.tenants.set, tenant, config)
 
     async def get_tenant_config(self, tenant: str) -> dict[str, Any] | None:
         """Get tenant configuration."""
-        tenants = await self._load_tenants()
-        return tenants.get(tenant)
+        return (await self._ready(self.tenants)).get(tenant)
 
     async def get_all_tenant_configs(self) -> dict[str, Any]:
         """Get all tenant configurations."""
-        return await self._load_tenants()
-
-    async def _load_tenants(self) -> dict[str, Any]:
-        """Load tenant configurations."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, load_json_self_heal, self.tenants_file, {}
-        )
+        return (await self._ready(self.tenants)).all()
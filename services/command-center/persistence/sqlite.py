@@ -31,7 +31,8 @@ class SQLiteBackend(PersistenceBackend):
 
     def _init_db_sync(self) -> None:
         """Synchronous database initialization."""
-        self._connection = sqlite3.connect(str(self.db_path))
+        # Calls arrive on executor threads; the delta writer serializes writes
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self._connection.execute("PRAGMA journal_mode=WAL")  # Better concurrency
         self._connection.execute("PRAGMA synchronous=NORMAL")  # Balance safety/speed
         self._connection.execute("PRAGMA foreign_keys=ON")  # Enable FK constraints
@@ -197,7 +198,7 @@ class SQLiteBackend(PersistenceBackend):
             "CREATE INDEX IF NOT EXISTS idx_anomaly_events_alert ON anomaly_events(alert_name)",
             "CREATE INDEX IF NOT EXISTS idx_anomaly_events_created ON anomaly_events(created_at)",
             "CREATE INDEX IF NOT EXISTS idx_anomaly_events_resolved ON anomaly_events(resolved_at)",
-            "CREATE INDEX IF NOT EXISTS idx_remediation_actions_anomaly ON remediation_actions(anomaly_id)",
+            "CREATE INDEX IF NOT EXISTS idx_remediation_actions_anomaly ON remediation_actions(anomaly_event_id)",
             "CREATE INDEX IF NOT EXISTS idx_remediation_actions_tenant ON remediation_actions(tenant_id)",
             "CREATE INDEX IF NOT EXISTS idx_remediation_actions_status ON remediation_actions(status)",
             "CREATE INDEX IF NOT EXISTS idx_remediation_actions_created ON remediation_actions(created_at)",
@@ -258,6 +259,71 @@ class SQLiteBackend(PersistenceBackend):
                     (tenant_id, json.dumps(schedule)),
                 )
 
+    async def apply_delta(
+        self,
+        schedules: dict[str, dict[str, Any] | None],
+        runs: list[dict[str, Any]],
+    ) -> None:
+        """Upsert/delete changed schedules and append new runs in one transaction."""
+        await asyncio.get_event_loop().run_in_executor(
+            None, self._apply_delta_sync, schedules, runs
+        )
+
+    def _apply_delta_sync(
+        self,
+        schedules: dict[str, dict[str, Any] | None],
+        runs: list[dict[str, Any]],
+    ) -> None:
+        """Synchronous delta apply."""
+        deleted = [(tenant_id,) for tenant_id, schedule in schedules.items() if schedule is None]
+        upserted = [
+            (tenant_id, json.dumps(schedule))
+            for tenant_id, schedule in schedules.items()
+            if schedule is not None
+        ]
+        with self._get_cursor() as cursor:
+            if deleted:
+                cursor.executemany("DELETE FROM import_schedules WHERE tenant_id = ?", deleted)
+            if upserted:
+                # Ensure tenants exist
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO tenants (tenant_id, config_json) VALUES (?, ?)",
+                    [
+                        (tenant_id, json.dumps({"tenant_id": tenant_id}))
+                        for tenant_id, _ in upserted
+                    ],
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO import_schedules (tenant_id, schedule_json, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(tenant_id) DO UPDATE SET
+                        schedule_json = excluded.schedule_json,
+                        updated_at = CURRENT_TIMESTAMP
+                """,
+                    upserted,
+                )
+            if runs:
+                cursor.executemany(
+                    """
+                    INSERT INTO local_action_runs
+                    (action_name, tenant_id, status, started_at, completed_at, output_json, error_message)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            run.get("action_name", "unknown"),
+                            run.get("tenant_id"),
+                            run.get("status", "unknown"),
+                            run.get("started_at"),
+                            run.get("completed_at"),
+                            json.dumps(run.get("output", {})),
+                            run.get("error_message"),
+                        )
+                        for run in runs
+                    ],
+                )
+
     async def load_schedules(self) -> dict[str, Any]:
         """Load tenant import schedules."""
         return await asyncio.get_event_loop().run_in_executor(None, self._load_schedules_sync)
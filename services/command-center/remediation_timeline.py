@@ -0,0 +1,179 @@
+"""
+Time-bucketed remediation counts for the recovery timeline.
+
+Phase XX: Backs /ops/remediations/timeline and its anomaly overlay.
+
+Bucketing is pushed down into SQLite: rows are selected with a plain range
+predicate on ts (served by idx_remediation_events_ts / _tenant_ts) and
+grouped by bucket number, so only one row per non-empty bucket comes back.
+Results are cached per (db, tenant, window, bucket) for
+REMEDIATION_TIMELINE_CACHE_TTL seconds; record_remediation_event() calls
+invalidate_timeline_cache() so new events show up immediately. Both
+endpoints read through the same cache, so a dashboard polling the timeline
+and the overlay together costs one query.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+REMEDIATION_TIMELINE_CACHE_TTL = float(os.getenv("REMEDIATION_TIMELINE_CACHE_TTL", "5"))
+_CACHE_MAX_ENTRIES = 256
+
+# (db_path, tenant, window_minutes, bucket_minutes) -> (expires_at, timeline)
+_cache: dict[tuple, tuple[float, list[dict[str, Any]]]] = {}
+_cache_lock = threading.Lock()
+_indexed_dbs: set[str] = set()
+
+
+def invalidate_timeline_cache() -> None:
+    """Drop all cached timelines (called when a remediation event is recorded)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def ensure_timeline_indexes(conn: sqlite3.Connection) -> None:
+    """Create the ts / (tenant, ts) indexes used by the timeline range scan."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_remediation_events_ts ON remediation_events(ts)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_remediation_events_tenant_ts ON remediation_events(tenant, ts)"
+    )
+
+
+def _iso_z(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def compute_timeline(
+    db_path: Path,
+    tenant: str | None,
+    window_minutes: int,
+    bucket_minutes: int,
+    now: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Count remediation events per bucket over the last window_minutes.
+
+    Buckets start at the window start rounded down to a multiple of
+    bucket_minutes past the hour and run through now; empty buckets are
+    included with count 0.
+    """
+    now = now or datetime.now(UTC)
+    start = now - timedelta(minutes=window_minutes)
+    step_seconds = bucket_minutes * 60
+
+    # Normalize start to bucket boundary (round down to nearest bucket)
+    bucket_start = start.replace(second=0, microsecond=0)
+    bucket_start -= timedelta(minutes=bucket_start.minute % bucket_minutes)
+    bucket_start_epoch = int(bucket_start.timestamp())
+
+    n_buckets = int((now - bucket_start).total_seconds() // step_seconds) + 1
+    counts = [0] * n_buckets
+
+    if db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            if str(db_path) not in _indexed_dbs:
+                ensure_timeline_indexes(conn)
+                conn.commit()
+                _indexed_dbs.add(str(db_path))
+
+            # ts is stored as ISO-8601 UTC with a Z suffix, so a text range
+            # compare matches datetime() ordering and can use the index
+            query = """
+                SELECT (CAST(strftime('%s', ts) AS INTEGER) - ?) / ? AS bucket, COUNT(*) AS cnt
+                FROM remediation_events
+                WHERE ts >= ?
+            """
+            params: list[Any] = [bucket_start_epoch, step_seconds, _iso_z(start)]
+            if tenant and tenant != "all":
+                query += " AND tenant = ?"
+                params.append(tenant)
+            query += " GROUP BY bucket"
+
+            for bucket, cnt in conn.execute(query, params):
+                if bucket is not None and 0 <= bucket < n_buckets:
+                    counts[bucket] += cnt
+        except sqlite3.OperationalError as e:
+            # Table not created yet (no remediation recorded so far)
+            if "no such table" not in str(e):
+                raise
+        finally:
+            conn.close()
+
+    step = timedelta(seconds=step_seconds)
+    return [{"ts": _iso_z(bucket_start + i * step), "count": c} for i, c in enumerate(counts)]
+
+
+def get_timeline(
+    db_path: Path, tenant: str | None, window_minutes: int, bucket_minutes: int
+) -> list[dict[str, Any]]:
+    """compute_timeline() through the TTL cache."""
+    key = (str(db_path), tenant or "all", window_minutes, bucket_minutes)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+    timeline = compute_timeline(db_path, tenant, window_minutes, bucket_minutes)
+
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            expired = [k for k, (expires, _) in _cache.items() if expires <= now]
+            for k in expired or list(_cache)[:1]:
+                del _cache[k]
+        _cache[key] = (now + REMEDIATION_TIMELINE_CACHE_TTL, timeline)
+    return timeline
+
+
+def detect_timeline_anomalies(
+    timeline: list[dict[str, Any]],
+    multiplier: float,
+    min_count: int,
+    window_size: int = 4,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Find anomaly and quiet buckets in a timeline.
+
+    Anomaly rule: count >= min_count AND count > avg * multiplier, where avg
+    is the rolling baseline over the previous window_size buckets.
+    Quiet period: count == 0
+
+    Returns:
+        (anomalies, quiet)
+    """
+    anomalies: list[dict[str, Any]] = []
+    quiet: list[dict[str, Any]] = []
+
+    for i, point in enumerate(timeline):
+        ts = point["ts"]
+        count = int(point["count"])
+
+        if count == 0:
+            quiet.append({"ts": ts, "count": count})
+            continue
+
+        # Rolling baseline (fewer buckets at the start of the window)
+        baseline_counts = [int(p["count"]) for p in timeline[max(0, i - window_size) : i]]
+        if not baseline_counts:
+            # First bucket, no baseline yet
+            continue
+
+        avg = sum(baseline_counts) / len(baseline_counts)
+
+        if count >= min_count and count > avg * multiplier:
+            anomalies.append(
+                {
+                    "ts": ts,
+                    "count": count,
+                    "baseline": round(avg, 2),
+                    "factor": round(count / avg, 2) if avg > 0 else float(count),
+                }
+            )
+
+    return anomalies, quiet
@@ -201,6 +201,8 @@ def get_delivery_stats():
     - pending_now: Deliveries ready for immediate attempt
     - near_failure: Deliveries close to max attempts
     - dedup_window_seconds: Current dedup window setting
+    - inflight: Deliveries currently being attempted by the worker pool
+    - latency_p50_seconds / latency_p99_seconds: Recent enqueue-to-delivery latency
 
     Requires: operator or admin role
 
@@ -209,13 +211,18 @@ def get_delivery_stats():
       "total_queued": 12,
       "pending_now": 3,
       "near_failure": 1,
-      "dedup_window_seconds": 300
+      "dedup_window_seconds": 300,
+      "inflight": 2,
+      "latency_p50_seconds": 0.4,
+      "latency_p99_seconds": 3.1
     }
     """
     try:
         import event_store
+        from delivery_worker import delivery_pool
 
         stats = event_store.get_delivery_stats()
+        stats.update(delivery_pool.stats())
         return stats
     except Exception as e:
         print(f"[alerts] ❌ Failed to get delivery stats: {e}")
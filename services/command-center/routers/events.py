@@ -12,14 +12,16 @@ import sys
 import uuid
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import event_store
+from event_ingest import event_writer
 from rbac import require_roles
+from sse_broadcast import sse_broadcaster
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -59,8 +61,11 @@ EVENT_SCHEMAS = {
     },
 }
 
-# Simple broadcaster for SSE (M2)
-subscribers: list[asyncio.Queue] = []
+# SSE fan-out is fed with every batch the ingest writer commits
+event_writer.add_commit_listener(sse_broadcaster.publish_many)
+
+# Upper bound on events accepted by one POST /events/batch call
+EVENT_BATCH_MAX = int(os.getenv("EVENT_BATCH_MAX", "1000"))
 
 
 @router.get("/schema", dependencies=[Depends(require_roles(["operator", "admin"]))])
@@ -86,13 +91,11 @@ async def get_schema(event_type: str):
     }
 
 
-@router.post("/publish")
-async def publish_event(event: dict, request: Request):
+def _normalize_event(event: dict, request: Request) -> dict:
     """
-    Publish an event to Command Center.
+    Validate an incoming event against its schema and fill in defaults.
 
-    Phase VI M1: Validate + normalize + store
-    Phase VI M2: Fan out to SSE subscribers
+    Mutates and returns the event. Raises HTTPException(400) if invalid.
     """
     # Validate event_type
     event_type = event.get("event_type")
@@ -132,100 +135,113 @@ async def publish_event(event: dict, request: Request):
         "client_ip": client_host,
     }
 
-    # Save to persistent store (M2)
+    return event
+
+
+@router.post("/publish")
+async def publish_event(event: dict, request: Request):
+    """
+    Publish an event to Command Center.
+
+    Phase VI M1: Validate + normalize + store
+    Phase VI M2: Fan out to SSE subscribers
+
+    The event is committed by the group-commit ingest writer (off the event
+    loop, shared with concurrent publishes) and reaches SSE subscribers from
+    its commit listener, with its store id.
+    """
+    _normalize_event(event, request)
+    event_type = event["event_type"]
+
+    stored = True
     try:
-        event_store.save_event(event)
+        await event_writer.submit(event, wait=True)
     except Exception as e:
         print(f"[events] ⚠️  Failed to save event: {e}")
-        # Don't fail publish if storage fails
-
-    # Fan out to SSE subscribers (M2)
-    await _broadcast_event(event)
+        # Don't fail publish if storage fails; still fan out (without an id)
+        stored = False
+        _broadcast_event(event)
 
     return {
         "status": "ok",
-        "stored": True,
+        "stored": stored,
         "event_type": event_type,
         "event_id": event["event_id"],
         "received_at": event["_meta"]["received_at"],
     }
 
 
-@router.get("/stream", dependencies=[Depends(require_roles(["operator", "admin"]))])
-async def event_stream():
+@router.post("/batch")
+async def publish_batch(body: list[dict] | dict, request: Request):
     """
-    Server-Sent Events stream for real-time event updates.
+    Publish several events in one request.
 
-    Phase VI M2: Live event streaming for dashboards and monitoring.
+    Accepts either a JSON array of events or {"events": [...]}. Every event
+    is validated like /events/publish; the whole batch is rejected if any
+    event is invalid. Valid batches are written through the group-commit
+    ingest writer and fanned out to SSE subscribers as they commit.
     """
+    events = body.get("events") if isinstance(body, dict) else body
+    if not isinstance(events, list) or not events:
+        raise HTTPException(status_code=400, detail="events must be a non-empty list")
+    if len(events) > EVENT_BATCH_MAX:
+        raise HTTPException(
+            status_code=413, detail=f"batch too large (max {EVENT_BATCH_MAX} events)"
+        )
 
-    async def event_generator():
-        # Create queue for this client
-        queue = asyncio.Queue()
-        subscribers.append(queue)
-
+    for i, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise HTTPException(status_code=400, detail=f"events[{i}]: must be an object")
         try:
-            # Send initial connection message
-            yield f"data: {json.dumps({'type': 'connected', 'timestamp': datetime.now(UTC).isoformat()})}\n\n"
-
-            while True:
-                try:
-                    # Wait for event with timeout
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"data: {json.dumps(event)}\n\n"
-                except TimeoutError:
-                    # Send heartbeat
-                    yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': datetime.now(UTC).isoformat()})}\n\n"
-        except Exception as e:
-            print(f"[events] SSE error: {e}")
-        finally:
-            # Remove from subscribers
-            if queue in subscribers:
-                subscribers.remove(queue)
+            _normalize_event(event, request)
+        except HTTPException as e:
+            detail = f"events[{i}]: {e.detail}"
+            raise HTTPException(status_code=e.status_code, detail=detail) from e
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
-        },
-    )
+    try:
+        await event_writer.submit_many(events, wait=True)
+    except Exception as e:
+        print(f"[events] ❌ Failed to store event batch: {e}")
+        raise HTTPException(status_code=503, detail="event store unavailable") from e
+
+    return {
+        "status": "ok",
+        "stored": len(events),
+        "event_ids": [event["event_id"] for event in events],
+    }
 
 
 @router.get("/stream", dependencies=[Depends(require_roles(["operator", "admin"]))])
-async def event_stream():
+async def event_stream(
+    last_event_id: str | None = Header(None),
+    since_id: int | None = None,
+):
     """
     Server-Sent Events stream for real-time event updates.
 
     Phase VI M2: Live event streaming for dashboards and monitoring.
+
+    Each event carries its store id as the SSE id. A reconnecting client
+    (Last-Event-ID header, or ?since_id= for clients that cannot set
+    headers) first receives the stored events it missed. A slow client's
+    buffer is bounded; dropped events are re-read from the store.
     """
+    resume_from = since_id
+    if last_event_id:
+        try:
+            resume_from = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from None
 
     async def event_generator():
-        # Create queue for this client
-        queue = asyncio.Queue()
-        subscribers.append(queue)
-
         try:
-            # Send initial connection message
-            yield f"data: {json.dumps({'type': 'connected', 'timestamp': datetime.now(UTC).isoformat()})}\n\n"
-
-            while True:
-                try:
-                    # Wait for event with timeout
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"data: {json.dumps(event)}\n\n"
-                except TimeoutError:
-                    # Send heartbeat
-                    yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': datetime.now(UTC).isoformat()})}\n\n"
+            async for frame in sse_broadcaster.stream(resume_from):
+                yield frame
+        except asyncio.CancelledError:
+            # Client disconnected
+            raise
         except Exception as e:
             print(f"[events] SSE error: {e}")
-        finally:
-            # Remove from subscribers
-            if queue in subscribers:
-                subscribers.remove(queue)
 
     return StreamingResponse(
         event_generator(),
@@ -234,11 +250,23 @@ async def event_stream():
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
+            "Access-Control-Allow-Headers": "Cache-Control, Last-Event-ID",
         },
     )
 
 
+@router.get("/stream/stats", dependencies=[Depends(require_roles(["operator", "admin"]))])
+async def event_stream_stats():
+    """Per-subscriber SSE buffer depth and dropped (lag) counts."""
+    subs = sse_broadcaster.stats()
+    return {
+        "status": "ok",
+        "subscribers": len(subs),
+        "buffer_max": sse_broadcaster.max_buffer,
+        "streams": subs,
+    }
+
+
 @router.get("/recent", dependencies=[Depends(require_roles(["operator", "admin"]))])
 async def recent(
     request: Request,
@@ -296,6 +324,104 @@ async def recent(
     }
 
 
+def _effective_tenant(request: Request, tenant_id: str | None) -> str | None:
+    """Header tenant, unless an admin/operator asked for a specific one (same rule as /recent)."""
+    header_tenant = getattr(request.state, "tenant_id", None)
+    user_roles = getattr(request.state, "user_roles", [])
+    is_admin = any(r in ("admin", "operator") for r in user_roles)
+    return tenant_id if (is_admin and tenant_id) else header_tenant
+
+
+@router.get("/browse", dependencies=[Depends(require_roles(["operator", "admin"]))])
+async def browse(
+    request: Request,
+    limit: int = 50,
+    cursor: str | None = None,
+    event_type: str | None = None,
+    source: str | None = None,
+    tenant_id: str | None = None,
+    severity: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    include_system: bool = True,
+    fields: str = "light",
+):
+    """
+    Page through events, newest first, with an opaque keyset cursor.
+
+    Query parameters are those of /recent, plus:
+    - cursor: next_cursor from the previous page
+    - until: Only events before this timestamp (ISO format)
+    - include_system: Include events without a tenant (default true)
+    - fields: "light" (headers only, no payload) or "full"
+
+    Pages cost the same however deep the cursor is (no OFFSET).
+    """
+    try:
+        events, next_cursor = await asyncio.to_thread(
+            event_store.browse_events,
+            limit=limit,
+            cursor=cursor,
+            tenant_id=_effective_tenant(request, tenant_id),
+            include_system=include_system,
+            event_type=event_type,
+            source=source,
+            severity=severity,
+            since=since,
+            until=until,
+            fields=fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return {
+        "status": "ok",
+        "count": len(events),
+        "events": events,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/export", dependencies=[Depends(require_roles(["operator", "admin"]))])
+async def export_ndjson(
+    request: Request,
+    event_type: str | None = None,
+    source: str | None = None,
+    tenant_id: str | None = None,
+    severity: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    include_system: bool = True,
+    fields: str = "full",
+):
+    """
+    Stream every matching event as NDJSON (one JSON object per line).
+
+    Filters match /browse. Events are read in keyset batches as the client
+    consumes the response, so memory stays flat for any range.
+    """
+    if fields not in ("light", "full"):
+        raise HTTPException(status_code=400, detail="fields must be 'light' or 'full'")
+
+    rows = event_store.iter_events(
+        tenant_id=_effective_tenant(request, tenant_id),
+        include_system=include_system,
+        event_type=event_type,
+        source=source,
+        severity=severity,
+        since=since,
+        until=until,
+        fields=fields,
+    )
+    # Sync iterator: Starlette pulls it from a worker thread, off the event loop
+    lines = (json.dumps(event) + "\n" for event in rows)
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=events.ndjson"},
+    )
+
+
 @router.get("/audit", dependencies=[Depends(require_roles(["operator", "admin"]))])
 async def audit_timeline(
     request: Request,
@@ -394,43 +520,9 @@ async def stats(
     }
 
 
-async def _broadcast_event(event: dict):
-    """Broadcast event to all SSE subscribers."""
-    if not subscribers:
-        return
-
-    msg = json.dumps(event)
-    for q in subscribers:
-        try:
-            await q.put(msg)
-        except Exception:
-            # Subscriber may have disconnected
-            pass
-
-
-@router.get("/stream", dependencies=[Depends(require_roles(["operator", "admin"]))])
-async def stream_events():
-    """
-    SSE endpoint: UI can connect and receive events in real-time.
-
-    Returns Server-Sent Events stream.
-    """
-    q: asyncio.Queue = asyncio.Queue()
-    subscribers.append(q)
-
-    async def event_generator():
-        try:
-            while True:
-                msg = await q.get()
-                yield f"data: {msg}\n\n"
-        except asyncio.CancelledError:
-            # Client disconnected
-            pass
-        finally:
-            if q in subscribers:
-                subscribers.remove(q)
-
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+def _broadcast_event(event: dict) -> None:
+    """Fan an event out to SSE subscribers (events stored via event_writer are sent by it)."""
+    sse_broadcaster.publish(event)
 
 
 # ============================================================================
@@ -453,7 +545,7 @@ async def manual_prune():
     """
     try:
         # Phase VII M4: Use per-tenant retention
-        results = event_store.prune_old_events_with_per_tenant()
+        results = await asyncio.to_thread(event_store.prune_old_events_with_per_tenant)
 
         total_pruned = sum(r["pruned_count"] for r in results)
 
@@ -480,11 +572,9 @@ async def manual_prune():
                     },
                 }
 
-                # Save prune event (after prune, so it doesn't get immediately deleted)
-                event_store.save_event(prune_event)
-
-                # Broadcast to SSE subscribers
-                await _broadcast_event(prune_event)
+                # Save prune event (after prune, so it doesn't get immediately deleted);
+                # the writer's commit listener broadcasts it to SSE subscribers
+                await event_writer.submit(prune_event, wait=True)
 
         return {
             "status": "ok",
@@ -1,6 +1,8 @@
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
+import event_store
 from fastapi import APIRouter, Depends, Query
 
 
@@ -85,3 +87,35 @@ def tenant_summary(hours: int = Query(24, ge=1, le=168)):
         "generated_at": now.isoformat() + "Z",
         "tenants": tenants,
     }
+
+
+@router.get("/events", dependencies=[Depends(AdminRequired)])
+def tenant_event_summary(hours: int = Query(24, ge=1, le=168)):
+    """
+    Per-tenant event volume, by severity and event type.
+
+    Served from the hourly event rollups, so the window starts on the hour:
+    the current partial hour plus the previous `hours - 1` full hours.
+    """
+    now = datetime.utcnow()
+    start_sec = (int(time.time()) // 3600 - (hours - 1)) * 3600
+    tenants: dict[str, dict[str, Any]] = {}
+    for r in event_store.get_event_rollups(start_sec):
+        tenant_id = r["tenant_id"] or "system"
+        t = tenants.setdefault(
+            tenant_id,
+            {"tenant_id": tenant_id, "total_events": 0, "by_severity": {}, "by_event_type": {}},
+        )
+        t["total_events"] += r["count"]
+        severity = r["severity"] or "unknown"
+        t["by_severity"][severity] = t["by_severity"].get(severity, 0) + r["count"]
+        t["by_event_type"][r["event_type"]] = (
+            t["by_event_type"].get(r["event_type"], 0) + r["count"]
+        )
+
+    return {
+        "range_hours": hours,
+        "range_start": datetime.utcfromtimestamp(start_sec).isoformat() + "Z",
+        "generated_at": now.isoformat() + "Z",
+        "tenants": sorted(tenants.values(), key=lambda x: x["total_events"], reverse=True),
+    }
@@ -0,0 +1,181 @@
+"""
+Shared SQLite connection layer for Command Center stores.
+
+Opens the database once in WAL mode and hands out long-lived connections:
+a single writer (serialized by a lock) plus a small pool of readers, so
+dashboards keep reading while ingest is writing. Because connections are
+reused, sqlite3's per-connection statement cache also keeps prepared
+statements warm across calls.
+
+Usage:
+    pool = SQLitePool("/data/events.db", name="events")
+    with pool.read("list_recent") as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+    with pool.write("save_event") as conn:
+        conn.execute("INSERT ...")
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from prometheus_client import Counter, Histogram
+
+# Pool / pragma tuning (overridable per deployment)
+POOL_READERS = int(os.getenv("SQLITE_POOL_READERS", "4"))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "16384"))  # 16 MiB page cache
+MMAP_SIZE_BYTES = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(128 * 1024 * 1024)))
+SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+STATEMENT_CACHE_SIZE = 256
+
+sqlite_op_seconds = Histogram(
+    "aetherlink_sqlite_op_seconds",
+    "SQLite operation latency (including pool/lock wait)",
+    ["db", "op", "mode"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+sqlite_op_errors_total = Counter(
+    "aetherlink_sqlite_op_errors_total",
+    "SQLite operations that raised",
+    ["db", "op", "mode"],
+)
+
+
+class SQLitePool:
+    """Single-writer / multi-reader SQLite connection pool.
+
+    Writes run inside ``BEGIN IMMEDIATE`` ... ``COMMIT`` on the one writer
+    connection; nested ``write()`` blocks on the same thread join the outer
+    transaction. Reads borrow a connection from the reader pool, growing it
+    lazily up to ``readers`` connections.
+
+    ``:memory:`` databases cannot be shared between connections, so in that
+    case reads are served by the writer connection.
+    """
+
+    def __init__(self, path: str, name: str = "sqlite", readers: int = POOL_READERS) -> None:
+        self.path = str(path)
+        self.name = name
+        self.max_readers = max(1, readers)
+        self._memory = self.path == ":memory:"
+        if not self._memory:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._write_lock = threading.RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._all: list[sqlite3.Connection] = []
+
+    # ------------------------------------------------------------------
+    # Connection setup
+    # ------------------------------------------------------------------
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new tuned connection (caller owns and closes it)."""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None,  # explicit transactions only
+        )
+        conn.row_factory = sqlite3.Row
+        if not self._memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        return conn
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self.connect()
+            self._all.append(self._writer)
+        return self._writer
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                conn = self.connect()
+                self._all.append(conn)
+                return conn
+        return self._readers.get(timeout=BUSY_TIMEOUT_MS / 1000)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def read(self, op: str) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection for one logical read operation."""
+        if self._memory:
+            with self.write(op) as conn:
+                yield conn
+            return
+
+        start = time.perf_counter()
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        except Exception:
+            sqlite_op_errors_total.labels(db=self.name, op=op, mode="read").inc()
+            raise
+        finally:
+            self._readers.put(conn)
+            sqlite_op_seconds.labels(db=self.name, op=op, mode="read").observe(
+                time.perf_counter() - start
+            )
+
+    @contextmanager
+    def write(self, op: str) -> Iterator[sqlite3.Connection]:
+        """Run one write transaction on the shared writer connection."""
+        start = time.perf_counter()
+        with self._write_lock:
+            conn = self._writer_conn()
+            if conn.in_transaction:
+                # Nested write on the same thread: join the outer transaction
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                sqlite_op_errors_total.labels(db=self.name, op=op, mode="write").inc()
+                raise
+            finally:
+                sqlite_op_seconds.labels(db=self.name, op=op, mode="write").observe(
+                    time.perf_counter() - start
+                )
+
+    def close(self) -> None:
+        """Close every connection opened by this pool."""
+        with self._write_lock, self._reader_lock:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all.clear()
+            self._writer = None
+            self._readers = queue.LifoQueue()
+            self._reader_count = 0
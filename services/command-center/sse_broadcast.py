@@ -0,0 +1,193 @@
+"""
+Server-Sent Events fan-out for /events/stream.
+
+Each committed event is serialized once into an SSE frame whose id is the
+event's store id, and appended to every subscriber's ring buffer
+(SSE_BUFFER_MAX frames). publish() never waits on a client. A subscriber
+that falls behind loses its own oldest frames, never anyone else's. The
+drop is counted (aetherlink_sse_dropped_total and the subscriber's lag),
+and its stream then refills the gap from the event store, so a slow
+dashboard still sees every event, only later.
+
+Clients that reconnect with Last-Event-ID first get the stored events after
+that id, then the live frames. Both refills read the store SSE_REPLAY_MAX
+events at a time and keep paging until they reach the subscriber's oldest
+buffered frame (or the end of the store), so no gap is ever skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+SSE_BUFFER_MAX = int(os.getenv("SSE_BUFFER_MAX", "256"))
+SSE_REPLAY_MAX = int(os.getenv("SSE_REPLAY_MAX", "1000"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "30"))
+
+sse_subscribers = Gauge(
+    "aetherlink_sse_subscribers",
+    "Open /events/stream connections",
+)
+sse_dropped_total = Counter(
+    "aetherlink_sse_dropped_total",
+    "SSE frames dropped from a slow subscriber's ring buffer",
+)
+sse_replayed_total = Counter(
+    "aetherlink_sse_replayed_total",
+    "Events sent to SSE subscribers from the event store",
+    ["reason"],  # resume (Last-Event-ID), lag (refill after drops)
+)
+
+
+def encode_frame(event: dict[str, Any]) -> str:
+    """SSE frame for an event, with its store id (if it has one) as the event id."""
+    data = f"data: {json.dumps(event)}\n\n"
+    event_id = event.get("id")
+    return f"id: {event_id}\n{data}" if event_id is not None else data
+
+
+def _status_frame(kind: str) -> str:
+    return f"data: {json.dumps({'type': kind, 'timestamp': datetime.now(UTC).isoformat()})}\n\n"
+
+
+class SSESubscriber:
+    """One stream's ring buffer and lag bookkeeping."""
+
+    __slots__ = ("buffer", "wakeup", "dropped", "lagged_from")
+
+    def __init__(self, max_buffer: int) -> None:
+        # (store id or None, encoded frame)
+        self.buffer: deque[tuple[int | None, str]] = deque(maxlen=max_buffer)
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        # Id just before the oldest dropped frame not yet refilled from the store
+        self.lagged_from: int | None = None
+
+
+class SSEBroadcaster:
+    """Serialize-once fan-out to bounded per-subscriber ring buffers."""
+
+    def __init__(
+        self,
+        load_after: Callable[[int, int], list[dict[str, Any]]] | None = None,
+        max_buffer: int = SSE_BUFFER_MAX,
+        replay_max: int = SSE_REPLAY_MAX,
+        heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+    ) -> None:
+        if load_after is None:
+            import event_store
+
+            load_after = event_store.list_after
+        self._load_after = load_after
+        self.max_buffer = max(1, max_buffer)
+        self.replay_max = replay_max
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers: list[SSESubscriber] = []
+
+    def subscribe(self) -> SSESubscriber:
+        sub = SSESubscriber(self.max_buffer)
+        self._subscribers.append(sub)
+        sse_subscribers.set(len(self._subscribers))
+        return sub
+
+    def unsubscribe(self, sub: SSESubscriber) -> None:
+        if sub in self._subscribers:
+            self._subscribers.remove(sub)
+            sse_subscribers.set(len(self._subscribers))
+
+    def publish(self, event: dict[str, Any]) -> int:
+        """Append one event to every subscriber's buffer; returns the subscriber count."""
+        return self.publish_many([event])
+
+    def publish_many(self, events: list[dict[str, Any]]) -> int:
+        """Append committed events (encoded once each) to every subscriber's buffer."""
+        if not self._subscribers or not events:
+            return len(self._subscribers)
+        frames = [(event.get("id"), encode_frame(event)) for event in events]
+        for sub in self._subscribers:
+            for frame in frames:
+                if len(sub.buffer) == self.max_buffer:
+                    oldest_id, _ = sub.buffer[0]  # evicted by the append below
+                    sub.dropped += 1
+                    sse_dropped_total.inc()
+                    if oldest_id is not None and (
+                        sub.lagged_from is None or oldest_id - 1 < sub.lagged_from
+                    ):
+                        sub.lagged_from = oldest_id - 1
+                sub.buffer.append(frame)
+            sub.wakeup.set()
+        return len(self._subscribers)
+
+    def stats(self) -> list[dict[str, int]]:
+        """Buffered and dropped frame counts per subscriber."""
+        return [{"buffered": len(s.buffer), "dropped": s.dropped} for s in self._subscribers]
+
+    async def _from_store(self, after_id: int, reason: str) -> list[dict[str, Any]]:
+        events = await asyncio.to_thread(self._load_after, after_id, self.replay_max)
+        sse_replayed_total.labels(reason=reason).inc(len(events))
+        return events
+
+    async def _catch_up(
+        self, sub: SSESubscriber, after_id: int, reason: str
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stored events after after_id, page by page, until the live buffer takes over."""
+        while True:
+            events = await self._from_store(after_id, reason)
+            for event in events:
+                yield event
+                after_id = event["id"]
+            if len(events) < self.replay_max:
+                return  # reached the end of the store
+            oldest = next((event_id for event_id, _ in sub.buffer if event_id is not None), None)
+            if oldest is not None and after_id >= oldest - 1:
+                return  # the buffer continues from here
+
+    async def stream(self, last_event_id: int | None = None) -> AsyncIterator[str]:
+        """
+        Frames for one client: connected, stored events after last_event_id,
+        then live events (refilled from the store after drops) and heartbeats.
+        """
+        sub = self.subscribe()
+        last_id = last_event_id
+        try:
+            yield _status_frame("connected")
+            if last_id is not None:
+                async for event in self._catch_up(sub, last_id, "resume"):
+                    yield encode_frame(event)
+                    last_id = event["id"]
+
+            while True:
+                if sub.lagged_from is not None:
+                    start = last_id if last_id is not None else sub.lagged_from
+                    sub.lagged_from = None
+                    async for event in self._catch_up(sub, start, "lag"):
+                        yield encode_frame(event)
+                        last_id = event["id"]
+
+                if not sub.buffer:
+                    sub.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(sub.wakeup.wait(), self.heartbeat_seconds)
+                    except TimeoutError:
+                        yield _status_frame("heartbeat")
+                    continue
+
+                event_id, frame = sub.buffer.popleft()
+                if event_id is not None and last_id is not None and event_id <= last_id:
+                    continue  # already sent from the store
+                yield frame
+                if event_id is not None:
+                    last_id = event_id
+        finally:
+            self.unsubscribe(sub)
+
+
+# Process-wide broadcaster for /events/stream
+sse_broadcaster = SSEBroadcaster()
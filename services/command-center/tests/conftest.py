@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the command-center test suite.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import event_store
+import pytest
+
+
+@pytest.fixture()
+def store(tmp_path, monkeypatch):
+    """event_store on a fresh database under tmp_path."""
+    monkeypatch.setattr(event_store, "DB_PATH", str(tmp_path / "events.db"))
+    event_store.init_db()
+    yield event_store
+    event_store.get_pool().close()
+
+
+def _make_event(i: int = 0, ts: datetime | None = None, **overrides) -> dict[str, Any]:
+    now = datetime.now(UTC)
+    event = {
+        "event_id": f"evt-{i}",
+        "event_type": "autoheal.attempted",
+        "source": "pytest",
+        "tenant_id": "acme",
+        "severity": "info",
+        "timestamp": (ts or now).isoformat(),
+        "payload": {"i": i},
+        "_meta": {"received_at": now.isoformat(), "client_ip": "127.0.0.1"},
+    }
+    event.update(overrides)
+    return event
+
+
+@pytest.fixture()
+def make_event():
+    """Factory for storable events: "evt-{i}" with {"i": i} as payload, at ts (default now)."""
+    return _make_event
@@ -0,0 +1,65 @@
+"""
+Tests for the segmented, indexed anomaly history store.
+"""
+
+import json
+
+import anomaly_history
+import pytest
+
+
+@pytest.fixture()
+def history(tmp_path, monkeypatch):
+    monkeypatch.setattr(anomaly_history, "HISTORY_PATH", tmp_path / "anomaly_history.jsonl")
+    yield anomaly_history
+    anomaly_history.get_store().close()
+
+
+def test_reads_are_newest_first_and_filtered(history):
+    for i in range(10):
+        tenant = "acme" if i % 2 else "other"
+        history.append_anomaly_record({"id": i, "tenant": tenant, "ts": 1000 + i})
+
+    assert [r["id"] for r in history.read_anomaly_records(limit=3)] == [9, 8, 7]
+    assert [r["id"] for r in history.read_anomaly_records(tenant="acme", limit=2)] == [9, 7]
+    assert [r["id"] for r in history.read_anomaly_records(tenant="acme", since_ts=1006)] == [9, 7]
+    assert [r["id"] for r in history.read_anomaly_records(since_ts=1008)] == [9, 8]
+
+
+def test_lookup_by_id(history):
+    history.append_anomaly_record({"id": 41, "tenant": "acme", "action": "restart"})
+    history.append_anomaly_record({"id": 42, "tenant": "acme", "action": "scale"})
+    assert history.get_anomaly_record(42)["action"] == "scale"
+    assert history.get_anomaly_record(7) is None
+
+
+def test_segments_rotate_and_stay_readable(history, monkeypatch):
+    monkeypatch.setattr(anomaly_history, "SEGMENT_BYTES", 200)
+    for i in range(20):
+        history.append_anomaly_record({"id": i, "tenant": "acme", "ts": 1000 + i})
+
+    path = history.HISTORY_PATH
+    assert len(list(path.parent.glob("anomaly_history.0*.jsonl"))) > 1
+    assert [r["id"] for r in history.read_anomaly_records(limit=20)] == list(range(19, -1, -1))
+    assert [r["id"] for r in history.read_anomaly_records(tenant="acme", limit=20)] == list(
+        range(19, -1, -1)
+    )
+    assert history.get_anomaly_record(0)["ts"] == 1000
+
+
+def test_legacy_file_is_indexed_on_open(history):
+    path = history.HISTORY_PATH
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(5):
+            f.write(json.dumps({"id": i, "tenant": "acme", "ts": 1000 + i}) + "\n")
+        f.write('{"id": 99, "tru')  # torn final write is ignored
+
+    assert history.get_anomaly_record(3)["ts"] == 1003
+    assert [r["id"] for r in history.read_anomaly_records(tenant="acme", limit=2)] == [4, 3]
+
+
+def test_reverse_reader_crosses_block_boundaries(tmp_path):
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(b"".join(f"line-{i:04d}\n".encode() for i in range(100)))
+    lines = list(anomaly_history.iter_lines_reverse(path, block_size=7))
+    assert lines[0] == b"line-0099" and lines[-1] == b"line-0000" and len(lines) == 100
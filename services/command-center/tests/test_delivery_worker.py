@@ -0,0 +1,86 @@
+"""
+Tests for the concurrent alert delivery worker pool.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from delivery_worker import DeliveryWorkerPool
+
+
+def alert(i: int = 0):
+    return {"event_id": f"alert-{i}", "tenant_id": "acme", "payload": {"rule_name": "r"}}
+
+
+def make_pool(handler, **kwargs):
+    return DeliveryWorkerPool(
+        poll_seconds=5,
+        flush_ms=10,
+        client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+
+
+async def run_until(pool, condition, timeout=3.0):
+    task = asyncio.create_task(pool.run())
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition():
+            assert asyncio.get_running_loop().time() < deadline, "timed out"
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_claim_leases_rows(store):
+    store.enqueue_alert_delivery("a-1", alert(), "http://hook.invalid/a")
+    first = store.claim_pending_deliveries(limit=10, lease_seconds=60)
+    assert [d["alert_event_id"] for d in first] == ["a-1"]
+    assert store.claim_pending_deliveries(limit=10, lease_seconds=60) == []
+
+
+def test_enqueue_wakes_pool_and_slow_destination_does_not_block(store):
+    async def handler(request):
+        if request.url.host == "slow.invalid":
+            await asyncio.sleep(0.5)
+        return httpx.Response(200)
+
+    pool = make_pool(handler, per_destination=1)
+
+    async def scenario():
+        async def enqueue_later():
+            await asyncio.sleep(0.05)  # pool already idle, waiting on its poll timeout
+            for i in range(3):
+                await asyncio.to_thread(
+                    store.enqueue_alert_delivery, f"slow-{i}", alert(i), "http://slow.invalid/"
+                )
+            await asyncio.to_thread(
+                store.enqueue_alert_delivery, "fast", alert(), "http://fast.invalid/"
+            )
+
+        asyncio.create_task(enqueue_later())
+        started = asyncio.get_running_loop().time()
+        await run_until(pool, lambda: pool.stats()["latency_p50_seconds"] > 0)
+        return asyncio.get_running_loop().time() - started
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 0.5  # the fast destination was served before the slow queue drained
+    assert store.get_delivery_stats()["total_queued"] >= 1
+
+
+def test_failures_are_batched_and_dead_lettered(store):
+    store.enqueue_alert_delivery("a-1", alert(), "http://down.invalid/", max_attempts=1)
+    store.enqueue_alert_delivery("a-2", alert(), "http://down.invalid/", max_attempts=5)
+
+    pool = make_pool(lambda request: httpx.Response(503, text="unavailable"))
+    asyncio.run(run_until(pool, lambda: store.get_delivery_stats()["total_queued"] == 1))
+
+    (retry,) = store.get_delivery_queue()
+    assert retry["alert_event_id"] == "a-2"
+    assert retry["attempt_count"] == 1
+    assert retry["last_error"].startswith("HTTP 503")
+    dead = store.list_recent(event_type="ops.alert.delivery.failed")
+    assert len(dead) == 1 and dead[0]["payload"]["alert_event_id"] == "a-1"
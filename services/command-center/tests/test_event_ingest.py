@@ -0,0 +1,109 @@
+"""
+Tests for the batched, group-commit event ingest writer and /events/batch.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from event_ingest import EventBatchWriter
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from routers import events as events_router
+
+
+def test_writer_group_commits_in_batches(make_event):
+    batches: list[int] = []
+
+    async def scenario():
+        writer = EventBatchWriter(
+            save_batch=lambda events: batches.append(len(events)), max_batch=10, flush_ms=20
+        )
+        await writer.start()
+        await writer.submit_many([make_event(i) for i in range(25)], wait=True)
+        await writer.stop()
+
+    asyncio.run(scenario())
+    assert sum(batches) == 25
+    assert max(batches) <= 10
+    assert len(batches) < 25  # grouped, not one commit per event
+
+
+def test_stop_flushes_buffered_events(store, make_event):
+    async def scenario():
+        writer = EventBatchWriter(max_batch=1000, flush_ms=10_000)
+        await writer.start()
+        for i in range(5):
+            await writer.submit(make_event(i))  # fire-and-forget
+        await writer.stop()
+
+    asyncio.run(scenario())
+    assert store.count_events() == 5
+
+
+def test_commit_failure_propagates_to_waiters(make_event):
+    def boom(events):
+        raise RuntimeError("disk full")
+
+    async def scenario():
+        writer = EventBatchWriter(save_batch=boom, flush_ms=1)
+        await writer.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await writer.submit(make_event(), wait=True)
+        finally:
+            await writer.stop()
+
+    asyncio.run(scenario())
+
+
+def test_batch_endpoint_stores_events(store):
+    app = FastAPI()
+    app.include_router(events_router.router)
+    client = TestClient(app)
+
+    body = {
+        "events": [
+            {
+                "event_type": "autoheal.attempted",
+                "source": "pytest",
+                "timestamp": datetime.now(UTC).isoformat(),
+                "payload": {"i": i},
+            }
+            for i in range(3)
+        ]
+    }
+    resp = client.post("/events/batch", json=body)
+    assert resp.status_code == 200
+    assert resp.json()["stored"] == 3
+    assert store.count_events() == 3
+
+
+def test_batch_endpoint_rejects_invalid_event(store):
+    app = FastAPI()
+    app.include_router(events_router.router)
+    client = TestClient(app)
+
+    resp = client.post("/events/batch", json=[{"event_type": "nope"}])
+    assert resp.status_code == 400
+    assert "events[0]" in resp.json()["detail"]
+    assert store.count_events() == 0
+
+
+def test_publish_endpoint_stores_through_writer(store):
+    app = FastAPI()
+    app.include_router(events_router.router)
+    client = TestClient(app)
+
+    resp = client.post(
+        "/events/publish",
+        json={
+            "event_type": "autoheal.attempted",
+            "source": "pytest",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "payload": {},
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["stored"] is True
+    assert store.list_after(0)[0]["event_id"] == resp.json()["event_id"]
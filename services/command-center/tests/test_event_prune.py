@@ -0,0 +1,133 @@
+"""
+Tests for batched, resumable event pruning with compressed archives.
+"""
+
+import gzip
+import json
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+import event_store
+import pytest
+
+
+@pytest.fixture()
+def store(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(event_store, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(event_store, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(event_store, "ARCHIVE_COMPRESSION", "gzip")
+    monkeypatch.setattr(event_store, "PRUNE_BATCH_SIZE", 4)
+    monkeypatch.setattr(event_store, "PRUNE_PAUSE_MS", 0)
+    return store
+
+
+@pytest.fixture()
+def seed(store, make_event):
+    def _seed(old: int = 10, fresh: int = 3):
+        now = datetime.now(UTC)
+        expired = now - timedelta(days=30)
+        store.save_events(
+            [
+                make_event(i, ts=expired if i < old else now, tenant_id=None)
+                for i in range(old + fresh)
+            ]
+        )
+
+    return _seed
+
+
+def read_archive(tmp_path):
+    lines = []
+    for path in sorted((tmp_path / "archive").glob("*.ndjson.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines += [json.loads(line) for line in f]
+    return lines
+
+
+def test_prune_deletes_in_batches_and_archives(store, tmp_path, seed):
+    seed()
+    result = store.prune_old_events()
+
+    assert result["pruned_count"] == 10
+    assert result["archived_count"] == 10
+    assert store.count_events() == 3
+    assert len(read_archive(tmp_path)) == 10
+    with store.get_pool().read("test") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM prune_checkpoint").fetchone()[0] == 0
+
+
+def test_interrupted_prune_resumes_from_checkpoint(store, tmp_path, monkeypatch, seed):
+    seed()
+
+    def interrupt(_seconds):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(event_store.time, "sleep", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            store.prune_old_events()
+    assert store.count_events() == 9  # first batch of 4 committed
+
+    result = store.prune_old_events()
+    assert result["resumed"] is True
+    assert result["pruned_count"] == 10  # includes the interrupted pass
+    assert store.count_events() == 3
+    assert len(read_archive(tmp_path)) == 10
+
+
+def test_per_tenant_prune_reports_throughput(store, seed):
+    seed()
+    results = store.prune_old_events_with_per_tenant()
+    system = next(r for r in results if r["scope"] == "system")
+    assert system["pruned_count"] == 10
+    assert system["rows_per_second"] > 0
+    assert store.count_events() == 3
+
+
+def test_prune_work_follows_expired_rows_not_their_spread(store, make_event, monkeypatch):
+    old = datetime.now(UTC) - timedelta(days=30)
+    events = []
+    for i in range(3000):
+        # globex fills the table; acme's six expired rows are spread across it
+        events.append(make_event(i, ts=old, tenant_id="globex"))
+        if i % 500 == 0:
+            events.append(make_event(i, ts=old, tenant_id="acme"))
+    # initech's six expired rows sit next to each other
+    events += [make_event(i, ts=old, tenant_id="initech") for i in range(6)]
+    store.save_events(events)
+
+    pool = store.get_pool()
+    read, write = pool.read, pool.write
+    work = {"writes": 0, "steps": 0}
+
+    def tick():
+        work["steps"] += 1
+        return 0
+
+    @contextmanager
+    def counted(open_conn, op):
+        with open_conn(op) as conn:
+            conn.set_progress_handler(tick, 10)  # one step per 10 VM instructions
+            try:
+                yield conn
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    def counted_write(op):
+        work["writes"] += op == "prune_events"
+        return counted(write, op)
+
+    monkeypatch.setattr(pool, "read", lambda op: counted(read, op))
+    monkeypatch.setattr(pool, "write", counted_write)
+
+    def prune(tenant):
+        work.update(writes=0, steps=0)
+        cutoff = datetime.now(UTC) - timedelta(days=7)
+        summary = store._prune_in_batches(f"tenant:{tenant}", "tenant_id = ?", (tenant,), cutoff)
+        assert summary["pruned_count"] == 6
+        return dict(work)
+
+    sparse, dense = prune("acme"), prune("initech")
+    # One write lock per PRUNE_BATCH_SIZE (4) expired rows, not per id window
+    assert sparse["writes"] == dense["writes"] == 2
+    assert sparse["steps"] <= dense["steps"] * 2
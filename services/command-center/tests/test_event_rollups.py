@@ -0,0 +1,82 @@
+"""
+Tests for the per-minute / per-hour event count rollups.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import event_store
+import pytest
+
+
+def raw_count(since=None, **filters):
+    """count_events forced onto the events table (since with microseconds)."""
+    if since is None:
+        since = datetime(1970, 1, 1, microsecond=1, tzinfo=UTC)
+    return event_store.count_events(since=since.replace(microsecond=1).isoformat(), **filters)
+
+
+@pytest.fixture()
+def seed(store, make_event):
+    def failure(ts: datetime, **overrides):
+        failed = {"event_type": "autoheal.failed", "source": "autoheal", "severity": "error"}
+        return make_event(ts=ts, **{**failed, **overrides})
+
+    def _seed():
+        now = datetime.now(UTC)
+        store.save_events(
+            [
+                failure(now - timedelta(minutes=2)),
+                failure(now - timedelta(minutes=5), tenant_id=None, severity="warning"),
+                failure(now - timedelta(hours=3), tenant_id="other", source="monitor"),
+                failure(now - timedelta(days=2), severity="critical"),
+            ]
+        )
+        return now
+
+    return _seed
+
+
+def test_aligned_counts_match_events_table(store, seed):
+    now = seed()
+    hour = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=4)
+    minute = now.replace(second=0, microsecond=0) - timedelta(minutes=10)
+
+    for since in (None, hour, minute):
+        for filters in ({}, {"tenant_id": "acme"}, {"severity": "ERROR"}, {"source": "monitor"}):
+            got = store.count_events(since=since.isoformat() if since else None, **filters)
+            # Aligned since values are exact on both paths
+            expected = raw_count(since, **filters)
+            assert got == expected, (since, filters)
+
+
+def test_event_stats_from_rollups(store, seed):
+    seed()
+    stats = store.get_event_stats()
+    assert stats["total"] == 4
+    assert stats["last_24h"] == 3
+    assert stats["by_severity"] == {"error": 2, "warning": 1, "critical": 1}
+
+    acme = store.get_event_stats(tenant_id="acme")
+    assert acme["total"] == 3  # includes the system (NULL tenant) event
+
+
+def test_prune_keeps_rollups_consistent(store, monkeypatch, seed):
+    seed()
+    monkeypatch.setattr(event_store, "RETENTION_DAYS", 1)
+    store.prune_old_events_with_per_tenant()
+
+    assert store.count_events() == raw_count() == 3
+    assert store.get_event_stats()["by_severity"] == {"error": 2, "warning": 1}
+    with store.get_pool().read("test") as conn:
+        zero = conn.execute("SELECT COUNT(*) FROM event_rollup_hour WHERE cnt <= 0").fetchone()[0]
+    assert zero == 0
+
+
+def test_init_db_backfills_existing_events(store, seed):
+    seed()
+    with store.get_pool().write("test") as conn:
+        conn.execute("DELETE FROM event_rollup_minute")
+        conn.execute("DELETE FROM event_rollup_hour")
+    store.init_db()
+    assert store.count_events() == 4
+    assert store.get_event_stats()["last_24h"] == 3
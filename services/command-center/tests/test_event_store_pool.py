@@ -0,0 +1,72 @@
+"""
+Tests for the pooled, WAL-mode event_store connection layer.
+"""
+
+import threading
+
+import event_store
+import pytest
+
+
+def test_pool_uses_wal_journal(store):
+    with store.get_pool().read("test") as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_save_list_and_count_round_trip(store, make_event):
+    store.save_event(make_event())
+    store.save_event(make_event(severity="critical"))
+    store.save_event(make_event(tenant_id="other"))
+
+    events = store.list_recent(limit=10, tenant_id="acme")
+    assert len(events) == 2
+    assert events[0]["severity"] == "critical"  # newest first
+    assert events[0]["payload"] == {"i": 0}
+
+    assert store.count_events(tenant_id="acme") == 2
+    assert store.count_events(severity="critical") == 1
+
+
+def test_pool_is_rebuilt_when_db_path_changes(store, tmp_path, monkeypatch):
+    first = store.get_pool()
+    monkeypatch.setattr(store, "DB_PATH", str(tmp_path / "other.db"))
+    second = store.get_pool()
+    assert first is not second
+    assert second.path.endswith("other.db")
+
+
+def test_concurrent_writers_and_readers(store, make_event):
+    errors: list[Exception] = []
+
+    def writer():
+        try:
+            for _ in range(25):
+                store.save_event(make_event())
+        except Exception as e:  # pragma: no cover - surfaced via assertion
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(25):
+                store.list_recent(limit=5)
+        except Exception as e:  # pragma: no cover - surfaced via assertion
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert store.count_events() == 100
+
+
+def test_failed_write_rolls_back(store, make_event):
+    with pytest.raises(KeyError):
+        with store.get_pool().write("test") as conn:
+            conn.execute(event_store._INSERT_EVENT_SQL, event_store._event_row(make_event()))
+            raise KeyError("boom")
+    assert store.count_events() == 0
@@ -0,0 +1,90 @@
+"""
+Tests for the append-only, segmented JSON fallback backend.
+"""
+
+import asyncio
+import json
+
+from persistence import JSONBackend
+from persistence.json_fallback import TailLog
+
+
+def test_writes_append_and_survive_restart(tmp_path):
+    async def scenario():
+        backend = JSONBackend(str(tmp_path))
+        await backend.initialize()
+        for i in range(3):
+            await backend.save_event({"i": i})
+        await backend.save_alert({"name": "cpu", "resolved_at": None})
+        await backend.update_tenant_config("acme", {"plan": "pro"})
+        await backend.save_import_record("acme", {"import_id": "imp-1"})
+        await backend.close()
+
+        reopened = JSONBackend(str(tmp_path))
+        await reopened.initialize()
+        return (
+            await reopened.get_recent_events(limit=2),
+            await reopened.get_active_alerts(),
+            await reopened.get_tenant_config("acme"),
+            await reopened.get_import_history("acme"),
+        )
+
+    events, alerts, tenant, imports = asyncio.run(scenario())
+
+    assert events == [{"i": 1}, {"i": 2}]
+    assert alerts == [{"name": "cpu", "resolved_at": None}]
+    assert tenant == {"plan": "pro"}
+    assert imports == [{"import_id": "imp-1"}]
+    # One line per event in the active segment; no whole-file rewrite
+    segment = tmp_path / "log" / "events" / "000001.jsonl"
+    assert len(segment.read_text().splitlines()) == 3
+
+
+def test_torn_tail_is_truncated_on_recovery(tmp_path):
+    log = TailLog(tmp_path / "events")
+    log.extend([{"i": 0}, {"i": 1}])
+    log.close()
+
+    segment = tmp_path / "events" / "000001.jsonl"
+    with open(segment, "ab") as f:
+        f.write(b'{"op":"add","v":{"i":')  # crash mid-append
+
+    recovered = TailLog(tmp_path / "events")
+    assert recovered.tail() == [{"i": 0}, {"i": 1}]
+    recovered.extend([{"i": 2}])
+    recovered.close()
+
+    lines = segment.read_text().splitlines()
+    assert [json.loads(line)["v"]["i"] for line in lines] == [0, 1, 2]
+
+
+def test_compaction_snapshots_and_drops_segments(tmp_path):
+    log = TailLog(tmp_path / "events", keep=5, segment_bytes=64, compact_segments=2)
+    log.extend([{"i": i} for i in range(3)])
+    for i in range(3, 20):
+        log.extend([{"i": i}])
+    log.close()
+
+    segments = sorted(p.name for p in (tmp_path / "events").glob("*.jsonl"))
+    assert len(segments) <= 3
+    snapshot = json.loads((tmp_path / "events" / "snapshot.json").read_text())
+    assert len(snapshot["state"]) <= 5
+
+    reopened = TailLog(tmp_path / "events", keep=5, segment_bytes=64, compact_segments=2)
+    assert reopened.tail() == [{"i": i} for i in range(15, 20)]
+
+
+def test_fresh_log_seeds_from_legacy_json(tmp_path):
+    (tmp_path / "acculynx_schedules.json").write_text(json.dumps({"acme": {"interval": 60}}))
+
+    async def scenario():
+        backend = JSONBackend(str(tmp_path))
+        await backend.apply_delta({"globex": {"interval": 5}}, [])
+        await backend.close()
+        # The legacy file is only read once; later changes live in the log
+        (tmp_path / "acculynx_schedules.json").write_text("{}")
+        return await JSONBackend(str(tmp_path)).load_schedules()
+
+    schedules = asyncio.run(scenario())
+
+    assert schedules == {"acme": {"interval": 60}, "globex": {"interval": 5}}
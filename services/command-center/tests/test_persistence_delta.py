@@ -0,0 +1,150 @@
+"""
+Tests for delta persistence: SQLiteBackend.apply_delta and the coalescing DeltaWriter.
+"""
+
+import asyncio
+import sqlite3
+
+from persistence import DeltaWriter, JSONBackend, SQLiteBackend
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.calls: list[tuple[dict, list]] = []
+
+    async def apply_delta(self, schedules, runs):
+        self.calls.append((dict(schedules), list(runs)))
+
+
+def test_sqlite_apply_delta_upserts_deletes_and_appends(tmp_path):
+    async def scenario():
+        backend = SQLiteBackend(str(tmp_path / "cc.db"))
+        await backend.initialize()
+        try:
+            await backend.apply_delta(
+                {"acme": {"interval": 60}, "globex": {"interval": 30}},
+                [{"action_name": "restart", "tenant_id": "acme", "status": "ok"}],
+            )
+            await backend.apply_delta(
+                {"acme": {"interval": 15}, "globex": None},
+                [{"action_name": "purge", "tenant_id": "acme", "status": "ok"}],
+            )
+            schedules = await backend.load_schedules()
+            runs = await backend.load_local_action_runs()
+        finally:
+            await backend.close()
+        return schedules, runs
+
+    schedules, runs = asyncio.run(scenario())
+
+    assert schedules == {"acme": {"interval": 15}}
+    # Each run stored once, not re-inserted with every change
+    assert sorted(r["action_name"] for r in runs) == ["purge", "restart"]
+    with sqlite3.connect(tmp_path / "cc.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM local_action_runs").fetchone()[0] == 2
+
+
+def test_json_backend_merges_delta_into_snapshots(tmp_path):
+    async def scenario():
+        backend = JSONBackend(str(tmp_path))
+        await backend.save_schedules({"acme": {"interval": 60}, "globex": {"interval": 30}})
+        await backend.apply_delta({"globex": None, "initech": {"interval": 5}}, [{"status": "ok"}])
+        return await backend.load_schedules(), await backend.load_local_action_runs()
+
+    schedules, runs = asyncio.run(scenario())
+
+    assert schedules == {"acme": {"interval": 60}, "initech": {"interval": 5}}
+    assert runs == [{"status": "ok"}]
+
+
+def test_writer_coalesces_burst_into_one_delta():
+    backend = RecordingBackend()
+
+    async def scenario():
+        writer = DeltaWriter([("rec", backend)], flush_ms=20)
+        await writer.start()
+        for i in range(5):
+            writer.upsert_schedule("acme", {"interval": i})
+        writer.append_run({"action_name": "restart"})
+        writer.delete_schedule("globex")
+        assert writer.pending == 3
+        await asyncio.sleep(0.1)
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert backend.calls == [
+        ({"acme": {"interval": 4}, "globex": None}, [{"action_name": "restart"}])
+    ]
+
+
+def test_writer_bounds_pending_runs_and_drains_on_stop():
+    backend = RecordingBackend()
+
+    async def scenario():
+        writer = DeltaWriter([("rec", backend)], max_pending=3, flush_ms=10_000)
+        await writer.start()
+        for i in range(5):
+            writer.append_run({"i": i})
+        assert writer.pending == 3
+        await writer.stop()
+        assert writer.pending == 0
+
+    asyncio.run(scenario())
+
+    assert backend.calls == [({}, [{"i": 2}, {"i": 3}, {"i": 4}])]
+
+
+def test_writer_reports_backend_failures():
+    errors: list[str] = []
+
+    class FailingBackend:
+        async def apply_delta(self, schedules, runs):
+            raise RuntimeError("disk full")
+
+    async def scenario():
+        writer = DeltaWriter([("bad", FailingBackend())], flush_ms=0, on_error=errors.append)
+        writer.upsert_schedule("acme", {})
+        await writer.flush()
+
+    asyncio.run(scenario())
+
+    assert errors == ["bad delta flush failed: disk full"]
+
+
+def test_failed_delta_is_retried_without_losing_or_repeating_changes():
+    healthy = RecordingBackend()
+
+    class FlakyBackend(RecordingBackend):
+        failing = True
+
+        async def apply_delta(self, schedules, runs):
+            if self.failing:
+                raise RuntimeError("database is locked")
+            await super().apply_delta(schedules, runs)
+
+    flaky = FlakyBackend()
+
+    async def scenario():
+        writer = DeltaWriter([("flaky", flaky), ("ok", healthy)], flush_ms=0)
+        writer.upsert_schedule("acme", {"interval": 60})
+        writer.upsert_schedule("globex", {"interval": 30})
+        writer.append_run({"i": 0})
+        await writer.flush()
+        assert writer.pending == 3  # held for the failed backend only
+
+        flaky.failing = False
+        writer.upsert_schedule("acme", {"interval": 15})  # newer change wins
+        writer.append_run({"i": 1})
+        await writer.flush()
+        assert writer.pending == 0
+
+    asyncio.run(scenario())
+
+    assert flaky.calls == [
+        ({"acme": {"interval": 15}, "globex": {"interval": 30}}, [{"i": 0}, {"i": 1}])
+    ]
+    assert healthy.calls == [
+        ({"acme": {"interval": 60}, "globex": {"interval": 30}}, [{"i": 0}]),
+        ({"acme": {"interval": 15}}, [{"i": 1}]),
+    ]
@@ -0,0 +1,87 @@
+"""
+Tests for SQL-bucketed, cached remediation timelines.
+"""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import remediation_timeline as rt
+
+
+@pytest.fixture()
+def db(tmp_path):
+    path = tmp_path / "recovery_events.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE remediation_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            alertname TEXT,
+            tenant TEXT,
+            action TEXT,
+            status TEXT,
+            details TEXT
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+    rt.invalidate_timeline_cache()
+    return path
+
+
+def insert(db, ts: datetime, tenant: str = "acme"):
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "INSERT INTO remediation_events (ts, tenant) VALUES (?, ?)",
+        (ts.replace(tzinfo=None).isoformat() + "Z", tenant),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_buckets_counted_in_sql(db):
+    now = datetime(2025, 11, 9, 12, 7, 30, tzinfo=UTC)
+    insert(db, now - timedelta(minutes=1))
+    insert(db, now - timedelta(minutes=2), tenant="other")
+    insert(db, now - timedelta(minutes=20))
+    insert(db, now - timedelta(minutes=90))  # outside the window
+
+    timeline = rt.compute_timeline(db, None, 60, 15, now=now)
+    assert timeline[0]["ts"] == "2025-11-09T11:00:00Z"
+    assert timeline[-1]["ts"] == "2025-11-09T12:00:00Z"
+    by_ts = {p["ts"]: p["count"] for p in timeline}
+    assert by_ts["2025-11-09T12:00:00Z"] == 2
+    assert by_ts["2025-11-09T11:45:00Z"] == 1
+    assert sum(by_ts.values()) == 3
+
+    acme = rt.compute_timeline(db, "acme", 60, 15, now=now)
+    assert sum(p["count"] for p in acme) == 2
+
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM remediation_events WHERE ts >= ?", ("x",)
+        ).fetchall()
+    plan = " ".join(str(r) for r in rows)
+    assert "idx_remediation_events_ts" in plan
+
+
+def test_cache_is_invalidated_by_new_events(db):
+    now = datetime.now(UTC)
+    insert(db, now)
+    first = rt.get_timeline(db, None, 60, 5)
+    insert(db, now)
+    assert rt.get_timeline(db, None, 60, 5) is first  # served from cache
+
+    rt.invalidate_timeline_cache()
+    assert sum(p["count"] for p in rt.get_timeline(db, None, 60, 5)) == 2
+
+
+def test_detect_anomalies_and_quiet_periods():
+    timeline = [{"ts": str(i), "count": c} for i, c in enumerate([1, 1, 0, 1, 9, 1])]
+    anomalies, quiet = rt.detect_timeline_anomalies(timeline, multiplier=2.0, min_count=3)
+    assert [a["ts"] for a in anomalies] == ["4"]
+    assert anomalies[0]["baseline"] == 0.75
+    assert [q["ts"] for q in quiet] == ["2"]
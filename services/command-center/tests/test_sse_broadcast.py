@@ -0,0 +1,115 @@
+"""
+Tests for bounded SSE fan-out, lag refill and Last-Event-ID resume.
+"""
+
+import asyncio
+import json
+
+from event_ingest import EventBatchWriter
+from sse_broadcast import SSEBroadcaster, encode_frame
+
+
+def _payload_ids(frames):
+    out = []
+    for frame in frames:
+        data = json.loads(frame.split("data: ", 1)[1])
+        if "payload" in data:
+            out.append(data["payload"]["i"])
+    return out
+
+
+async def _take(stream, n):
+    frames = []
+    async for frame in stream:
+        frames.append(frame)
+        if len(frames) == n:
+            break
+    await stream.aclose()
+    return frames
+
+
+def test_save_events_stamps_store_ids_and_list_after(store, make_event):
+    events = [make_event(i) for i in range(3)]
+    store.save_events(events)
+    ids = [e["id"] for e in events]
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    assert [e["event_id"] for e in store.list_after(ids[0])] == ["evt-1", "evt-2"]
+    assert encode_frame(events[0]).startswith(f"id: {ids[0]}\n")
+
+
+def test_slow_subscriber_buffer_is_bounded_and_refilled_from_store(store, make_event):
+    async def scenario():
+        hub = SSEBroadcaster(load_after=store.list_after, max_buffer=3, heartbeat_seconds=5)
+        writer = EventBatchWriter()  # not started: commits directly
+        writer.add_commit_listener(hub.publish_many)
+
+        stream = hub.stream()
+        assert "connected" in await stream.__anext__()
+        first = make_event(0)
+        await writer.submit(first, wait=True)
+        assert _payload_ids([await stream.__anext__()]) == [0]
+
+        # Nobody reads while 9 more events arrive: only the newest 3 stay buffered
+        await writer.submit_many([make_event(i) for i in range(1, 10)], wait=True)
+        assert hub.stats() == [{"buffered": 3, "dropped": 6}]
+        return await _take(stream, 9)
+
+    frames = asyncio.run(scenario())
+    assert _payload_ids(frames) == list(range(1, 10))
+
+
+def test_lag_refill_pages_past_the_replay_cap(store, make_event):
+    async def scenario():
+        # Short heartbeat: a stream that skips the gap runs out of events fast
+        hub = SSEBroadcaster(
+            load_after=store.list_after, max_buffer=5, replay_max=10, heartbeat_seconds=0.01
+        )
+        writer = EventBatchWriter()
+        writer.add_commit_listener(hub.publish_many)
+
+        stream = hub.stream()
+        assert "connected" in await stream.__anext__()
+        # 95 frames dropped: the gap is far larger than one replay page
+        await writer.submit_many([make_event(i) for i in range(100)], wait=True)
+        assert hub.stats() == [{"buffered": 5, "dropped": 95}]
+        return await _take(stream, 100)
+
+    frames = asyncio.run(scenario())
+    assert _payload_ids(frames) == list(range(100))
+
+
+def test_resume_with_last_event_id_replays_then_goes_live(store, make_event):
+    events = [make_event(i) for i in range(5)]
+    store.save_events(events)
+
+    async def scenario():
+        hub = SSEBroadcaster(load_after=store.list_after, heartbeat_seconds=5)
+        stream = hub.stream(last_event_id=events[1]["id"])
+        frames = [await stream.__anext__() for _ in range(4)]  # connected + 3 replayed
+        live = make_event(5)
+        store.save_events([live])
+        hub.publish_many([events[4], live])  # already-replayed id is skipped
+        frames.append(await stream.__anext__())
+        await stream.aclose()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert _payload_ids(frames) == [2, 3, 4, 5]
+
+
+def test_publish_serializes_each_event_once(monkeypatch):
+    import sse_broadcast
+
+    calls = []
+    real = sse_broadcast.encode_frame
+    monkeypatch.setattr(sse_broadcast, "encode_frame", lambda e: calls.append(e) or real(e))
+
+    async def scenario():
+        hub = SSEBroadcaster(load_after=lambda after, limit: [])
+        subs = [hub.subscribe() for _ in range(5)]
+        hub.publish({"id": 1, "payload": {}})
+        return subs
+
+    subs = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(len(s.buffer) == 1 for s in subs)
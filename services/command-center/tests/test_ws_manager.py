@@ -0,0 +1,121 @@
+"""
+Tests for the WebSocket broadcast hub.
+"""
+
+import asyncio
+import json
+
+from ws_manager import BaseWSManager, BroadcastHub
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[dict] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        pass
+
+
+def event(i: int, tenant: str | None = "acme", **extra):
+    return {"type": "remediation_event", "payload": {"id": i, "tenant": tenant, **extra}}
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+def test_slow_client_does_not_delay_others():
+    async def scenario():
+        manager = BaseWSManager("test")
+        slow, fast = FakeSocket(delay=0.5), FakeSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        await asyncio.wait_for(manager.broadcast(event(1)), 0.05)
+        await asyncio.sleep(0.05)
+        assert [m["payload"]["id"] for m in fast.sent] == [1]
+        assert slow.sent == []
+        manager.disconnect(slow)
+        manager.disconnect(fast)
+
+    asyncio.run(scenario())
+
+
+def test_routes_by_tenant_subscription():
+    async def scenario():
+        manager = BaseWSManager("test")
+        acme, other, everyone = FakeSocket(), FakeSocket(), FakeSocket()
+        await manager.connect(acme, tenants="acme")
+        await manager.connect(other, tenants=["other"])
+        await manager.connect(everyone, tenants="all")
+
+        manager.publish(event(1, "acme"))
+        manager.publish(event(2, "other"))
+        manager.publish(event(3, None))  # global message
+        await drain()
+
+        assert [m["payload"]["id"] for m in acme.sent] == [1, 3]
+        assert [m["payload"]["id"] for m in other.sent] == [2, 3]
+        assert [m["payload"]["id"] for m in everyone.sent] == [1, 2, 3]
+
+        manager.set_tenants(acme, "other")
+        manager.publish(event(4, "other"))
+        await drain()
+        assert acme.sent[-1]["payload"]["id"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_oldest():
+    async def scenario():
+        hub = BroadcastHub("test", max_queue=3)
+        ws = FakeSocket()
+        ws.gate.clear()
+        hub.subscribe(ws)
+        await asyncio.sleep(0)
+
+        for i in range(6):
+            hub.publish(event(i))
+        ws.gate.set()
+        await drain()
+        assert [m["payload"]["id"] for m in ws.sent] == [3, 4, 5]
+        assert hub.queue_depths() == [0]
+
+    asyncio.run(scenario())
+
+
+def test_coalesces_queued_messages_with_same_key():
+    async def scenario():
+        hub = BroadcastHub("test", coalesce_key=lambda m: m.get("key"))
+        ws = FakeSocket()
+        ws.gate.clear()
+        hub.subscribe(ws)
+        await asyncio.sleep(0)
+
+        hub.publish({"id": 0})
+        hub.publish({"key": "status", "value": 1})
+        hub.publish({"id": 2})
+        hub.publish({"key": "status", "value": 3})
+        ws.gate.set()
+        await drain()
+        assert ws.sent == [{"id": 0}, {"key": "status", "value": 3}, {"id": 2}]
+
+    asyncio.run(scenario())
+
+
+def test_publish_without_running_loop_is_noop_safe():
+    manager = BaseWSManager("test")
+    assert manager.publish(event(1)) == 0
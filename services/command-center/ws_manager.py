@@ -7,16 +7,29 @@ Supports multiple channels:
 
 Phase XX M8: Added Prometheus metrics for timeline WS event observability
 Phase XX M9: Added heartbeat tracking and stale connection detection
+Phase XX M14: Broadcast hub - messages are serialized once, routed by tenant
+subscription and fanned out through a bounded send queue per connection, so
+a slow client only backs up its own queue (oldest messages are dropped, or
+superseded ones coalesced) instead of stalling every other operator's feed.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import time
+from collections import deque
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from fastapi import WebSocket
-from prometheus_client import Counter, Gauge
+from prometheus_client import Counter, Gauge, Histogram
+
+WS_SEND_QUEUE_MAX = int(os.getenv("WS_SEND_QUEUE_MAX", "256"))
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+# drop_oldest | drop_newest | disconnect
+WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "drop_oldest")
 
 # Prometheus metric for timeline WS events
 timeline_ws_events_total = Counter(
@@ -46,30 +59,269 @@ frontend_timeline_events_total = Counter(
 )
 
 
-class BaseWSManager:
-    """Base WebSocket connection manager with broadcast capability.
+# Phase XX M14: Broadcast hub metrics
+ws_connections = Gauge(
+    "aetherlink_ws_connections",
+    "Open WebSocket connections per channel",
+    ["channel"],
+)
+
+ws_send_queue_depth = Gauge(
+    "aetherlink_ws_send_queue_depth",
+    "Messages waiting in per-connection send queues",
+    ["channel"],
+)
+
+ws_send_latency_seconds = Histogram(
+    "aetherlink_ws_send_latency_seconds",
+    "Time from broadcast to the message being written to a client socket",
+    ["channel"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+ws_messages_dropped_total = Counter(
+    "aetherlink_ws_messages_dropped_total",
+    "Messages not delivered to a slow client",
+    ["channel", "reason"],  # overflow, coalesced, disconnected
+)
+
+
+def message_tenant(message: dict[str, Any]) -> str | None:
+    """Tenant a message is about (top level or payload), None for global messages."""
+    payload = message.get("payload")
+    for source in (message, payload if isinstance(payload, dict) else {}):
+        tenant = source.get("tenant") or source.get("tenant_id")
+        if tenant:
+            return str(tenant)
+    return None
+
+
+def parse_tenants(value: str | Iterable[str] | None) -> frozenset[str] | None:
+    """Normalize a tenant subscription; None (or "all"/"*") means every tenant."""
+    if value is None:
+        return None
+    items = value.split(",") if isinstance(value, str) else value
+    tenants = frozenset(t.strip() for t in items if t and t.strip())
+    if not tenants or tenants & {"all", "*"}:
+        return None
+    return tenants
+
+
+class _Subscriber:
+    """One connection's tenant filter, bounded send queue and sender task."""
+
+    __slots__ = ("websocket", "tenants", "queue", "wakeup", "loop", "task")
+
+    def __init__(
+        self,
+        websocket: Any,
+        tenants: frozenset[str] | None,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.websocket = websocket
+        self.tenants = tenants
+        # (coalesce_key, text, enqueued_at)
+        self.queue: deque[tuple[str | None, str, float]] = deque()
+        self.wakeup = asyncio.Event()
+        self.loop = loop
+        self.task: asyncio.Task | None = None
+
+    def wants(self, tenant: str | None) -> bool:
+        return tenant is None or self.tenants is None or tenant in self.tenants
+
+
+class BroadcastHub:
+    """Serialize-once, tenant-routed fan-out to per-connection send queues.
+
+    Subscribers are anything with an async send_text(). publish() never
+    awaits a socket: it appends the encoded message to each matching
+    subscriber's queue and a per-connection task drains it. When a queue is
+    full the overflow policy applies (drop_oldest, drop_newest or
+    disconnect). Messages with a coalesce key replace a still-queued message
+    with the same key, so a slow client gets the latest state rather than
+    every intermediate one.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        max_queue: int = WS_SEND_QUEUE_MAX,
+        overflow: str = WS_OVERFLOW_POLICY,
+        send_timeout: float = WS_SEND_TIMEOUT_SECONDS,
+        coalesce_key: Callable[[dict[str, Any]], str | None] | None = None,
+    ) -> None:
+        if overflow not in ("drop_oldest", "drop_newest", "disconnect"):
+            raise ValueError(f"Unknown WS overflow policy: {overflow}")
+        self.channel = channel
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self.send_timeout = send_timeout
+        self.coalesce_key = coalesce_key
+        self._subscribers: dict[Any, _Subscriber] = {}
+
+    @property
+    def active_connections(self) -> list[Any]:
+        return list(self._subscribers)
+
+    def subscribe(self, websocket: Any, tenants: str | Iterable[str] | None = None) -> None:
+        """Register a connection and start its sender task (must run on the event loop)."""
+        if websocket in self._subscribers:
+            self.set_tenants(websocket, tenants)
+            return
+        sub = _Subscriber(websocket, parse_tenants(tenants), asyncio.get_running_loop())
+        sub.task = asyncio.create_task(self._sender(sub), name=f"ws-{self.channel}-sender")
+        self._subscribers[websocket] = sub
+        ws_connections.labels(channel=self.channel).set(len(self._subscribers))
+
+    def set_tenants(self, websocket: Any, tenants: str | Iterable[str] | None) -> None:
+        """Change which tenants a connection receives."""
+        sub = self._subscribers.get(websocket)
+        if sub is not None:
+            sub.tenants = parse_tenants(tenants)
+
+    def unsubscribe(self, websocket: Any) -> None:
+        sub = self._subscribers.pop(websocket, None)
+        if sub is None:
+            return
+        ws_connections.labels(channel=self.channel).set(len(self._subscribers))
+        if sub.queue:
+            ws_send_queue_depth.labels(channel=self.channel).dec(len(sub.queue))
+            ws_messages_dropped_total.labels(channel=self.channel, reason="disconnected").inc(
+                len(sub.queue)
+            )
+            sub.queue.clear()
+        if sub.task is not None and sub.task is not _current_task():
+            sub.loop.call_soon_threadsafe(sub.task.cancel)
+
+    def queue_depths(self) -> list[int]:
+        return [len(sub.queue) for sub in self._subscribers.values()]
+
+    def publish(self, message: dict[str, Any]) -> int:
+        """Queue a message for every subscribed connection; returns how many it was queued for.
+
+        Safe to call without a running event loop or from another thread.
+        """
+        if not self._subscribers:
+            return 0
+        tenant = message_tenant(message)
+        targets = [sub for sub in list(self._subscribers.values()) if sub.wants(tenant)]
+        if not targets:
+            return 0
+        text = json.dumps(message)
+        key = self.coalesce_key(message) if self.coalesce_key else None
+        enqueued_at = time.perf_counter()
+
+        for sub in targets:
+            if _on_loop(sub.loop):
+                self._offer(sub, key, text, enqueued_at)
+            else:
+                sub.loop.call_soon_threadsafe(self._offer, sub, key, text, enqueued_at)
+        return len(targets)
+
+    def _offer(self, sub: _Subscriber, key: str | None, text: str, enqueued_at: float) -> None:
+        if self._subscribers.get(sub.websocket) is not sub:
+            return  # disconnected meanwhile
+        depth = ws_send_queue_depth.labels(channel=self.channel)
+
+        if key is not None:
+            for i, (queued_key, _, queued_at) in enumerate(sub.queue):
+                if queued_key == key:
+                    # Keep the queue position and original timestamp, replace the content
+                    sub.queue[i] = (key, text, queued_at)
+                    ws_messages_dropped_total.labels(channel=self.channel, reason="coalesced").inc()
+                    return
+
+        if len(sub.queue) >= self.max_queue:
+            ws_messages_dropped_total.labels(channel=self.channel, reason="overflow").inc()
+            if self.overflow == "drop_newest":
+                return
+            if self.overflow == "disconnect":
+                print(f"[ws_manager] ⚠️  Disconnecting slow {self.channel} client (queue full)")
+                self._close(sub)
+                return
+            sub.queue.popleft()
+            depth.dec()
+
+        sub.queue.append((key, text, enqueued_at))
+        depth.inc()
+        sub.wakeup.set()
+
+    async def _sender(self, sub: _Subscriber) -> None:
+        latency = ws_send_latency_seconds.labels(channel=self.channel)
+        depth = ws_send_queue_depth.labels(channel=self.channel)
+        try:
+            while True:
+                while not sub.queue:
+                    sub.wakeup.clear()
+                    await sub.wakeup.wait()
+                _, text, enqueued_at = sub.queue.popleft()
+                depth.dec()
+                await asyncio.wait_for(sub.websocket.send_text(text), self.send_timeout)
+                latency.observe(time.perf_counter() - enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed or timed out: the client is gone or too slow to keep
+            self._close(sub)
+
+    def _close(self, sub: _Subscriber) -> None:
+        self.unsubscribe(sub.websocket)
+        close = getattr(sub.websocket, "close", None)
+        if close is not None:
+            task = asyncio.ensure_future(close())
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _current_task() -> asyncio.Task | None:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class BaseWSManager(BroadcastHub):
+    """WebSocket connection manager on top of the broadcast hub.
 
     Phase XX M9: Added heartbeat tracking and stale connection detection.
+    Phase XX M14: connect() takes a tenant subscription; broadcast() only
+    queues, so it returns without waiting on any client.
     """
 
-    def __init__(self) -> None:
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, channel: str = "default", **hub_options: Any) -> None:
+        super().__init__(channel, **hub_options)
         # Track last heartbeat timestamp per connection
         self.last_heartbeat: dict[WebSocket, float] = {}
         # Connections without heartbeat for this many seconds are considered stale
         self.stale_after_seconds: float = 35.0
 
-    async def connect(self, websocket: WebSocket) -> None:
-        """Accept and register a new WebSocket connection."""
+    async def connect(
+        self, websocket: WebSocket, tenants: str | Iterable[str] | None = None
+    ) -> None:
+        """Accept and register a new WebSocket connection.
+
+        Args:
+            websocket: The connection to accept
+            tenants: Tenant(s) to receive events for (comma-separated string
+                or iterable); None or "all" subscribes to every tenant
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.subscribe(websocket, tenants)
         # Initialize heartbeat timestamp
         self.last_heartbeat[websocket] = time.time()
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket from active connections."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.unsubscribe(websocket)
+
+    def unsubscribe(self, websocket: Any) -> None:
+        super().unsubscribe(websocket)
         # Clean up heartbeat tracking
         self.last_heartbeat.pop(websocket, None)
 
@@ -83,34 +335,34 @@ class BaseWSManager:
         self.last_heartbeat[websocket] = time.time()
         timeline_ws_heartbeat_total.labels(tenant=tenant).inc()
 
-    async def broadcast(self, message: dict[str, Any]) -> None:
-        """Broadcast message to all active connections, removing stale ones.
+    def publish(self, message: dict[str, Any]) -> int:
+        """Queue message for subscribed connections and refresh the stale gauge.
 
         Phase XX M9: Also tracks stale connections (no heartbeat for 35+ seconds)
         and updates Prometheus gauge.
         """
-        to_remove: list[WebSocket] = []
         now = time.time()
-        stale_count = 0
-
-        for ws in self.active_connections:
-            try:
-                # Check if connection is stale
-                last_hb = self.last_heartbeat.get(ws, 0)
-                if now - last_hb > self.stale_after_seconds:
-                    stale_count += 1
-
-                await ws.send_text(json.dumps(message))
-            except Exception:
-                to_remove.append(ws)
-
-        # Update stale connections gauge
+        stale_count = sum(
+            1
+            for ws in self.active_connections
+            if now - self.last_heartbeat.get(ws, 0) > self.stale_after_seconds
+        )
         timeline_ws_stale_connections.labels(tenant="all").set(stale_count)
+        return super().publish(message)
+
+    async def broadcast(self, message: dict[str, Any]) -> None:
+        """Broadcast message to all subscribed connections (does not wait for sends)."""
+        self.publish(message)
 
-        for ws in to_remove:
-            self.disconnect(ws)
+    async def send_personal(self, websocket: WebSocket, message: dict[str, Any]) -> None:
+        """Send to one connection through its queue, keeping order with broadcasts."""
+        sub = self._subscribers.get(websocket)
+        if sub is None:
+            await websocket.send_text(json.dumps(message))
+            return
+        self._offer(sub, None, json.dumps(message), time.perf_counter())
 
 
 # Global manager instances
-remediation_ws_manager = BaseWSManager()
-operator_activity_ws_manager = BaseWSManager()
+remediation_ws_manager = BaseWSManager("remediations")
+operator_activity_ws_manager = BaseWSManager("operator_activity")